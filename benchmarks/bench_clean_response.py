@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+#
+# Microbenchmark: response cleaning
+# =================================
+# Compares the original clean_response implementation (patterns compiled
+# from source on every call) with the precompiled clean_response_text and
+# the chunk-by-chunk StreamingResponseCleaner.
+#
+# Usage:
+#   python benchmarks/bench_clean_response.py [--repeat 5] [--number 2000]
+#
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from response_cleaner import StreamingResponseCleaner, clean_response_text
+
+CHUNK_SIZE = 4  # Roughly one token per streamed chunk
+
+SAMPLES = {
+    "plain_answer": "We built movements on the promise that justice could be organized. " * 12,
+    "qwen_with_think": "<think>\n" + "Let me reason about the question carefully. " * 30 + "\n</think>\n\n"
+                       + "MLK: The algorithm does not hate you; it simply remembers what we taught it. " * 6,
+    "labelled_question": '**Follow-up Question:** "But doesn\'t that contradict your earlier claim about progress?"\n'
+                         '**Rationale:** Pushes the expert off familiar ground.',
+}
+
+
+def legacy_clean_response(text):
+    """The clean_response implementation this module replaced, kept for comparison"""
+    text = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)
+    text = re.sub(r'\*\*(Opening|Follow-up) Question:\*\*\s*"?', '', text)
+    text = re.sub(r'\*\*Rationale:\*\*.*', '', text, flags=re.MULTILINE)
+    text = re.sub(r"^\*\*(MLK|HOST):\*\* ?", "", text.strip())
+    text = re.sub(r"^(MLK|HOST): ?", "", text.strip())
+    text = text.strip()
+    if (text.startswith('"') and text.endswith('"')) or \
+       (text.startswith("'") and text.endswith("'")):
+        text = text[1:-1]
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def streaming_clean(text, chunk_size=None):
+    """Feed text in token-sized chunks, as Ollama streaming would"""
+    chunk_size = chunk_size or CHUNK_SIZE
+    cleaner = StreamingResponseCleaner()
+    for start in range(0, len(text), chunk_size):
+        cleaner.feed(text[start:start + chunk_size])
+    return cleaner.finish()
+
+
+def best_time(function, text, repeat, number):
+    return min(timeit.repeat(lambda: function(text), repeat=repeat, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response cleaning implementations.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'sample':<20} {'legacy µs':>10} {'precompiled µs':>15} {'speedup':>8} {'streaming µs/chunk':>19}")
+    for name, text in SAMPLES.items():
+        assert legacy_clean_response(text) == clean_response_text(text) == streaming_clean(text)
+        legacy = best_time(legacy_clean_response, text, args.repeat, args.number)
+        precompiled = best_time(clean_response_text, text, args.repeat, args.number)
+        streaming = best_time(streaming_clean, text, args.repeat, max(1, args.number // 10))
+        chunks = max(1, -(-len(text) // CHUNK_SIZE))
+        print(f"{name:<20} {legacy * 1e6:>10.2f} {precompiled * 1e6:>15.2f} {legacy / precompiled:>7.1f}x {streaming * 1e6 / chunks:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
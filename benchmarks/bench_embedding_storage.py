@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+#
+# Embedding Storage Benchmark
+# ===========================
+# Compares the quantized, memory-mapped embedding storage
+# (quantized_index.py) with exact float32 search and with ChromaDB on the
+# same vectors:
+#   - recall@k against exact float32 cosine search
+#   - query latency p50 / p95
+#   - memory: bytes every query touches (quantized vectors and scales vs
+#     float32 vectors) and bytes on disk
+#
+# Vectors are either synthetic (clustered, like chunks of a few persona
+# corpora) or exported from an existing ChromaDB collection, in which case
+# --queries of its documents are held out and used as the queries.
+#
+# Usage:
+#   python benchmarks/bench_embedding_storage.py --count 20000 --dimensions 768
+#   python benchmarks/bench_embedding_storage.py --chroma-path ./chroma_db --collection expert_knowledge
+#   python benchmarks/bench_embedding_storage.py --skip-chroma --save /tmp/storage.json
+#
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from quantized_index import QUANTIZATIONS, QuantizedIndex
+
+
+def summarize(samples):
+    milliseconds = np.asarray(samples) * 1000
+    return {
+        "p50_ms": float(np.percentile(milliseconds, 50)),
+        "p95_ms": float(np.percentile(milliseconds, 95)),
+    }
+
+
+def directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def synthetic_vectors(count, dimensions, clusters, queries, seed):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimensions))
+    spread = 0.6
+    embeddings = centers[rng.integers(0, clusters, count)] + spread * rng.normal(size=(count, dimensions))
+    query_vectors = centers[rng.integers(0, clusters, queries)] + spread * rng.normal(size=(queries, dimensions))
+    return embeddings.astype(np.float32), query_vectors.astype(np.float32)
+
+
+def collection_vectors(chroma_path, collection_name, queries, seed):
+    import chromadb
+    collection = chromadb.PersistentClient(path=chroma_path).get_collection(collection_name)
+    embeddings = np.asarray(collection.get(include=["embeddings"])['embeddings'], dtype=np.float32)
+    if len(embeddings) <= queries:
+        raise SystemExit(f"{collection_name} has {len(embeddings)} embeddings; need more than --queries {queries}")
+    order = np.random.default_rng(seed).permutation(len(embeddings))
+    return embeddings[order[queries:]], embeddings[order[:queries]]
+
+
+def exact_neighbours(embeddings, query_vectors, k):
+    unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    truth, timings = [], []
+    for query in query_vectors:
+        start = time.perf_counter()
+        scores = unit @ (query / np.linalg.norm(query))
+        truth.append(set(np.argpartition(-scores, k - 1)[:k].tolist()))
+        timings.append(time.perf_counter() - start)
+    return truth, timings
+
+
+def measure(search, query_vectors, truth, k):
+    recalls, timings = [], []
+    for query, expected in zip(query_vectors, truth):
+        start = time.perf_counter()
+        found = search(query)
+        timings.append(time.perf_counter() - start)
+        recalls.append(len(expected & set(found)) / k)
+    return float(np.mean(recalls)), timings
+
+
+def bench_quantized(embeddings, query_vectors, truth, k, work_directory, oversample):
+    ids = [str(i) for i in range(len(embeddings))]
+    documents = [f"chunk {i}" for i in range(len(embeddings))]
+    rows = {}
+    for quantization in QUANTIZATIONS:
+        path = os.path.join(work_directory, quantization)
+        start = time.perf_counter()
+        QuantizedIndex.build(path, ids, documents, None, embeddings, quantization=quantization)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        index = QuantizedIndex(path, oversample=oversample)
+        open_seconds = time.perf_counter() - start
+        recall, timings = measure(lambda query: [row for row, _ in index.search(query, k)], query_vectors, truth, k)
+        rows[quantization] = {"recall": recall, **summarize(timings), "resident_bytes": index.resident_bytes(),
+                              "disk_bytes": directory_bytes(path), "build_seconds": build_seconds, "open_seconds": open_seconds}
+    return rows
+
+
+def bench_chroma(embeddings, query_vectors, truth, k, work_directory):
+    import chromadb
+    path = os.path.join(work_directory, "chroma")
+    client = chromadb.PersistentClient(path=path)
+    collection = client.get_or_create_collection("bench", metadata={"hnsw:space": "cosine"}, embedding_function=None)
+    start = time.perf_counter()
+    for offset in range(0, len(embeddings), 4096):
+        batch = embeddings[offset:offset + 4096]
+        collection.add(ids=[str(i) for i in range(offset, offset + len(batch))], embeddings=batch.tolist())
+    build_seconds = time.perf_counter() - start
+
+    def search(query):
+        return [int(doc_id) for doc_id in collection.query(query_embeddings=[query.tolist()], n_results=k)['ids'][0]]
+
+    recall, timings = measure(search, query_vectors, truth, k)
+    return {"recall": recall, **summarize(timings), "resident_bytes": embeddings.nbytes,  # HNSW keeps float32 vectors in memory
+            "disk_bytes": directory_bytes(path), "build_seconds": build_seconds, "open_seconds": None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall, latency and memory of quantized embedding storage vs float32 and ChromaDB.")
+    parser.add_argument('--count', type=int, default=20000, help="Synthetic vectors to index")
+    parser.add_argument('--dimensions', type=int, default=384)
+    parser.add_argument('--clusters', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=5, help="Results per query (recall@k)")
+    parser.add_argument('--oversample', type=int, default=4, help="Candidates re-scored exactly, as a multiple of k")
+    parser.add_argument('--chroma-path', default=None, help="Use the embeddings of an existing ChromaDB collection...")
+    parser.add_argument('--collection', default=None, help="...with this name")
+    parser.add_argument('--skip-chroma', action='store_true', help="Don't index the vectors into ChromaDB for comparison")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    if args.chroma_path:
+        embeddings, query_vectors = collection_vectors(args.chroma_path, args.collection or "expert_knowledge", args.queries, args.seed)
+    else:
+        embeddings, query_vectors = synthetic_vectors(args.count, args.dimensions, args.clusters, args.queries, args.seed)
+    print(f"📐 {len(embeddings)} vectors x {embeddings.shape[1]} dimensions, {len(query_vectors)} queries, recall@{args.k}")
+
+    work_directory = tempfile.mkdtemp(prefix="bench_embedding_storage_")
+    try:
+        truth, exact_timings = exact_neighbours(embeddings, query_vectors, args.k)
+        results = {"float32 (exact)": {"recall": 1.0, **summarize(exact_timings), "resident_bytes": embeddings.nbytes,
+                                       "disk_bytes": None, "build_seconds": None, "open_seconds": None}}
+        results.update(bench_quantized(embeddings, query_vectors, truth, args.k, work_directory, args.oversample))
+        if not args.skip_chroma:
+            results["chromadb (hnsw)"] = bench_chroma(embeddings, query_vectors, truth, args.k, work_directory)
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+    print(f"\n{'storage':<18} {'recall':>7} {'p50 ms':>8} {'p95 ms':>8} {'resident MB':>12} {'disk MB':>9} {'open ms':>8}")
+    for name, row in results.items():
+        disk = f"{row['disk_bytes'] / 1e6:>9.1f}" if row['disk_bytes'] is not None else f"{'-':>9}"
+        opened = f"{row['open_seconds'] * 1000:>8.1f}" if row['open_seconds'] is not None else f"{'-':>8}"
+        print(f"{name:<18} {row['recall']:>7.3f} {row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f} "
+              f"{row['resident_bytes'] / 1e6:>12.1f} {disk} {opened}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({"settings": vars(args), "results": results}, f, indent=2)
+        print(f"💾 Results saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
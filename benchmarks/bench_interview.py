@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+#
+# Interview Benchmark Harness
+# ===========================
+# Runs complete interviews against the deterministic fake Ollama server
+# (benchmarks/fake_ollama.py) and times each stage: opening, host
+# questions, expert responses, evaluations, every LLM request type,
+# retrieval, history assembly and transcript saving. It then runs
+# micro-benchmarks for retrieval, clean_response, get_conversation_history,
+# prompt assembly (with an instant LLM) and LLM request logging.
+#
+# Every stage is reported as count / p50 / p95 / mean in milliseconds.
+# Save a baseline with --save-baseline and compare later runs against it
+# with --compare to spot regressions. Baselines are machine specific, so
+# keep them out of the repository.
+#
+# Usage:
+#   python benchmarks/bench_interview.py --runs 3
+#   python benchmarks/bench_interview.py --ttft-ms 250 --tokens-per-second 40 --save-baseline /tmp/baseline.json
+#   python benchmarks/bench_interview.py --compare /tmp/baseline.json --fail-on-regression
+#
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_ollama import FakeOllamaServer, ResponseScript, add_latency_arguments, latency_from_arguments
+
+# Differences below this many milliseconds are treated as noise when comparing baselines
+NOISE_FLOOR_MS = 0.05
+
+MICRO_QUERIES = (
+    "algorithmic bias and digital segregation",
+    "nonviolence on social media",
+    "beloved community online",
+)
+
+
+def deep_merge(base, overrides):
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class StageTimer:
+    """Collects wall-clock samples per named stage"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[stage].append(time.perf_counter() - start)
+
+    def wrap(self, target, method_name, stage=None, stage_from_args=None):
+        """Replace target.method_name with a timed wrapper on that instance only"""
+        original = getattr(target, method_name)
+
+        def timed(*args, **kwargs):
+            name = stage_from_args(args, kwargs) if stage_from_args else (stage or method_name)
+            with self.measure(name):
+                return original(*args, **kwargs)
+
+        setattr(target, method_name, timed)
+
+    def summary(self):
+        return {stage: summarize(samples) for stage, samples in sorted(self.samples.items())}
+
+
+def summarize(samples):
+    milliseconds = np.asarray(samples) * 1000
+    return {
+        "count": int(milliseconds.size),
+        "p50_ms": float(np.percentile(milliseconds, 50)),
+        "p95_ms": float(np.percentile(milliseconds, 95)),
+        "mean_ms": float(milliseconds.mean()),
+    }
+
+
+def build_system(server_url, work_directory, logging_enabled=True, chroma_path=None):
+    """Create a RecursiveInterviewSystem wired to an Ollama URL and a scratch directory.
+
+    chroma_path lets several systems share one ChromaDB directory; it defaults
+    to a fresh directory inside work_directory.
+    """
+    os.makedirs(work_directory, exist_ok=True)
+    os.environ['OLLAMA_HOST'] = server_url
+    from chromadb.utils.embedding_functions import OllamaEmbeddingFunction
+    from interview_system import RecursiveInterviewSystem
+
+    overrides = {
+        'logging': {'enabled': logging_enabled, 'log_directory': os.path.join(work_directory, "logs")},
+        'chromadb': {'path': chroma_path or os.path.join(work_directory, "chroma_db")},
+        'persona_settings': {'default_persona_file_path': os.path.join(REPO_ROOT, "personas", "mlk.md"),
+                             'personas_directory': os.path.join(REPO_ROOT, "personas")},
+        'expert_defaults': {'martin_luther_king_jr': {'persona_file': os.path.join(REPO_ROOT, "personas", "mlk.md")}},
+        'transcript_filename_prefix': os.path.join(work_directory, "interview_"),
+        'transcript_store': {'enabled': False},
+        'web_search_settings': {'enabled': False},
+        # Nothing may open before embedding_function is set below, whatever config.yaml ships
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    class BenchmarkInterviewSystem(RecursiveInterviewSystem):
+        def _load_config(self, config_path="config.yaml"):
+            return deep_merge(super()._load_config(os.path.join(REPO_ROOT, "config.yaml")), overrides)
+
+    system = BenchmarkInterviewSystem()
+    # Chroma's default embedding function downloads an ONNX model; embed through Ollama instead.
+    # Scratch ChromaDB directories are empty, so every collection is created with this function.
+    system.embedding_function = OllamaEmbeddingFunction(url=server_url, model_name=system.config.get('embedding_model', 'nomic-embed-text'))
+    system.open_backends()
+    return system
+
+
+def instrument(system, timer):
+    """Time the interview stages of one system instance"""
+    for method_name in ("conduct_interview_opening", "generate_host_question", "generate_expert_response",
+                        "evaluate_response_depth", "detect_comfort_zone_patterns", "search_expert_knowledge",
+                        "get_conversation_history", "clean_response", "generate_interview_conclusion",
+                        "save_transcript"):
+        timer.wrap(system, method_name)
+    timer.wrap(system, "_make_llm_request", stage_from_args=lambda args, kwargs: f"llm:{kwargs.get('request_type') or args[0]}")
+
+
+def run_interviews(server_url, runs, max_exchanges, logging_enabled, timer):
+    """Run complete interviews, each in a fresh scratch directory"""
+    for _ in range(runs):
+        work_directory = tempfile.mkdtemp(prefix="recursive_bench_")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                with timer.measure("setup:system_init"):
+                    system = build_system(server_url, work_directory, logging_enabled)
+                with timer.measure("setup:expert_knowledge"):
+                    system.setup_mlk_expert()
+                instrument(system, timer)
+                topics = system.config.get('default_topics', [])
+                with timer.measure("interview:total"):
+                    system.run_interview(system.config.get('default_expert_name', "Martin Luther King Jr."),
+                                         topics, max_exchanges=max_exchanges)
+        finally:
+            shutil.rmtree(work_directory, ignore_errors=True)
+
+
+def run_micro_benchmarks(server_url, iterations, logging_enabled, timer):
+    """Micro-benchmark individual operations on a seeded system with a full history"""
+    work_directory = tempfile.mkdtemp(prefix="recursive_micro_")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            system = build_system(server_url, work_directory, logging_enabled)
+            system.setup_mlk_expert()
+        script = ResponseScript()
+        system.interview_history = [
+            {"speaker": "HOST" if i % 2 == 0 else "Martin Luther King Jr.", "text": script.reply(f"turn {i}"), "topic": "AI bias"}
+            for i in range(40)
+        ]
+        raw_responses = [script.reply(query) for query in MICRO_QUERIES]
+
+        for i in range(iterations):
+            with timer.measure("micro:retrieval"):
+                system.search_expert_knowledge(MICRO_QUERIES[i % len(MICRO_QUERIES)])
+            with timer.measure("micro:clean_response"):
+                system.clean_response(raw_responses[i % len(raw_responses)])
+            with timer.measure("micro:conversation_history"):
+                system.get_conversation_history()
+            with timer.measure("micro:llm_logging"):
+                system._log_llm_request("benchmark", "fake", raw_responses[0] * 4, {"temperature": 0.7})
+                system._log_llm_response("benchmark", {'response': raw_responses[0] * 4}, 0.01)
+
+        # Prompt assembly: everything a generation step does except waiting on the model and the vector store
+        context = system.search_expert_knowledge(MICRO_QUERIES[0])
+        system.search_expert_knowledge = lambda query, *args, **kwargs: context
+        canned = {'response': raw_responses[0]}
+        system._make_llm_request = lambda *args, **kwargs: canned
+        history = system.get_conversation_history()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(iterations):
+                with timer.measure("micro:prompt_assembly:host_question"):
+                    system.generate_host_question("AI bias", history)
+                with timer.measure("micro:prompt_assembly:expert_response"):
+                    system.generate_expert_response("Martin Luther King Jr.", MICRO_QUERIES[i % len(MICRO_QUERIES)], history)
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+
+def compare_to_baseline(current, baseline, threshold):
+    """Return rows of (stage, baseline_p50, current_p50, change, regressed)"""
+    rows = []
+    for stage, stats in current.items():
+        previous = baseline.get(stage)
+        if previous is None:
+            continue
+        change = (stats['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] if previous['p50_ms'] else 0.0
+        regressed = change > threshold and stats['p50_ms'] - previous['p50_ms'] > NOISE_FLOOR_MS
+        rows.append((stage, previous['p50_ms'], stats['p50_ms'], change, regressed))
+    return rows
+
+
+def print_summary(summary):
+    print(f"\n{'stage':<42} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'mean ms':>10}")
+    for stage, stats in summary.items():
+        print(f"{stage:<42} {stats['count']:>6} {stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} {stats['mean_ms']:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full interviews and hot paths against a fake Ollama server.")
+    parser.add_argument('--runs', type=int, default=3, help="Complete interviews to run")
+    parser.add_argument('--max-exchanges', type=int, default=None, help="Override interview.max_exchanges")
+    parser.add_argument('--iterations', type=int, default=200, help="Iterations per micro-benchmark")
+    parser.add_argument('--skip-interviews', action='store_true', help="Only run the micro-benchmarks")
+    parser.add_argument('--no-logging', action='store_true', help="Disable the system's file logging")
+    parser.add_argument('--save-baseline', default=None, help="Write the results to this JSON file")
+    parser.add_argument('--compare', default=None, help="Compare against a saved baseline JSON file")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Relative p50 slowdown counted as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 if any stage regressed")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    latency = latency_from_arguments(args)
+    timer = StageTimer()
+    with FakeOllamaServer(latency=latency, script=ResponseScript(think=not args.no_think), parallel=args.parallel) as server:
+        print(f"🦙 Fake Ollama on {server.url} (ttft {args.ttft_ms} ms {args.distribution}, {args.tokens_per_second or '∞'} tok/s)")
+        if not args.skip_interviews:
+            print(f"🎙️ Running {args.runs} full interview(s)...")
+            run_interviews(server.url, args.runs, args.max_exchanges, not args.no_logging, timer)
+        print(f"🔬 Running micro-benchmarks ({args.iterations} iterations)...")
+        run_micro_benchmarks(server.url, args.iterations, not args.no_logging, timer)
+        request_counts = dict(server.request_counts)
+
+    summary = timer.summary()
+    print_summary(summary)
+    print(f"\nFake server requests: {request_counts}")
+
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ('save_baseline', 'compare')},
+        "stages": summary,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare_to_baseline(summary, baseline.get('stages', {}), args.threshold)
+        print(f"\nCompared with {args.compare} (baseline from {baseline.get('created_at', 'unknown')}):")
+        print(f"{'stage':<42} {'base p50':>10} {'now p50':>10} {'change':>8}")
+        for stage, previous, current, change, regressed in rows:
+            marker = "  ⚠️ regression" if regressed else ""
+            print(f"{stage:<42} {previous:>10.3f} {current:>10.3f} {change:>+7.1%}{marker}")
+        regressions = [row for row in rows if row[4]]
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than the baseline by more than {args.threshold:.0%}")
+            if args.fail_on_regression:
+                sys.exit(1)
+        else:
+            print("\n✓ No regressions beyond the threshold")
+
+
+if __name__ == "__main__":
+    main()
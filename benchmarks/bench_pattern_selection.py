@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#
+# Pattern Selection Benchmark
+# ===========================
+# Measures the learned-pattern library (pattern_library.py) on synthetic
+# pattern embeddings where each successful question has many near-duplicate
+# re-phrasings:
+#   - k-means fit time and incremental add time
+#   - selection latency p50 / p95 (MMR over cluster representatives)
+#   - variety: mean pairwise similarity of the selected examples, and
+#     distinct source questions, against plain top-k by cosine similarity
+#
+# Usage:
+#   python benchmarks/bench_pattern_selection.py --count 20000 --dimensions 768
+#   python benchmarks/bench_pattern_selection.py --count 50000 --select 3 --diversity 0.7
+#
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, REPO_ROOT)
+
+from pattern_library import PatternLibrary
+
+
+def summarize(samples):
+    microseconds = np.asarray(samples) * 1e6
+    return f"p50 {np.percentile(microseconds, 50):.0f}µs, p95 {np.percentile(microseconds, 95):.0f}µs"
+
+
+def variety(vectors, picked_rows, sources):
+    unit = vectors[picked_rows] / np.linalg.norm(vectors[picked_rows], axis=1, keepdims=True)
+    similarities = unit @ unit.T
+    pairs = similarities[np.triu_indices(len(picked_rows), 1)]
+    return (float(pairs.mean()) if len(pairs) else 0.0), len(set(sources[picked_rows].tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit time, selection latency and variety of the learned-pattern library.")
+    parser.add_argument('--count', type=int, default=20000, help="Synthetic patterns")
+    parser.add_argument('--dimensions', type=int, default=768)
+    parser.add_argument('--questions', type=int, default=400, help="Distinct successful questions the patterns re-phrase")
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--select', type=int, default=2, help="Examples injected per prompt")
+    parser.add_argument('--max-clusters', type=int, default=128)
+    parser.add_argument('--diversity', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    questions = rng.normal(size=(args.questions, args.dimensions))
+    # Popular questions are re-phrased far more often than the rest
+    sources = rng.zipf(1.5, args.count) % args.questions
+    vectors = (questions[sources] + 0.35 * rng.normal(size=(args.count, args.dimensions))).astype(np.float32)
+    documents = [str(row) for row in range(args.count)]
+    print(f"📐 {args.count} patterns of {args.questions} questions x {args.dimensions} dimensions, {args.select} per prompt")
+
+    library = PatternLibrary(None, max_clusters=args.max_clusters, diversity=args.diversity, seed=args.seed)
+    start = time.perf_counter()
+    library.sync(documents, documents, lambda texts: vectors[[int(text) for text in texts]])
+    print(f"🧮 Embedded and clustered in {time.perf_counter() - start:.2f}s ({library.clusters} clusters)")
+
+    start = time.perf_counter()
+    extra = 20
+    for i in range(extra):
+        library.add(f"extra_{i}", documents[i], vectors[i])
+    print(f"➕ Incremental add: {(time.perf_counter() - start) * 1000 / extra:.2f}ms per pattern")
+    library.wait()
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query_vectors = questions[rng.integers(0, args.questions, args.queries)] + 0.5 * rng.normal(size=(args.queries, args.dimensions))
+    timings, mmr_similarity, mmr_distinct, top_similarity, top_distinct = [], [], [], [], []
+    for query in query_vectors.astype(np.float32):
+        start = time.perf_counter()
+        picked = library.select(query, args.select)
+        timings.append(time.perf_counter() - start)
+        similarity, distinct = variety(vectors, np.array([int(document) for document in picked]), sources)
+        mmr_similarity.append(similarity)
+        mmr_distinct.append(distinct)
+        top = np.argpartition(-(unit @ query), args.select - 1)[:args.select]
+        similarity, distinct = variety(vectors, top, sources)
+        top_similarity.append(similarity)
+        top_distinct.append(distinct)
+
+    print(f"⏱️  Selection: {summarize(timings)}")
+    print(f"{'selection':<12} {'mean pairwise cosine':>21} {'distinct questions':>19}")
+    print(f"{'top-k':<12} {np.mean(top_similarity):>21.3f} {np.mean(top_distinct):>19.2f}")
+    print(f"{'mmr':<12} {np.mean(mmr_similarity):>21.3f} {np.mean(mmr_distinct):>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
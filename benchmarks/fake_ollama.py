@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+#
+# Fake Ollama Server
+# ==================
+# A deterministic stand-in for the Ollama HTTP API, used by the benchmark
+# and load-test harnesses. It implements /api/generate, /api/chat,
+# /api/embed and /api/embeddings (plus /api/tags and /api/version), streams
+# NDJSON when asked to, and wraps generations in <think> blocks the way
+# qwen3 does.
+#
+# Response text depends only on the prompt, so runs are reproducible.
+# Latency comes from a LatencyModel: time-to-first-token drawn from a
+# constant, normal or lognormal distribution, then a steady token rate.
+# Like OLLAMA_NUM_PARALLEL, `parallel` caps how many requests are served
+# at once; the rest queue and their waits are recorded in queue_waits.
+#
+# Usage:
+#   python benchmarks/fake_ollama.py --port 11435 --tokens-per-second 40 --ttft-ms 250
+#   OLLAMA_HOST=http://127.0.0.1:11435 python interview_system.py
+#
+
+import argparse
+import contextlib
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+EMBEDDING_DIMENSIONS = 64
+TOKEN_PATTERN = re.compile(r'\s*\S+')
+
+ANSWER_SENTENCES = (
+    "The arc of the moral universe is long, but it does not bend on its own.",
+    "I have watched algorithms learn our prejudices and call them predictions.",
+    "Injustice anywhere is a threat to justice everywhere, and that includes the data we collect.",
+    "A feed that sorts us by outrage is a lunch counter with an invisible sign.",
+    "I was wrong to believe that exposure alone would shame power into changing.",
+    "Nonviolence in a networked age means refusing to amplify what degrades us.",
+    "We built the beloved community in church basements; I do not know yet if it survives in comment sections.",
+    "The question is not whether the machine is biased but who is accountable when it is.",
+)
+THINK_SENTENCES = (
+    "The host is pressing on a contradiction.",
+    "I should answer from lived experience rather than repeat a speech.",
+    "There is a tension between optimism and the evidence.",
+)
+RATIONALES = (
+    "The expert restates a familiar theme without new risk.",
+    "Some self-examination, but the answer stays on well-worn ground.",
+    "The expert concedes a past error and explores unfamiliar territory.",
+)
+
+
+class LatencyModel:
+    """Time-to-first-token and token-rate model for fake generations.
+
+    distribution is one of "constant", "normal" or "lognormal"; ttft_jitter_ms
+    is the standard deviation (normal) or the sigma scale (lognormal).
+    """
+
+    def __init__(self, ttft_ms=0.0, ttft_jitter_ms=0.0, tokens_per_second=0.0,
+                 distribution="constant", embed_ms_per_input=0.0, seed=0):
+        if distribution not in ("constant", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.ttft_ms = ttft_ms
+        self.ttft_jitter_ms = ttft_jitter_ms
+        self.tokens_per_second = tokens_per_second
+        self.distribution = distribution
+        self.embed_ms_per_input = embed_ms_per_input
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def time_to_first_token(self):
+        """Seconds to wait before the first token"""
+        if self.ttft_ms <= 0:
+            return 0.0
+        with self._lock:
+            if self.distribution == "normal":
+                value = self._random.gauss(self.ttft_ms, self.ttft_jitter_ms)
+            elif self.distribution == "lognormal":
+                sigma = self.ttft_jitter_ms / self.ttft_ms if self.ttft_ms else 0.0
+                value = self.ttft_ms * self._random.lognormvariate(0.0, sigma)
+            else:
+                value = self.ttft_ms
+        return max(value, 0.0) / 1000
+
+    def token_interval(self):
+        """Seconds between streamed tokens"""
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def embed_time(self, input_count):
+        return self.embed_ms_per_input * input_count / 1000
+
+
+def stable_hash(text):
+    return int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'big')
+
+
+def fake_embedding(text, dimensions=EMBEDDING_DIMENSIONS):
+    """Deterministic unit vector for a text"""
+    generator = np.random.default_rng(stable_hash(text))
+    vector = generator.standard_normal(dimensions)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class ResponseScript:
+    """Chooses deterministic reply text for a prompt"""
+
+    def __init__(self, answer_sentences=3, think=True, think_sentences=2):
+        self.answer_sentences = answer_sentences
+        self.think = think
+        self.think_sentences = think_sentences
+
+    @staticmethod
+    def is_evaluation(prompt, format=None):
+        return format is not None or "Score:" in prompt
+
+    def score_for(self, prompt):
+        return stable_hash(prompt) % 3 + 1
+
+    def reply(self, prompt, format=None):
+        seed = stable_hash(prompt)
+        if self.is_evaluation(prompt, format):
+            score = self.score_for(prompt)
+            if format is not None:
+                body = json.dumps({"score": score, "rationale": RATIONALES[score - 1], "comfort_zone_flags": []})
+            else:
+                body = f"Score: {score}\nRationale: {RATIONALES[score - 1]}"
+        else:
+            body = ' '.join(
+                ANSWER_SENTENCES[(seed + i) % len(ANSWER_SENTENCES)] for i in range(self.answer_sentences)
+            )
+        if self.think and format is None:
+            thinking = ' '.join(THINK_SENTENCES[(seed + i) % len(THINK_SENTENCES)] for i in range(self.think_sentences))
+            body = f"<think>\n{thinking}\n</think>\n\n{body}"
+        return body
+
+
+def tokenize(text):
+    """Split text into word-sized tokens that join back to the original"""
+    return TOKEN_PATTERN.findall(text)
+
+
+class FakeOllamaServer:
+    """Threaded fake Ollama HTTP server. Use as a context manager or call start()/stop()."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=None, script=None, parallel=None):
+        self.latency = latency or LatencyModel()
+        self.script = script or ResponseScript()
+        self.parallel = parallel
+        self.request_counts = {}
+        self.queue_waits = []  # Seconds each model request waited for a free slot
+        self._counts_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(parallel) if parallel else None
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def _count(self, path):
+        with self._counts_lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    @contextlib.contextmanager
+    def _slot(self):
+        """Hold one of the `parallel` model slots for the duration of a request"""
+        start = time.perf_counter()
+        if self._slots:
+            self._slots.acquire()
+        waited = time.perf_counter() - start
+        with self._counts_lock:
+            self.queue_waits.append(waited)
+        try:
+            yield
+        finally:
+            if self._slots:
+                self._slots.release()
+
+    def reset_stats(self):
+        with self._counts_lock:
+            self.request_counts = {}
+            self.queue_waits = []
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Otherwise split header/body writes stall on delayed ACKs
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json({"models": []})
+                elif self.path == "/api/version":
+                    self._send_json({"version": "0.0.0-fake"})
+                else:
+                    self._send_json({"error": "not found"}, status=404)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                server._count(self.path)
+                if self.path not in ("/api/generate", "/api/chat", "/api/embed", "/api/embeddings"):
+                    self._send_json({"error": "not found"}, status=404)
+                    return
+                with server._slot():
+                    if self.path == "/api/generate":
+                        self._generate(body, body.get('prompt', ''), chat=False)
+                    elif self.path == "/api/chat":
+                        messages = body.get('messages') or []
+                        prompt = "\n".join(message.get('content', '') for message in messages)
+                        self._generate(body, prompt, chat=True)
+                    elif self.path == "/api/embed":
+                        inputs = body.get('input', [])
+                        inputs = [inputs] if isinstance(inputs, str) else inputs
+                        time.sleep(server.latency.embed_time(len(inputs)))
+                        self._send_json({"model": body.get('model'), "embeddings": [fake_embedding(text) for text in inputs]})
+                    else:
+                        time.sleep(server.latency.embed_time(1))
+                        self._send_json({"embedding": fake_embedding(body.get('prompt', ''))})
+
+            def _generate(self, body, prompt, chat):
+                text = server.script.reply(prompt, body.get('format'))
+                tokens = tokenize(text)
+                num_predict = (body.get('options') or {}).get('num_predict')
+                if num_predict and num_predict > 0 and body.get('format') is None:
+                    tokens = tokens[:num_predict]
+                model = body.get('model', 'fake')
+                time.sleep(server.latency.time_to_first_token())
+                interval = server.latency.token_interval()
+
+                if body.get('stream', True) is False:
+                    time.sleep(interval * len(tokens))
+                    self._send_json(self._message(model, ''.join(tokens), chat, done=True, eval_count=len(tokens)))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for index, token in enumerate(tokens):
+                        if index and interval:
+                            time.sleep(interval)
+                        self._write_chunk(self._message(model, token, chat, done=False))
+                    self._write_chunk(self._message(model, '', chat, done=True, eval_count=len(tokens)))
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client closed the stream early (e.g. a word budget was reached)
+
+            def _message(self, model, text, chat, done, eval_count=None):
+                message = {"model": model, "created_at": datetime.now(timezone.utc).isoformat(), "done": done}
+                if chat:
+                    message["message"] = {"role": "assistant", "content": text}
+                else:
+                    message["response"] = text
+                if done:
+                    message.update({"done_reason": "stop", "eval_count": eval_count})
+                return message
+
+            def _write_chunk(self, payload):
+                data = (json.dumps(payload) + "\n").encode('utf-8')
+                self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, payload, status=200):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def add_latency_arguments(parser):
+    """Register the latency model options shared by the benchmark scripts"""
+    parser.add_argument('--ttft-ms', type=float, default=0.0, help="Mean time to first token")
+    parser.add_argument('--ttft-jitter-ms', type=float, default=0.0, help="Time-to-first-token spread")
+    parser.add_argument('--distribution', choices=["constant", "normal", "lognormal"], default="constant")
+    parser.add_argument('--tokens-per-second', type=float, default=0.0, help="Generation rate (0 = instant)")
+    parser.add_argument('--embed-ms', type=float, default=0.0, help="Embedding latency per input")
+    parser.add_argument('--no-think', action='store_true', help="Do not wrap generations in <think> blocks")
+    parser.add_argument('--parallel', type=int, default=None, help="Requests served at once (like OLLAMA_NUM_PARALLEL)")
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def latency_from_arguments(args):
+    return LatencyModel(
+        ttft_ms=args.ttft_ms, ttft_jitter_ms=args.ttft_jitter_ms, tokens_per_second=args.tokens_per_second,
+        distribution=args.distribution, embed_ms_per_input=args.embed_ms, seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a deterministic fake Ollama server.")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=11435)
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(args.host, args.port, latency_from_arguments(args), ResponseScript(think=not args.no_think),
+                              parallel=args.parallel)
+    print(f"🦙 Fake Ollama listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping fake Ollama server")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+#
+# Interview Load Test
+# ===================
+# Runs N concurrent interviews against one Ollama endpoint and one shared
+# ChromaDB path, ramping N in steps, to find where latency collapses. At
+# each step it records:
+#   - throughput (expert exchanges per minute)
+#   - LLM request latency p50/p95
+#   - queueing delay: measured by the fake server when it is the backend,
+#     otherwise estimated as LLM p50 above the first (least loaded) step
+#   - error rate (failed LLM requests and failed interviews)
+#   - ChromaDB contention: query/upsert latency p95 and "database is locked" errors
+# and prints a saturation curve, optionally saving it as JSON for capacity
+# planning.
+#
+# Each worker thread owns one RecursiveInterviewSystem and runs interviews
+# back to back; all workers share the Ollama endpoint and ChromaDB path.
+#
+# Usage:
+#   python benchmarks/load_test.py --steps 1,2,4,8 --ttft-ms 200 --tokens-per-second 50 --parallel 2
+#   python benchmarks/load_test.py --ollama-url http://gpu-box:11434 --steps 1,2,4 --max-exchanges 4
+#
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_interview import build_system
+from fake_ollama import FakeOllamaServer, ResponseScript, add_latency_arguments, latency_from_arguments
+
+CHROMA_OPERATIONS = ("query", "upsert", "add", "get")
+# A step counts as saturated once adding workers raises throughput by less than this fraction
+DEFAULT_MIN_GAIN = 0.10
+
+
+class StepMetrics:
+    """Thread-safe counters and latency samples for one concurrency step"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.llm_latencies = []
+        self.llm_requests = 0
+        self.llm_errors = 0
+        self.chroma_latencies = []
+        self.chroma_lock_errors = 0
+        self.exchanges = 0
+        self.interviews = 0
+        self.failed_interviews = 0
+
+    def record_llm(self, seconds, failed, request_type):
+        with self._lock:
+            self.llm_requests += 1
+            self.llm_latencies.append(seconds)
+            if failed:
+                self.llm_errors += 1
+            elif request_type == "EXPERT_RESPONSE":
+                self.exchanges += 1
+
+    def record_chroma(self, seconds, locked):
+        with self._lock:
+            self.chroma_latencies.append(seconds)
+            if locked:
+                self.chroma_lock_errors += 1
+
+    def record_interview(self, failed):
+        with self._lock:
+            self.interviews += 1
+            if failed:
+                self.failed_interviews += 1
+
+
+class TimedCollection:
+    """Wraps a Chroma collection to time operations and count lock errors"""
+
+    def __init__(self, collection, metrics_ref):
+        self._collection = collection
+        self._metrics_ref = metrics_ref
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if name not in CHROMA_OPERATIONS:
+            return attribute
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            locked = False
+            try:
+                return attribute(*args, **kwargs)
+            except Exception as e:
+                locked = "locked" in str(e).lower()
+                raise
+            finally:
+                self._metrics_ref[0].record_chroma(time.perf_counter() - start, locked)
+
+        return timed
+
+
+def instrument_system(system, metrics_ref):
+    """Route one system's LLM and Chroma calls through the current step's metrics"""
+    original_request = system._make_llm_request
+
+    def timed_request(request_type, *args, **kwargs):
+        start = time.perf_counter()
+        failed = False
+        try:
+            return original_request(request_type, *args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            metrics_ref[0].record_llm(time.perf_counter() - start, failed, request_type)
+
+    system._make_llm_request = timed_request
+    system.host_collection = TimedCollection(system.host_collection, metrics_ref)
+    system.expert_collection = TimedCollection(system.expert_collection, metrics_ref)
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(np.asarray(samples) * 1000, q)) if samples else 0.0
+
+
+def run_step(systems, concurrency, interviews_per_worker, max_exchanges, metrics_ref, server=None):
+    """Run interviews on `concurrency` workers at once and summarise the step"""
+    metrics = StepMetrics()
+    metrics_ref[0] = metrics
+    if server:
+        server.reset_stats()
+
+    def worker(system):
+        expert_name = system.config.get('default_expert_name', "Martin Luther King Jr.")
+        topics = system.config.get('default_topics', [])
+        for _ in range(interviews_per_worker):
+            system.reset_interview_state()
+            failed = False
+            try:
+                system.run_interview(expert_name, topics, max_exchanges=max_exchanges)
+            except Exception as e:
+                failed = True
+                system.logger.error(f"Load test interview failed: {e}")
+            metrics.record_interview(failed)
+
+    threads = [threading.Thread(target=worker, args=(system,), name=f"interview-{i}") for i, system in enumerate(systems[:concurrency])]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    step = {
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "interviews": metrics.interviews,
+        "exchanges": metrics.exchanges,
+        "exchanges_per_minute": metrics.exchanges / elapsed * 60 if elapsed else 0.0,
+        "llm_requests": metrics.llm_requests,
+        "llm_p50_ms": percentile_ms(metrics.llm_latencies, 50),
+        "llm_p95_ms": percentile_ms(metrics.llm_latencies, 95),
+        "error_rate": (metrics.llm_errors + metrics.failed_interviews) / max(metrics.llm_requests + metrics.interviews, 1),
+        "chroma_operations": len(metrics.chroma_latencies),
+        "chroma_p95_ms": percentile_ms(metrics.chroma_latencies, 95),
+        "chroma_lock_errors": metrics.chroma_lock_errors,
+        "queue_delay_measured": server is not None,
+    }
+    if server:
+        step["queue_p50_ms"] = percentile_ms(server.queue_waits, 50)
+        step["queue_p95_ms"] = percentile_ms(server.queue_waits, 95)
+    return step
+
+
+def estimate_queue_delay(steps):
+    """Without server-side numbers, treat LLM latency above the first step as queueing"""
+    baseline = steps[0]["llm_p50_ms"] if steps else 0.0
+    for step in steps:
+        if not step["queue_delay_measured"]:
+            step["queue_p50_ms"] = max(step["llm_p50_ms"] - baseline, 0.0)
+            step["queue_p95_ms"] = max(step["llm_p95_ms"] - baseline, 0.0)
+
+
+def find_saturation(steps, min_gain=DEFAULT_MIN_GAIN):
+    """Return the first concurrency whose throughput gain over the previous step is below min_gain"""
+    for previous, step in zip(steps, steps[1:]):
+        if step["exchanges_per_minute"] < previous["exchanges_per_minute"] * (1 + min_gain):
+            return step["concurrency"]
+    return None
+
+
+def print_curve(steps, saturation):
+    best = max((step["exchanges_per_minute"] for step in steps), default=0.0) or 1.0
+    print(f"\n{'workers':>7} {'exch/min':>9} {'llm p50':>9} {'llm p95':>9} {'queue p50':>10} {'errors':>7} {'chroma p95':>11} {'locks':>6}  throughput")
+    for step in steps:
+        bar = "█" * int(round(step["exchanges_per_minute"] / best * 30))
+        queue = f"{step['queue_p50_ms']:.0f}" + ("" if step["queue_delay_measured"] else "~")
+        marker = "  ← saturation" if step["concurrency"] == saturation else ""
+        print(f"{step['concurrency']:>7} {step['exchanges_per_minute']:>9.1f} {step['llm_p50_ms']:>9.0f} {step['llm_p95_ms']:>9.0f} "
+              f"{queue:>10} {step['error_rate']:>6.1%} {step['chroma_p95_ms']:>11.1f} {step['chroma_lock_errors']:>6}  {bar}{marker}")
+    print("(latencies in ms; ~ marks queueing estimated from latency growth)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramp concurrent interviews against shared backends and report a saturation curve.")
+    parser.add_argument('--steps', default="1,2,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument('--interviews-per-worker', type=int, default=1)
+    parser.add_argument('--max-exchanges', type=int, default=5, help="Exchanges per interview (keeps steps short)")
+    parser.add_argument('--ollama-url', default=None, help="Real Ollama endpoint; defaults to a local fake server")
+    parser.add_argument('--chroma-path', default=None, help="Shared ChromaDB path (defaults to a scratch directory)")
+    parser.add_argument('--logging', action='store_true', help="Enable the system's file logging")
+    parser.add_argument('--min-gain', type=float, default=DEFAULT_MIN_GAIN, help="Throughput gain below which a step counts as saturated")
+    parser.add_argument('--output', default=None, help="Write the saturation curve to this JSON file")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    levels = sorted({int(level) for level in args.steps.split(',') if level.strip()})
+    work_directory = tempfile.mkdtemp(prefix="recursive_load_")
+    chroma_path = args.chroma_path or os.path.join(work_directory, "chroma_db")
+    server = None
+    if args.ollama_url is None:
+        server = FakeOllamaServer(latency=latency_from_arguments(args), script=ResponseScript(think=not args.no_think),
+                                  parallel=args.parallel).start()
+    url = args.ollama_url or server.url
+    print(f"🏋️ Load testing {url} with shared ChromaDB at {chroma_path}")
+
+    metrics_ref = [StepMetrics()]
+    steps = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            systems = []
+            for i in range(max(levels)):
+                system = build_system(url, os.path.join(work_directory, f"worker_{i}"), args.logging, chroma_path=chroma_path)
+                if i == 0:
+                    system.setup_mlk_expert()
+                instrument_system(system, metrics_ref)
+                systems.append(system)
+
+        for concurrency in levels:
+            sys.stdout.write(f"   {concurrency} concurrent interview(s)... ")
+            sys.stdout.flush()
+            with contextlib.redirect_stdout(io.StringIO()):
+                step = run_step(systems, concurrency, args.interviews_per_worker, args.max_exchanges, metrics_ref, server)
+            steps.append(step)
+            print(f"{step['exchanges_per_minute']:.1f} exchanges/min")
+    finally:
+        if server:
+            server.stop()
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+    estimate_queue_delay(steps)
+    saturation = find_saturation(steps, args.min_gain)
+    print_curve(steps, saturation)
+    if saturation:
+        print(f"\n📈 Throughput stops scaling at {saturation} concurrent interviews")
+    else:
+        print("\n📈 Throughput was still scaling at the highest step tested")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"backend": url, "settings": vars(args), "saturation_concurrency": saturation, "steps": steps}, f, indent=2)
+        print(f"💾 Saturation curve saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
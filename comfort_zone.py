@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+#
+# Comfort Zone Detection
+# ======================
+# Finds an expert's rehearsed "greatest hits" in generated text.
+#
+# All of an expert's comfort_zone_phrases and comfort_zone_topics are
+# compiled into a single Aho-Corasick automaton, so a response (or a
+# streamed chunk of one) is scanned in one pass no matter how many
+# phrases are configured. Optionally, paraphrases are caught by comparing
+# sentence embeddings against precomputed phrase centroids with a single
+# NumPy matrix product.
+#
+# Usage (batch-score archived transcripts):
+#   python comfort_zone.py interview_20250101_120000.json [more.json ...] [--semantic]
+#
+
+import argparse
+import json
+import re
+from collections import deque
+
+import numpy as np
+import yaml
+
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+
+class AhoCorasickAutomaton:
+    """Case-insensitive multi-pattern matcher that finds every pattern in one pass"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for pattern_index, pattern in enumerate(self.patterns):
+            keyword = pattern.lower()
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_index)
+
+        # Breadth-first construction of failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def scan(self, text, state=0):
+        """Scan text from the given state. Returns ([(end_offset, pattern_index), ...], final_state)."""
+        matches = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for offset, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for pattern_index in output[state]:
+                    matches.append((offset, pattern_index))
+        return matches, state
+
+    def find(self, text):
+        """Return the sorted, de-duplicated indexes of every pattern occurring in text"""
+        matches, _ = self.scan(text)
+        return sorted({pattern_index for _, pattern_index in matches})
+
+
+class ComfortZoneStream:
+    """Incremental detector fed with streamed chunks; matches spanning chunk boundaries are found"""
+
+    def __init__(self, detector):
+        self.detector = detector
+        self._state = 0
+        self._seen = set()
+
+    def feed(self, chunk):
+        """Scan the next chunk and return only matches not reported earlier in this stream"""
+        matches, self._state = self.detector.automaton.scan(chunk, self._state)
+        new_indexes = sorted({pattern_index for _, pattern_index in matches} - self._seen)
+        self._seen.update(new_indexes)
+        return self.detector.matches_for(new_indexes)
+
+    @property
+    def matches(self):
+        return self.detector.matches_for(sorted(self._seen))
+
+
+class ComfortZoneDetector:
+    """Precompiled comfort-zone detector for one expert"""
+
+    def __init__(self, phrases, topics=(), embed_fn=None, similarity_threshold=0.82):
+        self.phrases = [p for p in phrases if p]
+        self.topics = [t for t in topics if t]
+        self.automaton = AhoCorasickAutomaton(self.phrases + self.topics)
+        self.embed_fn = embed_fn  # Callable taking a list of texts and returning a list of vectors
+        self.similarity_threshold = similarity_threshold
+        self._centroids = None
+
+    @classmethod
+    def from_expert_settings(cls, expert_settings, embed_fn=None, similarity_threshold=0.82):
+        """Build a detector from an expert_defaults entry in config.yaml"""
+        return cls(
+            expert_settings.get('comfort_zone_phrases', []) or [],
+            expert_settings.get('comfort_zone_topics', []) or [],
+            embed_fn=embed_fn,
+            similarity_threshold=similarity_threshold
+        )
+
+    def matches_for(self, pattern_indexes):
+        """{"phrases": [...], "topics": [...]} for automaton pattern indexes"""
+        phrase_count = len(self.phrases)
+        return {
+            "phrases": [self.phrases[i] for i in pattern_indexes if i < phrase_count],
+            "topics": [self.topics[i - phrase_count] for i in pattern_indexes if i >= phrase_count]
+        }
+
+    @property
+    def semantic_enabled(self):
+        return self.embed_fn is not None and bool(self.phrases)
+
+    def phrase_centroids(self):
+        """Unit-normalised phrase embeddings, computed once per detector"""
+        if self._centroids is None:
+            self._centroids = _normalise_rows(np.asarray(self.embed_fn(self.phrases), dtype=np.float32))
+        return self._centroids
+
+    def stream(self):
+        """Start an incremental scan over a streamed response"""
+        return ComfortZoneStream(self)
+
+    def detect_phrases(self, text):
+        """Exact phrases and topics in a single response, without paraphrase matching"""
+        return self.matches_for(self.automaton.find(text))
+
+    def detect(self, text):
+        """Detect exact phrases, topics and (if enabled) paraphrased phrases in a single response"""
+        result = self.detect_phrases(text)
+        result["paraphrases"] = []
+        if self.semantic_enabled and text.strip():
+            sentences = split_sentences(text)
+            similarities = self._similarities(sentences)
+            result["paraphrases"] = self._paraphrases_from(similarities.max(axis=0), result["phrases"])
+        return result
+
+    def score_transcript(self, transcript, expert_name=None):
+        """Score every expert utterance of a saved transcript; all sentences are embedded in one batch"""
+        entries = transcript.get('interview', [])
+        if expert_name is None:
+            expert_name = transcript.get('metadata', {}).get('expert_name')
+        utterances = [
+            (position, entry) for position, entry in enumerate(entries)
+            if entry.get('speaker') != "HOST" and (expert_name is None or entry.get('speaker') == expert_name)
+        ]
+
+        results = []
+        for position, entry in utterances:
+            result = self.detect_phrases(entry.get('text', ''))
+            result.update({"index": position, "topic": entry.get('topic'), "paraphrases": []})
+            results.append(result)
+
+        if self.semantic_enabled and results:
+            sentences = []
+            owners = []
+            for result_index, (_, entry) in enumerate(utterances):
+                for sentence in split_sentences(entry.get('text', '')):
+                    sentences.append(sentence)
+                    owners.append(result_index)
+            if sentences:
+                similarities = self._similarities(sentences)
+                owners = np.asarray(owners)
+                for result_index, result in enumerate(results):
+                    rows = similarities[owners == result_index]
+                    if len(rows):
+                        result["paraphrases"] = self._paraphrases_from(rows.max(axis=0), result["phrases"])
+        return results
+
+    def _similarities(self, sentences):
+        """Cosine similarity of every sentence against every phrase centroid as one matrix product"""
+        sentence_vectors = _normalise_rows(np.asarray(self.embed_fn(sentences), dtype=np.float32))
+        return sentence_vectors @ self.phrase_centroids().T
+
+    def _paraphrases_from(self, best_per_phrase, exact_phrases):
+        exact = set(exact_phrases)
+        return [
+            phrase for phrase, similarity in zip(self.phrases, best_per_phrase)
+            if similarity >= self.similarity_threshold and phrase not in exact
+        ]
+
+
+def split_sentences(text):
+    """Split text into non-empty sentences for embedding"""
+    return [s.strip() for s in SENTENCE_SPLIT_PATTERN.split(text) if s.strip()]
+
+
+def _normalise_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-score saved interview transcripts for comfort zone patterns.")
+    parser.add_argument('transcripts', nargs='+', help="Transcript JSON files written by save_transcript")
+    parser.add_argument('--config', default="config.yaml", help="Path to config.yaml")
+    parser.add_argument('--expert-key', default=None, help="expert_defaults entry to use (defaults to persona_settings.expert_defaults_key)")
+    parser.add_argument('--semantic', action='store_true', help="Also match paraphrases using embeddings from Ollama")
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+
+    expert_key = args.expert_key or config.get('persona_settings', {}).get('expert_defaults_key', 'martin_luther_king_jr')
+    expert_settings = config.get('expert_defaults', {}).get(expert_key, {})
+    detection_settings = config.get('comfort_zone_detection', {})
+
+    embed_fn = None
+    if args.semantic:
+        import ollama
+        client = ollama.Client()
+        embedding_model = config.get('embedding_model', 'nomic-embed-text')
+        embed_fn = lambda texts: client.embed(model=embedding_model, input=texts)['embeddings']
+
+    detector = ComfortZoneDetector.from_expert_settings(
+        expert_settings,
+        embed_fn=embed_fn,
+        similarity_threshold=detection_settings.get('similarity_threshold', 0.82)
+    )
+
+    for path in args.transcripts:
+        with open(path, 'r', encoding='utf-8') as f:
+            transcript = json.load(f)
+        results = detector.score_transcript(transcript)
+        flagged = [r for r in results if r['phrases'] or r['paraphrases']]
+        print(f"\n📄 {path}: {len(flagged)}/{len(results)} expert responses in comfort zone")
+        for result in flagged:
+            print(f"   [{result['topic']}] phrases={result['phrases']} paraphrases={result['paraphrases']} topics={result['topics']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+#
+# Exchange Scheduling
+# ===================
+# Decides which topic the host spends each remaining exchange on. The
+# interview loop asks next_action() for ("open", topic) or
+# ("follow_up", topic), runs that exchange, and reports the evaluated
+# depth back with record(), or with skip() when the exchange failed and
+# the topic should get no more; None means it is time to conclude.
+#
+#   SequentialScheduler  topics in order, each followed up until it reaches
+#                        depth 3 or max_follow_ups_per_response (the
+#                        original behaviour)
+#   AdaptiveScheduler    reserves an opening exchange for every topic and
+#                        gives each a fair share of the spare exchanges on
+#                        the first pass, following it up only while its
+#                        expected depth gain per follow-up stays above
+#                        min_expected_gain; whatever is left (shares a
+#                        topic didn't need) then goes to the topics most
+#                        likely to improve
+#
+# Expected gain combines DepthGainPriors (how much one follow-up has
+# raised depth before, from archived transcripts and their recorded
+# breakthroughs) with the gains observed on the topic in this interview.
+#
+
+from collections import defaultdict
+
+# Expected depth gain of one follow-up by the topic's best depth so far, used until the archive says otherwise
+DEFAULT_GAIN_BY_DEPTH = {1: 0.6, 2: 0.3}
+MAX_DEPTH = 3
+
+
+class DepthGainPriors:
+    """Historical depth gain per follow-up, overall and per topic, keyed by the depth it started from"""
+
+    def __init__(self, default_gain_by_depth=None, topic_weight=3.0):
+        self.default_gain_by_depth = {int(depth): gain for depth, gain in (default_gain_by_depth or DEFAULT_GAIN_BY_DEPTH).items()}
+        self.topic_weight = topic_weight  # Samples a topic needs before its own history counts as much as the overall rate
+        self._overall = defaultdict(lambda: [0.0, 0])  # start depth -> [total gain, samples]
+        self._by_topic = defaultdict(lambda: [0.0, 0])  # (topic, start depth) -> [total gain, samples]
+
+    def add_sample(self, topic, start_depth, gain):
+        for bucket in (self._overall[start_depth], self._by_topic[(topic, start_depth)]):
+            bucket[0] += gain
+            bucket[1] += 1
+
+    def add_depth_sequence(self, topic, depths):
+        """Record the follow-ups of one topic from the evaluated depths of its expert answers, in order"""
+        best = None
+        for depth in depths:
+            if depth is None:
+                continue
+            if best is not None and best < MAX_DEPTH:
+                self.add_sample(topic, best, max(depth - best, 0))
+            best = depth if best is None else max(best, depth)
+
+    def add_transcript(self, transcript):
+        """Learn from one transcript dict: per-answer depths, or its breakthroughs when depths weren't recorded"""
+        depths_by_topic = defaultdict(list)
+        for entry in transcript.get('interview', []):
+            if entry.get('speaker') != "HOST" and entry.get('topic') not in (None, "Introduction", "Conclusion"):
+                depths_by_topic[entry['topic']].append(entry.get('depth'))
+        recorded = {topic: depths for topic, depths in depths_by_topic.items() if any(depth is not None for depth in depths)}
+        for topic, depths in recorded.items():
+            self.add_depth_sequence(topic, depths)
+        # Older transcripts only kept breakthroughs; each is a follow-up whose gain we know
+        for breakthrough in transcript.get('metadata', {}).get('potential_breakthroughs', []):
+            improvement = breakthrough.get('improvement') or ()
+            if breakthrough.get('topic') not in recorded and len(improvement) == 2:
+                self.add_sample(breakthrough['topic'], improvement[0], max(improvement[1] - improvement[0], 0))
+
+    @classmethod
+    def from_transcript_store(cls, store, expert=None, **options):
+        """Priors from a TranscriptStore archive, optionally only one expert's interviews"""
+        priors = cls(**options)
+        for transcript in store.iter_transcripts(expert=expert):
+            priors.add_transcript(transcript)
+        return priors
+
+    def gain(self, topic, start_depth):
+        if start_depth >= MAX_DEPTH:
+            return 0.0
+        total, samples = self._overall.get(start_depth, (0.0, 0))
+        overall = total / samples if samples else self.default_gain_by_depth.get(start_depth, 0.0)
+        topic_total, topic_samples = self._by_topic.get((topic, start_depth), (0.0, 0))
+        if not topic_samples:
+            return overall
+        # Shrink the topic's own rate towards the overall rate while it has few samples
+        return (topic_total + overall * self.topic_weight) / (topic_samples + self.topic_weight)
+
+    def sample_count(self):
+        return sum(samples for _, samples in self._overall.values())
+
+
+class TopicProgress:
+    __slots__ = ("topic", "opened", "best_depth", "follow_ups", "gains", "finished", "allowance")
+
+    def __init__(self, topic):
+        self.topic = topic
+        self.opened = False
+        self.best_depth = 0
+        self.follow_ups = 0
+        self.gains = []  # Depth gained by each follow-up in this interview
+        self.finished = False
+        self.allowance = None  # Follow-ups the topic may take before every topic has been opened
+
+
+class SequentialScheduler:
+    """Topics in order; each gets follow-ups until depth 3, max_follow_ups or the budget runs out"""
+
+    def __init__(self, topics, budget, max_follow_ups):
+        self.budget = budget  # Exchanges available for topics (the opening and conclusion are not counted)
+        self.max_follow_ups = max_follow_ups
+        self.progress = {topic: TopicProgress(topic) for topic in topics}
+        self.used = 0
+        self._newly_finished = []
+
+    @property
+    def remaining(self):
+        return self.budget - self.used
+
+    def record(self, topic, depth):
+        """Report the evaluated depth of the exchange just run on `topic`"""
+        progress = self.progress[topic]
+        if progress.opened:
+            progress.follow_ups += 1
+            progress.gains.append(max(depth - progress.best_depth, 0))
+        progress.opened = True
+        progress.best_depth = max(progress.best_depth, depth)
+        self.used += 1
+
+    def skip(self, topic):
+        """Give up on `topic` after a failed exchange; the exchange still counts against the budget"""
+        progress = self.progress[topic]
+        self.used += 1
+        if progress.opened:
+            self._finish(progress)
+        else:
+            progress.finished = True  # Never opened, so there is nothing to report as finished
+
+    def _finish(self, progress):
+        if progress.opened and not progress.finished:
+            progress.finished = True
+            self._newly_finished.append(progress.topic)
+
+    def finished_topics(self):
+        """Topics that will get no more exchanges, each returned once"""
+        finished, self._newly_finished = self._newly_finished, []
+        return finished
+
+    def finish_all(self):
+        for progress in self.progress.values():
+            self._finish(progress)
+        return self.finished_topics()
+
+    def wants_follow_up(self, progress):
+        return progress.best_depth < MAX_DEPTH and progress.follow_ups < self.max_follow_ups
+
+    def next_action(self):
+        """("open" | "follow_up", topic) for the next exchange, or None to conclude"""
+        for progress in self.progress.values():
+            if progress.finished:
+                continue
+            if not progress.opened:
+                return ("open", progress.topic) if self.remaining > 0 else None
+            if self.remaining > 0 and self.wants_follow_up(progress):
+                return ("follow_up", progress.topic)
+            self._finish(progress)
+            if self.remaining <= 0:
+                return None
+        return None
+
+
+class AdaptiveScheduler(SequentialScheduler):
+    """Spends follow-ups where the expected depth gain is highest, without starving later topics"""
+
+    def __init__(self, topics, budget, max_follow_ups, priors=None, min_expected_gain=0.15, live_weight=1.0):
+        super().__init__(topics, budget, max_follow_ups)
+        self.priors = priors or DepthGainPriors()
+        self.min_expected_gain = min_expected_gain
+        self.live_weight = live_weight  # Prior strength, in follow-ups, against gains observed in this interview
+
+    def expected_gain(self, topic):
+        progress = self.progress[topic]
+        if progress.best_depth >= MAX_DEPTH or progress.follow_ups >= self.max_follow_ups:
+            return 0.0
+        prior = self.priors.gain(topic, progress.best_depth)
+        return (prior * self.live_weight + sum(progress.gains)) / (self.live_weight + len(progress.gains))
+
+    def _unopened(self):
+        return sum(1 for progress in self.progress.values() if not progress.opened and not progress.finished)
+
+    def record(self, topic, depth):
+        progress = self.progress[topic]
+        opening = not progress.opened
+        super().record(topic, depth)
+        if opening:
+            # Split the spare exchanges between this topic and the ones still to be opened
+            unopened = self._unopened()
+            spare = self.remaining - unopened
+            progress.allowance = -(-max(spare, 0) // (unopened + 1))
+
+    def wants_follow_up(self, progress):
+        return (self.remaining > self._unopened() and progress.follow_ups < progress.allowance
+                and self.expected_gain(progress.topic) >= self.min_expected_gain)
+
+    def next_action(self):
+        if self.remaining <= 0:
+            return None
+        for progress in self.progress.values():
+            if progress.finished:
+                continue
+            if not progress.opened:
+                return ("open", progress.topic)
+            if self.wants_follow_up(progress):
+                return ("follow_up", progress.topic)
+            if self._unopened():
+                # Move on for now; the topic may be revisited once every topic has been opened
+                continue
+            break
+
+        # Every topic is open: give the leftover budget to the topic most likely to improve
+        candidates = [(self.expected_gain(progress.topic), -index, progress.topic)
+                      for index, progress in enumerate(self.progress.values()) if not progress.finished]
+        gain, _, topic = max(candidates, default=(0.0, 0, None))
+        if topic is None or gain < self.min_expected_gain:
+            for progress in self.progress.values():
+                self._finish(progress)
+            return None
+        for progress in self.progress.values():
+            if progress.topic != topic and self.expected_gain(progress.topic) < self.min_expected_gain:
+                self._finish(progress)
+        return ("follow_up", topic)
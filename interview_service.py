@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+#
+# Interview Job Service
+# =====================
+# A small local HTTP service for running many interviews from one place.
+# Jobs (expert, topics, config overrides) go into a persistent SQLite queue
+# (job_queue.py) and run on a fixed pool of worker threads, each with its
+# own RecursiveInterviewSystem. While a job runs, its exchanges and depth
+# evaluations are streamed to clients as Server-Sent Events; the final
+# transcript can be fetched once it finishes.
+#
+# The queue holds at most service.max_queued_jobs waiting jobs; further
+# submissions get 503 with Retry-After, which is the backpressure signal
+# to producers while Ollama is saturated.
+#
+# Endpoints:
+#   POST   /jobs                    {"expert": ..., "topics": [...], "max_exchanges": 8, "overrides": {...}}
+#   GET    /jobs[?status=queued]    recent jobs
+#   GET    /jobs/<id>               status and queue position
+#   GET    /jobs/<id>/events        Server-Sent Events (resumable with Last-Event-ID)
+#   GET    /jobs/<id>/transcript    the saved transcript JSON
+#   DELETE /jobs/<id>               cancel a queued job
+#   GET    /health                  job counts per status and worker count
+#
+# Usage:
+#   python interview_service.py --port 8765 --workers 2
+#   curl -X POST localhost:8765/jobs -d '{"expert": "Martin Luther King Jr.", "topics": ["AI bias"]}'
+#   curl -N localhost:8765/jobs/1/events
+#
+# The service is also the coordinator for interview_worker.py on other
+# boxes: remote workers lease jobs, send heartbeats and events, and upload
+# their transcripts, which are archived in service.transcript_directory
+# (and indexed into the transcript store when it is enabled). Set
+# service.worker_token and bind to a reachable host to accept them:
+#   POST /leases                    {"worker": ...} -> 200 job, or 204 when the queue is empty
+#   POST /jobs/<id>/heartbeat       {"worker": ...} -> 200, or 409 if the lease was lost
+#   POST /jobs/<id>/events          {"worker": ..., "type": ..., "data": {...}} -> 201, or 409 if the lease was lost
+#   POST /jobs/<id>/complete        {"worker": ..., "filename": ..., "transcript": {...}}
+#   POST /jobs/<id>/fail            {"worker": ..., "error": ...}
+# Set service.workers to 0 to run a coordinator without local workers.
+#
+# Workers share the process's stdout, so console output of concurrent jobs
+# interleaves; use the event stream to follow one job.
+#
+
+import argparse
+import hmac
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import yaml
+
+from interview_worker import InterviewWorker, default_system_factory, worker_name
+from job_queue import FINISHED_STATUSES, JobQueue, QueueFullError
+
+DEFAULT_ALLOWED_OVERRIDES = ("interview", "host_llm_model", "host_llm_temperature", "expert_llm_model",
+                             "expert_llm_temperature", "evaluation_llm_model", "evaluation_llm_temperature",
+                             "expert_response_max_words", "web_search_settings", "structured_evaluation")
+
+
+class InterviewService:
+    """Job queue, worker pool and event fan-out behind the HTTP handler"""
+
+    def __init__(self, config, system_factory=default_system_factory, queue=None):
+        self.config = config
+        self.settings = config.get('service', {})
+        self.queue = queue or JobQueue(self.settings.get('database_path', "./jobs.db"),
+                                       max_queued=self.settings.get('max_queued_jobs', 50),
+                                       lease_seconds=self.settings.get('lease_seconds', 120),
+                                       max_attempts=self.settings.get('max_attempts', 3),
+                                       journal_mode=self.settings.get('queue_journal_mode', "WAL"))
+        self.system_factory = system_factory
+        self.worker_count = max(0, self.settings.get('workers', 2))
+        self.heartbeat_seconds = self.settings.get('heartbeat_seconds', 30)
+        self.worker_token = self.settings.get('worker_token')
+        self.transcript_directory = self.settings.get('transcript_directory', "./transcripts")
+        self.allowed_overrides = frozenset(self.settings.get('allowed_overrides', DEFAULT_ALLOWED_OVERRIDES))
+        self.poll_seconds = self.settings.get('event_poll_seconds', 1.0)
+        self.keepalive_seconds = self.settings.get('sse_keepalive_seconds', 15)
+        self._work_available = threading.Condition()
+        self._events_changed = threading.Condition()
+        self._stopping = threading.Event()
+        self._workers = []
+        self.httpd = None
+
+    # --- Jobs ---
+
+    def submit(self, expert_name, topics, max_exchanges=None, overrides=None):
+        """Validate and queue a job. Raises ValueError for bad input and QueueFullError under backpressure."""
+        if not expert_name or not isinstance(expert_name, str):
+            raise ValueError("'expert' must be a non-empty string")
+        if not isinstance(topics, list) or not topics or not all(isinstance(topic, str) and topic for topic in topics):
+            raise ValueError("'topics' must be a non-empty list of strings")
+        if max_exchanges is not None and (not isinstance(max_exchanges, int) or max_exchanges < 2):
+            raise ValueError("'max_exchanges' must be an integer of at least 2")
+        overrides = overrides or {}
+        if not isinstance(overrides, dict):
+            raise ValueError("'overrides' must be an object")
+        rejected = sorted(set(overrides) - self.allowed_overrides)
+        if rejected:
+            raise ValueError(f"overrides not allowed: {', '.join(rejected)}")
+        job = self.queue.submit(expert_name, topics, max_exchanges, overrides)
+        with self._work_available:
+            self._work_available.notify()
+        return job
+
+    def publish(self, job_id, event_type, data, worker=None):
+        """Add an event to a job's stream; with `worker`, only while it holds the lease. Returns whether it was added."""
+        if self.queue.add_event(job_id, event_type, data, worker=worker) is None:
+            return False
+        self.notify_events()
+        return True
+
+    def notify_events(self):
+        with self._events_changed:
+            self._events_changed.notify_all()
+
+    def wait_for_events(self, timeout):
+        """Block until an event is published in this process or timeout passes (workers elsewhere are polled)"""
+        with self._events_changed:
+            self._events_changed.wait(timeout)
+
+    def archive_transcript(self, job, worker, filename, transcript):
+        """Store a transcript uploaded by a remote worker and mark its job succeeded. False if the lease was lost."""
+        safe_name = os.path.basename(filename or "") or "transcript.json"
+        if not safe_name.startswith(f"job_{job['id']}_"):
+            safe_name = f"job_{job['id']}_{safe_name}"
+        os.makedirs(self.transcript_directory, exist_ok=True)
+        path = os.path.join(self.transcript_directory, safe_name)
+        # Write under a temporary name so a rejected upload never replaces an accepted transcript
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(transcript, f, indent=2, ensure_ascii=False)
+        if not self.queue.complete(job['id'], path, worker=worker):
+            os.remove(temporary_path)
+            return False
+        os.replace(temporary_path, path)
+        store_settings = self.config.get('transcript_store', {})
+        if store_settings.get('enabled', False) and store_settings.get('index_on_save', True):
+            try:
+                from transcript_store import TranscriptStore
+                with TranscriptStore(store_settings.get('path', "./transcripts.db")) as store:
+                    store.add_transcript(transcript, os.path.abspath(path))
+            except Exception as e:
+                print(f"⚠️ Failed to index transcript of job {job['id']}: {e}")
+        self.notify_events()
+        return True
+
+    # --- Lifecycle ---
+
+    def start_workers(self):
+        reclaimed = self.queue.reclaim_expired()
+        if reclaimed:
+            print(f"♻️  Reclaimed {reclaimed} job(s) whose worker stopped sending heartbeats")
+        for i in range(self.worker_count):
+            worker = InterviewWorker(worker_name(i), self.queue, self.config, self.system_factory,
+                                     transcript_directory=self.transcript_directory,
+                                     heartbeat_seconds=self.heartbeat_seconds, on_event=self.notify_events)
+            thread = threading.Thread(target=worker.run, args=(self._stopping, self.poll_seconds, self._work_available),
+                                      name=f"interview-worker-{i}", daemon=True)
+            thread.start()
+            self._workers.append(thread)
+
+    def serve(self, host=None, port=None):
+        """Start the workers and the HTTP server (in a background thread). Returns the bound (host, port)."""
+        self.start_workers()
+        handler = type("BoundServiceHandler", (ServiceRequestHandler,), {"service": self})
+        self.httpd = ThreadingHTTPServer((host or self.settings.get('host', "127.0.0.1"),
+                                          self.settings.get('port', 8765) if port is None else port), handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, name="interview-service-http", daemon=True).start()
+        return self.httpd.server_address
+
+    def stop(self, timeout=None):
+        """Stop the HTTP server and wait for workers to finish their current job"""
+        self._stopping.set()
+        with self._work_available:
+            self._work_available.notify_all()
+        with self._events_changed:
+            self._events_changed.notify_all()
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        for worker in self._workers:
+            worker.join(timeout)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    service = None  # Bound per server by InterviewService.serve()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self):
+        """(job_id or None, sub-resource or None) for /jobs/<id>[/<sub>], or None for other paths"""
+        parts = [part for part in urlparse(self.path).path.split('/') if part]
+        if not parts or parts[0] != "jobs" or len(parts) > 3:
+            return None
+        if len(parts) == 1:
+            return None, None
+        if not parts[1].isdigit():
+            return None
+        return int(parts[1]), parts[2] if len(parts) == 3 else None
+
+    def _job_payload(self, job):
+        job = dict(job)
+        job['queue_position'] = self.service.queue.position(job['id'])
+        return job
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(request, dict):
+            raise ValueError("request body must be a JSON object")
+        return request
+
+    def _worker_authorized(self):
+        token = self.service.worker_token
+        return not token or hmac.compare_digest(self.headers.get("X-Worker-Token", ""), token)
+
+    def do_POST(self):
+        if urlparse(self.path).path == "/leases" or (self._route() or (None, None))[1] is not None:
+            return self._handle_worker_request()
+        if self._route() != (None, None):
+            return self._send_json(404, {"error": "not found"})
+        try:
+            request = self._read_json()
+            job = self.service.submit(request.get('expert'), request.get('topics'), request.get('max_exchanges'), request.get('overrides'))
+        except (ValueError, AttributeError) as e:
+            return self._send_json(400, {"error": str(e)})
+        except QueueFullError as e:
+            return self._send_json(503, {"error": f"queue full: {e}"}, {"Retry-After": str(self.service.settings.get('retry_after_seconds', 30))})
+        self._send_json(202, self._job_payload(job), {"Location": f"/jobs/{job['id']}"})
+
+    def _handle_worker_request(self):
+        """Coordinator endpoints used by remote interview_worker.py processes"""
+        if not self._worker_authorized():
+            return self._send_json(403, {"error": "invalid worker token"})
+        try:
+            request = self._read_json()
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+        queue = self.service.queue
+        worker = request.get('worker')
+        if urlparse(self.path).path == "/leases":
+            if not worker:
+                return self._send_json(400, {"error": "'worker' is required"})
+            job = queue.claim(worker)
+            if job is None:
+                self.send_response(204)
+                self.end_headers()
+                return
+            return self._send_json(200, job)
+
+        job_id, action = self._route()
+        job = queue.get(job_id)
+        if job is None:
+            return self._send_json(404, {"error": "no such job"})
+        if not worker:
+            return self._send_json(400, {"error": "'worker' is required"})
+        if action == "heartbeat":
+            accepted = queue.heartbeat(job_id, worker)
+        elif action == "events":
+            if not request.get('type'):
+                return self._send_json(400, {"error": "'type' is required"})
+            # A worker that lost its lease must not write into the stream of the worker now running the job
+            if self.service.publish(job_id, request['type'], request.get('data') or {}, worker=worker):
+                return self._send_json(201, {"ok": True})
+            accepted = False
+        elif action == "complete":
+            if not isinstance(request.get('transcript'), dict):
+                return self._send_json(400, {"error": "'transcript' must be an object"})
+            accepted = self.service.archive_transcript(job, worker, request.get('filename'), request['transcript'])
+        elif action == "fail":
+            accepted = queue.fail(job_id, request.get('error') or "worker reported failure", worker=worker)
+            self.service.notify_events()
+        else:
+            return self._send_json(404, {"error": "not found"})
+        if not accepted:
+            return self._send_json(409, {"error": f"{worker} does not hold the lease on job {job_id}"})
+        self._send_json(200, {"ok": True})
+
+    def do_DELETE(self):
+        route = self._route()
+        if not route or route[0] is None or route[1] is not None:
+            return self._send_json(404, {"error": "not found"})
+        job = self.service.queue.get(route[0])
+        if job is None:
+            return self._send_json(404, {"error": "no such job"})
+        if not self.service.queue.cancel(job['id']):
+            return self._send_json(409, {"error": f"job is {job['status']}; only queued jobs can be cancelled"})
+        self.service.notify_events()
+        self._send_json(200, self.service.queue.get(job['id']))
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/health":
+            return self._send_json(200, {"jobs": self.service.queue.counts(), "workers": self.service.worker_count})
+        route = self._route()
+        if route is None:
+            return self._send_json(404, {"error": "not found"})
+        job_id, sub_resource = route
+        if job_id is None:
+            status = parse_qs(urlparse(self.path).query).get('status', [None])[0]
+            return self._send_json(200, {"jobs": self.service.queue.list_jobs(status)})
+        job = self.service.queue.get(job_id)
+        if job is None:
+            return self._send_json(404, {"error": "no such job"})
+        if sub_resource is None:
+            return self._send_json(200, self._job_payload(job))
+        if sub_resource == "events":
+            return self._stream_events(job_id)
+        if sub_resource == "transcript":
+            return self._send_transcript(job)
+        self._send_json(404, {"error": "not found"})
+
+    def _send_transcript(self, job):
+        if job['status'] != "succeeded" or not job['transcript_path']:
+            return self._send_json(409, {"error": f"job is {job['status']}; no transcript yet"})
+        try:
+            with open(job['transcript_path'], 'r', encoding='utf-8') as f:
+                transcript = json.load(f)
+        except (OSError, ValueError) as e:
+            return self._send_json(500, {"error": f"could not read transcript: {e}"})
+        self._send_json(200, transcript)
+
+    def _stream_events(self, job_id):
+        # Checked before the stream starts, while an error can still be sent as a response
+        try:
+            last_seq = int(self.headers.get("Last-Event-ID") or 0)
+        except ValueError:
+            return self._send_json(400, {"error": "Last-Event-ID must be an event id (an integer)"})
+        if last_seq < 0:
+            return self._send_json(400, {"error": "Last-Event-ID must not be negative"})
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        last_write = time.monotonic()
+        try:
+            while not self.service._stopping.is_set():
+                # Read the status before the events so a job finishing in between still has its last events sent
+                finished = self.service.queue.get(job_id)['status'] in FINISHED_STATUSES
+                for seq, event_type, data in self.service.queue.events_since(job_id, last_seq):
+                    self.wfile.write(f"id: {seq}\nevent: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+                    last_seq = seq
+                    last_write = time.monotonic()
+                if finished:
+                    break
+                if time.monotonic() - last_write >= self.service.keepalive_seconds:
+                    self.wfile.write(b": keepalive\n\n")
+                    last_write = time.monotonic()
+                self.wfile.flush()
+                self.service.wait_for_events(self.service.poll_seconds)
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away; it can resume with Last-Event-ID
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve interview jobs over HTTP with a persistent queue and live event streams.")
+    parser.add_argument('--config', default="config.yaml")
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None, help="Concurrent interviews (defaults to service.workers)")
+    parser.add_argument('--database', default=None, help="Job queue database (defaults to service.database_path)")
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    service_settings = config.setdefault('service', {})
+    if args.workers is not None:
+        service_settings['workers'] = args.workers
+    if args.database is not None:
+        service_settings['database_path'] = args.database
+
+    service = InterviewService(config)
+    host, port = service.serve(args.host, args.port)
+    print(f"🎙️  Interview service listening on http://{host}:{port} with {service.worker_count} worker(s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping; waiting for running interviews to finish...")
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+#
+# Compact Interview State
+# =======================
+# Bounded-memory storage for interview history, used when
+# memory.compact_state is enabled. Each utterance is a __slots__ record
+# with interned speaker and topic strings; its full text is spilled to an
+# append-only TextJournal on disk and only the (offset, length) pair is
+# kept in memory.
+#
+# Utterance supports the dict operations the interview loop relies on
+# (entry["text"], entry["depth"] = 3, entry.get(...), dict(entry)), so
+# InterviewHistory is a drop-in replacement for the list of dicts.
+#
+
+import sys
+import tempfile
+import threading
+from collections.abc import MutableSequence
+
+
+class TextJournal:
+    """Append-only UTF-8 text store addressed by (offset, length)"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._file = open(path, 'w+b') if path else tempfile.TemporaryFile()
+        self._lock = threading.Lock()
+
+    def append(self, text):
+        data = text.encode('utf-8')
+        with self._lock:
+            self._file.seek(0, 2)
+            offset = self._file.tell()
+            self._file.write(data)
+        return offset, len(data)
+
+    def read(self, offset, length):
+        with self._lock:
+            self._file.flush()
+            self._file.seek(offset)
+            return self._file.read(length).decode('utf-8')
+
+    def size(self):
+        with self._lock:
+            self._file.seek(0, 2)
+            return self._file.tell()
+
+    def truncate(self):
+        with self._lock:
+            self._file.seek(0)
+            self._file.truncate()
+
+    def close(self):
+        self._file.close()
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Utterance:
+    """One history entry. Missing optional fields behave like absent dict keys."""
+
+    __slots__ = ("speaker", "topic", "comfort_zone_phrases", "depth", "breakthrough",
+                 "_text", "_offset", "_length", "_journal", "_extra")
+
+    OPTIONAL_FIELDS = ("comfort_zone_phrases", "depth", "breakthrough")
+
+    def __init__(self, speaker, text, topic=None, journal=None):
+        self.speaker = _intern(speaker)
+        self.topic = _intern(topic)
+        self.comfort_zone_phrases = None
+        self.depth = None
+        self.breakthrough = None
+        self._extra = None
+        self._journal = journal
+        if journal is not None:
+            self._offset, self._length = journal.append(text or "")
+            self._text = None
+        else:
+            self._text = text
+            self._offset = self._length = None
+
+    @classmethod
+    def from_dict(cls, entry, journal=None):
+        utterance = cls(entry.get('speaker'), entry.get('text', ''), entry.get('topic'), journal)
+        for key, value in entry.items():
+            if key not in ('speaker', 'text', 'topic'):
+                utterance[key] = value
+        return utterance
+
+    @property
+    def text(self):
+        if self._journal is not None:
+            return self._journal.read(self._offset, self._length)
+        return self._text
+
+    def keys(self):
+        keys = ["speaker", "text", "topic"]
+        keys.extend(field for field in self.OPTIONAL_FIELDS if getattr(self, field) is not None)
+        if self._extra:
+            keys.extend(self._extra)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        if key in ("speaker", "text", "topic"):
+            return getattr(self, key)
+        if key in self.OPTIONAL_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return list(value) if key == "comfort_zone_phrases" else value
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "text":
+            raise KeyError("Utterance text is immutable once journaled")
+        if key in ("speaker", "topic"):
+            setattr(self, key, _intern(value))
+        elif key == "comfort_zone_phrases":
+            self.comfort_zone_phrases = tuple(_intern(phrase) for phrase in value)
+        elif key in self.OPTIONAL_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self):
+        return f"Utterance({self.to_dict()!r})"
+
+
+class InterviewHistory(MutableSequence):
+    """List of Utterances; dict entries are converted on insert"""
+
+    def __init__(self, journal=None, entries=()):
+        self.journal = journal
+        self._entries = []
+        self.extend(entries)
+
+    def _coerce(self, entry):
+        if isinstance(entry, Utterance):
+            return entry
+        return Utterance.from_dict(entry, self.journal)
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+    def __setitem__(self, index, entry):
+        if isinstance(index, slice):
+            self._entries[index] = [self._coerce(e) for e in entry]
+        else:
+            self._entries[index] = self._coerce(entry)
+
+    def __delitem__(self, index):
+        del self._entries[index]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def insert(self, index, entry):
+        self._entries.insert(index, self._coerce(entry))
+
+    def clear(self):
+        self._entries = []
+        if self.journal is not None:
+            self.journal.truncate()
+
+    def to_list(self):
+        return [entry.to_dict() for entry in self._entries]
@@ -11,52 +11,120 @@
 # please modify the 'config.yaml' file.
 #
 
+import time
+_IMPORT_STARTED_AT = time.perf_counter()  # Reported by --profile-startup
+
+import argparse
+import atexit
+import importlib
 import json
-import ollama
-import chromadb
 from datetime import datetime
 import os
 import sys
-import time
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import yaml
 import logging
 
+# ollama, chromadb, comfort_zone (numpy) and transcript_store are imported on first use to keep startup fast
+from exchange_scheduler import AdaptiveScheduler, DepthGainPriors, SequentialScheduler
+from interview_state import InterviewHistory, TextJournal
+from latency_budget import GenerationTimeout, is_timeout
+from memory_profile import MemoryProfiler, format_record
+from persona_registry import PersonaRegistry, fingerprint
+from response_cleaner import StreamingResponseCleaner, clean_response_text, strip_think_blocks
+from tracing import Tracer, traced
+
+# Evaluator output patterns, compiled once
+EVALUATION_SCORE_PATTERN = re.compile(r"Score:\s*([1-3])", re.IGNORECASE)
+EVALUATION_RATIONALE_PATTERN = re.compile(r"Rationale:\s*(.+)", re.IGNORECASE | re.DOTALL)
+EVALUATION_SINGLE_SCORE_PATTERN = re.compile(r"^[1-3]$")
+
+# Knowledge used for the default expert when its persona file cannot be read
+DEFAULT_PERSONA_FALLBACK = """
+# Martin Luther King Jr. — Evolved Digital Persona (1929-2025)
+
+**MLK:** I am Martin Luther King Jr., now 96 years old in 2025.
+I was born in 1929 and supposedly assassinated in 1968, but I've lived to see the internet, 9/11, Obama's presidency, Trump's era, and the rise of AI.
+My core values remain: nonviolence, beloved community, and systemic justice. But I've had 57 years to evolve my thinking.
+
+**MLK:** On technology and AI: I see algorithmic bias as the new form of segregation.
+These systems learn from our past prejudices and encode them into the future. Predictive policing that targets Black neighborhoods is digital redlining. AI hiring systems that reject Black names are lunch counters with mathematical 'Whites Only' signs.
+"""
+
+# Characters of a breakthrough response kept in memory in compact mode (the full text stays in the journal)
+BREAKTHROUGH_PREVIEW_CHARS = 200
+
+# Generations whose length the latency budget's lower_num_predict step caps (evaluations stay whole)
+NUM_PREDICT_DEGRADABLE_REQUESTS = ("HOST_OPENING_QUESTION", "HOST_FOLLOWUP_QUESTION", "EXPERT_RESPONSE", "INTERVIEW_CONCLUSION")
+
+# The Ollama server ollama.Client() talks to, part of every coalesced LLM and embedding request's key
+OLLAMA_BACKEND = os.environ.get('OLLAMA_HOST', '127.0.0.1:11434')
+
+# Per-interview counters for speculative follow-ups: generated, used, thrown away, and the time each side cost
+EMPTY_SPECULATION_STATS = {'started': 0, 'used': 0, 'discarded': 0, 'failed': 0, 'seconds_saved': 0.0, 'seconds_wasted': 0.0}
+
+# JSON schema passed to Ollama's `format` option for structured evaluations
+EVALUATION_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer", "enum": [1, 2, 3]},
+        "rationale": {"type": "string"},
+        "comfort_zone_flags": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["score", "rationale", "comfort_zone_flags"]
+}
+
 class RecursiveInterviewSystem:
-    def __init__(self):
-        self.config = self._load_config()
+    def __init__(self, config=None):
+        # A config dict can be passed in (the job service does this to apply per-job overrides)
+        self.config = config if config is not None else self._load_config()
         
         # Setup logging first
         self._setup_logging()
-        
-        # Initialize Ollama client
-        self.client = ollama.Client()
-        
-        # Initialize ChromaDB for RAG
-        self.chroma_client = chromadb.PersistentClient(
-            path=self.config.get('chromadb', {}).get('path', "./chroma_db")
-        )
-        
-        # Create collections for Host and Expert knowledge
-        self.host_collection = self.chroma_client.get_or_create_collection(
-            name=self.config.get('chromadb', {}).get('host_collection_name', "host_knowledge"),
-            metadata={"description": "The Recursive host's accumulated knowledge"}
-        )
-        
-        self.expert_collection = self.chroma_client.get_or_create_collection(
-            name=self.config.get('chromadb', {}).get('expert_collection_name', "expert_knowledge"),
-            metadata={"description": "Expert persona knowledge base"}
-        )
+
+        # Hot-path tracing (no-op unless tracing.enabled)
+        self.tracer = Tracer.from_config(self.config.get('tracing', {}))
+        
+        # Ollama and ChromaDB handles are created on first use (see the properties below)
+        self.startup_timings = []  # (step, seconds) for --profile-startup
+        self._client = None
+        self._chroma_client = None
+        self._host_collection = None
+        self._expert_collection = None  # Pins one collection for every expert when set (see expert_collection)
+        self._persona_registry = None
+        self._retrieval_cache = None  # See retrieval_cache
+        self._topic_briefings = None  # See topic_briefings
+        self._pattern_library = None  # See pattern_library
+        self._write_buffer = None  # See write_buffer
+        self.latency_budget = None  # LatencyBudget of the running interview (latency_budget.enabled)
+        self._model_router = None  # See model_router
+        self.current_topic = None  # Topic of the exchange in progress; model routing escalates per topic
+        self.current_expert_name = None  # Selects the expert collection while an interview runs
+        self.embedding_function = None  # Chroma embedding function for new collections (None = Chroma's default)
+        self._warm_up_thread = None
+        if not self.config.get('startup', {}).get('lazy_initialization', False):
+            # Open everything now so configuration problems surface at startup
+            self.open_backends()
         
         # Host persona from config
         self.host_persona = self.config.get('host_ai_settings', {}).get('host_persona_definition', 
             "You are the host of 'The Recursive,' dedicated to philosophical inquiry and uncomfortable truths.")
 
+        # Compact state spills utterance texts to a journal file; memory profiling adds tracemalloc checkpoints
+        memory_settings = self.config.get('memory', {})
+        self.compact_state = memory_settings.get('compact_state', False)
+        self._journal = TextJournal(memory_settings.get('journal_path')) if self.compact_state else None
+        self.memory_profiler = MemoryProfiler.from_config(memory_settings)
+
         # Track interview state
-        self.interview_history = []
+        self.interview_history = InterviewHistory(self._journal) if self.compact_state else []
+        self.current_topics = None
         self.follow_up_count = {}
         self.topic_depth_scores = {}  # Track depth achieved per topic
         self.comfort_zone_patterns = []  # Track repeated comfort zone responses
+        self._comfort_zone_detectors = {}  # Precompiled detectors keyed by persona and phrase set
 
         # Web search settings
         self.web_search_settings = self.config.get('web_search_settings', {
@@ -67,6 +135,169 @@ class RecursiveInterviewSystem:
         })
         self.potential_breakthroughs = []
 
+        # Callables taking (event_type, data), told about exchanges and evaluations as they happen
+        self.event_listeners = []
+
+        # Episode audio rendered sentence by sentence while the interview runs (speech.enabled)
+        self._speech_pipeline = None
+        self.episode_audio = None
+        self.audio_report = None
+
+        # Structured evaluation bookkeeping
+        self.last_evaluation = None
+        self.evaluation_stats = {'structured_calls': 0, 'parse_failures': 0, 'retries': 0, 'fallbacks': 0}
+
+        # Follow-up questions generated while the previous answer is evaluated (speculation.enabled)
+        self._speculation_executor = None
+        self._speculation_lock = threading.Lock()
+        self.speculation_stats = dict(EMPTY_SPECULATION_STATS)
+
+        # This interview's share of identical in-flight backend calls (single_flight.enabled)
+        self._single_flight_lock = threading.Lock()
+        self.single_flight_stats = {}
+
+    def _timed_startup_step(self, step, function):
+        start = time.perf_counter()
+        result = function()
+        self.startup_timings.append((step, time.perf_counter() - start))
+        return result
+
+    def _import_module(self, name):
+        if name in sys.modules:
+            return sys.modules[name]
+        return self._timed_startup_step(f"import {name}", lambda: importlib.import_module(name))
+
+    @property
+    def client(self):
+        """Ollama client, created on first use"""
+        if self._client is None:
+            ollama = self._import_module('ollama')
+            budget_settings = self.config.get('latency_budget', {})
+            timeout = budget_settings.get('request_timeout_seconds') if budget_settings.get('enabled', False) else None
+            # With a latency budget, a hung request fails after the timeout instead of stalling the episode
+            factory = (lambda: ollama.Client(timeout=timeout)) if timeout else ollama.Client
+            self._client = self._timed_startup_step("ollama.Client()", factory)
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    @property
+    def chroma_client(self):
+        """ChromaDB client for RAG, opened on first use"""
+        if self._chroma_client is None:
+            server_settings = self.config.get('retrieval_server', {})
+            if server_settings.get('url'):
+                # Collections shared through retrieval_server.py instead of a store of our own
+                from retrieval_server import RetrievalClient
+                self._chroma_client = self._timed_startup_step("RetrievalClient()", lambda: RetrievalClient.from_config(server_settings))
+                return self._chroma_client
+            chromadb = self._import_module('chromadb')
+            path = self.config.get('chromadb', {}).get('path', "./chroma_db")
+            self._chroma_client = self._timed_startup_step("chromadb.PersistentClient()", lambda: chromadb.PersistentClient(path=path))
+        return self._chroma_client
+
+    @chroma_client.setter
+    def chroma_client(self, value):
+        self._chroma_client = value
+
+    def _get_or_create_collection(self, name, metadata):
+        options = {"embedding_function": self.embedding_function} if self.embedding_function is not None else {}
+        collection = self.chroma_client.get_or_create_collection(name=name, metadata=metadata, **options)
+        storage_settings = self.config.get('embedding_storage', {})
+        # A retrieval server owns its collections' storage, so only local collections are wrapped
+        if storage_settings.get('enabled', False) and not self.config.get('retrieval_server', {}).get('url'):
+            from quantized_index import QuantizedCollection
+            # Queries must be embedded like the stored documents: with the collection's own function
+            embed = self.embedding_function or getattr(collection, '_embedding_function', None)
+            collection = QuantizedCollection.from_config(collection, embed, storage_settings)
+        return collection
+
+    @property
+    def host_collection(self):
+        """Host's knowledge collection, opened on first use"""
+        if self._host_collection is None:
+            self._host_collection = self._timed_startup_step("host collection", lambda: self._get_or_create_collection(
+                self.config.get('chromadb', {}).get('host_collection_name', "host_knowledge"),
+                {"description": "The Recursive host's accumulated knowledge"}
+            ))
+        return self._host_collection
+
+    @host_collection.setter
+    def host_collection(self, value):
+        self._host_collection = value
+
+    @property
+    def persona_registry(self):
+        """Registry of known experts; rebuilt if self.config is replaced"""
+        if self._persona_registry is None or self._persona_registry.config is not self.config:
+            self._persona_registry = PersonaRegistry(self.config, self._open_expert_collection, self._on_expert_collection_opened)
+        return self._persona_registry
+
+    def _open_expert_collection(self, name, metadata):
+        return self._timed_startup_step(f"expert collection {name}", lambda: self._get_or_create_collection(name, metadata))
+
+    def _on_expert_collection_opened(self, persona, collection):
+        if self.config.get('persona_settings', {}).get('ingest_on_first_use', True):
+            self.load_persona_knowledge(persona, collection)
+
+    def expert_collection_for(self, expert_name=None):
+        """Knowledge collection of the named expert (default: the current one)"""
+        if self._expert_collection is not None:
+            return self._expert_collection
+        return self.persona_registry.collection(expert_name or self.current_expert_name)
+
+    @property
+    def expert_collection(self):
+        """Current expert's knowledge collection, opened on first use"""
+        return self.expert_collection_for(self.current_expert_name)
+
+    @expert_collection.setter
+    def expert_collection(self, value):
+        # Assigning pins one collection for all experts (tests and benchmarks wrap it this way)
+        self._expert_collection = value
+
+    def open_backends(self):
+        """Create the Ollama client and open the host and default expert collections now rather than on first use"""
+        return self.client, self.host_collection, self.expert_collection
+
+    def start_model_warm_up(self):
+        """Load the interview models into Ollama in the background with zero-token generates.
+
+        Runs at most once per instance and only when startup.warm_up_models is set.
+        Returns the warm-up thread, or None.
+        """
+        startup_settings = self.config.get('startup', {})
+        if not startup_settings.get('warm_up_models', False) or self._warm_up_thread is not None:
+            return self._warm_up_thread
+
+        # The expert answers first, so load its model first
+        models = list(dict.fromkeys(model for model in (
+            self.config.get('expert_llm_model', 'qwen3:4b'),
+            self.config.get('host_llm_model', 'qwen3:4b'),
+            self.config.get('evaluation_llm_model', 'qwen3:4b'),
+        ) if model))
+        keep_alive = startup_settings.get('keep_alive', "30m")
+        client = self.client  # Create the client here rather than racing to create it from the thread
+
+        def warm_up():
+            for model in models:
+                start = time.perf_counter()
+                try:
+                    # An empty prompt makes Ollama load the model and return without generating
+                    client.generate(model=model, prompt="", keep_alive=keep_alive)
+                except Exception as e:
+                    self.logger.warning(f"Model warm-up failed for {model}: {e}")
+                    continue
+                elapsed = time.perf_counter() - start
+                self.startup_timings.append((f"warm-up {model}", elapsed))
+                self.logger.info(f"Warmed up {model} in {elapsed:.2f}s (keep_alive {keep_alive})")
+
+        self._warm_up_thread = threading.Thread(target=warm_up, name="ollama-warm-up", daemon=True)
+        self._warm_up_thread.start()
+        return self._warm_up_thread
+
     def _setup_logging(self):
         """Setup comprehensive logging system"""
         logging_config = self.config.get('logging', {})
@@ -88,12 +319,18 @@ class RecursiveInterviewSystem:
         self.logger = logging.getLogger('recursive_interview')
         self.logger.setLevel(log_level)
         
+        # Handlers are shared by every instance in the process; only the first one creates them,
+        # so repeated instances don't each open (and leak) a log file
+        if self.logger.handlers:
+            self.logger.info("Logging system already initialized")
+            return
+
         # Create file handler with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_filename = f"{logging_config.get('log_filename_prefix', 'recursive_')}{timestamp}.log"
         log_filepath = os.path.join(log_directory, log_filename)
         
-        file_handler = logging.FileHandler(log_filepath, encoding='utf-8')
+        file_handler = logging.FileHandler(log_filepath, encoding='utf-8', delay=True)  # Opened on first record
         file_handler.setLevel(log_level)
         
         # Create console handler
@@ -109,9 +346,8 @@ class RecursiveInterviewSystem:
         console_handler.setFormatter(formatter)
         
         # Add handlers to logger
-        if not self.logger.handlers:  # Avoid duplicate handlers
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+        self.logger.addHandler(file_handler)
+        self.logger.addHandler(console_handler)
             
         self.logger.info("Logging system initialized")
         self.logger.info(f"Log file: {log_filepath}")
@@ -146,26 +382,97 @@ class RecursiveInterviewSystem:
             'request_type': request_type,
             'response_length': len(response_text),
             'response_preview': response_text[:200] + "..." if len(response_text) > 200 else response_text,
-            'full_response': response_text,  # Full response for debugging
             'processing_time_seconds': processing_time
         }
+        if self.config.get('logging', {}).get('include_full_responses', True):
+            log_entry['full_response'] = response_text  # Full response for debugging
         
         self.logger.info(f"LLM_RESPONSE - {request_type}: {json.dumps(log_entry, indent=2)}")
 
-    def _make_llm_request(self, request_type: str, model: str, prompt: str, options: dict = None):
-        """Make LLM request with logging"""
+    def _make_llm_request(self, request_type: str, model: str, prompt: str, options: dict = None,
+                          on_text=None, word_budget: int = None, format=None, routed: bool = True):
+        """Make LLM request with logging, on the request type's model cascade when model routing is on.
+
+        routed=False keeps the given model even if the request type has a cascade. With a latency budget,
+        a request that times out switches on the next degradation step and is retried once; a second
+        timeout raises GenerationTimeout.
+        """
+        streamed = []
+        if on_text is not None:
+            forward = on_text
+
+            def on_text(text):
+                streamed.append(text)
+                forward(text)
+
+        for attempt in range(2):
+            try:
+                return self._route_llm_request(request_type, model, prompt, options, on_text, word_budget, format, routed)
+            except Exception as e:
+                if self.latency_budget is None or not is_timeout(e):
+                    raise
+                step = self.latency_budget.request_timed_out(f"{request_type} request timed out ({e})")
+                if step is not None:
+                    self._announce_degradation(step)
+                # Streamed text has already been handed on, so a stream that timed out part-way is not retried
+                if attempt > 0 or streamed:
+                    raise GenerationTimeout(f"{request_type} request timed out") from e
+                self.logger.warning(f"{request_type} request timed out; retrying once")
+
+    def _route_llm_request(self, request_type, model, prompt, options, on_text, word_budget, format, routed):
+        router = self.model_router if routed else None
+        cascade = router.cascade(request_type) if router is not None else None
+        if cascade is None:
+            return self._send_llm_request(request_type, model, prompt, options, on_text, word_budget, format)
+
+        tier = router.start_tier(request_type, self.current_topic)
+        while True:
+            start = time.perf_counter()
+            response = self._send_llm_request(request_type, cascade.models[tier], prompt, options, on_text, word_budget, format)
+            router.record_call(request_type, tier, time.perf_counter() - start)
+            # Streamed text has already been handed on, so a streamed draft is never retried
+            if tier + 1 >= len(cascade.models) or on_text is not None:
+                return response
+            accepted, reason = cascade.check(clean_response_text(response['response']))
+            if accepted:
+                return response
+            router.record_escalation(request_type, tier)
+            self.logger.info(f"{request_type} draft from {cascade.models[tier]} rejected ({reason}); escalating to {cascade.models[tier + 1]}")
+            tier += 1
+
+    def _send_llm_request(self, request_type, model, prompt, options=None, on_text=None, word_budget=None, format=None):
         start_time = time.time()
+        span = self.tracer.start_span(f"generation:{request_type}", model=model, prompt_chars=len(prompt))
         
+        if request_type in NUM_PREDICT_DEGRADABLE_REQUESTS and self._degraded('lower_num_predict'):
+            cap = self.config.get('latency_budget', {}).get('degraded_num_predict', 160)
+            options = {**(options or {}), 'num_predict': min((options or {}).get('num_predict', cap), cap)}
+
         # Log the request
         self._log_llm_request(request_type, model, prompt, options)
         
         try:
             # Make the actual request
-            response = self.client.generate(
-                model=model,
-                prompt=prompt,
-                options=options or {}
-            )
+            # Structured (format-constrained) output is parsed as a whole, so it is never streamed
+            if format is None and self.config.get('streaming', {}).get('enabled', False):
+                generate = lambda: self._stream_llm_request(request_type, model, prompt, options, on_text, word_budget)
+            elif format is not None:
+                generate = lambda: self.client.generate(
+                    model=model,
+                    prompt=prompt,
+                    options=options or {},
+                    format=format
+                )
+            else:
+                generate = lambda: self.client.generate(
+                    model=model,
+                    prompt=prompt,
+                    options=options or {}
+                )
+            if on_text is None and self._shareable_generation(request_type, options):
+                response = self._coalesced("llm", (OLLAMA_BACKEND, model, prompt, options or {}, format, word_budget), generate)
+            else:
+                response = generate()
             
             processing_time = time.time() - start_time
             
@@ -182,6 +489,46 @@ class RecursiveInterviewSystem:
             self._log_llm_response(request_type, error_response, processing_time)
             
             raise
+        finally:
+            self.tracer.end_span(span)
+
+    def _stream_llm_request(self, request_type: str, model: str, prompt: str, options: dict = None,
+                            on_text=None, word_budget: int = None):
+        """Stream a generation, cleaning chunks as they arrive.
+
+        on_text receives each newly cleaned piece of text. If word_budget is set,
+        generation stops once the cleaned text exceeds it.
+        """
+        cleaner = StreamingResponseCleaner()
+        raw_chunks = []
+        stopped_at_word_budget = False
+
+        stream = self.client.generate(
+            model=model,
+            prompt=prompt,
+            options=options or {},
+            stream=True
+        )
+        try:
+            for chunk in stream:
+                piece = chunk['response'] or ''
+                raw_chunks.append(piece)
+                cleaned_piece = cleaner.feed(piece)
+                if cleaned_piece and on_text:
+                    on_text(cleaned_piece)
+                if word_budget and cleaner.word_count > word_budget:
+                    stopped_at_word_budget = True
+                    self.logger.info(f"{request_type} stopped at word budget of {word_budget} words")
+                    break
+        finally:
+            # Closing the generator drops the HTTP stream so Ollama stops generating
+            if hasattr(stream, 'close'):
+                stream.close()
+
+        return {
+            'response': ''.join(raw_chunks),
+            'stopped_at_word_budget': stopped_at_word_budget
+        }
 
     def _load_config(self, config_path="config.yaml") -> dict:
         try:
@@ -200,154 +547,203 @@ class RecursiveInterviewSystem:
             raise
 
     def setup_mlk_expert(self):
-        """Initialize MLK expert with base knowledge from personas/mlk.md"""
-        
-        persona_file_path = self.config.get('persona_settings', {}).get('default_persona_file_path', "personas/mlk.md")
-        
+        """Initialize the default expert (MLK) with base knowledge from its persona file"""
+        return self.setup_expert(self.persona_registry.default_key)
+
+    def setup_expert(self, expert_name=None):
+        """Make sure an expert's collection holds the current documents from its persona file"""
+        persona = self.persona_registry.resolve(expert_name)
+        collection = self.expert_collection_for(persona)
+        return self.load_persona_knowledge(persona, collection)
+
+    def load_persona_knowledge(self, persona, collection):
+        """Upsert a persona file's documents into the expert's collection unless they are already current.
+
+        Returns the number of documents written.
+        """
+        persona_file_path = persona.file_path
         try:
+            if not persona_file_path:
+                raise FileNotFoundError("no persona file configured")
             with open(persona_file_path, "r", encoding="utf-8") as f:
-                mlk_md_content = f.read()
+                persona_content = f.read()
         except Exception as e:
+            if persona.key != self.persona_registry.default_key:
+                print(f"⚠️ Error reading persona file {persona_file_path} for {persona.name}: {e}. Expert knowledge will be empty.")
+                return 0
             print(f"Error reading persona file {persona_file_path}: {e}. Using fallback knowledge.")
-            mlk_md_content = """
-# Martin Luther King Jr. — Evolved Digital Persona (1929-2025)
-
-**MLK:** I am Martin Luther King Jr., now 96 years old in 2025.
-I was born in 1929 and supposedly assassinated in 1968, but I've lived to see the internet, 9/11, Obama's presidency, Trump's era, and the rise of AI.
-My core values remain: nonviolence, beloved community, and systemic justice. But I've had 57 years to evolve my thinking.
-
-**MLK:** On technology and AI: I see algorithmic bias as the new form of segregation.
-These systems learn from our past prejudices and encode them into the future. Predictive policing that targets Black neighborhoods is digital redlining. AI hiring systems that reject Black names are lunch counters with mathematical 'Whites Only' signs.
-"""
-
-        # Split content by double newlines
-        raw_chunks = mlk_md_content.split('\n\n')
-        
-        documents_to_add = []
-        ids_to_add = []
-        metadatas_to_add = []
-        doc_id_counter = 0
-        
-        for chunk in raw_chunks:
-            text = chunk.strip()
-            
-            # Skip HOST lines
-            if text.startswith("**HOST:") or text.startswith("HOST:"):
-                continue
+            persona_content = DEFAULT_PERSONA_FALLBACK
 
-            # Remove speaker tags like **MLK:** or MLK:
-            text = re.sub(r"^\*\*MLK:\*\* ?", "", text)
-            text = re.sub(r"^MLK: ?", "", text)
-            
-            # Remove Markdown headings
-            text = re.sub(r"^#+ ?", "", text)
-            
-            # Remove lines that are just separators or metadata-like
-            if text.startswith("---") or text.startswith("## ") or text.startswith("### "):
-                continue
-            if text.lower().startswith("featured persona:") or \
-               text.lower().startswith("theme:") or \
-               text.lower().startswith("background evolution") or \
-               text.lower().startswith("core unchanging values") or \
-               text.lower().startswith("evolutionary developments") or \
-               text.lower().startswith("style evolution") or \
-               text.lower().startswith("recursive questioning triggers") or \
-               text.lower().startswith("self-correction moments") or \
-               text.lower().startswith("modern issues synthesis") or \
-               text.lower().startswith("failsafes") or \
-               text.lower().startswith("voice synthesis notes"):
-                continue
+        content_fingerprint = fingerprint(persona_content)
+        metadata = collection.metadata if isinstance(getattr(collection, 'metadata', None), dict) else {}
+        if metadata.get('persona_fingerprint') == content_fingerprint:
+            print(f"✓ {persona.name} expert knowledge is up to date in {persona.collection_name}.")
+            return 0
 
-            # Clean up multiple newlines within a chunk that might have been missed
-            text = re.sub(r"\n+", "\n", text).strip()
+        documents_to_add = persona.extract_documents(persona_content)
+        if not documents_to_add:
+            print(f"⚠️ No documents were extracted from {persona_file_path}. {persona.name} expert knowledge might be empty.")
+            return 0
 
-            if len(text) < 20: # Using a slightly higher threshold for persona docs
-                continue
-                
-            doc_id_counter += 1
-            documents_to_add.append(text)
-            doc_id_prefix = self.config.get('persona_settings', {}).get('persona_doc_id_prefix', "mlk_doc_")
-            ids_to_add.append(f"{doc_id_prefix}{doc_id_counter}")
-            metadatas_to_add.append({"source": persona_file_path, "type": "base_persona"})
-
-        if documents_to_add:
-            self.expert_collection.upsert(
-                ids=ids_to_add,
-                documents=documents_to_add,
-                metadatas=metadatas_to_add
-            )
-            print(f"✓ MLK expert knowledge initialized from {persona_file_path} with {len(documents_to_add)} documents.")
-        else:
-            print(f"⚠️ No documents were extracted from {persona_file_path}. MLK expert knowledge might be empty.")
+        if metadata.get('persona_fingerprint'):
+            # The persona file changed; drop its old documents so removed passages don't linger
+            collection.delete(where={"type": "base_persona"})
+        collection.upsert(
+            ids=[f"{persona.doc_id_prefix}{i}" for i in range(1, len(documents_to_add) + 1)],
+            documents=documents_to_add,
+            metadatas=[{"source": persona_file_path, "type": "base_persona"} for _ in documents_to_add]
+        )
+        if metadata:
+            collection.modify(metadata={**metadata, "persona_fingerprint": content_fingerprint})
+        self._expert_knowledge_changed(persona.name)
+        print(f"✓ {persona.name} expert knowledge initialized from {persona_file_path} with {len(documents_to_add)} documents.")
+        return len(documents_to_add)
 
     def get_embedding(self, text):
         """Generate embeddings using Ollama"""
-        response = self.client.embeddings(
-            model=self.config.get('embedding_model', 'nomic-embed-text'),
-            prompt=text
-        )
+        model = self.config.get('embedding_model', 'nomic-embed-text')
+        response = self._coalesced("embedding", (OLLAMA_BACKEND, model, text),
+                                   lambda: self.client.embeddings(model=model, prompt=text))
         return response['embedding']
 
-    def search_expert_knowledge(self, query, n_results=None):
-        """Search expert's knowledge base"""
+    def _retrieval_n_results(self, n_results=None):
+        """Knowledge chunks per expert turn: the configured default, shrunk when the latency budget says so"""
         if n_results is None:
             n_results = self.config.get('chromadb', {}).get('default_n_results', 3)
+        if self._degraded('shrink_retrieval'):
+            n_results = min(n_results, self.config.get('latency_budget', {}).get('degraded_n_results', 1))
+        return n_results
+
+    @traced()
+    def search_expert_knowledge(self, query, n_results=None, expert_name=None, query_embedding=None):
+        """Search expert's knowledge base"""
+        n_results = self._retrieval_n_results(n_results)
             
-        results = self.expert_collection.query(
-            query_texts=[query],
-            n_results=n_results
-        )
+        if query_embedding is not None:
+            # Already embedded with the collection's embedding function
+            results = self._query_collection(
+                self.expert_collection_for(expert_name),
+                query_embeddings=[query_embedding],
+                n_results=n_results
+            )
+        else:
+            results = self._query_collection(
+                self.expert_collection_for(expert_name),
+                query_texts=[query],
+                n_results=n_results
+            )
         
-        if results['documents'] and results['documents'][0]:
-            return "\n\n".join(results['documents'][0])
-        return ""
+        documents = results['documents'][0] if results['documents'] and results['documents'][0] else []
+        if self._write_buffer is not None:
+            # Read-your-writes: snippets queued this exchange but not yet written still count
+            overlay_limit = min(n_results, self.config.get('write_behind', {}).get('overlay_n_results', 2))
+            unwritten = self._write_buffer.matching(self.expert_collection_for(expert_name), query, overlay_limit)
+            documents = list(dict.fromkeys(unwritten + documents))[:max(n_results, len(unwritten))]
+        return "\n\n".join(documents)
 
+    @traced()
     def clean_response(self, text):
         """Remove thinking tags and clean up response formatting"""
-        # Remove <think> tags and their content
-        text = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)
-        
-        # Remove **Label:** formatting like **Opening Question:** or **Follow-up Question:**
-        text = re.sub(r'\*\*(Opening|Follow-up) Question:\*\*\s*"?', '', text)
-        
-        # Remove **Rationale:** and the rest of its line
-        text = re.sub(r'\*\*Rationale:\*\*.*', '', text, flags=re.MULTILINE)
+        return clean_response_text(text)
 
-        # Remove potential speaker tags like **MLK:** or HOST: at the start
-        text = re.sub(r"^\*\*(MLK|HOST):\*\* ?", "", text.strip())
-        text = re.sub(r"^(MLK|HOST): ?", "", text.strip())
+    def get_embeddings(self, texts):
+        """Generate embeddings for a batch of texts in a single Ollama call"""
+        model = self.config.get('embedding_model', 'nomic-embed-text')
+        texts = list(texts)
+        response = self._coalesced("embedding", (OLLAMA_BACKEND, model, texts),
+                                   lambda: self.client.embed(model=model, input=texts))
+        return response['embeddings']
 
-        # Remove surrounding quotes
-        text = text.strip()
-        if (text.startswith('"') and text.endswith('"')) or \
-           (text.startswith("'") and text.endswith("'")):
-            text = text[1:-1]
+    def _shareable_generation(self, request_type, options):
+        """Whether a generation may share another caller's output: greedy decoding, or allowlisted despite sampling"""
+        settings = self.config.get('single_flight', {})
+        if not settings.get('enabled', False) or not settings.get('coalesce_llm', True):
+            return False
+        # Ollama samples at its default temperature when none is given
+        if (options or {}).get('temperature') == 0:
+            return True
+        return request_type in (settings.get('nonzero_temperature_request_types') or [])
 
-        # Clean up extra whitespace and newlines
-        text = ' '.join(text.split())
-        
-        return text.strip()
+    def _coalesced(self, kind, key_parts, function):
+        """Run a backend call, or share the identical one another interview in this process already has in flight"""
+        if not self.config.get('single_flight', {}).get('enabled', False):
+            return function()
+        from single_flight import PROCESS_GROUP, request_key
+        result, shared = PROCESS_GROUP.do(kind, request_key(*key_parts), function)
+        with self._single_flight_lock:
+            stats = self.single_flight_stats.setdefault(kind, {'requests': 0, 'shared': 0})
+            stats['requests'] += 1
+            stats['shared'] += int(shared)
+        if shared:
+            self.logger.debug(f"Shared an identical in-flight {kind} call")
+        return result
+
+    def _query_collection(self, collection, **query):
+        """collection.query, coalesced with identical queries in flight against the same store"""
+        chroma_settings = self.config.get('chromadb', {})
+        store = self.config.get('retrieval_server', {}).get('url') or chroma_settings.get('path', './chroma_db')
+        return self._coalesced("retrieval", (store, getattr(collection, 'name', repr(collection)), query),
+                               lambda: collection.query(**query))
+
+    def single_flight_report(self):
+        from single_flight import dedup_report
+        with self._single_flight_lock:
+            return {kind: dedup_report(stats) for kind, stats in sorted(self.single_flight_stats.items())}
+
+    def get_comfort_zone_detector(self, expert_name=None):
+        """Return the precompiled comfort zone detector for an expert, building it on first use"""
+        persona = self.persona_registry.resolve(expert_name or self.current_expert_name)
+        expert_defaults = persona.settings
+        detection_settings = self.config.get('comfort_zone_detection', {})
+        phrases = tuple(expert_defaults.get('comfort_zone_phrases', []) or [])
+        topics = tuple(expert_defaults.get('comfort_zone_topics', []) or [])
+        semantic_enabled = detection_settings.get('semantic_matching_enabled', False)
+        threshold = detection_settings.get('similarity_threshold', 0.82)
 
+        # Rebuild only when the configured phrases or matching settings change
+        cache_key = (persona.key, phrases, topics, semantic_enabled, threshold)
+        detector = self._comfort_zone_detectors.get(cache_key)
+        if detector is None:
+            from comfort_zone import ComfortZoneDetector
+            detector = ComfortZoneDetector(
+                phrases,
+                topics,
+                embed_fn=self.get_embeddings if semantic_enabled else None,
+                similarity_threshold=threshold
+            )
+            self._comfort_zone_detectors[cache_key] = detector
+        return detector
+
+    @traced()
     def detect_comfort_zone_patterns(self, response, expert_name):
         """Detect if expert is using familiar phrases or comfort zone responses"""
-        expert_defaults = self.config.get('expert_defaults', {}).get('martin_luther_king_jr', {})
-        comfort_phrases = expert_defaults.get('comfort_zone_phrases', [])
-        
-        comfort_zone_detected = []
-        for phrase in comfort_phrases:
-            if phrase.lower() in response.lower():
-                comfort_zone_detected.append(phrase)
-        
+        detector = self.get_comfort_zone_detector(expert_name)
+        try:
+            detection = detector.detect(response)
+        except Exception as e:
+            # Semantic matching depends on the embedding model; fall back to exact phrases
+            self.logger.error(f"Semantic comfort zone matching failed: {e}")
+            detection = detector.detect_phrases(response)
+            detection["paraphrases"] = []
+
+        comfort_zone_detected = detection["phrases"] + detection["paraphrases"]
+
         if comfort_zone_detected:
-            self.comfort_zone_patterns.extend(comfort_zone_detected)
+            self.comfort_zone_patterns.extend(sys.intern(phrase) for phrase in comfort_zone_detected)
             self.logger.info(f"Comfort zone patterns detected: {comfort_zone_detected}")
-            
+        if detection["topics"]:
+            self.logger.info(f"Comfort zone topics mentioned: {detection['topics']}")
+
         return len(comfort_zone_detected) > 0, comfort_zone_detected
     
+    @traced()
     def conduct_interview_opening(self, expert_name):
         """Conduct the interview opening sequence"""
         self.logger.info(f"Starting interview opening with {expert_name}")
         
+        # Load models in the background while the static introduction is delivered
+        self.start_model_warm_up()
+
         print(f"\n🎙️  THE RECURSIVE")
         print("=" * 60)
         
@@ -355,9 +751,10 @@ These systems learn from our past prejudices and encode them into the future. Pr
         host_intro = self.config.get('prompts', {}).get('interview_opening', {}).get('host_introduction', 
             "Welcome to The Recursive—where great minds evolve, and comfortable assumptions die.")
         print(f"\n🎤 HOST: {host_intro}")
+        self._speak("HOST", host_intro)
         
         # Expert introduction question
-        expert_defaults = self.config.get('expert_defaults', {}).get('martin_luther_king_jr', {})
+        expert_defaults = self.persona_registry.resolve(expert_name).settings
         years_evolved = expert_defaults.get('years_evolved', 57)
         core_theme = expert_defaults.get('core_theme', 'justice and social change')
         
@@ -371,6 +768,7 @@ These systems learn from our past prejudices and encode them into the future. Pr
         )
         
         print(f"\n🎤 HOST: {intro_question}")
+        self._speak("HOST", intro_question)
         self.logger.info(f"Opening question posed: {intro_question}")
         
         # Expert opening response
@@ -388,12 +786,14 @@ These systems learn from our past prejudices and encode them into the future. Pr
             "text": intro_response,
             "topic": "Introduction"
         })
+        self._emit("exchange", topic="Introduction", question=intro_question, response=intro_response, follow_up=False)
         
         print(f"\n{'─' * 60}")
         print("🔥 Now let's dig deeper...")
         print("─" * 60)
         self.logger.info("Interview opening completed successfully")
 
+    @traced()
     def generate_host_question(self, topic, conversation_history="", is_followup=False, expert_response_text=None):
         """Generate a question from the Host AI using config prompts"""
         
@@ -412,16 +812,20 @@ These systems learn from our past prejudices and encode them into the future. Pr
             max_patterns_to_inject = learning_settings.get('max_patterns_to_inject_in_prompt', 1)
             query_by_topic = learning_settings.get('query_successful_patterns_by_topic', True)
             
-            retrieved_patterns_docs = []
-            if query_by_topic and topic: # Ensure topic is not None or empty
+            # Varied examples from the clustered pattern library when pattern_selection is on (None = query the collection)
+            selected_patterns = self._select_learned_patterns(topic if query_by_topic else None, max_patterns_to_inject, host_knowledge_config)
+            retrieved_patterns_docs = selected_patterns or []
+            if selected_patterns is None and query_by_topic and topic: # Ensure topic is not None or empty
                 self.logger.info(f"Querying host_collection for successful patterns related to topic: '{topic}'")
                 try:
-                    topic_patterns_results = self.host_collection.query(
-                        query_texts=[f"successful patterns for topic: {topic}"], # Query text based on topic
-                        n_results=max_patterns_to_inject,
-                        where={"type": "successful_pattern_context"}, 
-                        include=["documents"] # Only need documents for prompt
-                    )
+                    with self.tracer.span("host_pattern_query", scope="topic"):
+                        topic_patterns_results = self._query_collection(
+                            self.host_collection,
+                            query_texts=[f"successful patterns for topic: {topic}"], # Query text based on topic
+                            n_results=max_patterns_to_inject,
+                            where={"type": "successful_pattern_context"}, 
+                            include=["documents"] # Only need documents for prompt
+                        )
                     if topic_patterns_results and topic_patterns_results['documents'] and topic_patterns_results['documents'][0]:
                         retrieved_patterns_docs.extend(topic_patterns_results['documents'][0])
                         self.logger.info(f"Retrieved {len(topic_patterns_results['documents'][0])} topic-specific patterns for '{topic}'.")
@@ -429,16 +833,18 @@ These systems learn from our past prejudices and encode them into the future. Pr
                     self.logger.error(f"Error querying host_collection for topic-specific patterns ('{topic}'): {e}")
 
             # If not enough topic-specific patterns, query for general ones
-            if len(retrieved_patterns_docs) < max_patterns_to_inject:
+            if selected_patterns is None and len(retrieved_patterns_docs) < max_patterns_to_inject:
                 num_general_needed = max_patterns_to_inject - len(retrieved_patterns_docs)
                 self.logger.info(f"Querying host_collection for {num_general_needed} general successful patterns.")
                 try:
-                    general_patterns_results = self.host_collection.query(
-                        query_texts=[host_knowledge_config.get('successful_pattern_query', "successful challenging questions")],
-                        n_results=num_general_needed,
-                        where={"type": "successful_pattern_context"},
-                        include=["documents"]
-                    )
+                    with self.tracer.span("host_pattern_query", scope="general"):
+                        general_patterns_results = self._query_collection(
+                            self.host_collection,
+                            query_texts=[host_knowledge_config.get('successful_pattern_query', "successful challenging questions")],
+                            n_results=num_general_needed,
+                            where={"type": "successful_pattern_context"},
+                            include=["documents"]
+                        )
                     if general_patterns_results and general_patterns_results['documents'] and general_patterns_results['documents'][0]:
                         retrieved_patterns_docs.extend(general_patterns_results['documents'][0])
                         self.logger.info(f"Retrieved {len(general_patterns_results['documents'][0])} general patterns.")
@@ -468,10 +874,13 @@ These systems learn from our past prejudices and encode them into the future. Pr
         else:
             prompt_template = self.config.get('prompts', {}).get('question_generation', {}).get('opening_question',
                 "Generate an opening question for the topic: {topic}")
+            # The expert being interviewed now, not the configured default; an unregistered expert keeps
+            # its own name, as in its answers and the conclusion
+            persona = self.persona_registry.get(self.current_expert_name) if self.current_expert_name else self.persona_registry.default
             
             base_prompt = prompt_template.format(
                 host_persona=self.host_persona,
-                expert_name=self.config.get('default_expert_name', 'Expert'),
+                expert_name=persona.name if persona is not None else self.current_expert_name,
                 topic=topic
             )
             request_type = "HOST_OPENING_QUESTION"
@@ -491,6 +900,7 @@ These systems learn from our past prejudices and encode them into the future. Pr
         
         return cleaned_response
 
+    @traced()
     def perform_web_search(self, query: str) -> list[str]:
         """Performs a web search and returns a list of relevant text snippets."""
         if not self.web_search_settings.get('enabled', False):
@@ -584,10 +994,16 @@ These systems learn from our past prejudices and encode them into the future. Pr
             self.logger.error(f"Error during web search for query '{query}': {e}")
             return []
 
-    def generate_expert_response(self, expert_name, question, conversation_history=""):
-        """Generate a response from the Expert AI using config prompts"""
+    def add_web_knowledge(self, expert_name, question, invalidate_cache=True):
+        """Perform a web search for the question and integrate the results into the expert's RAG collection.
 
-        # 1. Perform web search and integrate results into RAG
+        Returns the snippets found (empty when web search is off or found nothing). invalidate_cache=False
+        keeps the expert's cached retrievals, for snippets added by a retrieval cache miss.
+        """
+        if self._degraded('skip_web_search'):
+            self.logger.info(f"Behind schedule; skipping web search for question: {question[:100]}...")
+            return []
+        web_snippets = []
         if self.web_search_settings.get('enabled', True):
             self.logger.info(f"Attempting web search for question: {question[:100]}...")
             web_snippets = self.perform_web_search(question)
@@ -617,52 +1033,254 @@ These systems learn from our past prejudices and encode them into the future. Pr
                 
                 if docs_to_add:
                     try:
-                        self.expert_collection.upsert(
-                            ids=ids_to_add,
-                            documents=docs_to_add,
-                            metadatas=metadatas_to_add
-                        )
+                        with self.tracer.span("web_knowledge_upsert", documents=len(docs_to_add)):
+                            self._upsert(
+                                self.expert_collection_for(expert_name),
+                                ids=ids_to_add,
+                                documents=docs_to_add,
+                                metadatas=metadatas_to_add
+                            )
                         self.logger.info(f"Successfully upserted {len(docs_to_add)} web search snippets into expert_collection for question: '{question[:50]}...'")
+                        if invalidate_cache:
+                            self._expert_knowledge_changed(expert_name)
                     except Exception as e:
                         self.logger.error(f"Failed to upsert web search snippets into expert_collection for question '{question[:50]}...': {e}")
                         # Interview continues without this specific web knowledge update
             else:
                 self.logger.info(f"No new usable information from web search to add to knowledge base for question: '{question[:50]}...'.")
+        return web_snippets
+
+    @property
+    def retrieval_cache(self):
+        """Semantic cache of retrieved knowledge blocks, or None when retrieval_cache.enabled is off"""
+        settings = self.config.get('retrieval_cache', {})
+        if self._retrieval_cache is None and settings.get('enabled', False):
+            from retrieval_cache import SemanticRetrievalCache
+            self._retrieval_cache = SemanticRetrievalCache.from_config(settings)
+        return self._retrieval_cache
+
+    @property
+    def write_buffer(self):
+        """Background batched upserts (see write_behind.py), or None when write_behind.enabled is off"""
+        settings = self.config.get('write_behind', {})
+        if self._write_buffer is None and settings.get('enabled', False):
+            from write_behind import WriteBehindBuffer
+            self._write_buffer = WriteBehindBuffer.from_config(settings, logger=self.logger)
+            # The writer thread is a daemon; flush what it still holds when the process exits
+            atexit.register(self._write_buffer.close, settings.get('shutdown_timeout_seconds', 30))
+        return self._write_buffer
+
+    def _upsert(self, collection, ids, documents, metadatas):
+        """collection.upsert(), queued on the write buffer when write-behind is on"""
+        if self.write_buffer is not None:
+            self.write_buffer.upsert(collection, ids=ids, documents=documents, metadatas=metadatas)
+        else:
+            collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+
+    def flush_writes(self, timeout=None):
+        """Wait until every queued upsert is written"""
+        if self._write_buffer is None:
+            return True
+        flushed = self._write_buffer.flush(timeout)
+        if not flushed:
+            self.logger.warning(f"Write buffer still has {self._write_buffer.pending_count()} unwritten document(s) after {timeout}s")
+        return flushed
+
+    def _question_embedding(self, question):
+        # Embed with the collections' own function when there is one, so the vector can be reused for the query
+        if self.embedding_function is not None:
+            return list(self.embedding_function([question])[0])
+        return self.get_embeddings([question])[0]
+
+    def _expert_knowledge_changed(self, expert_name=None):
+        """Drop cached retrievals that may no longer match the expert's collection"""
+        if self._retrieval_cache is None:
+            return
+        # A pinned collection is shared by every expert
+        namespace = None if self._expert_collection is not None else self.persona_registry.resolve(expert_name).key
+        dropped = self._retrieval_cache.invalidate(namespace)
+        if dropped:
+            self.logger.info(f"Expert knowledge changed; dropped {dropped} cached retrieval(s)")
+
+    def retrieve_expert_knowledge(self, expert_name, question):
+        """Knowledge block for a question: reused from the retrieval cache, re-ranked from the topic's
+        briefing bundle, or a web search plus a collection query"""
+        cache = self.retrieval_cache
+        briefings = self.topic_briefings
+        bundle = briefings.ready(expert_name, self.current_topic) if briefings is not None else None
+        namespace = self.persona_registry.resolve(expert_name).key
+        vector = None
+        if cache is not None or bundle is not None:
+            try:
+                vector = self._question_embedding(question)
+            except Exception as e:
+                self.logger.error(f"Could not embed question for retrieval: {e}")
+        if cache is not None and vector is not None:
+            knowledge = cache.lookup(namespace, vector)
+            if knowledge is not None:
+                self.logger.info(f"Retrieval cache hit for question: '{question[:50]}...'")
+                return knowledge
+        if bundle is not None and vector is not None:
+            # The bundle already holds the topic's web snippets and collection candidates
+            return "\n\n".join(briefings.rank(bundle, vector, self._retrieval_n_results()))
 
-        # 2. Search expert's knowledge base (now potentially including web results)
-        relevant_knowledge = self.search_expert_knowledge(question)
+        # Snippets found for this question only add to the collection; blocks cached for other questions stay valid
+        self.add_web_knowledge(expert_name, question, invalidate_cache=False)
+        query_embedding = vector if vector is not None and self.embedding_function is not None else None
+        knowledge = self.search_expert_knowledge(question, expert_name=expert_name, query_embedding=query_embedding)
+        if cache is not None and vector is not None:
+            cache.store(namespace, vector, knowledge)
+        return knowledge
+
+    @property
+    def topic_briefings(self):
+        """Per-topic knowledge bundles (see knowledge_bundle.py), or None when topic_briefing.enabled is off"""
+        if self._topic_briefings is None and self.config.get('topic_briefing', {}).get('enabled', False):
+            from knowledge_bundle import TopicBriefings
+            self._topic_briefings = TopicBriefings(self.build_topic_bundle)
+        return self._topic_briefings
+
+    @property
+    def pattern_library(self):
+        """Clustered successful patterns (see pattern_library.py), synced with the host collection on first use;
+        None when pattern_selection.enabled is off"""
+        if self._pattern_library is None and self.config.get('pattern_selection', {}).get('enabled', False):
+            from pattern_library import PatternLibrary
+            library = PatternLibrary.from_config(self.config.get('pattern_selection', {}))
+            # A retrieval server's collections can't list their documents; the library then grows from saved patterns
+            if hasattr(self.host_collection, 'get'):
+                start = time.perf_counter()
+                patterns = self.host_collection.get(where={"type": "successful_pattern_context"}, include=["documents"])
+                embedded = library.sync(patterns['ids'], patterns['documents'], self._embed_texts)
+                self.logger.info(f"Pattern library: {len(library)} pattern(s) in {library.clusters} cluster(s), "
+                                 f"{embedded} newly embedded, in {time.perf_counter() - start:.2f}s")
+                if library.dirty:
+                    library.save()
+            self._pattern_library = library
+        return self._pattern_library
+
+    def _select_learned_patterns(self, topic, n_results, host_knowledge_config):
+        """Relevant but varied successful patterns from the pattern library, or None when pattern_selection
+        is off or the library can't be used"""
+        if not self.config.get('pattern_selection', {}).get('enabled', False):
+            return None
+        query = (f"successful patterns for topic: {topic}" if topic
+                 else host_knowledge_config.get('successful_pattern_query', "successful challenging questions"))
+        try:
+            with self.tracer.span("host_pattern_selection"):
+                library = self.pattern_library
+                patterns = library.select(self._embed_texts([query])[0], n_results) if len(library) else []
+        except Exception as e:
+            self.logger.error(f"Pattern library selection failed, querying host_collection instead: {e}")
+            return None
+        self.logger.info(f"Selected {len(patterns)} varied pattern(s) from {len(library)} in the pattern library.")
+        return patterns
+
+    def _add_learned_pattern(self, pattern_id, document):
+        """Place a newly saved pattern in the library's clusters so the next selection can use it"""
+        try:
+            self.pattern_library.add(pattern_id, document, self._embed_texts([document])[0])
+        except Exception as e:
+            self.logger.error(f"Failed to add successful pattern (ID: {pattern_id}) to the pattern library: {e}")
+
+    def save_pattern_library(self):
+        """Write the pattern library's embeddings and clusters if they changed"""
+        if self._pattern_library is None or not self._pattern_library.dirty:
+            return
+        try:
+            self._pattern_library.wait()
+            self._pattern_library.save()
+        except OSError as e:
+            self.logger.error(f"Failed to save the pattern library: {e}")
+
+    def _embed_texts(self, texts):
+        # Same embedding space as _question_embedding, so bundle documents and questions compare
+        if self.embedding_function is not None:
+            return [list(vector) for vector in self.embedding_function(list(texts))]
+        return self.get_embeddings(texts)
+
+    def build_topic_bundle(self, expert_name, topic):
+        """Pull a topic's candidate pool (web snippets plus the closest collection chunks) and embed it in one batch"""
+        from knowledge_bundle import KnowledgeBundle
+        settings = self.config.get('topic_briefing', {})
+        snippets = self.add_web_knowledge(expert_name, topic) if settings.get('web_search', True) else []
+        results = self._query_collection(
+            self.expert_collection_for(expert_name),
+            query_texts=[topic],
+            n_results=settings.get('pool_size', 24)
+        )
+        documents = results['documents'][0] if results['documents'] and results['documents'][0] else []
+        documents = list(dict.fromkeys(list(snippets) + list(documents)))
+        bundle = KnowledgeBundle(topic, documents, self._embed_texts(documents) if documents else [])
+        self.logger.info(f"Topic briefing for '{topic}': {len(bundle)} candidate chunk(s) ({len(snippets)} from the web)")
+        return bundle
+
+    def _brief_topic(self, expert_name, topic):
+        """Make sure the topic's bundle is built before its first question; failures fall back to per-question retrieval"""
+        if self.topic_briefings is None:
+            return
+        try:
+            with self.tracer.span("topic_briefing", topic=topic):
+                self.topic_briefings.get(expert_name, topic)
+        except Exception as e:
+            self.logger.error(f"Topic briefing for '{topic}' failed; retrieving per question instead: {e}")
+
+    @traced()
+    def generate_expert_response(self, expert_name, question, conversation_history=""):
+        """Generate a response from the Expert AI using config prompts"""
+
+        # Web search into the knowledge base, then retrieval (both skipped for a near-identical cached question)
+        relevant_knowledge = self.retrieve_expert_knowledge(expert_name, question)
         
         # Get expert defaults
-        expert_defaults = self.config.get('expert_defaults', {}).get('martin_luther_king_jr', {})
-        expert_age = expert_defaults.get('expert_age', 96)
+        persona = self.persona_registry.resolve(expert_name)
+        expert_age = persona.settings.get('expert_age', 96)
         max_words = self.config.get('expert_response_max_words', 200)
         
         prompt_template = self.config.get('prompts', {}).get('expert_response', {}).get('main_prompt',
             "You are {expert_name}. Respond to: {question}")
         
-        expert_prompt = prompt_template.format(
+        # The expert's fixed fields are filled in once per persona; only the per-question fields are formatted here
+        expert_prompt = persona.prompt_template(
+            prompt_template,
             expert_name=expert_name,
             expert_age=expert_age,
+            max_words=max_words
+        ).format(
             relevant_knowledge=relevant_knowledge,
             conversation_history=conversation_history,
-            question=question,
-            max_words=max_words
+            question=question
         )
 
-        response = self._make_llm_request(
-            request_type="EXPERT_RESPONSE",
-            model=self.config.get('expert_llm_model', 'qwen3:4b'),
-            prompt=expert_prompt,
-            options={"temperature": self.config.get('expert_llm_temperature', 0.7)}
-        )
+        streaming_settings = self.config.get('streaming', {})
+        # With streaming on, finished sentences are synthesized while the rest of the answer is generated
+        utterance = self.episode_audio.utterance(self._voice_for(expert_name)) if self.episode_audio is not None else None
+        try:
+            response = self._make_llm_request(
+                request_type="EXPERT_RESPONSE",
+                model=self.config.get('expert_llm_model', 'qwen3:4b'),
+                prompt=expert_prompt,
+                options={"temperature": self.config.get('expert_llm_temperature', 0.7)},
+                on_text=utterance.feed if utterance else None,
+                word_budget=max_words if streaming_settings.get('stop_expert_at_word_budget', False) else None
+            )
+        except GenerationTimeout:
+            if utterance:
+                utterance.finish()  # End the turn on whatever was already streamed
+            raise
         
         cleaned_response = self.clean_response(response['response'])
+        if utterance:
+            utterance.finish(cleaned_response)
         self.logger.debug(f"Generated EXPERT_RESPONSE: {cleaned_response}")
         
         return cleaned_response
 
+    @traced()
     def evaluate_response_depth(self, question, response):
         """Evaluate if response is deep enough or needs follow-up using config prompts"""
+        if self.config.get('structured_evaluation', {}).get('enabled', False):
+            return self.evaluate_response_depth_structured(question, response)
         
         prompt_template = self.config.get('prompts', {}).get('evaluation', {}).get('main_prompt',
             "Evaluate this response. Score 1-3 and provide rationale.")
@@ -672,18 +1290,22 @@ These systems learn from our past prejudices and encode them into the future. Pr
             response=response
         )
 
-        result = self._make_llm_request(
-            request_type="RESPONSE_EVALUATION",
-            model=self.config.get('evaluation_llm_model', 'qwen3:4b'),
-            prompt=eval_prompt,
-            options={"temperature": self.config.get('evaluation_llm_temperature', 0.1)}
-        )
+        try:
+            result = self._make_llm_request(
+                request_type="RESPONSE_EVALUATION",
+                model=self._evaluation_model(),
+                prompt=eval_prompt,
+                options={"temperature": self.config.get('evaluation_llm_temperature', 0.1)},
+                routed=not self._degraded('small_evaluation_model')  # The latency budget's smaller model wins
+            )
+        except GenerationTimeout as e:
+            return self._timed_out_evaluation(e)
         
         cleaned_result = self.clean_response(result['response'])
         
         try:
-            score_match = re.search(r"Score:\s*([1-3])", cleaned_result, re.IGNORECASE)
-            rationale_match = re.search(r"Rationale:\s*(.+)", cleaned_result, re.IGNORECASE | re.DOTALL)
+            score_match = EVALUATION_SCORE_PATTERN.search(cleaned_result)
+            rationale_match = EVALUATION_RATIONALE_PATTERN.search(cleaned_result)
             
             if score_match and rationale_match:
                 score = int(score_match.group(1).strip())
@@ -698,7 +1320,7 @@ These systems learn from our past prejudices and encode them into the future. Pr
                     return score, rationale_not_articulated
                 
                 # Fallback if only a number is present
-                single_number_match = re.match(r"^[1-3]$", cleaned_result)
+                single_number_match = EVALUATION_SINGLE_SCORE_PATTERN.match(cleaned_result)
                 if single_number_match:
                     score = int(single_number_match.group(0))
                     rationale_no_rationale = self.config.get('prompts', {}).get('evaluation', {}).get('rationale_no_rationale_provided', "No rationale provided (single number response).")
@@ -714,6 +1336,74 @@ These systems learn from our past prejudices and encode them into the future. Pr
             self.logger.error(f"Evaluation exception: {str(e)}. Raw output: {cleaned_result}")
             return 2, f"{rationale_exception_prefix} {str(e)}. Raw output: '{cleaned_result[:100]}...'"
 
+    def evaluate_response_depth_structured(self, question, response):
+        """Evaluate depth with schema-constrained JSON output, retrying once on invalid output"""
+        structured_settings = self.config.get('structured_evaluation', {})
+        evaluation_prompts = self.config.get('prompts', {}).get('evaluation', {})
+        max_retries = structured_settings.get('max_retries', 1)
+
+        prompt_template = evaluation_prompts.get('main_prompt',
+            "Evaluate this response. Score 1-3 and provide rationale.")
+        format_instructions = evaluation_prompts.get('structured_format_instructions',
+            'Respond with ONLY a JSON object: {"score": 1, 2 or 3, "rationale": "<one or two sentences>", '
+            '"comfort_zone_flags": ["<rehearsed phrases or themes the expert fell back on>"]}')
+        eval_prompt = prompt_template.format(question=question, response=response) + "\n\n" + format_instructions
+
+        options = {
+            "temperature": self.config.get('evaluation_llm_temperature', 0.1),
+            "num_predict": structured_settings.get('num_predict', 160)
+        }
+
+        raw_output = ""
+        for attempt in range(max_retries + 1):
+            prompt = eval_prompt
+            if attempt > 0:
+                self.evaluation_stats['retries'] += 1
+                prompt = eval_prompt + "\n\n" + evaluation_prompts.get('structured_retry_instruction',
+                    "Your previous reply did not match the required JSON format. Reply with the JSON object only.")
+
+            try:
+                result = self._make_llm_request(
+                    request_type="RESPONSE_EVALUATION",
+                    model=self._evaluation_model(),
+                    prompt=prompt,
+                    options=options,
+                    format=EVALUATION_RESPONSE_SCHEMA,
+                    routed=not self._degraded('small_evaluation_model')
+                )
+            except GenerationTimeout as e:
+                self.evaluation_stats['fallbacks'] += 1
+                self.last_evaluation = None
+                return self._timed_out_evaluation(e)
+            self.evaluation_stats['structured_calls'] += 1
+            raw_output = result['response']
+
+            try:
+                evaluation = parse_structured_evaluation(raw_output)
+            except ValueError as e:
+                self.evaluation_stats['parse_failures'] += 1
+                self.logger.warning(f"Structured evaluation failed validation (attempt {attempt + 1}/{max_retries + 1}): {e}")
+                continue
+
+            self.last_evaluation = evaluation
+            if evaluation['comfort_zone_flags']:
+                self.logger.info(f"Evaluator comfort zone flags: {evaluation['comfort_zone_flags']}")
+            self.logger.debug(f"Evaluation result: Score {evaluation['score']}, Rationale: {evaluation['rationale']}")
+            return evaluation['score'], evaluation['rationale']
+
+        # Every attempt failed validation; fall back to the default score
+        self.evaluation_stats['fallbacks'] += 1
+        self.last_evaluation = None
+        rationale_parsing_error_prefix = evaluation_prompts.get('rationale_parsing_error_prefix', "Default score due to parsing error. Raw output:")
+        return 2, f"{rationale_parsing_error_prefix} '{raw_output[:100]}...'"
+
+    def _timed_out_evaluation(self, error):
+        """The default score for an answer whose evaluation timed out even after degrading"""
+        self.logger.warning(f"Evaluation skipped: {error}")
+        rationale_timeout = self.config.get('prompts', {}).get('evaluation', {}).get('rationale_timeout', "Default score because the evaluation timed out.")
+        return 2, rationale_timeout
+
+    @traced()
     def generate_interview_conclusion(self, expert_name, topics_covered):
         """Generate a thoughtful conclusion to the interview"""
         
@@ -770,189 +1460,86 @@ These systems learn from our past prejudices and encode them into the future. Pr
         return self.clean_response(response['response'])
 
     def run_interview(self, expert_name, topics, max_exchanges=None):
-        """Run a complete interview with proper opening and conclusion"""
+        """Run a complete interview with proper opening and conclusion. Returns the transcript filename."""
         if max_exchanges is None:
             max_exchanges = self.config.get('interview', {}).get('max_exchanges', 15)
         
+        self.current_expert_name = expert_name
+        self.current_topics = list(topics)
+        interview_span = self.tracer.start_span("interview", expert=expert_name, topics=len(topics))
+        self.memory_profiler.start()
         self.logger.info(f"Starting interview with {expert_name}, max_exchanges: {max_exchanges}")
         self.logger.info(f"Topics to cover: {topics}")
+        self._emit("interview_started", expert=expert_name, topics=list(topics), max_exchanges=max_exchanges)
+        self.start_episode_audio()
+        self.start_latency_budget(topics, max_exchanges)
+        if self.topic_briefings is not None and self.config.get('topic_briefing', {}).get('ahead_of_time', True):
+            # Built in the background while the opening runs; each topic waits for its own bundle
+            self.topic_briefings.prepare(expert_name, topics)
         
         # Conduct interview opening
-        self.conduct_interview_opening(expert_name)
+        self._start_timed_exchange("Introduction")
+        try:
+            self.conduct_interview_opening(expert_name)
+        except GenerationTimeout as e:
+            self._report_skipped_exchange("the introduction", e)
         
         exchange_count = 1  # We've already done the opening exchange
         max_follow_ups = self.config.get('interview', {}).get('max_follow_ups_per_response', 2)
         min_topic_depth_for_early_conclusion = self.config.get('interview', {}).get('min_topic_depth_before_early_conclusion', 0)
+        # One exchange is the opening and one is reserved for the conclusion
+        scheduler = self.create_scheduler(topics, max(max_exchanges - 2, 0), max_follow_ups)
+        self._finish_timed_exchange(scheduler)
+        topic_threads = {}  # topic -> state of the conversation on it (span, latest question and answer)
         topics_covered_count = 0
 
-        for i, topic in enumerate(topics):
-            # Wrap-up Management: Check if max_exchanges is nearly reached
-            if exchange_count >= max_exchanges - 1: # Reserve 1 for conclusion
-                self.logger.warning(f"Max exchanges ({max_exchanges}) nearly reached. Proceeding to conclusion before starting new topic '{topic}'.")
+        while True:
+            action = scheduler.next_action()
+            finished_topics = scheduler.finished_topics()
+            for finished_topic in finished_topics:
+                self._complete_topic(finished_topic, topic_threads[finished_topic], scheduler.progress[finished_topic].follow_ups)
+                topics_covered_count += 1
+            # A speculative follow-up is only kept for the exchange it was generated for
+            self._discard_speculations(topic_threads, keep=action[1] if action and action[0] == "follow_up" else None)
+            if action is None:
+                break
+            # Optional: When a topic completes, conclude early if every topic is open and meets the minimum depth
+            if min_topic_depth_for_early_conclusion > 0 and finished_topics and len(topic_threads) == len(topics) and \
+                    all(self.topic_depth_scores.get(t, 0) >= min_topic_depth_for_early_conclusion for t in topics):
+                self.logger.info(f"All {len(topics)} topics covered and met minimum depth of {min_topic_depth_for_early_conclusion}. Concluding interview early.")
+                self._discard_speculations(topic_threads)
                 break
-                
-            self.logger.info(f"Starting topic {i+1}/{len(topics)}: {topic} (Exchange {exchange_count}/{max_exchanges})")
-            print(f"\n📋 TOPIC: {topic}")
-            print("-" * 40)
-            
-            # Initial question
-            question = self.generate_host_question(topic)
-            print(f"\n🎤 HOST: {question}")
-            
-            # Expert response
-            response = self.generate_expert_response(
-                expert_name, 
-                question,
-                self.get_conversation_history()
-            )
-            print(f"\n👤 {expert_name.upper()}: {response}")
-            
-            # Check for comfort zone patterns
-            is_comfort_zone, comfort_patterns = self.detect_comfort_zone_patterns(response, expert_name)
-            if is_comfort_zone:
-                print(f"   [🚨 Comfort zone detected: {comfort_patterns[:2]}]")
-            
-            # Add to history
-            self.interview_history.append({
-                "speaker": "HOST",
-                "text": question,
-                "topic": topic
-            })
-            self.interview_history.append({
-                "speaker": expert_name,
-                "text": response,
-                "topic": topic
-            })
-            
-            exchange_count += 1
-            
-            # Evaluate and follow up
-            current_depth, rationale = self.evaluate_response_depth(question, response)
-            follow_ups = 0
-            last_follow_up = None # Stores the question that led to the current response
-            best_depth_for_topic = current_depth # Tracks the max depth achieved for this specific topic
-            
-            depth_description = 'Shallow' if current_depth == 1 else ('Moderate' if current_depth == 2 else 'Profound')
-            print(f"\n💭 [Initial Response depth: {depth_description}. Rationale: {rationale}]")
-            self.logger.info(f"Topic '{topic}' initial response depth: {current_depth} ({depth_description})")
-
-            # Follow-up loop
-            while current_depth < 3 and follow_ups < max_follow_ups and exchange_count < max_exchanges - 1: # Reserve 1 for conclusion
-                previous_depth = current_depth
-                self.logger.info(f"Generating follow-up {follow_ups + 1}/{max_follow_ups} for topic '{topic}' (Exchange {exchange_count +1})")
-                print(f"   [Pushing deeper... Previous depth: {previous_depth}]")
-                
-                # Generate follow-up (this is 'question' for the next turn)
-                follow_up = self.generate_host_question(
-                    topic,
-                    self.get_conversation_history(),
-                    is_followup=True,
-                    expert_response_text=response
-                )
-                current_follow_up_question = self.generate_host_question(
-                    topic,
-                    self.get_conversation_history(),
-                    is_followup=True,
-                    expert_response_text=response # Pass current expert response to inform follow-up
-                )
-                last_follow_up = current_follow_up_question # This is the question that will be evaluated
-                print(f"\n🎤 HOST: {current_follow_up_question}")
-                
-                # Expert response to follow-up
-                current_expert_response_to_follow_up = self.generate_expert_response(
-                    expert_name,
-                    current_follow_up_question,
-                    self.get_conversation_history()
-                )
-                response = current_expert_response_to_follow_up # Update response for next iteration / saving
-                print(f"\n👤 {expert_name.upper()}: {response}")
-                
-                # Check for comfort zone patterns again
-                is_comfort_zone, comfort_patterns = self.detect_comfort_zone_patterns(response, expert_name)
-                if is_comfort_zone:
-                    print(f"   [🚨 Retreating to comfort zone: {comfort_patterns[:2]}]")
-                
-                # Add to history
-                self.interview_history.append({
-                    "speaker": "HOST",
-                    "text": current_follow_up_question,
-                    "topic": topic
-                })
-                self.interview_history.append({
-                    "speaker": expert_name,
-                    "text": response,
-                    "topic": topic
-                })
-                
-                exchange_count += 1
-                follow_ups += 1
-                
-                # Re-evaluate
-                new_depth, rationale = self.evaluate_response_depth(current_follow_up_question, response)
-                current_depth = new_depth # Update current_depth for the while loop condition
-                best_depth_for_topic = max(best_depth_for_topic, current_depth)
-                
-                depth_description = 'Shallow' if current_depth == 1 else ('Moderate' if current_depth == 2 else 'Profound')
-                print(f"\n💭 [Follow-up Response depth: {current_depth}. Rationale: {rationale}]")
-                self.logger.info(f"Follow-up {follow_ups} for topic '{topic}' achieved depth: {current_depth} ({depth_description})")
-
-                # Breakthrough Recognition
-                if (current_depth > previous_depth + 1) or \
-                   (current_depth == 3 and previous_depth < 3):
-                    self.logger.info(f"Potential breakthrough on topic '{topic}': Depth improved from {previous_depth} to {current_depth} after follow-up: '{current_follow_up_question[:100]}...'")
-                    self.potential_breakthroughs.append({
-                        "topic": topic,
-                        "improvement": (previous_depth, current_depth),
-                        "question": current_follow_up_question,
-                        "response": response,
-                        "rationale": rationale
-                    })
-            
-            # Record the best depth achieved for this topic
-            self.topic_depth_scores[topic] = best_depth_for_topic
-            topics_covered_count +=1
-
-            # Save successful challenging patterns to host knowledge
-            if best_depth_for_topic == 3 and last_follow_up: 
-                host_knowledge_config = self.config.get('host_ai_settings', {}).get('host_knowledge', {})
-                pattern_id_prefix = host_knowledge_config.get('pattern_id_prefix', "pattern_")
-                
-                pattern_document_string = f"""Successful Pattern:
-Topic: {topic}
-Question: {last_follow_up}
-Expert Response: {response}
-Evaluation: Score {best_depth_for_topic} - {rationale}"""
 
-                pattern_id = f"{pattern_id_prefix}{len(self.interview_history)}_{topic.replace(' ', '_').replace('/', '_')}" # Sanitize topic for ID
-                
-                try:
-                    self.host_collection.upsert(
-                        ids=[pattern_id],
-                        documents=[pattern_document_string],
-                        metadatas=[{
-                            "type": "successful_pattern_context", 
-                            "topic": topic, 
-                            "depth_achieved": best_depth_for_topic,
-                            "timestamp": datetime.now().isoformat()
-                        }]
-                    )
-                    self.logger.info(f"Saved successful questioning pattern to host knowledge. ID: {pattern_id}, Topic: '{topic}', Depth: {best_depth_for_topic}")
-                    self.logger.debug(f"Pattern details: {pattern_document_string}")
-                except Exception as e:
-                    self.logger.error(f"Failed to upsert successful pattern (ID: {pattern_id}) to host_collection: {e}")
+            kind, topic = action
+            self._start_timed_exchange(topic)
+            # Speculate only if this topic could get another follow-up after this exchange
+            follow_ups_after = scheduler.progress[topic].follow_ups + (kind == "follow_up")
+            speculate = self.speculation_enabled and scheduler.remaining > 1 and follow_ups_after < scheduler.max_follow_ups
+            try:
+                if kind == "open":
+                    self.logger.info(f"Starting topic {topics.index(topic) + 1}/{len(topics)}: {topic} (Exchange {exchange_count}/{max_exchanges})")
+                    topic_threads[topic] = self._open_topic(expert_name, topic, exchange_count, speculate=speculate)
+                else:
+                    follow_up_number = scheduler.progress[topic].follow_ups + 1
+                    self.logger.info(f"Generating follow-up {follow_up_number}/{max_follow_ups} for topic '{topic}' (Exchange {exchange_count + 1})")
+                    self._follow_up_topic(expert_name, topic, topic_threads[topic], exchange_count, follow_up_number, speculate=speculate)
+            except GenerationTimeout as e:
+                # The topic gets no more exchanges; the time spent still counts against the budget
+                self._report_skipped_exchange(f"topic '{topic}'", e)
+                scheduler.skip(topic)
+                self._finish_timed_exchange(scheduler)
+                continue
+            exchange_count += 1
+            self._memory_checkpoint(f"exchange {exchange_count}")
+            scheduler.record(topic, topic_threads[topic]["depth"])
+            self._finish_timed_exchange(scheduler)
 
-            self.logger.info(f"Completed topic '{topic}' after {follow_ups} follow-up(s), best depth achieved: {best_depth_for_topic}")
-            
-            # Optional: Check for early conclusion if min depth met for all topics covered so far
-            if min_topic_depth_for_early_conclusion > 0 and topics_covered_count == len(topics):
-                all_topics_met_min_depth = True
-                for t in topics:
-                    if self.topic_depth_scores.get(t, 0) < min_topic_depth_for_early_conclusion:
-                        all_topics_met_min_depth = False
-                        break
-                if all_topics_met_min_depth:
-                    self.logger.info(f"All {len(topics)} topics covered and met minimum depth of {min_topic_depth_for_early_conclusion}. Concluding interview early.")
-                    break # Break topic loop to go to conclusion
+        for finished_topic in scheduler.finish_all():
+            self._complete_topic(finished_topic, topic_threads[finished_topic], scheduler.progress[finished_topic].follow_ups)
+            topics_covered_count += 1
+        unopened = [t for t in topics if t not in topic_threads]
+        if unopened:
+            self.logger.warning(f"Max exchanges ({max_exchanges}) nearly reached. Proceeding to conclusion without starting topic(s): {unopened}.")
 
         # After loop completion (natural or break)
         if topics_covered_count == len(topics):
@@ -961,12 +1548,20 @@ Evaluation: Score {best_depth_for_topic} - {rationale}"""
             self.logger.info(f"Interview concluded after covering {topics_covered_count}/{len(topics)} topics.")
             
         # Generate and deliver conclusion
+        self.current_topic = None
         print(f"\n{'═' * 60}")
         print("🎯 THE RECURSIVE: Final Analysis")
         print("═" * 60)
         
-        conclusion = self.generate_interview_conclusion(expert_name, topics)
+        try:
+            conclusion = self.generate_interview_conclusion(expert_name, topics)
+        except GenerationTimeout as e:
+            self._report_skipped_exchange("the conclusion", e)
+            conclusion = self.config.get('prompts', {}).get('interview_conclusion', {}).get('timeout_fallback',
+                "That's all the time we have. Thank you for letting us push past the comfortable answers.")
         print(f"\n🎤 HOST: {conclusion}")
+        self._speak("HOST", conclusion)
+        self._emit("conclusion", text=conclusion)
         
         # Add conclusion to history
         self.interview_history.append({
@@ -982,7 +1577,451 @@ Evaluation: Score {best_depth_for_topic} - {rationale}"""
         self.logger.info(f"Interview completed. Total exchanges: {len(self.interview_history)}")
         self.logger.info(f"Comfort zone patterns detected: {len(set(self.comfort_zone_patterns))}")
         self.logger.info(f"Topic depth scores: {self.topic_depth_scores}")
-        self.save_transcript()
+        if self._retrieval_cache is not None:
+            self.logger.info(f"Retrieval cache: {self._retrieval_cache.report()}")
+        if self._model_router is not None:
+            self.logger.info(f"Model routing: {json.dumps(self._model_router.report())}")
+        if self.speculation_enabled:
+            self.logger.info(f"Speculative follow-ups: {self.speculation_report()}")
+        if self._topic_briefings is not None:
+            self.logger.info(f"Topic briefings: {self._topic_briefings.report()}")
+        if self.config.get('single_flight', {}).get('enabled', False):
+            self.logger.info(f"Shared in-flight calls: {self.single_flight_report()}")
+        if self._pattern_library is not None:
+            self.logger.info(f"Pattern library: {self._pattern_library.report()}")
+        self.tracer.end_span(interview_span)
+        self._memory_checkpoint("interview")
+        self.finish_episode_audio()
+        self.flush_writes(self.config.get('write_behind', {}).get('shutdown_timeout_seconds', 30))
+        if self._write_buffer is not None:
+            self.logger.info(f"Write buffer: {self._write_buffer.report()}")
+        self.save_pattern_library()
+        transcript_filename = self.save_transcript()
+        self.export_trace(transcript_filename)
+        self._emit("interview_completed", transcript=transcript_filename, topic_depth_scores=dict(self.topic_depth_scores))
+        return transcript_filename
+
+    def create_scheduler(self, topics, budget, max_follow_ups):
+        """Scheduler that decides which topic gets each of the `budget` topic exchanges (see exchange_scheduler.py)"""
+        settings = self.config.get('scheduling', {})
+        strategy = settings.get('strategy', 'sequential')
+        if strategy == 'adaptive':
+            return AdaptiveScheduler(topics, budget, max_follow_ups, priors=self.load_depth_gain_priors(),
+                                     min_expected_gain=settings.get('min_expected_gain', 0.15),
+                                     live_weight=settings.get('prior_weight', 1.0))
+        if strategy != 'sequential':
+            self.logger.warning(f"Unknown scheduling strategy '{strategy}'; using sequential")
+        return SequentialScheduler(topics, budget, max_follow_ups)
+
+    def load_depth_gain_priors(self):
+        """Depth gain per follow-up learned from the transcript archive, or the configured defaults without one"""
+        settings = self.config.get('scheduling', {})
+        options = {'default_gain_by_depth': settings.get('default_gain_by_depth'),
+                   'topic_weight': settings.get('topic_prior_weight', 3.0)}
+        store_path = self.config.get('transcript_store', {}).get('path', "./transcripts.db")
+        if not settings.get('learn_from_archive', True) or not os.path.exists(store_path):
+            return DepthGainPriors(**options)
+        try:
+            from transcript_store import TranscriptStore
+            with TranscriptStore(store_path) as store:
+                priors = DepthGainPriors.from_transcript_store(store, expert=self.current_expert_name, **options)
+            self.logger.info(f"Loaded {priors.sample_count()} archived follow-up outcomes for scheduling")
+            return priors
+        except Exception as e:
+            self.logger.error(f"Failed to load scheduling priors from {store_path}: {e}")
+            return DepthGainPriors(**options)
+
+    def start_latency_budget(self, topics, max_exchanges):
+        settings = self.config.get('latency_budget', {})
+        self.latency_budget = None
+        if not settings.get('enabled', False):
+            return
+        from latency_budget import LatencyBudget
+        self.latency_budget = LatencyBudget.from_config(settings)
+        self.latency_budget.start_interview(len(topics), max_exchanges)
+        self.logger.info(f"Latency budget: {self.latency_budget.interview_seconds}s for the interview, "
+                         f"{self.latency_budget.topic_seconds:.0f}s per topic, {self.latency_budget.exchange_seconds:.0f}s per exchange")
+
+    def _degraded(self, step):
+        """Whether the running interview has fallen far enough behind to switch on a degradation step"""
+        return self.latency_budget is not None and self.latency_budget.active(step)
+
+    @property
+    def model_router(self):
+        """Per-request-type model cascades, or None when model_routing.enabled is off"""
+        settings = self.config.get('model_routing', {})
+        if self._model_router is None and settings.get('enabled', False):
+            from model_router import ModelRouter
+            self._model_router = ModelRouter.from_config(settings)
+        return self._model_router
+
+    def _evaluation_model(self):
+        if self._degraded('small_evaluation_model'):
+            return self.config.get('latency_budget', {}).get('degraded_evaluation_model', "qwen3:1.7b")
+        return self.config.get('evaluation_llm_model', 'qwen3:4b')
+
+    def _start_timed_exchange(self, topic):
+        if self.latency_budget is not None:
+            self.latency_budget.start_exchange(topic)
+
+    def _finish_timed_exchange(self, scheduler):
+        if self.latency_budget is None:
+            return
+        remaining = scheduler.remaining
+        if self._degraded('cut_follow_ups'):
+            remaining = min(remaining, sum(1 for progress in scheduler.progress.values() if not progress.opened))
+        step = self.latency_budget.finish_exchange(remaining)
+        if step is not None:
+            self._announce_degradation(step)
+        # Also catches cut_follow_ups switched on by a request timeout during the exchange
+        if self._degraded('cut_follow_ups'):
+            scheduler.max_follow_ups = 0
+
+    def _announce_degradation(self, step):
+        degradation = self.latency_budget.degradations[-1]
+        print(f"   [⏱️ Behind schedule, degrading: {step}]")
+        self.logger.warning(f"Latency budget: switched on '{step}' because {degradation['reason']}")
+        self._emit("degradation", **degradation)
+
+    def _report_skipped_exchange(self, what, error):
+        print(f"   [⏱️ Timed out again after degrading; skipping {what}]")
+        self.logger.error(f"Skipping {what}: {error}")
+
+    def _record_exchange(self, expert_name, topic, question, response, follow_up):
+        """Add one host question and expert answer to the history and return the comfort zone phrases found"""
+        is_comfort_zone, comfort_patterns = self.detect_comfort_zone_patterns(response, expert_name)
+        if is_comfort_zone:
+            label = "Retreating to comfort zone" if follow_up else "Comfort zone detected"
+            print(f"   [🚨 {label}: {comfort_patterns[:2]}]")
+        self.interview_history.append({
+            "speaker": "HOST",
+            "text": question,
+            "topic": topic
+        })
+        self.interview_history.append({
+            "speaker": expert_name,
+            "text": response,
+            "topic": topic,
+            "comfort_zone_phrases": comfort_patterns
+        })
+        self._emit("exchange", topic=topic, question=question, response=response, follow_up=follow_up,
+                   comfort_zone_phrases=list(comfort_patterns))
+        return comfort_patterns
+
+    def _open_topic(self, expert_name, topic, exchange_count, speculate=False):
+        """Ask a topic's initial question and return the thread state later follow-ups build on"""
+        print(f"\n📋 TOPIC: {topic}")
+        print("-" * 40)
+        thread = {"span": self.tracer.start_span("topic", topic=topic), "last_follow_up": None}
+        self.current_topic = topic
+        self._brief_topic(expert_name, topic)
+        exchange_span = self.tracer.start_span("exchange", number=exchange_count + 1, follow_up=False)
+
+        try:
+            question = self.generate_host_question(topic)
+            print(f"\n🎤 HOST: {question}")
+            self._speak("HOST", question)
+            response = self.generate_expert_response(expert_name, question, self.get_conversation_history())
+        except GenerationTimeout:
+            self.tracer.end_span(exchange_span)
+            self.tracer.end_span(thread["span"])
+            raise
+        print(f"\n👤 {expert_name.upper()}: {response}")
+        self._record_exchange(expert_name, topic, question, response, follow_up=False)
+        speculation = self._speculate_follow_up(topic, response) if speculate else None
+
+        depth, rationale = self.evaluate_response_depth(question, response)
+        self.interview_history[-1]["depth"] = depth
+        thread.update(response=response, rationale=rationale, depth=depth, speculation=speculation)
+        if self.model_router is not None:
+            self.model_router.record_depth(topic, depth)
+        self.topic_depth_scores[topic] = depth
+
+        depth_description = 'Shallow' if depth == 1 else ('Moderate' if depth == 2 else 'Profound')
+        print(f"\n💭 [Initial Response depth: {depth_description}. Rationale: {rationale}]")
+        self.logger.info(f"Topic '{topic}' initial response depth: {depth} ({depth_description})")
+        self._emit("evaluation", topic=topic, depth=depth, rationale=rationale, follow_up=False)
+        exchange_span.set(depth=depth)
+        self.tracer.end_span(exchange_span)
+        return thread
+
+    def _follow_up_topic(self, expert_name, topic, thread, exchange_count, follow_up_number, speculate=False):
+        """Push deeper on a topic with one follow-up question, updating its thread state"""
+        previous_depth = thread["depth"]
+        self.current_topic = topic
+        exchange_span = self.tracer.start_span("exchange", number=exchange_count + 1, follow_up=True)
+        print(f"   [Pushing deeper... Previous depth: {previous_depth}]")
+
+        try:
+            question = self._take_speculative_follow_up(topic, thread)
+            if question is None:
+                question = self.generate_host_question(
+                    topic,
+                    self.get_conversation_history(),
+                    is_followup=True,
+                    expert_response_text=thread["response"]  # The answer being followed up
+                )
+            print(f"\n🎤 HOST: {question}")
+            self._speak("HOST", question)
+            response = self.generate_expert_response(expert_name, question, self.get_conversation_history())
+        except GenerationTimeout:
+            self.tracer.end_span(exchange_span)
+            raise
+        print(f"\n👤 {expert_name.upper()}: {response}")
+        self._record_exchange(expert_name, topic, question, response, follow_up=True)
+        speculation = self._speculate_follow_up(topic, response) if speculate else None
+
+        depth, rationale = self.evaluate_response_depth(question, response)
+        self.interview_history[-1]["depth"] = depth
+        thread.update(response=response, rationale=rationale, depth=depth, last_follow_up=question, speculation=speculation)
+        if self.model_router is not None:
+            self.model_router.record_depth(topic, depth)
+        self.topic_depth_scores[topic] = max(self.topic_depth_scores.get(topic, 0), depth)
+
+        depth_description = 'Shallow' if depth == 1 else ('Moderate' if depth == 2 else 'Profound')
+        print(f"\n💭 [Follow-up Response depth: {depth}. Rationale: {rationale}]")
+        self.logger.info(f"Follow-up {follow_up_number} for topic '{topic}' achieved depth: {depth} ({depth_description})")
+        self._emit("evaluation", topic=topic, depth=depth, rationale=rationale, follow_up=True)
+
+        # Breakthrough Recognition
+        if (depth > previous_depth + 1) or (depth == 3 and previous_depth < 3):
+            self.logger.info(f"Potential breakthrough on topic '{topic}': Depth improved from {previous_depth} to {depth} after follow-up: '{question[:100]}...'")
+            self.interview_history[-1]["breakthrough"] = True
+            self.potential_breakthroughs.append({
+                "topic": topic,
+                "improvement": (previous_depth, depth),
+                "question": question,
+                "response": response[:BREAKTHROUGH_PREVIEW_CHARS] if self.compact_state else response,
+                "rationale": rationale
+            })
+            self._emit("breakthrough", topic=topic, improvement=[previous_depth, depth], question=question)
+        exchange_span.set(depth=depth)
+        self.tracer.end_span(exchange_span)
+
+    @property
+    def speculation_enabled(self):
+        return self.config.get('speculation', {}).get('enabled', False)
+
+    def _follow_up_tier(self, topic):
+        router = self.model_router
+        if router is None or router.cascade("HOST_FOLLOWUP_QUESTION") is None:
+            return None
+        return router.start_tier("HOST_FOLLOWUP_QUESTION", topic)
+
+    def _speculate_follow_up(self, topic, response):
+        """Start generating the follow-up to `response` in the background, before its evaluation is known.
+
+        The question is built exactly as _follow_up_topic would build it; nothing is printed, spoken or
+        added to the history until the scheduler actually asks for that follow-up.
+        """
+        history = self.get_conversation_history()
+        started = time.perf_counter()
+
+        def generate():
+            question = self.generate_host_question(topic, history, is_followup=True, expert_response_text=response)
+            return question, time.perf_counter()
+
+        if self._speculation_executor is None:
+            self._speculation_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculation")
+        future = self._speculation_executor.submit(generate)
+        with self._speculation_lock:
+            self.speculation_stats['started'] += 1
+        return {"future": future, "started": started, "tier": self._follow_up_tier(topic)}
+
+    def _take_speculative_follow_up(self, topic, thread):
+        """The speculative follow-up generated for the thread's latest answer, or None to generate one now"""
+        speculation = thread.pop("speculation", None)
+        if speculation is None:
+            return None
+        if self._follow_up_tier(topic) != speculation["tier"]:
+            # The evaluation moved the topic to another model tier; the draft came from the wrong model
+            self._discard_speculation(speculation)
+            return None
+        needed_at = time.perf_counter()
+        try:
+            question, finished = speculation["future"].result()
+        except Exception as e:
+            self.logger.error(f"Speculative follow-up for '{topic}' failed: {e}")
+            with self._speculation_lock:
+                self.speculation_stats['failed'] += 1
+            return None
+        # Saved: the part of the generation that ran while the evaluation did
+        saved = min(needed_at, finished) - speculation["started"]
+        with self._speculation_lock:
+            self.speculation_stats['used'] += 1
+            self.speculation_stats['seconds_saved'] += saved
+        self.logger.info(f"Using speculative follow-up for '{topic}' ({saved:.2f}s saved)")
+        return question
+
+    def _discard_speculation(self, speculation):
+        def count_waste(future):
+            # A request already sent can't be recalled; its time is wasted once it finishes
+            if future.exception() is None:
+                with self._speculation_lock:
+                    self.speculation_stats['seconds_wasted'] += future.result()[1] - speculation["started"]
+
+        with self._speculation_lock:
+            self.speculation_stats['discarded'] += 1
+        speculation["future"].add_done_callback(count_waste)
+
+    def _discard_speculations(self, topic_threads, keep=None):
+        """Drop speculative follow-ups for every topic except `keep` (the one about to be followed up)"""
+        for topic, thread in topic_threads.items():
+            if topic != keep and thread.get("speculation") is not None:
+                self._discard_speculation(thread.pop("speculation"))
+
+    def speculation_report(self):
+        with self._speculation_lock:
+            stats = dict(self.speculation_stats)
+        stats['seconds_saved'] = round(stats['seconds_saved'], 3)
+        stats['seconds_wasted'] = round(stats['seconds_wasted'], 3)
+        return stats
+
+    def _complete_topic(self, topic, thread, follow_ups):
+        """Record a topic the scheduler has finished with and save its questioning pattern if it reached depth 3"""
+        best_depth_for_topic = self.topic_depth_scores.get(topic, thread["depth"])
+        last_follow_up = thread["last_follow_up"]
+
+        # Save successful challenging patterns to host knowledge
+        if best_depth_for_topic == 3 and last_follow_up:
+            host_knowledge_config = self.config.get('host_ai_settings', {}).get('host_knowledge', {})
+            pattern_id_prefix = host_knowledge_config.get('pattern_id_prefix', "pattern_")
+            
+            pattern_document_string = f"""Successful Pattern:
+Topic: {topic}
+Question: {last_follow_up}
+Expert Response: {thread["response"]}
+Evaluation: Score {best_depth_for_topic} - {thread["rationale"]}"""
+
+            pattern_id = f"{pattern_id_prefix}{len(self.interview_history)}_{topic.replace(' ', '_').replace('/', '_')}" # Sanitize topic for ID
+            
+            try:
+                self._upsert(
+                    self.host_collection,
+                    ids=[pattern_id],
+                    documents=[pattern_document_string],
+                    metadatas=[{
+                        "type": "successful_pattern_context", 
+                        "topic": topic, 
+                        "depth_achieved": best_depth_for_topic,
+                        "timestamp": datetime.now().isoformat()
+                    }]
+                )
+                self.logger.info(f"Saved successful questioning pattern to host knowledge. ID: {pattern_id}, Topic: '{topic}', Depth: {best_depth_for_topic}")
+                self.logger.debug(f"Pattern details: {pattern_document_string}")
+                if self.config.get('pattern_selection', {}).get('enabled', False):
+                    self._add_learned_pattern(pattern_id, pattern_document_string)
+            except Exception as e:
+                self.logger.error(f"Failed to upsert successful pattern (ID: {pattern_id}) to host_collection: {e}")
+
+        self.logger.info(f"Completed topic '{topic}' after {follow_ups} follow-up(s), best depth achieved: {best_depth_for_topic}")
+        thread["span"].set(best_depth=best_depth_for_topic, follow_ups=follow_ups)
+        self._emit("topic_completed", topic=topic, best_depth=best_depth_for_topic, follow_ups=follow_ups)
+        self.tracer.end_span(thread["span"])
+
+    @property
+    def speech_pipeline(self):
+        """TTS worker pool and clip cache, created on first use (see speech_pipeline.py)"""
+        if self._speech_pipeline is None:
+            speech_pipeline = self._import_module('speech_pipeline')
+            self._speech_pipeline = speech_pipeline.SpeechPipeline.from_config(self.config.get('speech', {}))
+        return self._speech_pipeline
+
+    def _voice_for(self, speaker):
+        speech_settings = self.config.get('speech', {})
+        if speaker == "HOST":
+            return speech_settings.get('host_voice', "host")
+        return self.persona_registry.resolve(speaker).settings.get('voice', speech_settings.get('expert_voice', "expert"))
+
+    def _speak(self, speaker, text):
+        """Hand a complete line to the episode audio, if audio is being rendered"""
+        if self.episode_audio is not None and text:
+            self.episode_audio.say(self._voice_for(speaker), text)
+
+    def start_episode_audio(self):
+        speech_settings = self.config.get('speech', {})
+        self.audio_report = None
+        if not speech_settings.get('enabled', False):
+            return
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(speech_settings.get('output_directory', "./audio"),
+                                   f"{speech_settings.get('output_filename_prefix', 'episode_')}{timestamp}.wav")
+        try:
+            self.episode_audio = self.speech_pipeline.start_episode(output_path)
+            self.logger.info(f"Rendering episode audio to {output_path}")
+        except Exception as e:
+            self.logger.error(f"Failed to start episode audio: {e}")
+
+    def finish_episode_audio(self):
+        """Wait for the last sentences to be synthesized and finish the episode WAV"""
+        if self.episode_audio is None:
+            return
+        episode, self.episode_audio = self.episode_audio, None
+        start = time.perf_counter()
+        try:
+            self.audio_report = episode.close()
+        except Exception as e:
+            self.logger.error(f"Episode audio failed: {e}")
+            return
+        self.audio_report.update(self.speech_pipeline.stats)
+        self.logger.info(f"Episode audio finished {time.perf_counter() - start:.1f}s after the last exchange: {self.audio_report}")
+        print(f"🔊 Episode audio saved to {self.audio_report['path']} ({self.audio_report['duration_seconds']:.0f}s)")
+
+    def _emit(self, event_type, **data):
+        """Tell event listeners about interview progress; a failing listener never stops the interview"""
+        for listener in self.event_listeners:
+            try:
+                listener(event_type, data)
+            except Exception as e:
+                self.logger.error(f"Event listener failed on {event_type}: {e}")
+
+    def _memory_checkpoint(self, label):
+        record = self.memory_profiler.checkpoint(label)
+        if record:
+            self.logger.info(f"MEMORY - {format_record(record)}")
+
+    def reset_interview_state(self):
+        """Clear all per-interview state so one instance can run many interviews with flat memory use"""
+        if self.compact_state:
+            self.interview_history.clear()  # Also truncates the journal
+        else:
+            self.interview_history = []
+        self.follow_up_count = {}
+        self.topic_depth_scores = {}
+        self.comfort_zone_patterns = []
+        self.potential_breakthroughs = []
+        self.last_evaluation = None
+        self.evaluation_stats = {'structured_calls': 0, 'parse_failures': 0, 'retries': 0, 'fallbacks': 0}
+        self.speculation_stats = dict(EMPTY_SPECULATION_STATS)
+        with self._single_flight_lock:
+            self.single_flight_stats = {}
+        if self._topic_briefings is not None:
+            self._topic_briefings.clear()
+        if self._model_router is not None:
+            self._model_router.reset()  # Escalated tiers and routing stats belong to one interview
+        self.current_expert_name = None
+        self.current_topics = None
+        self.tracer.reset()
+        self.memory_profiler.reset()
+        self.logger.info("Interview state reset")
+
+    def export_trace(self, transcript_filename=None):
+        """Write the interview's spans as a Chrome trace-event file and log where the time went"""
+        if not self.tracer.enabled:
+            return None
+        tracing_settings = self.config.get('tracing', {})
+        base_name = os.path.splitext(os.path.basename(transcript_filename))[0] if transcript_filename else \
+            f"interview_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        trace_path = os.path.join(tracing_settings.get('output_directory', "./traces"), f"{base_name}.trace.json")
+        try:
+            self.tracer.export_chrome_trace(trace_path)
+        except OSError as e:
+            self.logger.error(f"Failed to write trace to {trace_path}: {e}")
+            return None
+        for name, total, count in self.tracer.summary()[:10]:
+            self.logger.info(f"TRACE - {name}: {total:.3f}s over {count} span(s)")
+        print(f"🔍 Trace saved to {trace_path} (open in https://ui.perfetto.dev)")
+        return trace_path
 
     def get_conversation_history(self, last_n=None):
         """Get recent conversation history"""
@@ -991,6 +2030,7 @@ Evaluation: Score {best_depth_for_topic} - {rationale}"""
         recent = self.interview_history[-last_n:] if len(self.interview_history) > last_n else self.interview_history
         return "\n".join([f"{exc['speaker']}: {exc['text']}" for exc in recent])
 
+    @traced()
     def save_transcript(self):
         """Save interview transcript with logging"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1000,14 +2040,19 @@ Evaluation: Score {best_depth_for_topic} - {rationale}"""
         
         transcript_data = {
             "timestamp": timestamp,
-            "interview": self.interview_history,
+            "interview": [dict(entry) for entry in self.interview_history],
             "metadata": {
                 "total_exchanges": len(self.interview_history),
-                "expert_name": self.config.get('default_expert_name', 'Unknown'),
-                "topics": self.config.get('default_topics', []),
+                "expert_name": getattr(self, 'current_expert_name', None) or self.config.get('default_expert_name', 'Unknown'),
+                "topics": getattr(self, 'current_topics', None) or self.config.get('default_topics', []),
                 "topic_depth_scores": self.topic_depth_scores,
                 "comfort_zone_patterns_detected": len(set(self.comfort_zone_patterns)),
                 "unique_comfort_phrases": list(set(self.comfort_zone_patterns)),
+                "evaluation_stats": self.evaluation_stats,
+                "potential_breakthroughs": [
+                    {key: bt[key] for key in ("topic", "improvement", "question", "rationale")}
+                    for bt in self.potential_breakthroughs
+                ],
                 "config_snapshot": {
                     "host_llm_model": self.config.get('host_llm_model'),
                     "expert_llm_model": self.config.get('expert_llm_model'),
@@ -1016,6 +2061,27 @@ Evaluation: Score {best_depth_for_topic} - {rationale}"""
             }
         }
         
+        if self.memory_profiler.enabled:
+            transcript_data["metadata"]["memory_report"] = self.memory_profiler.records
+        if self.audio_report:
+            transcript_data["metadata"]["audio"] = self.audio_report
+        if self._retrieval_cache is not None:
+            transcript_data["metadata"]["retrieval_cache"] = self._retrieval_cache.report()
+        if self.latency_budget is not None:
+            transcript_data["metadata"]["latency_budget"] = self.latency_budget.report()
+        if self._model_router is not None:
+            transcript_data["metadata"]["model_routing"] = self._model_router.report()
+        if self._write_buffer is not None:
+            transcript_data["metadata"]["write_behind"] = self._write_buffer.report()
+        if self.speculation_enabled:
+            transcript_data["metadata"]["speculation"] = self.speculation_report()
+        if self._topic_briefings is not None:
+            transcript_data["metadata"]["topic_briefing"] = self._topic_briefings.report()
+        if self.config.get('single_flight', {}).get('enabled', False):
+            transcript_data["metadata"]["single_flight"] = self.single_flight_report()
+        if self._pattern_library is not None:
+            transcript_data["metadata"]["pattern_selection"] = self._pattern_library.report()
+        
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(transcript_data, f, indent=2, ensure_ascii=False)
         
@@ -1023,25 +2089,95 @@ Evaluation: Score {best_depth_for_topic} - {rationale}"""
         self.logger.info(f"Interview transcript saved to {filename}")
         self.logger.info(f"Final interview statistics: {len(self.interview_history)} total exchanges")
 
+        # Index the transcript into the searchable archive
+        store_settings = self.config.get('transcript_store', {})
+        if store_settings.get('enabled', False) and store_settings.get('index_on_save', True):
+            try:
+                from transcript_store import TranscriptStore
+                with TranscriptStore(store_settings.get('path', "./transcripts.db")) as store:
+                    stored = store.add_transcript(transcript_data, os.path.abspath(filename))
+                self.logger.info(f"Indexed {stored} utterances from {filename} into transcript store")
+            except Exception as e:
+                self.logger.error(f"Failed to index transcript {filename} into transcript store: {e}")
+
+        return filename
+
+def parse_structured_evaluation(raw_output):
+    """Parse and validate evaluator JSON. Raises ValueError if it does not match EVALUATION_RESPONSE_SCHEMA."""
+    text = strip_think_blocks(raw_output or "").strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {e}")
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+
+    score = data.get('score')
+    if isinstance(score, bool) or not isinstance(score, int) or score not in (1, 2, 3):
+        raise ValueError(f"score must be 1, 2 or 3, got {score!r}")
+
+    rationale = data.get('rationale')
+    if not isinstance(rationale, str) or not rationale.strip():
+        raise ValueError("rationale must be a non-empty string")
+
+    if 'comfort_zone_flags' not in data:
+        raise ValueError("comfort_zone_flags is required (an empty list when there are none)")
+    flags = data['comfort_zone_flags']
+    if not isinstance(flags, list) or not all(isinstance(flag, str) for flag in flags):
+        raise ValueError("comfort_zone_flags must be a list of strings")
+
+    return {"score": score, "rationale": rationale.strip(), "comfort_zone_flags": flags}
+
+MODULE_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED_AT
+
+def print_startup_profile(system, init_seconds, setup_seconds):
+    """Report where startup time went"""
+    print("\n⏱️  Startup profile")
+    print(f"   {'import interview_system':<40} {MODULE_IMPORT_SECONDS:>8.3f}s")
+    print(f"   {'RecursiveInterviewSystem()':<40} {init_seconds:>8.3f}s")
+    for step, seconds in list(system.startup_timings):
+        print(f"     {step:<38} {seconds:>8.3f}s")
+    print(f"   {'setup_expert()':<40} {setup_seconds:>8.3f}s")
+
 def main():
+    parser = argparse.ArgumentParser(description="Run an interview on The Recursive.")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Report import, initialization and model warm-up time, then exit")
+    args = parser.parse_args()
+
     # Initialize system
     print("🚀 Initializing The Recursive Interview System...")
+    init_start = time.perf_counter()
     try:
         system = RecursiveInterviewSystem()
+        if args.profile_startup:
+            system.open_backends()  # Measure backend startup even in lazy mode
     except Exception as e:
         print(f"❌ Failed to initialize system: {e}")
         sys.exit(1)
+    init_seconds = time.perf_counter() - init_start
+
+    # Start loading models while the expert knowledge base is prepared
+    warm_up_thread = system.start_model_warm_up()
     
-    # Setup MLK expert
+    # Make sure the expert's knowledge is loaded
+    expert_name_to_run = system.config.get('default_expert_name', "Martin Luther King Jr.")
+    setup_start = time.perf_counter()
     try:
-        system.setup_mlk_expert()
+        system.setup_expert(expert_name_to_run)
     except Exception as e:
-        system.logger.error(f"Failed to setup MLK expert: {e}")
+        system.logger.error(f"Failed to setup expert {expert_name_to_run}: {e}")
         print(f"❌ Failed to setup expert: {e}")
         sys.exit(1)
+    setup_seconds = time.perf_counter() - setup_start
+
+    if args.profile_startup:
+        if warm_up_thread:
+            warm_up_thread.join()
+        print_startup_profile(system, init_seconds, setup_seconds)
+        return
     
     # Run interview with configurable defaults
-    expert_name_to_run = system.config.get('default_expert_name', "Martin Luther King Jr.")
     topics_to_run = system.config.get('default_topics', [
         "AI bias and algorithmic justice",
         "The evolution of nonviolence in the digital age",
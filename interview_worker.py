@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+#
+# Interview Worker
+# ================
+# Pulls interview jobs from a shared queue and runs them, renewing the
+# job's lease with heartbeats while the interview runs. Start one of these
+# on every box that has Ollama capacity; throughput then grows with the
+# number of boxes instead of with how carefully topics are split by hand.
+#
+# Two ways to reach the queue:
+#   --coordinator URL   the interview service (interview_service.py) on one
+#                       box hands out jobs over HTTP and collects every
+#                       transcript into its own archive (recommended)
+#   --queue PATH        open a job_queue SQLite file on shared storage
+#                       directly; transcripts go to --transcripts, which
+#                       should be shared storage too
+#
+# Each worker thread uses the local config.yaml (so the local Ollama and
+# ChromaDB) with the job's overrides applied. A worker that can't renew its
+# lease keeps the interview running but stops publishing its events, and
+# its result is discarded; the job has already been handed to another
+# worker.
+#
+# Usage:
+#   python interview_worker.py --coordinator http://studio-box:8765 --threads 2 --token $RECURSIVE_WORKER_TOKEN
+#   python interview_worker.py --queue /mnt/shared/jobs.db --transcripts /mnt/shared/transcripts
+#
+
+import argparse
+import copy
+import json
+import os
+import socket
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+
+import yaml
+
+from job_queue import JobQueue
+
+
+def deep_merge(base, overrides):
+    """Return base with overrides applied recursively (dicts merge, everything else replaces)"""
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def default_system_factory(config):
+    from interview_system import RecursiveInterviewSystem
+    return RecursiveInterviewSystem(config=config)
+
+
+class CoordinatorClient:
+    """The JobQueue calls a worker needs, made over HTTP against interview_service.py"""
+
+    def __init__(self, url, token=None, timeout=30):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+
+    def _post(self, path, payload):
+        request = urllib.request.Request(self.url + path, data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                                         method="POST", headers={"Content-Type": "application/json"})
+        if self.token:
+            request.add_header("X-Worker-Token", self.token)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                return response.status, json.loads(body) if body else None
+        except urllib.error.HTTPError as e:
+            if e.code == 409:
+                return 409, None
+            raise
+
+    def claim(self, worker):
+        status, job = self._post("/leases", {"worker": worker})
+        return job if status == 200 else None
+
+    def heartbeat(self, job_id, worker):
+        return self._post(f"/jobs/{job_id}/heartbeat", {"worker": worker})[0] == 200
+
+    def add_event(self, job_id, event_type, data, worker=None):
+        """Returns None (like JobQueue.add_event) when the coordinator rejects the event because the lease was lost"""
+        status, _ = self._post(f"/jobs/{job_id}/events", {"worker": worker, "type": event_type, "data": data})
+        return None if status == 409 else True
+
+    def complete(self, job_id, transcript_path, worker=None):
+        """Upload the transcript so the coordinator can archive it"""
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            transcript = json.load(f)
+        payload = {"worker": worker, "filename": os.path.basename(transcript_path), "transcript": transcript}
+        return self._post(f"/jobs/{job_id}/complete", payload)[0] == 200
+
+    def fail(self, job_id, error, worker=None):
+        return self._post(f"/jobs/{job_id}/fail", {"worker": worker, "error": error})[0] == 200
+
+
+class InterviewWorker:
+    """Claims jobs from a JobQueue or CoordinatorClient and runs them one at a time"""
+
+    def __init__(self, name, queue, config, system_factory=default_system_factory, transcript_directory="./transcripts",
+                 heartbeat_seconds=30, on_event=None):
+        self.name = name
+        self.queue = queue
+        self.config = config
+        self.system_factory = system_factory
+        self.transcript_directory = transcript_directory
+        self.heartbeat_seconds = heartbeat_seconds
+        self.on_event = on_event  # Called after each event is recorded (the service wakes its event streams)
+        self.logger = None
+        self._lost_leases = set()  # Jobs this worker is still running but no longer holds the lease on
+
+    def job_config(self, job):
+        config = deep_merge(self.config, job['overrides'])
+        config['transcript_filename_prefix'] = os.path.join(self.transcript_directory, f"job_{job['id']}_")
+        return config
+
+    def publish(self, job_id, event_type, data):
+        # Once the lease is lost, the job's stream belongs to the worker that holds it now
+        if job_id in self._lost_leases:
+            return
+        if self.queue.add_event(job_id, event_type, data, worker=self.name) is None:
+            self._lost_leases.add(job_id)
+            return
+        if self.on_event:
+            self.on_event()
+
+    def _keep_lease(self, job_id, done):
+        while not done.wait(self.heartbeat_seconds):
+            try:
+                if not self.queue.heartbeat(job_id, self.name):
+                    self._lost_leases.add(job_id)
+                    print(f"⚠️ {self.name} lost the lease on job {job_id}; it has been handed to another worker")
+                    return
+            except Exception as e:
+                # Keep trying; the lease only lapses if heartbeats fail for a whole lease period
+                if self.logger:
+                    self.logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+
+    def run_job(self, job):
+        """Run one claimed job and report the result. Returns True if the result was accepted."""
+        job_id = job['id']
+        done = threading.Event()
+        keeper = threading.Thread(target=self._keep_lease, args=(job_id, done), name=f"lease-{job_id}", daemon=True)
+        keeper.start()
+        try:
+            self.publish(job_id, "status", {"status": "running", "worker": self.name})
+            os.makedirs(self.transcript_directory, exist_ok=True)
+            system = self.system_factory(self.job_config(job))
+            self.logger = getattr(system, 'logger', None)
+            system.event_listeners.append(lambda event_type, data: self.publish(job_id, event_type, data))
+            system.setup_expert(job['expert_name'])
+            transcript_path = system.run_interview(job['expert_name'], job['topics'], max_exchanges=job['max_exchanges'])
+        except Exception as e:
+            accepted = self.queue.fail(job_id, f"{type(e).__name__}: {e}", worker=self.name)
+        else:
+            accepted = self.queue.complete(job_id, transcript_path, worker=self.name)
+        finally:
+            done.set()
+            keeper.join()
+            self._lost_leases.discard(job_id)
+        if self.on_event:
+            self.on_event()
+        if not accepted:
+            message = f"Result of job {job_id} discarded: {self.name} no longer holds its lease"
+            if self.logger:
+                self.logger.warning(message)
+            print(f"⚠️ {message}")
+        return accepted
+
+    def run(self, stop, idle_seconds=2.0, wake=None):
+        """Claim and run jobs until `stop` is set. `wake` (a Condition) is waited on between empty polls."""
+        while not stop.is_set():
+            try:
+                job = self.queue.claim(self.name)
+            except Exception as e:
+                # Unreachable coordinator, a locked queue database on shared storage, a malformed reply...
+                self._report_loop_error(f"could not claim a job ({type(e).__name__}: {e})")
+                job = None
+            if job is None:
+                if wake is not None:
+                    with wake:
+                        wake.wait(idle_seconds)
+                else:
+                    stop.wait(idle_seconds)
+                continue
+            try:
+                self.run_job(job)
+            except Exception as e:
+                # Reporting the result failed; the lease will lapse and the job will be retried elsewhere
+                self._report_loop_error(f"could not report job {job['id']} ({type(e).__name__}: {e})")
+
+    def _report_loop_error(self, message):
+        if self.logger:
+            self.logger.warning(f"{self.name} {message}")
+        print(f"⚠️ {self.name} {message}")
+
+
+def worker_name(index):
+    return f"{socket.gethostname()}:{os.getpid()}:worker-{index}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run interview jobs from a shared queue.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--coordinator', help="URL of the interview service handing out jobs")
+    source.add_argument('--queue', help="Path of a shared job queue database")
+    parser.add_argument('--config', default="config.yaml")
+    parser.add_argument('--threads', type=int, default=1, help="Interviews to run at once on this box")
+    parser.add_argument('--token', default=os.environ.get('RECURSIVE_WORKER_TOKEN'), help="Coordinator worker token")
+    parser.add_argument('--transcripts', default=None, help="Transcript directory (defaults to a scratch directory with --coordinator)")
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    service_settings = config.get('service', {})
+    heartbeat_seconds = service_settings.get('heartbeat_seconds', 30)
+    if args.coordinator:
+        queue = CoordinatorClient(args.coordinator, args.token)
+        # Transcripts are uploaded to the coordinator; local copies are only needed until then
+        transcript_directory = args.transcripts or tempfile.mkdtemp(prefix="recursive_worker_")
+    else:
+        queue = JobQueue(args.queue, lease_seconds=service_settings.get('lease_seconds', 120),
+                         max_attempts=service_settings.get('max_attempts', 3),
+                         journal_mode=service_settings.get('queue_journal_mode', "DELETE"))
+        transcript_directory = args.transcripts or service_settings.get('transcript_directory', "./transcripts")
+
+    stop = threading.Event()
+    threads = []
+    for i in range(max(1, args.threads)):
+        worker = InterviewWorker(worker_name(i), queue, config, transcript_directory=transcript_directory,
+                                 heartbeat_seconds=heartbeat_seconds)
+        thread = threading.Thread(target=worker.run, args=(stop,), name=f"interview-worker-{i}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    print(f"👷 {len(threads)} worker(s) pulling jobs from {args.coordinator or args.queue}")
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(1)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping after the current interviews finish...")
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+#
+# Interview Job Queue
+# ===================
+# A persistent SQLite queue of interview jobs (expert, topics, config
+# overrides) plus the live events each job emits while it runs. The
+# interview service (interview_service.py) submits and claims jobs here;
+# because the queue lives on disk, queued jobs survive a restart.
+#
+# Claiming takes a write lock (BEGIN IMMEDIATE), so any number of worker
+# threads can pull jobs without two of them getting the same one.
+#
+# A claimed job is leased to its worker for lease_seconds. Workers renew
+# the lease with heartbeat() while the interview runs; a job whose lease
+# runs out (its worker crashed or lost its node) goes back in the queue,
+# or fails once it has been attempted max_attempts times. complete() and
+# fail() only succeed for the worker that holds the lease, so a worker that
+# was presumed dead can't overwrite the result of the one that took over.
+#
+# Several machines can share one queue file on network storage; use
+# journal_mode="DELETE" there, since SQLite's WAL mode needs shared memory
+# that network filesystems don't provide.
+#
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'queued',
+    expert_name TEXT NOT NULL,
+    topics TEXT NOT NULL,
+    max_exchanges INTEGER,
+    overrides TEXT NOT NULL DEFAULT '{}',
+    worker TEXT,
+    lease_expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    transcript_path TEXT,
+    error TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
+
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class QueueFullError(Exception):
+    """Raised by submit() when max_queued jobs are already waiting"""
+
+
+# Columns added after the first release of the queue, added to older databases on open
+MIGRATED_COLUMNS = (
+    ("lease_expires_at", "REAL"),
+    ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+class JobQueue:
+    """SQLite-backed interview job queue with leases; safe to share between threads and processes"""
+
+    def __init__(self, path="./jobs.db", max_queued=None, lease_seconds=120, max_attempts=3, journal_mode="WAL"):
+        self.path = path
+        self.max_queued = max_queued
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.journal_mode = journal_mode
+        self._local = threading.local()
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+        existing = {row['name'] for row in connection.execute("PRAGMA table_info(jobs)")}
+        for column, definition in MIGRATED_COLUMNS:
+            if column not in existing:
+                connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads, so each thread opens its own
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job['topics'] = json.loads(job['topics'])
+        job['overrides'] = json.loads(job['overrides'])
+        return job
+
+    def submit(self, expert_name, topics, max_exchanges=None, overrides=None):
+        """Queue a job and return it. Raises QueueFullError when the queue is at max_queued."""
+        with self._transaction() as connection:
+            if self.max_queued is not None:
+                queued = connection.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+                if queued >= self.max_queued:
+                    raise QueueFullError(f"{queued} jobs already queued")
+            cursor = connection.execute(
+                "INSERT INTO jobs (expert_name, topics, max_exchanges, overrides, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                (expert_name, json.dumps(list(topics), ensure_ascii=False), max_exchanges,
+                 json.dumps(overrides or {}, ensure_ascii=False), time.time())
+            )
+            return self._job(connection.execute("SELECT * FROM jobs WHERE id = ?", (cursor.lastrowid,)).fetchone())
+
+    def claim(self, worker):
+        """Lease the oldest queued job to `worker` and return it, or None if the queue is empty.
+
+        Expired leases are reclaimed first, so a crashed worker's job is picked up by the next claim.
+        """
+        with self._transaction() as connection:
+            now = time.time()
+            self._reclaim_expired(connection, now)
+            row = connection.execute("SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started_at = ?, lease_expires_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (RUNNING, worker, now, now + self.lease_seconds, row['id'])
+            )
+            return self._job(connection.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone())
+
+    def heartbeat(self, job_id, worker):
+        """Extend a job's lease. Returns False if `worker` no longer holds it."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + self.lease_seconds, job_id, worker, RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def reclaim_expired(self):
+        """Requeue (or fail, after max_attempts) running jobs whose lease has run out. Returns how many."""
+        with self._transaction() as connection:
+            return self._reclaim_expired(connection, time.time())
+
+    def _reclaim_expired(self, connection, now):
+        # Running jobs without a lease predate leases; treat them as expired
+        expired = connection.execute(
+            "SELECT id, worker, attempts FROM jobs WHERE status = ? AND COALESCE(lease_expires_at, 0) < ?", (RUNNING, now)
+        ).fetchall()
+        for row in expired:
+            if row['attempts'] >= self.max_attempts:
+                error = f"lease expired on {row['worker']} after {row['attempts']} attempt(s)"
+                connection.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                                   (FAILED, error, now, row['id']))
+                self._add_event(connection, row['id'], "status", {"status": FAILED, "error": error})
+            else:
+                connection.execute("UPDATE jobs SET status = ?, worker = NULL, started_at = NULL, lease_expires_at = NULL WHERE id = ?",
+                                   (QUEUED, row['id']))
+                self._add_event(connection, row['id'], "status", {"status": QUEUED, "reason": f"lease expired on {row['worker']}"})
+        return len(expired)
+
+    def _finish(self, job_id, status, transcript_path=None, error=None, worker=None):
+        # The final status event is written in the same transaction, so a stream that sees the job
+        # finished has also seen its last event
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = ?, transcript_path = ?, error = ?, finished_at = ?, lease_expires_at = NULL "
+                "WHERE id = ? AND status = ? AND (? IS NULL OR worker = ?)",
+                (status, transcript_path, error, time.time(), job_id, RUNNING, worker, worker)
+            )
+            if cursor.rowcount != 1:
+                return False
+            data = {"status": status}
+            if transcript_path:
+                data["transcript"] = transcript_path
+            if error:
+                data["error"] = error
+            self._add_event(connection, job_id, "status", data)
+            return True
+
+    def complete(self, job_id, transcript_path, worker=None):
+        """Mark a running job succeeded. With `worker`, only if that worker still holds the lease."""
+        return self._finish(job_id, SUCCEEDED, transcript_path=transcript_path, worker=worker)
+
+    def fail(self, job_id, error, worker=None):
+        return self._finish(job_id, FAILED, error=error, worker=worker)
+
+    def cancel(self, job_id):
+        """Cancel a job that hasn't started. Returns False if it is already running or finished."""
+        with self._transaction() as connection:
+            cursor = connection.execute("UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                                        (CANCELLED, time.time(), job_id, QUEUED))
+            if cursor.rowcount != 1:
+                return False
+            self._add_event(connection, job_id, "status", {"status": CANCELLED})
+            return True
+
+    def requeue_running(self):
+        """Put jobs left running by a crashed process back in the queue. Returns how many."""
+        with self._transaction() as connection:
+            return connection.execute("UPDATE jobs SET status = ?, worker = NULL, started_at = NULL, lease_expires_at = NULL WHERE status = ?",
+                                      (QUEUED, RUNNING)).rowcount
+
+    def get(self, job_id):
+        return self._job(self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list_jobs(self, status=None, limit=100):
+        """Most recent jobs first"""
+        if status:
+            rows = self._connection().execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit))
+        else:
+            rows = self._connection().execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        return [self._job(row) for row in rows]
+
+    def position(self, job_id):
+        """Number of queued jobs ahead of this one (0 = next), or None if it isn't queued"""
+        row = self._connection().execute(
+            "SELECT (SELECT COUNT(*) FROM jobs WHERE status = ? AND id < j.id) FROM jobs j WHERE j.id = ? AND j.status = ?",
+            (QUEUED, job_id, QUEUED)
+        ).fetchone()
+        return row[0] if row else None
+
+    def counts(self):
+        """Jobs per status"""
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {status: count for status, count in rows}
+
+    def add_event(self, job_id, event_type, data, worker=None):
+        """Append an event to a job's stream and return its sequence number (1-based).
+
+        With `worker`, only if that worker still holds the job's lease; returns None otherwise.
+        """
+        with self._transaction() as connection:
+            if worker is not None and connection.execute(
+                    "SELECT 1 FROM jobs WHERE id = ? AND status = ? AND worker = ?", (job_id, RUNNING, worker)).fetchone() is None:
+                return None
+            return self._add_event(connection, job_id, event_type, data)
+
+    @staticmethod
+    def _add_event(connection, job_id, event_type, data):
+        seq = connection.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)).fetchone()[0]
+        connection.execute("INSERT INTO job_events (job_id, seq, type, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                           (job_id, seq, event_type, json.dumps(data, ensure_ascii=False), time.time()))
+        return seq
+
+    def events_since(self, job_id, after_seq=0):
+        """Events with seq > after_seq as (seq, type, data) tuples"""
+        rows = self._connection().execute(
+            "SELECT seq, type, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq", (job_id, after_seq)
+        )
+        return [(row['seq'], row['type'], json.loads(row['data'])) for row in rows]
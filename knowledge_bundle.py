@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+#
+# Topic Knowledge Bundles
+# =======================
+# Follow-ups stay within one topic, yet every expert turn used to run its
+# own top-k query against the expert collection (plus a web search). A
+# topic briefing instead pulls a larger candidate pool for the topic once,
+# when the topic opens or ahead of time for every topic, embeds it in one
+# batch, and keeps it in memory. Each question on the topic then re-ranks
+# that pool with a single matrix-vector product.
+#
+# Usage:
+#   briefings = TopicBriefings(build_bundle)            # build_bundle(expert, topic) -> KnowledgeBundle
+#   briefings.prepare("MLK", ["AI bias", "Nonviolence"]) # optional: build in the background now
+#   bundle = briefings.get("MLK", "AI bias")            # waits for (or builds) the bundle
+#   bundle.rank(question_vector, 3)
+#
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+
+class KnowledgeBundle:
+    """A topic's candidate documents with unit-normalized embeddings, ranked in memory"""
+
+    def __init__(self, topic, documents, embeddings):
+        self.topic = topic
+        self.documents = list(documents)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        matrix = matrix.reshape(len(self.documents), -1) if self.documents else np.zeros((0, 0), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = matrix / np.where(norms == 0, 1.0, norms)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def rank(self, vector, n_results):
+        """The n_results documents closest to vector by cosine similarity, best first"""
+        count = min(n_results, len(self.documents))
+        if count <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        scores = self.matrix @ query  # Query norm doesn't change the order
+        top = np.argpartition(-scores, count - 1)[:count]
+        return [self.documents[i] for i in top[np.argsort(-scores[top])]]
+
+
+class TopicBriefings:
+    """Knowledge bundles per (expert, topic), built on first use or ahead of time on a background worker"""
+
+    def __init__(self, build):
+        self._build = build
+        self._futures = {}  # (expert, topic) -> Future of a KnowledgeBundle
+        self._lock = threading.Lock()
+        self._executor = None
+        self.stats = {'built': 0, 'failed': 0, 'build_seconds': 0.0, 'ranked': 0, 'rank_seconds': 0.0}
+
+    def _timed_build(self, expert_name, topic):
+        start = time.perf_counter()
+        try:
+            bundle = self._build(expert_name, topic)
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+            raise
+        with self._lock:
+            self.stats['built'] += 1
+            self.stats['build_seconds'] += time.perf_counter() - start
+        return bundle
+
+    def prepare(self, expert_name, topics):
+        """Start building bundles for topics in order, one at a time, without waiting for them"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="topic-briefing")
+            for topic in topics:
+                if (expert_name, topic) not in self._futures:
+                    self._futures[(expert_name, topic)] = self._executor.submit(self._timed_build, expert_name, topic)
+
+    def get(self, expert_name, topic):
+        """The topic's bundle, waiting for a prepared build or building it now. Raises if the build failed."""
+        key = (expert_name, topic)
+        with self._lock:
+            future = self._futures.get(key)
+            building_here = future is None
+            if building_here:
+                future = self._futures[key] = Future()
+        if building_here:
+            try:
+                future.set_result(self._timed_build(expert_name, topic))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def ready(self, expert_name, topic):
+        """The topic's bundle if it has been built successfully, else None; never waits"""
+        with self._lock:
+            future = self._futures.get((expert_name, topic))
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def rank(self, bundle, vector, n_results):
+        start = time.perf_counter()
+        documents = bundle.rank(vector, n_results)
+        with self._lock:
+            self.stats['ranked'] += 1
+            self.stats['rank_seconds'] += time.perf_counter() - start
+        return documents
+
+    def clear(self):
+        with self._lock:
+            self._futures = {}
+
+    def report(self):
+        with self._lock:
+            stats = dict(self.stats)
+        return {
+            "built": stats['built'],
+            "failed": stats['failed'],
+            "mean_build_seconds": round(stats['build_seconds'] / stats['built'], 3) if stats['built'] else 0.0,
+            "ranked": stats['ranked'],
+            "mean_rank_microseconds": round(stats['rank_seconds'] * 1e6 / stats['ranked'], 1) if stats['ranked'] else 0.0,
+        }
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+#
+# Latency Budget
+# ==============
+# Deadlines for the whole interview, each topic and each exchange, for
+# episodes that have to finish inside a fixed production window. After
+# every exchange the budget checks whether the run has fallen behind:
+#
+#   - the exchange took longer than exchange_seconds
+#   - the exchanges on the topic add up to more than topic_seconds
+#   - elapsed time plus the remaining exchanges at the average pace so far
+#     would overrun interview_seconds
+#
+# Each time it has, the next degradation step is switched on and recorded.
+# Steps only ever get switched on, never off, so once the run is cheaper it
+# stays predictable. The interview system checks active(step) where each
+# step applies:
+#
+#   skip_web_search         no web search before expert answers
+#   shrink_retrieval        degraded_n_results knowledge chunks per query
+#   lower_num_predict       host and expert generations capped at degraded_num_predict tokens
+#   small_evaluation_model  depth evaluation on degraded_evaluation_model
+#   cut_follow_ups          no more follow-ups; remaining topics are only opened
+#
+# A request that hits request_timeout_seconds also switches on the next step;
+# the interview system then retries it once and, if that times out too,
+# raises GenerationTimeout so the exchange is skipped instead of the episode
+# ending.
+#
+
+import time
+
+DEGRADATION_STEPS = ("skip_web_search", "shrink_retrieval", "lower_num_predict", "small_evaluation_model", "cut_follow_ups")
+
+
+class GenerationTimeout(Exception):
+    """A generation timed out again after the latency budget degraded and retried it"""
+
+
+def is_timeout(error):
+    """Whether an exception is a request timeout (httpx's TimeoutException family, raised by ollama.Client, or TimeoutError)"""
+    return isinstance(error, TimeoutError) or any(cls.__name__ == 'TimeoutException' for cls in type(error).__mro__)
+
+
+class LatencyBudget:
+    """Interview, topic and exchange deadlines with stepwise degradation when the run falls behind"""
+
+    def __init__(self, interview_seconds, topic_seconds=None, exchange_seconds=None, steps=DEGRADATION_STEPS,
+                 clock=time.monotonic):
+        unknown = [step for step in steps if step not in DEGRADATION_STEPS]
+        if unknown:
+            raise ValueError(f"Unknown degradation step(s) {unknown}; expected some of {list(DEGRADATION_STEPS)}")
+        self.interview_seconds = interview_seconds
+        self.topic_seconds = topic_seconds
+        self.exchange_seconds = exchange_seconds
+        self.steps = list(steps)
+        self.clock = clock
+        self.level = 0  # Number of steps switched on
+        self.degradations = []  # One record per step switched on
+        self.missed_deadlines = {'exchange': 0, 'topic': 0, 'interview': 0, 'request': 0}
+        self._started = None
+        self._topic = None
+        self._topic_seconds_used = {}  # topic -> seconds spent on its exchanges so far
+        self._exchange_started = None
+        self._exchange_durations = []
+
+    @classmethod
+    def from_config(cls, settings):
+        return cls(settings.get('interview_seconds', 1800), topic_seconds=settings.get('topic_seconds'),
+                   exchange_seconds=settings.get('exchange_seconds'),
+                   steps=settings.get('degradation_steps', DEGRADATION_STEPS))
+
+    def start_interview(self, topic_count, exchange_count):
+        """Start the clock; topic and exchange deadlines default to even shares of the interview"""
+        self._started = self.clock()
+        if self.topic_seconds is None:
+            self.topic_seconds = self.interview_seconds / max(topic_count, 1)
+        if self.exchange_seconds is None:
+            self.exchange_seconds = self.interview_seconds / max(exchange_count, 1)
+
+    def elapsed(self):
+        return self.clock() - self._started if self._started is not None else 0.0
+
+    def start_exchange(self, topic=None):
+        self._topic = topic
+        self._exchange_started = self.clock()
+
+    def finish_exchange(self, remaining_exchanges):
+        """Check the deadlines after an exchange; returns the step switched on, if any"""
+        now = self.clock()
+        duration = now - self._exchange_started
+        self._exchange_durations.append(duration)
+        reasons = []
+        if duration > self.exchange_seconds:
+            self.missed_deadlines['exchange'] += 1
+            reasons.append(f"exchange took {duration:.1f}s (deadline {self.exchange_seconds:.1f}s)")
+        if self._topic is not None:
+            topic_seconds_used = self._topic_seconds_used.get(self._topic, 0.0) + duration
+            self._topic_seconds_used[self._topic] = topic_seconds_used
+            if topic_seconds_used > self.topic_seconds:
+                self.missed_deadlines['topic'] += 1
+                reasons.append(f"topic '{self._topic}' has taken {topic_seconds_used:.1f}s (deadline {self.topic_seconds:.1f}s)")
+        # The conclusion is one more exchange
+        average = sum(self._exchange_durations) / len(self._exchange_durations)
+        projected = now - self._started + average * (remaining_exchanges + 1)
+        if projected > self.interview_seconds:
+            self.missed_deadlines['interview'] += 1
+            reasons.append(f"projected {projected:.1f}s for the interview (deadline {self.interview_seconds:.1f}s)")
+        return self._degrade("; ".join(reasons)) if reasons else None
+
+    def request_timed_out(self, reason):
+        """Record a request that hit its timeout; returns the step switched on, if any"""
+        self.missed_deadlines['request'] += 1
+        return self._degrade(reason)
+
+    def _degrade(self, reason):
+        if self.level >= len(self.steps):
+            return None
+        step = self.steps[self.level]
+        self.level += 1
+        self.degradations.append({"step": step, "reason": reason, "topic": self._topic,
+                                  "elapsed_seconds": round(self.elapsed(), 1),
+                                  "exchange": len(self._exchange_durations)})
+        return step
+
+    def active(self, step):
+        return step in self.steps[:self.level]
+
+    def report(self):
+        return {
+            "interview_seconds": self.interview_seconds,
+            "topic_seconds": round(self.topic_seconds, 1) if self.topic_seconds is not None else None,
+            "exchange_seconds": round(self.exchange_seconds, 1) if self.exchange_seconds is not None else None,
+            "elapsed_seconds": round(self.elapsed(), 1),
+            "met_deadline": self.elapsed() <= self.interview_seconds,
+            "missed_deadlines": dict(self.missed_deadlines),
+            "degradations": list(self.degradations),
+        }
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+#
+# Memory Profiling
+# ================
+# tracemalloc checkpoints for long-running interview processes. Each
+# checkpoint records current and peak traced memory, the change since the
+# previous checkpoint and the source lines that grew the most, so memory
+# creep can be attributed per exchange and per interview.
+#
+# Snapshots are expensive; enable this while investigating, not in
+# production runs.
+#
+
+import tracemalloc
+
+# Allocations made by tracemalloc itself and the import system are noise in the reports
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryProfiler:
+    """Records tracemalloc checkpoints; every method is a no-op when disabled"""
+
+    def __init__(self, enabled=False, top_n=5, frames=1):
+        self.enabled = enabled
+        self.top_n = top_n
+        self.frames = frames
+        self.records = []
+        self._previous = None
+        self._started_tracing = False
+
+    @classmethod
+    def from_config(cls, memory_settings):
+        memory_settings = memory_settings or {}
+        return cls(
+            enabled=memory_settings.get('profiling_enabled', False),
+            top_n=memory_settings.get('report_top_n', 5),
+            frames=memory_settings.get('traceback_frames', 1),
+        )
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def start(self):
+        """Begin tracing (if not already) and take the baseline snapshot"""
+        if not self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._previous = self._snapshot()
+
+    def checkpoint(self, label):
+        """Record memory use since the previous checkpoint. Returns the record, or None when disabled."""
+        if not self.enabled:
+            return None
+        if self._previous is None:
+            self.start()
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        growth = snapshot.compare_to(self._previous, 'lineno')
+        record = {
+            "label": label,
+            "current_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "delta_kb": round(sum(stat.size_diff for stat in growth) / 1024, 1),
+            "top_growth": [
+                {"location": str(stat.traceback[0]), "size_diff_kb": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff}
+                for stat in growth[:self.top_n] if stat.size_diff > 0
+            ],
+        }
+        self._previous = snapshot
+        self.records.append(record)
+        return record
+
+    def reset(self):
+        """Drop recorded checkpoints and start a fresh baseline"""
+        self.records = []
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._previous = self._snapshot()
+
+    def stop(self):
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self._previous = None
+
+
+def format_record(record):
+    """One-line summary of a checkpoint for logs"""
+    top = record["top_growth"][0] if record["top_growth"] else None
+    hotspot = f"; top growth {top['location']} (+{top['size_diff_kb']} KB)" if top else ""
+    return (f"{record['label']}: current {record['current_kb'] / 1024:.2f} MB, peak {record['peak_kb'] / 1024:.2f} MB, "
+            f"delta {record['delta_kb']:+.1f} KB{hotspot}")
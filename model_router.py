@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+#
+# Model Routing
+# =============
+# Lets each LLM request type run on a cascade of models, cheapest first,
+# so routine calls (an opening question) don't pay for the model that only
+# hard ones (a follow-up on a topic the expert keeps deflecting) need.
+#
+# A request moves up its cascade in two ways:
+#   escalate_after_shallow  the topic's last N answers were evaluated depth 1,
+#                           so requests on it start one tier higher (and
+#                           another tier higher after N more); a deeper
+#                           answer drops the topic back to the first tier
+#   self_check              a cheap check of the draft ("question": a single
+#                           question of sensible length, "answer": a real
+#                           answer of at least min_words); a rejected draft is
+#                           retried on the next tier
+#
+# Calls, latency and escalations are counted per request type and tier.
+#
+
+import re
+from collections import defaultdict
+
+QUESTION_WORD_RANGE = (5, 80)
+ANSWER_MIN_WORDS = 20
+
+
+def check_question(text, min_words=QUESTION_WORD_RANGE[0], max_words=QUESTION_WORD_RANGE[1]):
+    """A host question should be one question of reasonable length"""
+    words = len(text.split())
+    if not text.rstrip().endswith("?"):
+        return False, "draft is not a question"
+    if not min_words <= words <= max_words:
+        return False, f"draft has {words} words (expected {min_words}-{max_words})"
+    return True, None
+
+
+def check_answer(text, min_words=ANSWER_MIN_WORDS):
+    """An expert answer should have substance and no leaked scaffolding"""
+    words = len(text.split())
+    if words < min_words:
+        return False, f"draft has {words} words (expected at least {min_words})"
+    if re.match(r'^(ERROR|As an AI)\b', text):
+        return False, "draft is an error or a refusal"
+    return True, None
+
+
+SELF_CHECKS = {
+    "question": check_question,
+    "answer": check_answer,
+}
+
+
+class ModelCascade:
+    """Models for one request type, cheapest first, with the rules for moving up"""
+
+    def __init__(self, request_type, models, escalate_after_shallow=None, self_check=None, **check_options):
+        if not models:
+            raise ValueError(f"Model cascade for {request_type} has no models")
+        if self_check is not None and self_check not in SELF_CHECKS:
+            raise ValueError(f"Unknown self_check '{self_check}' for {request_type}; expected one of {sorted(SELF_CHECKS)}")
+        self.request_type = request_type
+        self.models = list(models)
+        self.escalate_after_shallow = escalate_after_shallow
+        self.self_check = self_check
+        self.check_options = check_options  # e.g. min_words / max_words for the self-check
+
+    def start_tier(self, shallow_streak):
+        if not self.escalate_after_shallow:
+            return 0
+        return min(shallow_streak // self.escalate_after_shallow, len(self.models) - 1)
+
+    def check(self, text):
+        """(accepted, reason) for a cleaned draft"""
+        if self.self_check is None:
+            return True, None
+        return SELF_CHECKS[self.self_check](text, **self.check_options)
+
+
+class ModelRouter:
+    """Per-request-type cascades plus the topic depth history and statistics they run on"""
+
+    def __init__(self, cascades):
+        self.cascades = {cascade.request_type: cascade for cascade in cascades}
+        self.shallow_streaks = defaultdict(int)  # topic -> consecutive depth-1 evaluations
+        # request type -> tier -> counters
+        self._stats = defaultdict(lambda: defaultdict(lambda: {'calls': 0, 'seconds': 0.0, 'escalations': 0}))
+
+    @classmethod
+    def from_config(cls, settings):
+        cascades = []
+        for request_type, cascade_settings in (settings.get('cascades') or {}).items():
+            options = dict(cascade_settings)
+            cascades.append(ModelCascade(request_type, options.pop('models', []), **options))
+        return cls(cascades)
+
+    def cascade(self, request_type):
+        return self.cascades.get(request_type)
+
+    def start_tier(self, request_type, topic=None):
+        return self.cascades[request_type].start_tier(self.shallow_streaks[topic] if topic is not None else 0)
+
+    def record_depth(self, topic, depth):
+        """Feed back an evaluated answer on a topic"""
+        self.shallow_streaks[topic] = self.shallow_streaks[topic] + 1 if depth <= 1 else 0
+
+    def record_call(self, request_type, tier, seconds):
+        stats = self._stats[request_type][tier]
+        stats['calls'] += 1
+        stats['seconds'] += seconds
+
+    def record_escalation(self, request_type, tier):
+        self._stats[request_type][tier]['escalations'] += 1
+
+    def reset(self):
+        """Forget depth history and statistics before the next interview"""
+        self.shallow_streaks.clear()
+        self._stats.clear()
+
+    def report(self):
+        """Per request type and tier: model, calls, escalation rate and mean latency"""
+        report = {}
+        for request_type, tiers in sorted(self._stats.items()):
+            models = self.cascades[request_type].models
+            total_calls = sum(stats['calls'] for stats in tiers.values())
+            report[request_type] = {
+                "calls": total_calls,
+                "tiers": [
+                    {
+                        "model": models[tier],
+                        "calls": stats['calls'],
+                        "share": round(stats['calls'] / total_calls, 3) if total_calls else 0.0,
+                        "escalation_rate": round(stats['escalations'] / stats['calls'], 3) if stats['calls'] else 0.0,
+                        "mean_seconds": round(stats['seconds'] / stats['calls'], 3) if stats['calls'] else 0.0,
+                    }
+                    for tier, stats in sorted(tiers.items())
+                ],
+            }
+        return report
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+#
+# Learned Pattern Library
+# =======================
+# generate_host_question injects the host collection's top matches for a
+# topic as examples. After many episodes those are near-duplicates of one
+# successful question, which spends prompt tokens without showing the host
+# anything new. A PatternLibrary keeps every successful pattern's unit
+# embedding and groups them with spherical k-means (at most max_clusters
+# clusters; each pattern is its own cluster until there are more). Each
+# cluster is represented by its medoid, the member closest to its
+# centroid. Selection runs maximal marginal relevance (MMR) over the
+# representatives: every pick balances similarity to the query against
+# similarity to the examples already picked. It is vectorized over at most
+# max_clusters candidates, so it takes microseconds however many patterns
+# there are.
+#
+# A pattern saved after a topic reaches depth 3 joins the nearest cluster
+# (updating its centroid and medoid) straight away. k-means re-runs in the
+# background once the library has grown by refit_growth since the last
+# fit. Embeddings and clusters are saved in directory and reused across
+# runs; only patterns the library hasn't seen are embedded.
+#
+# Usage:
+#   library = PatternLibrary.load("./pattern_library")
+#   library.sync(ids, documents, embed)       # match the host collection, embedding only new patterns
+#   library.add("pattern_12_AI_bias", document, vector)
+#   library.select(query_vector, 2)            # varied examples, most relevant first
+#   library.save()
+#
+# Rebuild the library from the host collection ahead of time with:
+#   python pattern_library.py --config config.yaml
+#
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ARRAYS_FILE = "patterns.npz"
+DOCUMENTS_FILE = "patterns.json"
+EMBED_BATCH_SIZE = 256  # Patterns embedded per call when syncing
+KMEANS_SEED_SAMPLE = 32  # Rows sampled per cluster for k-means++ seeding
+
+
+def _unit_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def _cluster_sums(matrix, assignments, clusters):
+    """Per-cluster sums of member vectors, in one pass over the rows sorted by cluster"""
+    sums = np.zeros((clusters, matrix.shape[1]), dtype=np.float32)
+    if len(assignments):
+        order = np.argsort(assignments, kind='stable')
+        grouped = assignments[order]
+        starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        sums[grouped[starts]] = np.add.reduceat(matrix[order], starts, axis=0)
+    return sums
+
+
+def _medoids(matrix, assignments, centroids):
+    """The row of each cluster's member closest to its (unit) centroid; -1 for empty clusters"""
+    representatives = np.full(len(centroids), -1, dtype=np.int64)
+    if len(assignments):
+        closeness = np.einsum('ij,ij->i', matrix, centroids[assignments])
+        order = np.lexsort((-closeness, assignments))
+        grouped = assignments[order]
+        firsts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        representatives[grouped[firsts]] = order[firsts]
+    return representatives
+
+
+def _seed_centroids(matrix, clusters, rng):
+    """k-means++ seeding (each seed drawn in proportion to its squared cosine distance from the seeds so far),
+    over a sample of the rows so seeding stays cheap for large libraries"""
+    sample = matrix[rng.choice(len(matrix), min(len(matrix), KMEANS_SEED_SAMPLE * clusters), replace=False)]
+    chosen = [int(rng.integers(len(sample)))]
+    distance = np.maximum(1.0 - sample @ sample[chosen[0]], 0.0)
+    for _ in range(1, clusters):
+        weights = distance ** 2
+        total = weights.sum()
+        pick = int(rng.choice(len(sample), p=weights / total)) if total > 0 else int(rng.integers(len(sample)))
+        chosen.append(pick)
+        distance = np.minimum(distance, np.maximum(1.0 - sample @ sample[pick], 0.0))
+    return sample[chosen]
+
+
+def spherical_kmeans(matrix, clusters, iterations=15, seed=0):
+    """Cluster unit rows by cosine similarity: (assignments, per-cluster sums, counts)"""
+    centroids = _seed_centroids(matrix, clusters, np.random.default_rng(seed))
+    for _ in range(iterations):
+        similarities = matrix @ centroids.T
+        assignments = np.argmax(similarities, axis=1)
+        sums = _cluster_sums(matrix, assignments, clusters)
+        empty = np.flatnonzero(np.bincount(assignments, minlength=clusters) == 0)
+        if len(empty):
+            # Re-seed empty clusters with the rows their centroids fit worst
+            worst = np.argsort(similarities[np.arange(len(matrix)), assignments])[:len(empty)]
+            sums[empty] = matrix[worst]
+        updated = _unit_rows(sums)
+        converged = np.allclose(updated, centroids, atol=1e-5)
+        centroids = updated
+        if converged:
+            break
+    assignments = np.argmax(matrix @ centroids.T, axis=1)
+    return assignments, _cluster_sums(matrix, assignments, clusters), np.bincount(assignments, minlength=clusters)
+
+
+class PatternLibrary:
+    """Successful host patterns with their embeddings, clustered, selected for relevance and variety"""
+
+    def __init__(self, directory=None, max_clusters=128, diversity=0.5, refit_growth=1.5, iterations=15, seed=0):
+        self.directory = directory
+        self.max_clusters = max_clusters
+        self.diversity = diversity  # MMR weight of redundancy against relevance (0 = plain top-k)
+        self.refit_growth = refit_growth
+        self.iterations = iterations
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._executor = None
+        self._refitting = False
+        self._replaced = 0  # Rows overwritten in place; a background refit started before one is thrown away
+        self.dirty = False  # Changed since the last save
+        self.stats = {'added': 0, 'refits': 0, 'selections': 0, 'select_seconds': 0.0}
+        self._reset([], [], np.zeros((0, 0), dtype=np.float32))
+
+    @classmethod
+    def from_config(cls, settings):
+        return cls.load(
+            settings.get('directory', "./pattern_library"),
+            max_clusters=settings.get('max_clusters', 128),
+            diversity=settings.get('diversity', 0.5),
+            refit_growth=settings.get('refit_growth', 1.5),
+            iterations=settings.get('kmeans_iterations', 15),
+        )
+
+    def _reset(self, ids, documents, matrix):
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self._rows = {pattern_id: row for row, pattern_id in enumerate(self.ids)}
+        self.matrix = matrix
+        self.fitted_count = 0
+        self.assignments = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros((0, matrix.shape[1]), dtype=np.float32)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.representatives = np.zeros(0, dtype=np.int64)
+        self._candidate_rows = np.zeros(0, dtype=np.int64)
+        self._candidates = np.zeros((0, matrix.shape[1]), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def clusters(self):
+        return int(np.count_nonzero(self.counts))
+
+    # --- Clustering ---
+
+    def fit(self):
+        """Re-cluster every pattern now (k-means once there are more patterns than max_clusters)"""
+        while True:
+            with self._lock:
+                matrix, replaced = self.matrix, self._replaced
+            clustering = self._cluster(matrix)
+            with self._lock:
+                if self._install(matrix, clustering, replaced):
+                    return
+
+    def _cluster(self, matrix):
+        if len(matrix) <= self.max_clusters:
+            # Every pattern is its own cluster
+            return np.arange(len(matrix)), matrix.copy(), np.ones(len(matrix), dtype=np.int64)
+        return spherical_kmeans(matrix, self.max_clusters, self.iterations, self.seed)
+
+    def _install(self, matrix, clustering, replaced):
+        """Adopt a clustering of matrix's rows; rows appended since it was taken join their nearest cluster"""
+        if replaced != self._replaced:
+            return False  # A row changed under the fit; fit again
+        self.assignments, self.sums, self.counts = clustering
+        self.representatives = np.full(len(self.counts), -1, dtype=np.int64)
+        self.fitted_count = len(matrix)
+        for row in range(len(matrix), len(self.ids)):
+            self.assignments = np.append(self.assignments, -1)
+            self._place(row)
+        self.representatives = _medoids(self.matrix, self.assignments, _unit_rows(self.sums))
+        self._refresh_candidates()
+        self.stats['refits'] += 1
+        self.dirty = True
+        return True
+
+    def _refit_due(self):
+        return (not self._refitting and len(self.ids) > self.max_clusters
+                and len(self.ids) >= self.refit_growth * max(self.fitted_count, 1))
+
+    def _refit_in_background(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pattern-clustering")
+            self._refitting = True
+        self._executor.submit(self._background_fit)
+
+    def _background_fit(self):
+        try:
+            self.fit()
+        finally:
+            with self._lock:
+                self._refitting = False
+
+    def wait(self):
+        """Block until a background refit has finished (for saving, tests and the CLI)"""
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            executor.submit(lambda: None).result()
+
+    def _place(self, row):
+        """Put one row into a cluster and update that cluster's centroid and medoid"""
+        vector = self.matrix[row]
+        empty = np.flatnonzero(self.counts == 0)
+        if len(empty):
+            cluster = int(empty[0])
+        elif len(self.counts) < self.max_clusters:
+            cluster = len(self.counts)
+            self.sums = np.vstack([self.sums, np.zeros((1, self.matrix.shape[1]), dtype=np.float32)])
+            self.counts = np.append(self.counts, 0)
+            self.representatives = np.append(self.representatives, -1)
+        else:
+            cluster = int(np.argmax(_unit_rows(self.sums) @ vector))
+        self.assignments[row] = cluster
+        self.sums[cluster] += vector
+        self.counts[cluster] += 1
+        self._update_medoid(cluster)
+
+    def _update_medoid(self, cluster):
+        members = np.flatnonzero(self.assignments == cluster)
+        if len(members) == 0:
+            self.representatives[cluster] = -1
+            return
+        centroid = _unit_rows(self.sums[cluster:cluster + 1])[0]
+        self.representatives[cluster] = members[int(np.argmax(self.matrix[members] @ centroid))]
+
+    def _refresh_candidates(self):
+        self._candidate_rows = self.representatives[self.representatives >= 0]
+        self._candidates = self.matrix[self._candidate_rows]
+
+    # --- Patterns ---
+
+    def add(self, pattern_id, document, vector):
+        """Add (or replace) a pattern and place it in its nearest cluster; refits in the background when due"""
+        vector = _unit_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        with self._lock:
+            if len(self.ids) and vector.shape[1] != self.matrix.shape[1]:
+                raise ValueError(f"Pattern embedding has {vector.shape[1]} dimensions; the library has {self.matrix.shape[1]}")
+            row = self._rows.get(pattern_id)
+            if row is not None:
+                previous = self.assignments[row]
+                self.sums[previous] -= self.matrix[row]
+                self.counts[previous] -= 1
+                self.matrix = self.matrix.copy()  # A background fit may be reading the old array
+                self.matrix[row] = vector[0]
+                self.documents[row] = document
+                self._replaced += 1
+                self._update_medoid(previous)
+            else:
+                row = len(self.ids)
+                self._rows[pattern_id] = row
+                self.ids.append(pattern_id)
+                self.documents.append(document)
+                self.matrix = np.vstack([self.matrix, vector]) if len(self.matrix) else vector
+                if not len(self.sums):
+                    self.sums = np.zeros((0, vector.shape[1]), dtype=np.float32)
+                self.assignments = np.append(self.assignments, -1)
+            self._place(row)
+            self._refresh_candidates()
+            self.stats['added'] += 1
+            self.dirty = True
+            refit = self._refit_due()
+        if refit:
+            self._refit_in_background()
+
+    def sync(self, ids, documents, embed):
+        """Match the host collection's patterns: embed only the ones the library hasn't seen, drop deleted ones.
+
+        Returns the number of patterns embedded.
+        """
+        current = dict(zip(ids, documents))
+        with self._lock:
+            known = [(row, pattern_id) for row, pattern_id in enumerate(self.ids) if pattern_id in current]
+            removed = len(self.ids) - len(known)
+            kept_rows = [row for row, _ in known]
+            matrix = self.matrix[kept_rows] if kept_rows else None
+            clustered = len(self.assignments) == len(self.ids)
+        kept_ids = [pattern_id for _, pattern_id in known]
+        new_ids = [pattern_id for pattern_id in dict.fromkeys(ids) if pattern_id not in set(kept_ids)]
+        if not new_ids and not removed and clustered:
+            return 0
+        new_documents = [current[pattern_id] for pattern_id in new_ids]
+        new_vectors = _unit_rows(np.vstack([
+            np.asarray(embed(new_documents[offset:offset + EMBED_BATCH_SIZE]), dtype=np.float32)
+            for offset in range(0, len(new_documents), EMBED_BATCH_SIZE)
+        ])) if new_ids else None
+        parts = [part for part in (matrix, new_vectors) if part is not None and len(part)]
+        combined = np.vstack(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+        with self._lock:
+            self._reset(kept_ids + new_ids, [current[pattern_id] for pattern_id in kept_ids + new_ids], combined)
+            self._replaced += 1
+        self.fit()
+        return len(new_ids)
+
+    def select(self, vector, n_results):
+        """Up to n_results varied patterns for a query, most relevant first, by MMR over cluster representatives"""
+        start = time.perf_counter()
+        with self._lock:
+            rows, candidates, documents = self._candidate_rows, self._candidates, self.documents
+        count = min(n_results, len(rows))
+        if count <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape[0] != candidates.shape[1]:
+            raise ValueError(f"Query embedding has {query.shape[0]} dimensions; the library has {candidates.shape[1]}")
+        relevance = candidates @ (query / (np.linalg.norm(query) or 1.0))
+        redundancy = np.zeros(len(rows), dtype=np.float32)  # Similarity to the closest pattern picked so far
+        picked = []
+        for _ in range(count):
+            scores = (1.0 - self.diversity) * relevance - self.diversity * redundancy
+            scores[picked] = -np.inf
+            pick = int(np.argmax(scores))
+            picked.append(pick)
+            redundancy = np.maximum(redundancy, candidates @ candidates[pick])
+        with self._lock:
+            self.stats['selections'] += 1
+            self.stats['select_seconds'] += time.perf_counter() - start
+        return [documents[rows[i]] for i in picked]
+
+    # --- Storage ---
+
+    @classmethod
+    def load(cls, directory, **options):
+        """The library saved in directory, or an empty one"""
+        library = cls(directory, **options)
+        arrays_path = os.path.join(directory, ARRAYS_FILE)
+        documents_path = os.path.join(directory, DOCUMENTS_FILE)
+        if not (os.path.exists(arrays_path) and os.path.exists(documents_path)):
+            return library
+        with open(documents_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        with np.load(arrays_path) as arrays:
+            library._reset(saved['ids'], saved['documents'], arrays['matrix'])
+            if len(arrays['counts']) > library.max_clusters:
+                return library  # Saved with more clusters than allowed now; sync() re-fits
+            library.assignments, library.sums, library.counts = arrays['assignments'], arrays['sums'], arrays['counts']
+            library.representatives = arrays['representatives']
+        library.fitted_count = saved.get('fitted_count', len(library.ids))
+        library._refresh_candidates()
+        return library
+
+    def save(self):
+        """Write embeddings and clusters to directory (atomically, so a reader never sees half a library)"""
+        with self._lock:
+            saved = {'ids': list(self.ids), 'documents': list(self.documents), 'fitted_count': self.fitted_count}
+            arrays = {'matrix': self.matrix, 'assignments': self.assignments, 'sums': self.sums,
+                      'counts': self.counts, 'representatives': self.representatives}
+            self.dirty = False
+        os.makedirs(self.directory, exist_ok=True)
+        arrays_path = os.path.join(self.directory, ARRAYS_FILE)
+        documents_path = os.path.join(self.directory, DOCUMENTS_FILE)
+        with open(arrays_path + ".tmp", 'wb') as f:
+            np.savez(f, **arrays)
+        with open(documents_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(saved, f, ensure_ascii=False)
+        os.replace(arrays_path + ".tmp", arrays_path)
+        os.replace(documents_path + ".tmp", documents_path)
+
+    def report(self):
+        with self._lock:
+            stats = dict(self.stats)
+            patterns, clusters = len(self.ids), self.clusters
+        return {
+            "patterns": patterns,
+            "clusters": clusters,
+            "added": stats['added'],
+            "refits": stats['refits'],
+            "selections": stats['selections'],
+            "mean_select_microseconds": round(stats['select_seconds'] * 1e6 / stats['selections'], 1) if stats['selections'] else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed and cluster the host's learned patterns ahead of time.")
+    parser.add_argument('--config', default="config.yaml", help="Path to config.yaml")
+    args = parser.parse_args()
+
+    import yaml
+    from interview_system import RecursiveInterviewSystem
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    config.setdefault('pattern_selection', {})['enabled'] = True
+
+    start = time.perf_counter()
+    library = RecursiveInterviewSystem(config=config).pattern_library
+    library.wait()
+    library.save()
+    report = library.report()
+    print(f"✓ {report['patterns']} pattern(s) in {report['clusters']} cluster(s), saved to {library.directory} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+#
+# Persona Registry
+# ================
+# Knows every expert the system can interview. Personas come from two
+# places: entries under expert_defaults in config.yaml, and persona files
+# (personas/*.md) discovered on disk. A file is matched to an
+# expert_defaults entry by its persona_file setting or by the name in its
+# first "# " heading ("# Ada Lovelace — ..." -> ada_lovelace); unmatched
+# files become personas with default settings.
+#
+# Each expert gets its own ChromaDB collection, opened on first use and
+# kept in a small LRU so one process can serve interviews for many experts
+# without mixing their knowledge. The first time a collection is opened,
+# an on_first_open callback can bring its persona documents up to date.
+#
+# Per-expert prompt prefixes (the expert prompt with the fields that never
+# change for that expert already filled in) are built once and cached on
+# the Persona.
+#
+
+import glob
+import hashlib
+import os
+import re
+import string
+import threading
+from collections import OrderedDict
+
+DEFAULT_EXPERT_KEY = "martin_luther_king_jr"
+HEADING_PATTERN = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+HEADING_NAME_SEPARATORS = re.compile(r"\s+[—–-]\s+|\s*\(")
+BOLD_SPEAKER_TAG_PATTERN = re.compile(r"^\*\*[^*\n]{1,40}:\*\* ?")
+MARKDOWN_HEADING_PATTERN = re.compile(r"^#+ ?")
+NEWLINES_PATTERN = re.compile(r"\n+")
+
+# Section titles in persona files that describe the persona rather than speak as it
+SECTION_TITLE_PREFIXES = (
+    "featured persona:", "theme:", "background evolution", "core unchanging values",
+    "evolutionary developments", "style evolution", "recursive questioning triggers",
+    "self-correction moments", "modern issues synthesis", "failsafes", "voice synthesis notes",
+)
+MIN_DOCUMENT_CHARS = 20
+
+
+def slugify(name):
+    """'Martin Luther King Jr.' -> 'martin_luther_king_jr'"""
+    return re.sub(r"[^a-z0-9]+", "_", (name or "").lower()).strip("_")
+
+
+def partial_format(template, **values):
+    """Fill in the given fields of a str.format template and leave the others as placeholders"""
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if field in values:
+            value = values[field]
+            if conversion:
+                value = {"r": repr, "s": str, "a": ascii}[conversion](value)
+            parts.append(format(value, spec or "").replace("{", "{{").replace("}", "}}"))
+        else:
+            parts.append("{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}")
+    return "".join(parts)
+
+
+def persona_name_from_file(path):
+    """Expert name from the first '# ' heading of a persona file, or None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            match = HEADING_PATTERN.search(f.read(4096))
+    except OSError:
+        return None
+    if not match:
+        return None
+    return HEADING_NAME_SEPARATORS.split(match.group(1), maxsplit=1)[0].strip() or None
+
+
+class Persona:
+    """One expert: display name, expert_defaults settings and where its knowledge lives"""
+
+    def __init__(self, key, name, settings=None, file_path=None, doc_id_prefix=None,
+                 collection_name=None, speaker_tag=None, aliases=()):
+        self.key = key
+        self.name = name
+        self.settings = settings or {}
+        self.file_path = file_path
+        self.doc_id_prefix = doc_id_prefix or f"{key}_doc_"
+        self.collection_name = collection_name
+        self.speaker_tag = speaker_tag
+        self.aliases = tuple(aliases)
+        self._speaker_tag_pattern = re.compile(rf"^{re.escape(speaker_tag)}: ?") if speaker_tag else None
+        self._prompt_templates = {}
+
+    def names(self):
+        """Every name this persona answers to, for registry lookups"""
+        names = [self.key, self.name, *self.aliases]
+        if self.speaker_tag:
+            names.append(self.speaker_tag)
+        return names
+
+    def extract_documents(self, content):
+        """Split persona markdown into knowledge documents, dropping host lines, headings and speaker tags"""
+        documents = []
+        for chunk in content.split("\n\n"):
+            text = chunk.strip()
+            if text.startswith("**HOST:") or text.startswith("HOST:"):
+                continue
+            text = BOLD_SPEAKER_TAG_PATTERN.sub("", text)
+            if self._speaker_tag_pattern:
+                text = self._speaker_tag_pattern.sub("", text)
+            text = MARKDOWN_HEADING_PATTERN.sub("", text)
+            if text.startswith("---") or text.startswith("## ") or text.startswith("### "):
+                continue
+            if text.lower().startswith(SECTION_TITLE_PREFIXES):
+                continue
+            text = NEWLINES_PATTERN.sub("\n", text).strip()
+            if len(text) < MIN_DOCUMENT_CHARS:
+                continue
+            documents.append(text)
+        return documents
+
+    def prompt_template(self, template, **static_values):
+        """The template with this expert's fixed fields filled in, built once per template and values"""
+        cache_key = (template, tuple(sorted(static_values.items())))
+        prefix = self._prompt_templates.get(cache_key)
+        if prefix is None:
+            prefix = self._prompt_templates[cache_key] = partial_format(template, **static_values)
+        return prefix
+
+    def __repr__(self):
+        return f"Persona({self.key!r}, {self.name!r}, file={self.file_path!r}, collection={self.collection_name!r})"
+
+
+def fingerprint(content):
+    """Short content hash stored on a collection to tell whether its persona documents are current"""
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
+
+
+class PersonaRegistry:
+    """Discovers personas and hands out their collections through an LRU of open handles"""
+
+    def __init__(self, config, open_collection, on_first_open=None):
+        self.config = config
+        persona_settings = config.get('persona_settings', {})
+        self.personas_directory = persona_settings.get('personas_directory', "personas")
+        self.default_key = persona_settings.get('expert_defaults_key', DEFAULT_EXPERT_KEY)
+        self.max_open_collections = max(1, persona_settings.get('max_open_collections', 8))
+        self._open_collection = open_collection
+        self._on_first_open = on_first_open
+        self._personas = None
+        self._lookup = {}
+        self._collections = OrderedDict()  # persona key -> open collection, least recently used first
+        self._opened = set()  # Keys whose on_first_open has run; survives LRU eviction
+        self._lock = threading.RLock()
+
+    @property
+    def personas(self):
+        """Persona per key, discovered on first access"""
+        if self._personas is None:
+            with self._lock:
+                if self._personas is None:
+                    self._discover()
+        return self._personas
+
+    def _discover(self):
+        persona_settings = self.config.get('persona_settings', {})
+        expert_defaults = self.config.get('expert_defaults', {}) or {}
+        base_collection = self.config.get('chromadb', {}).get('expert_collection_name', "expert_knowledge")
+        personas = {}
+
+        def add(key, settings, file_path, name=None):
+            defaults = {}
+            if key == self.default_key:
+                # The original single-expert settings still describe the default expert
+                defaults = {
+                    'file_path': persona_settings.get('default_persona_file_path', "personas/mlk.md"),
+                    'doc_id_prefix': persona_settings.get('persona_doc_id_prefix', "mlk_doc_"),
+                    'name': self.config.get('default_expert_name'),
+                }
+            personas[key] = Persona(
+                key,
+                settings.get('display_name') or name or defaults.get('name') or key.replace('_', ' ').title(),
+                settings=settings,
+                file_path=settings.get('persona_file') or file_path or defaults.get('file_path'),
+                doc_id_prefix=settings.get('doc_id_prefix') or defaults.get('doc_id_prefix'),
+                collection_name=settings.get('collection_name') or f"{base_collection}_{key}",
+                speaker_tag=settings.get('speaker_tag'),
+                aliases=settings.get('aliases', ()),
+            )
+
+        claimed_files = set()
+        for key, settings in expert_defaults.items():
+            settings = settings or {}
+            add(key, settings, None)
+            if personas[key].file_path:
+                claimed_files.add(os.path.normpath(personas[key].file_path))
+
+        for path in sorted(glob.glob(os.path.join(self.personas_directory, "*.md"))):
+            if os.path.normpath(path) in claimed_files:
+                continue
+            name = persona_name_from_file(path)
+            key = slugify(name) or slugify(os.path.splitext(os.path.basename(path))[0])
+            if key in personas:
+                if not (expert_defaults.get(key) or {}).get('persona_file'):
+                    personas[key].file_path = path
+                continue
+            add(key, {}, path, name)
+
+        if self.default_key not in personas:
+            add(self.default_key, {}, None)
+
+        self._personas = personas
+        self._lookup = {}
+        for persona in personas.values():
+            for name in persona.names():
+                self._lookup.setdefault(slugify(name), persona)
+
+    def get(self, expert_name):
+        """Persona matching a key, display name, alias or speaker tag, or None"""
+        self.personas
+        return self._lookup.get(slugify(expert_name))
+
+    def resolve(self, expert_name=None):
+        """Like get(), but falls back to the default expert for unknown or missing names"""
+        if isinstance(expert_name, Persona):
+            return expert_name
+        return (self.get(expert_name) if expert_name else None) or self.personas[self.default_key]
+
+    @property
+    def default(self):
+        return self.personas[self.default_key]
+
+    def collection(self, expert_name=None):
+        """The expert's collection, opened (and brought up to date) on first use"""
+        persona = self.resolve(expert_name)
+        with self._lock:
+            collection = self._collections.get(persona.key)
+            if collection is not None:
+                self._collections.move_to_end(persona.key)
+                return collection
+            collection = self._open_collection(persona.collection_name, {
+                "description": f"{persona.name} persona knowledge base",
+                "expert": persona.key,
+            })
+            if persona.key not in self._opened and self._on_first_open is not None:
+                self._on_first_open(persona, collection)
+            self._opened.add(persona.key)
+            self._collections[persona.key] = collection
+            while len(self._collections) > self.max_open_collections:
+                self._collections.popitem(last=False)
+            return collection
+
+    def open_collections(self):
+        """Keys of the currently open collections, least recently used first"""
+        with self._lock:
+            return list(self._collections)
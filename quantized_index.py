@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+#
+# Quantized Embedding Storage
+# ===========================
+# Persona corpora, web snippets and saved patterns keep growing the expert
+# and host collections, and their float32 embeddings are most of the index
+# memory. A QuantizedIndex keeps a collection's embeddings as int8 (4x
+# smaller, one float32 scale per vector) or float16 (2x smaller) in a
+# memory-mapped file. A query makes an approximate pass over the quantized
+# vectors, then re-scores the best n_results * oversample candidates
+# exactly against float32 copies, which stay on disk and are read only
+# for those rows. Document texts are read from disk for the final results
+# only, so an index costs little resident memory and opens in
+# milliseconds.
+#
+# QuantizedCollection wraps a Chroma collection so search_expert_knowledge
+# and the host-pattern queries are answered from the index. The index is
+# exported from the collection (Chroma's own embeddings, so nothing is
+# re-embedded) on the first query and reused across runs while the
+# collection's count matches. Documents upserted since are fetched back
+# with their embeddings and searched exactly until max_delta accumulate,
+# then the index is rebuilt. A delete rebuilds it on the next query.
+# Metadata filters are supported for {"key": value} equality; other
+# filters go to the collection itself.
+#
+# Usage:
+#   index = QuantizedIndex.build("./quantized_index/expert_mlk", ids, documents, metadatas, embeddings)
+#   index.search(vector, 3)                          # [(row, cosine similarity), ...]
+#   collection = QuantizedCollection(chroma_collection, embed, "./quantized_index")
+#
+# benchmarks/bench_embedding_storage.py measures recall@k and memory
+# against plain float32 search and ChromaDB.
+#
+
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+QUANTIZATIONS = ("int8", "float16")
+EXPORT_PAGE_SIZE = 1024
+SEARCH_CHUNK_ROWS = 8192  # Rows dequantized at a time during the approximate pass
+
+
+def _unit_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def _matches(metadata, where):
+    return where is None or all((metadata or {}).get(key) == value for key, value in where.items())
+
+
+def simple_where(where):
+    """Whether a Chroma where filter is plain {"key": value} equality, which the index can apply itself"""
+    return where is None or (isinstance(where, dict) and
+                             all(not key.startswith('$') and not isinstance(value, dict) for key, value in where.items()))
+
+
+class QuantizedIndex:
+    """Quantized vectors in a memory-mapped file, with exact float32 re-scoring of the best candidates"""
+
+    def __init__(self, directory, oversample=4):
+        self.directory = directory
+        self.oversample = oversample
+        with open(os.path.join(directory, "manifest.json"), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.quantization = self.manifest['quantization']
+        count = self.manifest['count']
+        self.vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode='r')[:count]
+        self.exact = np.load(os.path.join(directory, "exact.npy"), mmap_mode='r')[:count]
+        self.scales = np.load(os.path.join(directory, "scales.npy"))[:count] if self.quantization == "int8" else None
+        self.ids, self.metadatas, self._offsets = [], [], []
+        with open(os.path.join(directory, "records.jsonl"), 'rb') as f:
+            offset = 0
+            for line in f:
+                record = json.loads(line)
+                self.ids.append(record['id'])
+                self.metadatas.append(record.get('metadata'))
+                self._offsets.append(offset)
+                offset += len(line)
+
+    @classmethod
+    def build(cls, directory, ids, documents, metadatas, embeddings, quantization="int8", oversample=4, source_count=None):
+        """Write an index for the given records (replacing any index in directory) and open it"""
+        writer = IndexWriter(directory, len(ids), np.asarray(embeddings).shape[1] if len(ids) else 0, quantization)
+        writer.add(ids, documents, metadatas, embeddings)
+        writer.finish(source_count)
+        return cls(directory, oversample=oversample)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resident_bytes(self):
+        """Bytes a search touches on every query: the quantized vectors and their scales"""
+        return self.vectors.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def documents(self, rows):
+        """Texts of the given rows, read from disk"""
+        with open(os.path.join(self.directory, "records.jsonl"), 'rb') as f:
+            documents = []
+            for row in rows:
+                f.seek(self._offsets[row])
+                documents.append(json.loads(f.readline())['document'])
+            return documents
+
+    def _approximate_scores(self, query):
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), SEARCH_CHUNK_ROWS):
+            chunk = np.asarray(self.vectors[start:start + SEARCH_CHUNK_ROWS], dtype=np.float32)
+            scores[start:start + len(chunk)] = chunk @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def search(self, vector, n_results, where=None, exclude=()):
+        """[(row, cosine similarity)] of the n_results best rows, best first"""
+        if not self.ids or n_results <= 0:
+            return []
+        query = _unit_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        scores = self._approximate_scores(query)
+        if where is not None or exclude:
+            excluded = set(exclude)
+            allowed = np.array([_matches(metadata, where) and doc_id not in excluded
+                                for doc_id, metadata in zip(self.ids, self.metadatas)], dtype=bool)
+            scores[~allowed] = -np.inf
+            eligible = int(allowed.sum())
+        else:
+            eligible = len(self.ids)
+        pool = min(n_results * self.oversample, eligible)
+        if pool <= 0:
+            return []
+        candidates = np.argpartition(-scores, pool - 1)[:pool]
+        candidates.sort()  # Sequential reads from the float32 file
+        exact_scores = np.asarray(self.exact[candidates], dtype=np.float32) @ query
+        order = np.argsort(-exact_scores)[:n_results]
+        return [(int(candidates[i]), float(exact_scores[i])) for i in order]
+
+
+class IndexWriter:
+    """Streams records into a new index directory, so an export never holds every float32 vector in memory"""
+
+    def __init__(self, directory, count, dimensions, quantization="int8"):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization '{quantization}'; expected one of {list(QUANTIZATIONS)}")
+        self.directory = directory
+        self.quantization = quantization
+        self.count = count
+        self.dimensions = dimensions
+        self._building = f"{directory}.building-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(self._building, ignore_errors=True)
+        os.makedirs(self._building)
+        open_memmap = np.lib.format.open_memmap
+        self._vectors = open_memmap(os.path.join(self._building, "vectors.npy"), mode='w+',
+                                    dtype=np.int8 if quantization == "int8" else np.float16, shape=(count, dimensions))
+        self._exact = open_memmap(os.path.join(self._building, "exact.npy"), mode='w+', dtype=np.float32, shape=(count, dimensions))
+        self._scales = np.ones(count, dtype=np.float32)
+        self._records = open(os.path.join(self._building, "records.jsonl"), 'w', encoding='utf-8')
+        self._row = 0
+
+    def add(self, ids, documents, metadatas, embeddings):
+        if not len(ids):
+            return
+        rows = _unit_rows(embeddings)
+        end = self._row + len(rows)
+        self._exact[self._row:end] = rows
+        if self.quantization == "int8":
+            # Symmetric per-vector scale: the largest component maps to +/-127
+            scales = np.abs(rows).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._vectors[self._row:end] = np.round(rows / scales[:, None]).astype(np.int8)
+            self._scales[self._row:end] = scales
+        else:
+            self._vectors[self._row:end] = rows.astype(np.float16)
+        metadatas = metadatas if metadatas is not None else [None] * len(ids)
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self._records.write(json.dumps({"id": doc_id, "document": document, "metadata": metadata}, ensure_ascii=False) + "\n")
+        self._row = end
+
+    def finish(self, source_count=None):
+        """Flush the files and move the finished index into place"""
+        if self._row != self.count:
+            raise ValueError(f"index expected {self.count} records, got {self._row}")
+        self._vectors.flush()
+        self._exact.flush()
+        del self._vectors, self._exact
+        self._records.close()
+        np.save(os.path.join(self._building, "scales.npy"), self._scales)
+        with open(os.path.join(self._building, "manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump({"quantization": self.quantization, "count": self.count, "dimensions": self.dimensions,
+                       "source_count": self.count if source_count is None else source_count}, f)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.replace(self._building, self.directory)
+
+
+class QuantizedCollection:
+    """A Chroma collection whose queries are answered from a QuantizedIndex plus the documents upserted since"""
+
+    def __init__(self, collection, embed, directory, quantization="int8", oversample=4, max_delta=256):
+        self.collection = collection
+        self.embed = embed  # The collection's embedding function, for query_texts
+        self.directory = os.path.join(directory, collection.name)
+        self.quantization = quantization
+        self.oversample = oversample
+        self.max_delta = max_delta
+        self.index = None
+        self._delta = {}  # id -> (document, metadata, unit vector) upserted since the index was built
+        self._stale = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_config(cls, collection, embed, settings):
+        return cls(collection, embed, settings.get('directory', "./quantized_index"),
+                   quantization=settings.get('quantization', "int8"), oversample=settings.get('oversample', 4),
+                   max_delta=settings.get('max_delta', 256))
+
+    def __getattr__(self, name):
+        # metadata, modify, count, get, ... go straight to the collection
+        return getattr(self.collection, name)
+
+    def upsert(self, ids, documents=None, metadatas=None, **options):
+        self.collection.upsert(ids=ids, documents=documents, metadatas=metadatas, **options)
+        # Read back the embeddings Chroma just computed rather than embedding the documents again
+        stored = self.collection.get(ids=list(ids), include=["embeddings", "documents", "metadatas"])
+        vectors = _unit_rows(stored['embeddings']) if len(stored['ids']) else []
+        with self._lock:
+            for doc_id, document, metadata, vector in zip(stored['ids'], stored['documents'], stored['metadatas'], vectors):
+                self._delta[doc_id] = (document, metadata, vector)
+            if len(self._delta) > self.max_delta:
+                self._stale = True
+
+    def delete(self, *args, **kwargs):
+        self.collection.delete(*args, **kwargs)
+        with self._lock:
+            self._stale = True
+
+    def _ensure_index(self):
+        with self._lock:
+            if self.index is not None and not self._stale:
+                return self.index
+            source_count = self.collection.count()
+            if not self._stale and os.path.exists(os.path.join(self.directory, "manifest.json")):
+                index = QuantizedIndex(self.directory, oversample=self.oversample)
+                if index.manifest.get('source_count') == source_count and index.quantization == self.quantization:
+                    self.index = index
+                    return index
+            self.index = self._export(source_count)
+            self._delta = {}
+            self._stale = False
+            return self.index
+
+    def _export(self, count):
+        """Build the index from the collection's stored embeddings, a page at a time"""
+        writer = None
+        for offset in range(0, count, EXPORT_PAGE_SIZE):
+            page = self.collection.get(limit=min(EXPORT_PAGE_SIZE, count - offset), offset=offset,
+                                       include=["embeddings", "documents", "metadatas"])
+            if not len(page['ids']):
+                break
+            if writer is None:
+                writer = IndexWriter(self.directory, count, np.asarray(page['embeddings']).shape[1], self.quantization)
+            writer.add(page['ids'], page['documents'], page['metadatas'], page['embeddings'])
+        if writer is None:
+            writer = IndexWriter(self.directory, 0, 0, self.quantization)
+        writer.count = writer._row  # Rows deleted while the collection was exported are simply missing
+        writer.finish(count)
+        return QuantizedIndex(self.directory, oversample=self.oversample)
+
+    def query(self, query_texts=None, query_embeddings=None, n_results=10, where=None, include=None, **options):
+        """collection.query() answered from the index; unsupported filters or options go to the collection"""
+        if options or not simple_where(where) or (query_embeddings is None and self.embed is None):
+            return self.collection.query(query_texts=query_texts, query_embeddings=query_embeddings,
+                                         n_results=n_results, where=where, **({'include': include} if include else {}), **options)
+        vectors = query_embeddings if query_embeddings is not None else self.embed(list(query_texts))
+        index = self._ensure_index()
+        with self._lock:
+            delta = dict(self._delta)
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for vector in vectors:
+            query = _unit_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+            hits = [(similarity, "index", row) for row, similarity in index.search(query, n_results, where, exclude=delta)]
+            hits += [(float(entry[2] @ query), "delta", doc_id) for doc_id, entry in delta.items() if _matches(entry[1], where)]
+            hits = sorted(hits, key=lambda hit: -hit[0])[:n_results]
+            index_documents = iter(index.documents([row for _, source, row in hits if source == "index"]))
+            ids, documents, metadatas = [], [], []
+            for _, source, key in hits:
+                if source == "index":
+                    ids.append(index.ids[key])
+                    documents.append(next(index_documents))
+                    metadatas.append(index.metadatas[key])
+                else:
+                    ids.append(key)
+                    documents.append(delta[key][0])
+                    metadatas.append(delta[key][1])
+            results["ids"].append(ids)
+            results["documents"].append(documents)
+            results["metadatas"].append(metadatas)
+            results["distances"].append([1.0 - hit[0] for hit in hits])
+        return results
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+#
+# Offline Transcript Re-evaluation
+# ================================
+# Re-scores the depth of archived interview exchanges with the current
+# evaluation prompt and evaluation model.
+#
+# Transcript files are streamed one at a time and turned back into
+# (question, response) pairs. Several pairs are packed into one evaluator
+# prompt, as many as the configured prompt-token budget allows, and the
+# batches are fanned out across a thread or process pool. Results are
+# appended to a CSV file as each batch completes, so an interrupted run
+# resumes where it stopped; rows scored with another model or prompt (a
+# different prompt_hash) don't count, so a new campaign can share the file.
+# A Parquet copy can be written at the end for
+# columnar analysis (requires pyarrow).
+#
+# Usage:
+#   python rescore_transcripts.py "interview_*.json" --output rescored.csv [--workers 4] [--pool process]
+#   python rescore_transcripts.py archive/ --output rescored.csv --parquet rescored.parquet
+#
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import ollama
+import yaml
+
+from interview_system import EVALUATION_RESPONSE_SCHEMA, parse_structured_evaluation
+from response_cleaner import strip_think_blocks
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = [
+    "transcript", "transcript_timestamp", "expert_name", "entry_index", "topic",
+    "question", "response", "live_topic_depth", "score", "rationale", "comfort_zone_flags",
+    "evaluation_model", "prompt_hash", "pairs_in_prompt", "evaluated_at"
+]
+
+# Topics that are not depth-evaluated during a live interview
+SKIPPED_TOPICS = ("Introduction", "Conclusion")
+
+BATCH_EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "evaluations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "exchange": {"type": "integer"},
+                    "score": {"type": "integer", "enum": [1, 2, 3]},
+                    "rationale": {"type": "string"},
+                    "comfort_zone_flags": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["exchange", "score", "rationale", "comfort_zone_flags"]
+            }
+        }
+    },
+    "required": ["evaluations"]
+}
+
+DEFAULT_BATCH_INSTRUCTIONS = (
+    "Apply the evaluation criteria above to each of the {count} numbered exchanges below, "
+    "independently of one another. Ignore the single-exchange output format given above.\n\n"
+    "{exchanges}\n\n"
+    'Respond with ONLY a JSON object: {{"evaluations": [{{"exchange": <number>, "score": 1, 2 or 3, '
+    '"rationale": "<one or two sentences>", "comfort_zone_flags": ["<rehearsed phrases or themes>"]}}, ...]}} '
+    "with exactly one entry per exchange."
+)
+
+
+def estimate_tokens(text):
+    """Rough token estimate (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+def expand_transcript_paths(patterns):
+    """Expand files, directories and glob patterns into a sorted list of transcript paths"""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(glob.glob(os.path.join(pattern, "*.json")))
+        else:
+            paths.extend(glob.glob(pattern))
+    return sorted(set(paths))
+
+
+def iter_exchange_pairs(transcript_paths):
+    """Stream (question, response) pairs from transcript files, holding one file in memory at a time"""
+    for path in transcript_paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                transcript = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Skipping unreadable transcript {path}: {e}")
+            continue
+
+        entries = transcript.get('interview', [])
+        metadata = transcript.get('metadata', {})
+        depth_scores = metadata.get('topic_depth_scores', {})
+        for index in range(len(entries) - 1):
+            question_entry, response_entry = entries[index], entries[index + 1]
+            topic = question_entry.get('topic')
+            if question_entry.get('speaker') != "HOST" or response_entry.get('speaker') == "HOST":
+                continue
+            if topic in SKIPPED_TOPICS or response_entry.get('topic') != topic:
+                continue
+            yield {
+                "transcript": path,
+                "transcript_timestamp": transcript.get('timestamp', ''),
+                "expert_name": response_entry.get('speaker', metadata.get('expert_name', '')),
+                "entry_index": index,
+                "topic": topic,
+                "question": question_entry.get('text', ''),
+                "response": response_entry.get('text', ''),
+                "live_topic_depth": depth_scores.get(topic, '')
+            }
+
+
+def pack_pairs(pairs, pairs_per_prompt, max_prompt_tokens, base_prompt_tokens=0):
+    """Group pairs into batches limited by count and by the estimated prompt size"""
+    batch = []
+    batch_tokens = base_prompt_tokens
+    for pair in pairs:
+        pair_tokens = estimate_tokens(pair['question']) + estimate_tokens(pair['response']) + 16
+        if batch and (len(batch) >= pairs_per_prompt or batch_tokens + pair_tokens > max_prompt_tokens):
+            yield batch
+            batch = []
+            batch_tokens = base_prompt_tokens
+        batch.append(pair)
+        batch_tokens += pair_tokens
+    if batch:
+        yield batch
+
+
+def load_completed_keys(output_path):
+    """Read (transcript, entry_index, evaluation_model, prompt_hash) keys already written by an earlier run.
+
+    A score only counts as done for the model and prompt it was produced with, so a campaign with a changed
+    main_prompt or evaluation_llm_model re-scores everything into the same file.
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            completed.add((row['transcript'], int(row['entry_index']), row.get('evaluation_model'), row.get('prompt_hash')))
+    return completed
+
+
+class BatchEvaluator:
+    """Scores packed batches of exchanges; picklable so it can run in worker processes"""
+
+    def __init__(self, config, model=None):
+        self.config = config
+        self.model = model or config.get('evaluation_llm_model', 'qwen3:4b')
+        self.batch_settings = config.get('batch_evaluation', {})
+        self.evaluation_prompts = config.get('prompts', {}).get('evaluation', {})
+        self._client = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_client'] = None  # Each worker process opens its own client
+        return state
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = ollama.Client()
+        return self._client
+
+    @property
+    def prompt_hash(self):
+        """Identifies the evaluation prompt and model a score was produced with"""
+        signature = json.dumps([
+            self.model,
+            self.evaluation_prompts.get('main_prompt', ''),
+            self.evaluation_prompts.get('batch_instructions', DEFAULT_BATCH_INSTRUCTIONS)
+        ])
+        return hashlib.sha1(signature.encode('utf-8')).hexdigest()[:12]
+
+    def _criteria(self):
+        prompt_template = self.evaluation_prompts.get('main_prompt',
+            "Evaluate this response. Score 1-3 and provide rationale.")
+        return prompt_template.format(question="(given per exchange below)", response="(given per exchange below)")
+
+    def base_prompt_tokens(self):
+        instructions = self.evaluation_prompts.get('batch_instructions', DEFAULT_BATCH_INSTRUCTIONS)
+        return estimate_tokens(self._criteria()) + estimate_tokens(instructions)
+
+    def build_batch_prompt(self, batch):
+        exchanges = "\n\n".join(
+            f"### Exchange {number}\nQuestion: {pair['question']}\nExpert's Response: {pair['response']}"
+            for number, pair in enumerate(batch, start=1)
+        )
+        instructions = self.evaluation_prompts.get('batch_instructions', DEFAULT_BATCH_INSTRUCTIONS)
+        return self._criteria() + "\n\n" + instructions.format(count=len(batch), exchanges=exchanges)
+
+    def _generate(self, prompt, schema, num_predict):
+        response = self.client.generate(
+            model=self.model,
+            prompt=prompt,
+            format=schema,
+            options={
+                "temperature": self.config.get('evaluation_llm_temperature', 0.1),
+                "num_predict": num_predict
+            }
+        )
+        return response['response']
+
+    def evaluate_batch(self, batch):
+        """Score a batch with one prompt; exchanges missing from the reply are scored individually"""
+        scored = {}
+        if len(batch) > 1:
+            num_predict = self.batch_settings.get('num_predict_per_pair', 120) * len(batch)
+            try:
+                raw_output = self._generate(self.build_batch_prompt(batch), BATCH_EVALUATION_SCHEMA, num_predict)
+                for item in json.loads(strip_think_blocks(raw_output)).get('evaluations', []):
+                    number = item.get('exchange') if isinstance(item, dict) else None
+                    if isinstance(number, int) and 1 <= number <= len(batch) and number not in scored:
+                        try:
+                            scored[number] = parse_structured_evaluation(json.dumps(item))
+                        except ValueError:
+                            continue
+            except (ValueError, AttributeError, KeyError):
+                pass  # Fall through to single-pair evaluation
+            except Exception as e:
+                # A backend error (Ollama ResponseError, timeout, dropped connection) costs this batch, not the run
+                logger.warning(f"Batch of {len(batch)} exchanges failed ({type(e).__name__}: {e}); scoring them one by one")
+
+        rows = []
+        failures = 0
+        for number, pair in enumerate(batch, start=1):
+            evaluation = scored.get(number)
+            pairs_in_prompt = len(batch)
+            if evaluation is None:
+                evaluation = self.evaluate_single(pair)
+                pairs_in_prompt = 1
+            if evaluation is None:
+                failures += 1
+                continue
+            rows.append(dict(
+                pair,
+                score=evaluation['score'],
+                rationale=evaluation['rationale'],
+                comfort_zone_flags=json.dumps(evaluation['comfort_zone_flags'], ensure_ascii=False),
+                evaluation_model=self.model,
+                prompt_hash=self.prompt_hash,
+                pairs_in_prompt=pairs_in_prompt,
+                evaluated_at=datetime.now().isoformat()
+            ))
+        return rows, failures
+
+    def evaluate_single(self, pair):
+        """Score one exchange with the structured single-exchange prompt, retrying once"""
+        prompt_template = self.evaluation_prompts.get('main_prompt',
+            "Evaluate this response. Score 1-3 and provide rationale.")
+        format_instructions = self.evaluation_prompts.get('structured_format_instructions',
+            'Respond with ONLY a JSON object: {"score": 1, 2 or 3, "rationale": "<one or two sentences>", '
+            '"comfort_zone_flags": ["<rehearsed phrases or themes the expert fell back on>"]}')
+        prompt = prompt_template.format(question=pair['question'], response=pair['response']) + "\n\n" + format_instructions
+        num_predict = self.config.get('structured_evaluation', {}).get('num_predict', 160)
+
+        for _ in range(2):
+            try:
+                return parse_structured_evaluation(self._generate(prompt, EVALUATION_RESPONSE_SCHEMA, num_predict))
+            except ValueError:
+                continue
+            except Exception as e:
+                logger.warning(f"Scoring {pair['transcript']} entry {pair['entry_index']} failed ({type(e).__name__}: {e})")
+        return None
+
+
+def rescore(transcript_paths, output_path, config, workers=4, pool="thread", model=None, log=print):
+    """Re-score every exchange not yet present in output_path. Returns (written, failed) counts."""
+    evaluator = BatchEvaluator(config, model=model)
+    batch_settings = config.get('batch_evaluation', {})
+    pairs_per_prompt = batch_settings.get('pairs_per_prompt', 4)
+    max_prompt_tokens = batch_settings.get('max_prompt_tokens', 6000)
+
+    prompt_hash = evaluator.prompt_hash
+    completed = {key for key in load_completed_keys(output_path) if key[2:] == (evaluator.model, prompt_hash)}
+    if completed:
+        log(f"↻ Resuming: {len(completed)} exchanges already scored with {evaluator.model} (prompt {prompt_hash}) in {output_path}")
+
+    pairs = (
+        pair for pair in iter_exchange_pairs(transcript_paths)
+        if (pair['transcript'], pair['entry_index'], evaluator.model, prompt_hash) not in completed
+    )
+    batches = pack_pairs(pairs, pairs_per_prompt, max_prompt_tokens, evaluator.base_prompt_tokens())
+
+    write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+    written = 0
+    failed = 0
+    start_time = time.time()
+    executor_class = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+
+    with open(output_path, 'a', encoding='utf-8', newline='') as output_file, executor_class(max_workers=workers) as executor:
+        writer = csv.DictWriter(output_file, fieldnames=RESULT_COLUMNS)
+        if write_header:
+            writer.writeheader()
+
+        def collect(finished):
+            nonlocal written, failed
+            # Futures come back as a set; keep rows in submission order within each flush
+            for future in sorted(finished, key=submission_order.get):
+                rows, failures = future.result()
+                writer.writerows(rows)
+                written += len(rows)
+                failed += failures
+            output_file.flush()  # Every finished batch is durable progress
+            elapsed = time.time() - start_time
+            log(f"   {written} exchanges scored, {failed} failed ({written / elapsed * 60 if elapsed else 0:.1f}/min)")
+
+        in_flight = set()
+        submission_order = {}
+        for batch in batches:
+            # Bound the number of queued batches so transcripts keep streaming instead of loading all at once
+            if len(in_flight) >= workers * 2:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+            future = executor.submit(evaluator.evaluate_batch, batch)
+            submission_order[future] = len(submission_order)
+            in_flight.add(future)
+        if in_flight:
+            finished, _ = wait(in_flight)
+            collect(finished)
+
+    return written, failed
+
+
+def write_parquet(csv_path, parquet_path):
+    """Write a columnar copy of the results (requires pyarrow)"""
+    try:
+        import pyarrow.csv as pa_csv
+        import pyarrow.parquet as pa_parquet
+    except ImportError:
+        print("❌ Writing Parquet requires pyarrow (pip install pyarrow). CSV results are unaffected.")
+        return False
+    pa_parquet.write_table(pa_csv.read_csv(csv_path), parquet_path)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score archived interview transcripts with the current evaluator.")
+    parser.add_argument('transcripts', nargs='+', help="Transcript files, directories or glob patterns")
+    parser.add_argument('--output', default="rescored_exchanges.csv", help="CSV results file (appended to; enables resume)")
+    parser.add_argument('--parquet', default=None, help="Also write the results as a Parquet file at the end")
+    parser.add_argument('--config', default="config.yaml", help="Path to config.yaml")
+    parser.add_argument('--model', default=None, help="Evaluation model (defaults to evaluation_llm_model)")
+    parser.add_argument('--workers', type=int, default=None, help="Concurrent evaluator calls")
+    parser.add_argument('--pool', choices=["thread", "process"], default="thread", help="Worker pool type")
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+
+    transcript_paths = expand_transcript_paths(args.transcripts)
+    print(f"🔁 Re-scoring exchanges from {len(transcript_paths)} transcript(s) into {args.output}")
+    workers = args.workers or config.get('batch_evaluation', {}).get('workers', 4)
+    written, failed = rescore(transcript_paths, args.output, config, workers=workers, pool=args.pool, model=args.model)
+    print(f"✓ Done: {written} exchanges scored, {failed} could not be scored (re-run to retry them)")
+
+    if args.parquet and write_parquet(args.output, args.parquet):
+        print(f"💾 Columnar results written to {args.parquet}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+#
+# Response Cleaning
+# =================
+# Strips model scaffolding from generated text: <think> blocks, label
+# prefixes such as **Opening Question:**, **Rationale:** lines, leading
+# speaker tags, surrounding quotes and redundant whitespace.
+#
+# clean_response_text() cleans a complete response using precompiled
+# patterns. StreamingResponseCleaner produces the same result from a
+# stream of token chunks, emitting cleaned text as soon as it is stable so
+# it can be displayed (and checked against a word budget) while the model
+# is still generating.
+#
+
+import re
+
+THINK_OPEN_TAG = "<think>"
+THINK_CLOSE_TAG = "</think>"
+THINK_TAG_PATTERN = re.compile(r'<(/?)think>')
+LABEL_PATTERN = re.compile(r'\*\*(Opening|Follow-up) Question:\*\*\s*"?')
+LABEL_LITERALS = ("**Opening Question:**", "**Follow-up Question:**")
+RATIONALE_LITERAL = "**Rationale:**"
+RATIONALE_LINE_PATTERN = re.compile(r'\*\*Rationale:\*\*.*')
+BOLD_SPEAKER_PATTERN = re.compile(r"^\*\*(MLK|HOST):\*\* ?")
+BOLD_SPEAKER_LITERALS = ("**MLK:**", "**HOST:**")
+SPEAKER_PATTERN = re.compile(r"^(MLK|HOST): ?")
+SPEAKER_LITERALS = ("MLK:", "HOST:")
+QUOTE_CHARACTERS = ('"', "'")
+WHITESPACE_RUN_PATTERN = re.compile(r'\s+')
+# Content runs (group 1) versus whitespace and, when the response opened with a quote, that quote character
+FORMAT_TOKEN_PATTERNS = {
+    None: re.compile(r'(\S+)|\s+'),
+    '"': re.compile(r'([^\s"]+)|\s+|"'),
+    "'": re.compile(r"([^\s']+)|\s+|'"),
+}
+
+
+def strip_think_blocks(text):
+    """Remove <think> blocks, including nested ones. Unclosed blocks are dropped to the end of the text."""
+    if THINK_OPEN_TAG not in text and THINK_CLOSE_TAG not in text:
+        return text
+
+    pieces = []
+    depth = 0
+    position = 0
+    for match in THINK_TAG_PATTERN.finditer(text):
+        if depth == 0:
+            pieces.append(text[position:match.start()])
+        if match.group(1):
+            depth = max(depth - 1, 0)  # A stray closing tag is simply removed
+        else:
+            depth += 1
+        position = match.end()
+    if depth == 0:
+        pieces.append(text[position:])
+    return ''.join(pieces)
+
+
+def clean_response_text(text):
+    """Remove thinking tags and clean up response formatting"""
+    text = strip_think_blocks(text)
+
+    if '**' in text:
+        # Remove **Label:** formatting like **Opening Question:** or **Follow-up Question:**
+        text = LABEL_PATTERN.sub('', text)
+        # Remove **Rationale:** and the rest of its line
+        text = RATIONALE_LINE_PATTERN.sub('', text)
+
+    # Remove potential speaker tags like **MLK:** or HOST: at the start
+    text = BOLD_SPEAKER_PATTERN.sub('', text.strip())
+    text = SPEAKER_PATTERN.sub('', text.strip())
+
+    # Remove surrounding quotes
+    text = text.strip()
+    if text and text[0] in QUOTE_CHARACTERS and text[-1] == text[0]:
+        text = text[1:-1]
+
+    # Clean up extra whitespace and newlines
+    return ' '.join(text.split())
+
+
+class StreamingResponseCleaner:
+    """State machine that cleans a response chunk by chunk.
+
+    feed() returns the newly stable cleaned text; finish() returns the complete
+    cleaned response, which always equals clean_response_text() of the joined
+    chunks. A leading quote is withheld from the streamed text until it is known
+    whether a matching closing quote removes it.
+    """
+
+    def __init__(self):
+        # <think> stage
+        self._think_buffer = ""
+        self._think_depth = 0
+        # Label prefix stage
+        self._label_buffer = ""
+        # **Rationale:** stage
+        self._rationale_buffer = ""
+        self._dropping_rationale = False
+        # Leading speaker tag stage: "bold" -> "plain" -> "body"
+        self._lead_buffer = ""
+        self._lead_state = "bold"
+        # Quote and whitespace stage
+        self._started = False
+        self._opening_quote = None
+        self._body_leading_space = False
+        self._tail = []
+        self._body = []
+        self._space_count = 0
+        self._final_text = None
+
+    @property
+    def text(self):
+        """Cleaned text emitted so far"""
+        if self._final_text is not None:
+            return self._final_text
+        return ''.join(self._body)
+
+    @property
+    def word_count(self):
+        """Number of words in the cleaned text emitted so far"""
+        if self._final_text is not None:
+            return len(self._final_text.split())
+        return self._space_count + 1 if self._body else 0
+
+    def feed(self, chunk):
+        """Consume the next chunk and return the cleaned text that became stable"""
+        if self._final_text is not None:
+            raise ValueError("Cannot feed a StreamingResponseCleaner after finish()")
+        text = self._think_stage(chunk, False)
+        text = self._label_stage(text, False)
+        text = self._rationale_stage(text, False)
+        text = self._lead_stage(text, False)
+        return self._format_stage(text)
+
+    def finish(self):
+        """Flush all buffered state and return the complete cleaned response"""
+        if self._final_text is not None:
+            return self._final_text
+        text = self._think_stage("", True)
+        text = self._label_stage(text, True)
+        text = self._rationale_stage(text, True)
+        text = self._lead_stage(text, True)
+        self._format_stage(text)
+        self._final_text = self._resolve_ending()
+        return self._final_text
+
+    def _think_stage(self, text, final):
+        buffer = self._think_buffer + text
+        output = []
+        while buffer:
+            index = buffer.find('<')
+            if index == -1:
+                if self._think_depth == 0:
+                    output.append(buffer)
+                buffer = ""
+                break
+            if self._think_depth == 0:
+                output.append(buffer[:index])
+            buffer = buffer[index:]
+            if buffer.startswith(THINK_OPEN_TAG):
+                self._think_depth += 1
+                buffer = buffer[len(THINK_OPEN_TAG):]
+                continue
+            if buffer.startswith(THINK_CLOSE_TAG):
+                self._think_depth = max(self._think_depth - 1, 0)
+                buffer = buffer[len(THINK_CLOSE_TAG):]
+                continue
+            if not final and (THINK_OPEN_TAG.startswith(buffer) or THINK_CLOSE_TAG.startswith(buffer)):
+                break  # Might still become a tag once the next chunk arrives
+            if self._think_depth == 0:
+                output.append('<')
+            buffer = buffer[1:]
+        self._think_buffer = buffer
+        return ''.join(output)
+
+    def _label_stage(self, text, final):
+        buffer = self._label_buffer + text
+        output = []
+        while buffer:
+            index = buffer.find('**')
+            if index == -1:
+                if not final and buffer.endswith('*'):
+                    output.append(buffer[:-1])
+                    buffer = '*'
+                else:
+                    output.append(buffer)
+                    buffer = ""
+                break
+            output.append(buffer[:index])
+            buffer = buffer[index:]
+            match = LABEL_PATTERN.match(buffer)
+            if match:
+                if not final and match.end() == len(buffer) and not buffer.endswith('"'):
+                    break  # Trailing whitespace or an opening quote may still follow
+                buffer = buffer[match.end():]
+                continue
+            if not final and any(literal.startswith(buffer) for literal in LABEL_LITERALS):
+                break
+            output.append(buffer[0])
+            buffer = buffer[1:]
+        self._label_buffer = buffer
+        return ''.join(output)
+
+    def _rationale_stage(self, text, final):
+        buffer = self._rationale_buffer + text
+        output = []
+        while buffer:
+            if self._dropping_rationale:
+                newline = buffer.find('\n')
+                if newline == -1:
+                    buffer = ""
+                    break
+                self._dropping_rationale = False
+                buffer = buffer[newline:]
+                continue
+            index = buffer.find('**')
+            if index == -1:
+                if not final and buffer.endswith('*'):
+                    output.append(buffer[:-1])
+                    buffer = '*'
+                else:
+                    output.append(buffer)
+                    buffer = ""
+                break
+            output.append(buffer[:index])
+            buffer = buffer[index:]
+            if buffer.startswith(RATIONALE_LITERAL):
+                self._dropping_rationale = True
+                buffer = buffer[len(RATIONALE_LITERAL):]
+                continue
+            if not final and RATIONALE_LITERAL.startswith(buffer):
+                break
+            output.append(buffer[0])
+            buffer = buffer[1:]
+        self._rationale_buffer = buffer
+        return ''.join(output)
+
+    def _lead_stage(self, text, final):
+        if self._lead_state == "body":
+            return text
+        buffer = self._lead_buffer + text
+        for state, literals in (("bold", BOLD_SPEAKER_LITERALS), ("plain", SPEAKER_LITERALS)):
+            if self._lead_state != state:
+                continue
+            buffer = buffer.lstrip()
+            if not buffer and not final:
+                self._lead_buffer = ""
+                return ""
+            matched = next((literal for literal in literals if buffer.startswith(literal)), None)
+            if matched:
+                rest = buffer[len(matched):]
+                if not rest and not final:
+                    self._lead_buffer = buffer
+                    return ""  # Need one more character to know whether a space follows
+                buffer = rest[1:] if rest.startswith(' ') else rest
+            elif not final and any(literal.startswith(buffer) for literal in literals):
+                self._lead_buffer = buffer
+                return ""
+            self._lead_state = "plain" if state == "bold" else "body"
+        self._lead_buffer = ""
+        return buffer.lstrip()
+
+    def _format_stage(self, text):
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+            if text[0] in QUOTE_CHARACTERS:
+                self._opening_quote = text[0]
+                text = text[1:]
+        token_pattern = FORMAT_TOKEN_PATTERNS[self._opening_quote]
+        output = []
+        for match in token_pattern.finditer(text):
+            if match.lastindex != 1:
+                # Whitespace, or a quote that may turn out to be the closing one
+                self._tail.append(match.group())
+                continue
+            if self._tail:
+                collapsed = WHITESPACE_RUN_PATTERN.sub(' ', ''.join(self._tail))
+                self._tail = []
+                if not self._body and not output and collapsed.startswith(' '):
+                    self._body_leading_space = True
+                    collapsed = collapsed[1:]
+                output.append(collapsed)
+            output.append(match.group())
+        delta = ''.join(output)
+        if delta:
+            self._body.append(delta)
+            self._space_count += delta.count(' ')
+        return delta
+
+    def _resolve_ending(self):
+        body = ''.join(self._body)
+        tail = ''.join(self._tail).rstrip()
+        if not body:
+            # Nothing but quotes and whitespace arrived; let the batch rules decide
+            return clean_response_text((self._opening_quote or '') + tail)
+        if self._opening_quote and tail.endswith(self._opening_quote):
+            return (body + WHITESPACE_RUN_PATTERN.sub(' ', tail[:-1])).rstrip()
+        prefix = ''
+        if self._opening_quote:
+            prefix = self._opening_quote + (' ' if self._body_leading_space else '')
+        return prefix + body + WHITESPACE_RUN_PATTERN.sub(' ', tail)
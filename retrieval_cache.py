@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+#
+# Semantic Retrieval Cache
+# ========================
+# Follow-up questions within a topic are often close paraphrases of each
+# other, and each one used to pay for a web search, a web snippet upsert
+# and an expert collection query. This cache keys the knowledge block
+# retrieved for a question by the question's embedding: a later question
+# within max_cosine_distance of a cached one (for the same expert) reuses
+# its block and skips the search entirely.
+#
+# Entries expire after ttl_seconds, the least recently used are evicted
+# past max_entries, and every entry for an expert is dropped when that
+# expert's collection is changed by another writer (invalidate(): persona
+# ingestion, topic briefings), so a cached block never hides documents
+# added since it was retrieved. Web snippets added on a miss don't
+# invalidate: they were searched for that miss's question, not the cached
+# ones. The cache is thread-safe, so topic briefings built in the
+# background can invalidate it.
+#
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SemanticRetrievalCache:
+    """Knowledge blocks keyed by question embedding, matched by cosine distance"""
+
+    def __init__(self, max_cosine_distance=0.08, max_entries=256, ttl_seconds=1800, clock=time.monotonic):
+        self.max_cosine_distance = max_cosine_distance
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()  # id -> (namespace, unit vector, knowledge, stored at), least recently used first
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    @classmethod
+    def from_config(cls, settings):
+        return cls(max_cosine_distance=settings.get('max_cosine_distance', 0.08),
+                   max_entries=settings.get('max_entries', 256),
+                   ttl_seconds=settings.get('ttl_seconds', 1800))
+
+    @staticmethod
+    def _unit(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expire(self):
+        if not self.ttl_seconds:
+            return
+        cutoff = self.clock() - self.ttl_seconds
+        expired = [entry_id for entry_id, entry in self._entries.items() if entry[3] < cutoff]
+        for entry_id in expired:
+            del self._entries[entry_id]
+        self.stats['expirations'] += len(expired)
+
+    def lookup(self, namespace, vector):
+        """The cached knowledge for the nearest question within max_cosine_distance, or None"""
+        with self._lock:
+            self._expire()
+            candidates = [(entry_id, entry) for entry_id, entry in self._entries.items() if entry[0] == namespace]
+            if candidates:
+                matrix = np.vstack([entry[1] for _, entry in candidates])
+                similarities = matrix @ self._unit(vector)
+                best = int(np.argmax(similarities))
+                if 1.0 - similarities[best] <= self.max_cosine_distance:
+                    entry_id, entry = candidates[best]
+                    self._entries.move_to_end(entry_id)
+                    self.stats['hits'] += 1
+                    return entry[2]
+            self.stats['misses'] += 1
+            return None
+
+    def store(self, namespace, vector, knowledge):
+        with self._lock:
+            self._entries[self._next_id] = (namespace, self._unit(vector), knowledge, self.clock())
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, namespace=None):
+        """Drop every entry for a namespace (or all of them); call when its collection changes"""
+        with self._lock:
+            stale = [entry_id for entry_id, entry in self._entries.items() if namespace is None or entry[0] == namespace]
+            for entry_id in stale:
+                del self._entries[entry_id]
+            self.stats['invalidations'] += len(stale)
+            return len(stale)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def report(self):
+        """Counters plus the hit rate over all lookups so far"""
+        with self._lock:
+            stats, entries = dict(self.stats), len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        return {**stats, 'entries': entries, 'hit_rate': round(stats['hits'] / lookups, 3) if lookups else 0.0}
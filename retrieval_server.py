@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+#
+# Retrieval Server
+# ================
+# chromadb.PersistentClient(path=...) is opened separately by every process,
+# so interview workers either each copy chroma_db or contend for one
+# directory that was never meant to be shared. This server is the one
+# process that opens the store; workers reach the host and expert
+# collections through RetrievalClient, which stands in for the Chroma
+# client (set retrieval_server.url in config.yaml). Every interview then
+# shares one consistent, warm index.
+#
+# Queries for the same collection and parameters that arrive within
+# batch_window_ms are answered by a single collection.query() call, so
+# their texts are embedded as one batch. The client keeps a pool of
+# keep-alive connections instead of connecting per request.
+#
+# Embeddings are computed by the server's collections (Chroma's default
+# embedding function); an embedding_function passed by a client is ignored.
+#
+# Endpoints (JSON bodies, /collections/<name>/<operation>):
+#   POST /collections/<name>/open     {"metadata": {...}}  -> {"name": ..., "metadata": {...}}
+#   POST /collections/<name>/query    collection.query() arguments -> its result
+#   POST /collections/<name>/upsert   {"ids": [...], "documents": [...], "metadatas": [...]}
+#   POST /collections/<name>/delete   {"ids": [...]} or {"where": {...}}
+#   POST /collections/<name>/modify   {"metadata": {...}}
+#   POST /collections/<name>/count    {} -> {"count": n}
+#   GET  /health                      open collections and batching statistics
+#
+# Usage:
+#   python retrieval_server.py --port 8766              # opens chromadb.path from config.yaml
+#   retrieval_server: {url: "http://127.0.0.1:8766"}    # in each worker's config.yaml
+#
+
+import argparse
+import http.client
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlparse
+
+import yaml
+
+QUERY_RESULT_FIELDS = ("ids", "documents", "metadatas", "distances", "embeddings", "uris", "data")
+
+
+def _jsonable(value):
+    """Chroma results may hold numpy arrays; turn them into lists"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+class RetrievalServerError(Exception):
+    """The retrieval server rejected a request or failed to run it"""
+
+    def __init__(self, status, message):
+        super().__init__(f"retrieval server returned {status}: {message}")
+        self.status = status
+
+
+class _Batch:
+    def __init__(self):
+        self.items = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.closed = False
+        self.results = None
+        self.error = None
+
+
+class QueryBatcher:
+    """Groups requests with the same key that arrive within a short window into one call"""
+
+    def __init__(self, window_seconds=0.005, max_batch_size=32):
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._open = {}  # key -> batch still accepting items
+        self.stats = {'requests': 0, 'batches': 0}
+
+    def submit(self, key, items, execute):
+        """Run execute(all items of the batch) -> one result per item, and return this request's results"""
+        with self._lock:
+            self.stats['requests'] += 1
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open[key] = _Batch()
+            start = len(batch.items)
+            batch.items.extend(items)
+            if len(batch.items) >= self.max_batch_size:
+                batch.full.set()
+                del self._open[key]
+
+        if leader:
+            # The first request waits out the window for others, then runs the whole batch
+            batch.full.wait(self.window_seconds)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+                self.stats['batches'] += 1
+            try:
+                batch.results = execute(batch.items)
+            except Exception as e:
+                batch.error = e
+            batch.done.set()
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[start:start + len(items)]
+
+
+class RetrievalServer:
+    """Owns the Chroma client and its collections and serves them over HTTP"""
+
+    def __init__(self, chroma_client, batch_window_ms=5, max_batch_size=32):
+        self.chroma_client = chroma_client
+        self.batcher = QueryBatcher(batch_window_ms / 1000.0, max_batch_size)
+        self._collections = {}
+        self._lock = threading.Lock()
+        self.httpd = None
+
+    @classmethod
+    def from_config(cls, config):
+        import chromadb
+        settings = config.get('retrieval_server', {})
+        chroma_client = chromadb.PersistentClient(path=config.get('chromadb', {}).get('path', "./chroma_db"))
+        return cls(chroma_client, batch_window_ms=settings.get('batch_window_ms', 5),
+                   max_batch_size=settings.get('max_batch_size', 32))
+
+    def collection(self, name, metadata=None):
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self.chroma_client.get_or_create_collection(name=name, metadata=metadata)
+                self._collections[name] = collection
+            return collection
+
+    def query(self, name, arguments):
+        """collection.query(), batched with concurrent queries that share everything but their query texts/embeddings"""
+        collection = self.collection(name)
+        kind = "query_embeddings" if arguments.get('query_embeddings') is not None else "query_texts"
+        queries = arguments.get(kind) or []
+        options = {key: value for key, value in arguments.items() if key not in ("query_texts", "query_embeddings")}
+        key = (name, kind, json.dumps(options, sort_keys=True))
+
+        def execute(all_queries):
+            result = collection.query(**{kind: all_queries}, **options)
+            # One result row per query; split the fields that have rows, keep the rest (e.g. "included") as is
+            return [{field: (value[i:i + 1] if field in QUERY_RESULT_FIELDS and value is not None else value)
+                     for field, value in result.items()} for i in range(len(all_queries))]
+
+        rows = self.batcher.submit(key, queries, execute)
+        merged = {}
+        for field in rows[0] if rows else ():
+            if field in QUERY_RESULT_FIELDS and rows[0][field] is not None:
+                merged[field] = [row for result in rows for row in result[field]]
+            else:
+                merged[field] = rows[0][field]
+        return merged
+
+    def serve(self, host="127.0.0.1", port=8766):
+        """Start the HTTP server in a background thread. Returns the bound (host, port)."""
+        handler = type("BoundRetrievalHandler", (RetrievalRequestHandler,), {"server_state": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, name="retrieval-server-http", daemon=True).start()
+        return self.httpd.server_address
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+class RetrievalRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pooled client connections are reused
+    server_state = None  # Bound per server by RetrievalServer.serve()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(_jsonable(payload), ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            return self._send_json(404, {"error": "not found"})
+        state = self.server_state
+        self._send_json(200, {"collections": sorted(state._collections), "batching": dict(state.batcher.stats)})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        parts = [unquote(part) for part in urlparse(self.path).path.split('/') if part]
+        if len(parts) != 3 or parts[0] != "collections":
+            return self._send_json(404, {"error": "not found"})
+        _, name, operation = parts
+        try:
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+
+        state = self.server_state
+        try:
+            if operation == "open":
+                collection = state.collection(name, request.get('metadata'))
+                return self._send_json(200, {"name": name, "metadata": collection.metadata})
+            if operation == "query":
+                return self._send_json(200, state.query(name, request))
+            collection = state.collection(name)
+            if operation == "upsert":
+                collection.upsert(**request)
+            elif operation == "delete":
+                collection.delete(**request)
+            elif operation == "modify":
+                collection.modify(**request)
+            elif operation == "count":
+                return self._send_json(200, {"count": collection.count()})
+            else:
+                return self._send_json(404, {"error": f"unknown operation '{operation}'"})
+        except (TypeError, ValueError) as e:
+            return self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            return self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+        self._send_json(200, {"ok": True})
+
+
+class RetrievalClient:
+    """Stands in for a chromadb client, with collections served by a RetrievalServer"""
+
+    def __init__(self, url, pool_size=4, timeout=30):
+        parsed = urlparse(url)
+        if parsed.scheme != "http" or not parsed.hostname:
+            raise ValueError(f"Retrieval server URL must be http://host:port, got '{url}'")
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=max(1, pool_size))  # Idle keep-alive connections
+
+    @classmethod
+    def from_config(cls, settings):
+        return cls(settings['url'], pool_size=settings.get('pool_size', 4), timeout=settings.get('timeout_seconds', 30))
+
+    def _connection(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def request(self, collection_name, operation, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        path = f"/collections/{quote(collection_name, safe='')}/{operation}"
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+                response = connection.getresponse()
+                data = json.loads(response.read() or b"{}")
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                if attempt:
+                    raise
+                continue  # A pooled connection the server has since closed; retry once on a fresh one
+            except Exception:
+                connection.close()
+                raise
+            self._release(connection)
+            if response.status != 200:
+                raise RetrievalServerError(response.status, data.get('error', "unknown error"))
+            return data
+
+    def get_or_create_collection(self, name, metadata=None, **options):
+        """options (e.g. embedding_function) are ignored; the server's collections embed documents themselves"""
+        opened = self.request(name, "open", {"metadata": metadata})
+        return RemoteCollection(self, name, opened.get('metadata'))
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class RemoteCollection:
+    """The collection calls the interview system makes, forwarded to the retrieval server"""
+
+    def __init__(self, client, name, metadata=None):
+        self.client = client
+        self.name = name
+        self.metadata = metadata
+
+    def query(self, **arguments):
+        return self.client.request(self.name, "query", arguments)
+
+    def upsert(self, ids, documents=None, metadatas=None):
+        payload = {"ids": list(ids), "documents": documents}
+        if metadatas is not None:
+            payload["metadatas"] = metadatas
+        self.client.request(self.name, "upsert", payload)
+
+    def delete(self, ids=None, where=None):
+        self.client.request(self.name, "delete", {key: value for key, value in (("ids", ids), ("where", where)) if value is not None})
+
+    def modify(self, metadata=None, name=None):
+        self.client.request(self.name, "modify", {key: value for key, value in (("metadata", metadata), ("name", name)) if value is not None})
+        if metadata is not None:
+            self.metadata = metadata
+
+    def count(self):
+        return self.client.request(self.name, "count", {})['count']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the ChromaDB knowledge store to interview processes over HTTP.")
+    parser.add_argument('--config', default="config.yaml")
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--path', default=None, help="ChromaDB directory (defaults to chromadb.path)")
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    if args.path is not None:
+        config.setdefault('chromadb', {})['path'] = args.path
+    settings = config.get('retrieval_server', {})
+
+    server = RetrievalServer.from_config(config)
+    host, port = server.serve(args.host or settings.get('host', "127.0.0.1"),
+                              settings.get('port', 8766) if args.port is None else args.port)
+    print(f"📚 Retrieval server for {config.get('chromadb', {}).get('path', './chroma_db')} listening on http://{host}:{port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping retrieval server...")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
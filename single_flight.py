@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+#
+# Single-Flight Request Coalescing
+# ================================
+# Concurrent interviews in one process (interview_service.py workers,
+# interview_worker.py --threads, load tests) often share default_topics,
+# the host persona and the prompt templates, so they issue identical
+# opening-question generations, embedding requests and pattern queries at
+# the same moment. A SingleFlight group lets the first caller of a key
+# make the backend call while identical callers that arrive before it
+# finishes wait and get (a copy of) its result, or its exception.
+# Nothing is cached: once the call finishes, the next request for the
+# key makes a new call.
+#
+# PROCESS_GROUP is shared by every RecursiveInterviewSystem in the process;
+# the interview system decides which requests are safe to share (see
+# single_flight in config.yaml).
+#
+# Usage:
+#   result, shared = PROCESS_GROUP.do("llm", request_key(model, prompt, options), lambda: client.generate(...))
+#
+
+import copy
+import hashlib
+import json
+import threading
+from collections import defaultdict
+
+
+def request_key(*parts):
+    """A stable key for a request's parameters (dicts compare regardless of key order)"""
+    encoded = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # (kind, key) -> call in flight
+        self.stats = defaultdict(lambda: {'requests': 0, 'shared': 0})
+
+    def do(self, kind, key, function):
+        """(result, shared): run function, or wait for the identical call already running"""
+        with self._lock:
+            self.stats[kind]['requests'] += 1
+            call = self._calls.get((kind, key))
+            leader = call is None
+            if leader:
+                call = self._calls[(kind, key)] = _Call()
+            else:
+                self.stats[kind]['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Each waiter gets its own copy, so no caller can change another's result
+            return copy.deepcopy(call.result), True
+
+        try:
+            call.result = function()
+            return call.result, False
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[(kind, key)]
+            call.done.set()
+
+    def report(self):
+        with self._lock:
+            return {kind: dedup_report(stats) for kind, stats in sorted(self.stats.items())}
+
+
+def dedup_report(stats):
+    """Requests, backend calls made and the share of requests served by another caller's call"""
+    requests, shared = stats['requests'], stats['shared']
+    return {"requests": requests, "backend_calls": requests - shared, "shared": shared,
+            "dedup_ratio": round(shared / requests, 3) if requests else 0.0}
+
+
+PROCESS_GROUP = SingleFlight()
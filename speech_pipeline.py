@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+#
+# Speech Pipeline
+# ===============
+# Renders an episode's audio while the interview is still running, instead
+# of from the finished script afterwards (voice-sythesis_pipeline.md).
+# Cleaned host and expert text arrives sentence by sentence; each sentence
+# is handed to a text-to-speech backend on a worker pool, so both speakers
+# synthesize in parallel, and an assembler thread appends the finished
+# clips to the episode WAV in script order as soon as they are ready.
+#
+# Clips are cached on disk by (voice, text hash): the fixed introduction,
+# re-runs and repeated lines are synthesized once.
+#
+# A backend is any object with synthesize(text, voice) -> WAV bytes. All
+# clips of an episode must share one sample rate, width and channel count.
+#   ToneTTSBackend   local stand-in: a quiet tone per voice (or silence)
+#                    lasting as long as the text would take to say; no
+#                    model or network needed, so tests and dry runs use it
+#   "module:Class"   any other backend, imported by load_backend()
+#
+# Usage:
+#   pipeline = SpeechPipeline(ToneTTSBackend(), cache_directory="./audio_cache")
+#   episode = pipeline.start_episode("./audio/episode.wav")
+#   line = episode.utterance("host")
+#   line.feed("Welcome to The Recursive. Today we")   # streamed pieces
+#   line.finish()
+#   report = episode.close()                           # waits for the last clips
+#
+
+import hashlib
+import importlib
+import io
+import os
+import queue
+import re
+import tempfile
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# A sentence ends at . ! ? or … (plus any closing quotes or brackets) followed by whitespace
+SENTENCE_END_PATTERN = re.compile(r'[.!?…]+["\'”’)\]]*\s+')
+
+
+class SentenceSplitter:
+    """Turns a stream of text pieces into complete sentences"""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text):
+        """Add text and return the sentences it completed"""
+        self._buffer += text
+        sentences = []
+        position = 0
+        for match in SENTENCE_END_PATTERN.finditer(self._buffer):
+            sentence = self._buffer[position:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            position = match.end()
+        self._buffer = self._buffer[position:]
+        return sentences
+
+    def flush(self):
+        """Return whatever is left as a final sentence (or nothing)"""
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+def wav_bytes(samples, sample_rate):
+    """Encode float samples in [-1, 1] as 16-bit mono WAV"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+class ToneTTSBackend:
+    """Stand-in TTS: a tone per voice (or silence) as long as the text would take to speak"""
+
+    def __init__(self, sample_rate=16000, words_per_minute=150, tone=True, amplitude=0.1):
+        self.sample_rate = sample_rate
+        self.words_per_minute = words_per_minute
+        self.tone = tone
+        self.amplitude = amplitude
+
+    def duration(self, text):
+        return max(len(text.split()), 1) * 60.0 / self.words_per_minute
+
+    def synthesize(self, text, voice):
+        frames = int(round(self.duration(text) * self.sample_rate))
+        if not self.tone:
+            return wav_bytes(np.zeros(frames), self.sample_rate)
+        # Each voice gets its own pitch so the speakers can be told apart when listening
+        frequency = 180 + int(hashlib.sha1(voice.encode('utf-8')).hexdigest()[:4], 16) % 160
+        t = np.arange(frames) / self.sample_rate
+        return wav_bytes(self.amplitude * np.sin(2 * np.pi * frequency * t), self.sample_rate)
+
+
+TTS_BACKENDS = {
+    "tone": ToneTTSBackend,
+}
+
+
+def load_backend(name, options=None):
+    """A backend by short name ("tone") or import path ("package.module:ClassName")"""
+    if name in TTS_BACKENDS:
+        backend_class = TTS_BACKENDS[name]
+    elif ':' in name:
+        module_name, class_name = name.split(':', 1)
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+    else:
+        raise ValueError(f"Unknown TTS backend '{name}' (use one of {sorted(TTS_BACKENDS)} or 'module:Class')")
+    return backend_class(**(options or {}))
+
+
+class AudioCache:
+    """Synthesized clips on disk, keyed by (voice, text hash)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, voice, text):
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, re.sub(r'[^A-Za-z0-9_.-]+', '_', voice), f"{digest}.wav")
+
+    def get(self, voice, text):
+        path = self.path(voice, text)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def put(self, voice, text, audio):
+        path = self.path(voice, text)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so a concurrent reader never sees half a clip
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio)
+        os.replace(temp_path, path)
+
+
+class SpeechPipeline:
+    """Shared synthesis pool and clip cache; start_episode() opens the audio for one interview"""
+
+    def __init__(self, backend, cache_directory=None, workers=4, pause_seconds=0.4):
+        self.backend = backend
+        self.cache = AudioCache(cache_directory) if cache_directory else None
+        self.pause_seconds = pause_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="tts")
+        self._lock = threading.Lock()
+        self._pending = {}  # (voice, text) -> future, so a line requested twice at once is synthesized once
+        self.stats = {'synthesized': 0, 'cache_hits': 0}
+
+    @classmethod
+    def from_config(cls, settings):
+        backend = load_backend(settings.get('backend', "tone"), settings.get('backend_options'))
+        return cls(backend, cache_directory=settings.get('cache_directory', "./audio_cache"),
+                   workers=settings.get('workers', 4), pause_seconds=settings.get('pause_seconds', 0.4))
+
+    def _synthesize(self, voice, text):
+        if self.cache:
+            audio = self.cache.get(voice, text)
+            if audio is not None:
+                with self._lock:
+                    self.stats['cache_hits'] += 1
+                return audio
+        audio = self.backend.synthesize(text, voice)
+        if self.cache:
+            self.cache.put(voice, text, audio)
+        with self._lock:
+            self.stats['synthesized'] += 1
+        return audio
+
+    def submit(self, voice, text):
+        """Start synthesizing one sentence and return a future of its WAV bytes"""
+        key = (voice, text)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._synthesize, voice, text)
+            self._pending[key] = future
+        # Outside the lock: the callback runs right away if the clip is already done
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def start_episode(self, output_path):
+        return EpisodeAudio(self, output_path)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+class Utterance:
+    """One speaker turn; feed() it streamed text and finish() it when the turn is complete"""
+
+    def __init__(self, episode, voice):
+        self.episode = episode
+        self.voice = voice
+        self._splitter = SentenceSplitter()
+        self._fed = False
+
+    def feed(self, text):
+        self._fed = True
+        for sentence in self._splitter.feed(text):
+            self.episode._add(self.voice, sentence)
+
+    def finish(self, full_text=None):
+        """End the turn. full_text is spoken instead when nothing was streamed (streaming is off)."""
+        if not self._fed and full_text:
+            self.feed(full_text)
+        for sentence in self._splitter.flush():
+            self.episode._add(self.voice, sentence)
+        self.episode._add_pause()
+
+
+class EpisodeAudio:
+    """An episode WAV assembled in script order while later sentences are still being synthesized"""
+
+    def __init__(self, pipeline, output_path):
+        self.pipeline = pipeline
+        self.output_path = output_path
+        self.segments = []  # {"voice", "text", "start", "duration"} in script order
+        self.error = None
+        self._queue = queue.Queue()  # Futures (or pauses) in script order; None ends the episode
+        self._writer = None
+        self._format = None
+        self._frames = 0
+        self._assembler = threading.Thread(target=self._assemble, name="episode-audio", daemon=True)
+        self._assembler.start()
+
+    def utterance(self, voice):
+        return Utterance(self, voice)
+
+    def say(self, voice, text):
+        """Speak a complete turn"""
+        self.utterance(voice).finish(text)
+
+    def _add(self, voice, sentence):
+        self._queue.put((voice, sentence, self.pipeline.submit(voice, sentence)))
+
+    def _add_pause(self):
+        self._queue.put("pause")
+
+    def _assemble(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue  # Keep draining so close() doesn't hang
+            try:
+                if item == "pause":
+                    self._write_silence(self.pipeline.pause_seconds)
+                    continue
+                voice, sentence, future = item
+                with wave.open(io.BytesIO(future.result()), 'rb') as clip:
+                    self._open_writer(clip)
+                    if clip.getparams()[:3] != self._format:
+                        raise ValueError(f"clip for voice '{voice}' has format {clip.getparams()[:3]}, "
+                                         f"episode has {self._format}")
+                    frames = clip.getnframes()
+                    start = self._frames / self._writer.getframerate()
+                    self._writer.writeframes(clip.readframes(frames))
+                self._frames += frames
+                self.segments.append({"voice": voice, "text": sentence, "start": round(start, 3),
+                                      "duration": round(frames / self._writer.getframerate(), 3)})
+            except Exception as e:
+                self.error = e
+
+    def _open_writer(self, clip):
+        if self._writer is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+            self._format = clip.getparams()[:3]  # (channels, sample width, frame rate) every clip must match
+            self._writer = wave.open(self.output_path, 'wb')
+            self._writer.setnchannels(clip.getnchannels())
+            self._writer.setsampwidth(clip.getsampwidth())
+            self._writer.setframerate(clip.getframerate())
+
+    def _write_silence(self, seconds):
+        if self._writer is None or seconds <= 0:
+            return  # Nothing to pause after yet
+        frames = int(seconds * self._writer.getframerate())
+        self._writer.writeframes(b"\0" * frames * self._writer.getsampwidth() * self._writer.getnchannels())
+        self._frames += frames
+
+    def close(self):
+        """Wait for the remaining clips, finish the WAV and return a report. Raises if assembly failed."""
+        self._queue.put(None)
+        self._assembler.join()
+        if self._writer is not None:
+            self._writer.close()
+        if self.error is not None:
+            raise self.error
+        rate = self._writer.getframerate() if self._writer is not None else 1
+        return {
+            "path": self.output_path if self._writer is not None else None,
+            "duration_seconds": round(self._frames / rate, 3),
+            "sentences": len(self.segments),
+        }
@@ -0,0 +1,105 @@
+import unittest
+import json
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'benchmarks')))
+
+import ollama
+
+from bench_interview import StageTimer, compare_to_baseline, run_interviews
+from fake_ollama import FakeOllamaServer, LatencyModel, ResponseScript
+from load_test import estimate_queue_delay, find_saturation
+from response_cleaner import clean_response_text
+
+
+class TestFakeOllamaServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeOllamaServer(latency=LatencyModel(ttft_ms=5, tokens_per_second=2000)).start()
+        cls.client = ollama.Client(host=cls.server.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_generate_is_deterministic_and_streams_the_same_text(self):
+        first = self.client.generate(model="fake", prompt="Tell me about justice")['response']
+        streamed = ''.join(chunk['response'] for chunk in self.client.generate(model="fake", prompt="Tell me about justice", stream=True))
+        self.assertEqual(first, streamed)
+        self.assertTrue(first.startswith("<think>"))
+        self.assertNotIn("<think>", clean_response_text(first))
+
+    def test_evaluation_replies_match_the_requested_format(self):
+        text = self.client.generate(model="fake", prompt="Respond with Score: and Rationale:")['response']
+        self.assertRegex(clean_response_text(text), r"^Score: [1-3] Rationale: ")
+        structured = self.client.generate(model="fake", prompt="Evaluate", format={"type": "object"})['response']
+        self.assertIn(json.loads(structured)['score'], (1, 2, 3))
+
+    def test_chat_and_embeddings(self):
+        reply = self.client.chat(model="fake", messages=[{"role": "user", "content": "Hello"}])
+        self.assertEqual(reply['message']['content'], ResponseScript().reply("Hello"))
+        vectors = self.client.embed(model="fake", input=["a", "b", "a"])['embeddings']
+        self.assertEqual(vectors[0], vectors[2])
+        self.assertNotEqual(vectors[0], vectors[1])
+
+
+class TestFakeServerParallelSlots(unittest.TestCase):
+
+    def test_requests_beyond_parallel_limit_queue(self):
+        with FakeOllamaServer(latency=LatencyModel(ttft_ms=100), parallel=1) as server:
+            client = ollama.Client(host=server.url)
+            threads = [threading.Thread(target=client.generate, kwargs={"model": "fake", "prompt": str(i)}) for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            waits = sorted(server.queue_waits)
+        self.assertLess(waits[0], 0.05)
+        self.assertGreater(waits[1], 0.08)
+
+
+class TestInterviewHarness(unittest.TestCase):
+
+    def test_full_interview_runs_against_the_fake_server(self):
+        # Smoke test for build_system: the shipped config.yaml must not open backends before it is wired up
+        timer = StageTimer()
+        with FakeOllamaServer(latency=LatencyModel(ttft_ms=0)) as server, patch.dict(os.environ):
+            run_interviews(server.url, runs=1, max_exchanges=3, logging_enabled=False, timer=timer)
+            request_counts = dict(server.request_counts)
+        self.assertEqual(len(timer.samples["interview:total"]), 1)
+        self.assertIn("llm:EXPERT_RESPONSE", timer.samples)
+        self.assertGreater(request_counts.get('/api/embed', 0), 0)
+
+
+class TestSaturationCurve(unittest.TestCase):
+
+    def make_step(self, concurrency, throughput, p50, measured=False):
+        return {"concurrency": concurrency, "exchanges_per_minute": throughput, "llm_p50_ms": p50,
+                "llm_p95_ms": p50 * 2, "queue_delay_measured": measured}
+
+    def test_saturation_is_first_step_without_meaningful_gain(self):
+        steps = [self.make_step(1, 100, 50), self.make_step(2, 190, 52), self.make_step(4, 200, 90), self.make_step(8, 205, 170)]
+        self.assertEqual(find_saturation(steps), 4)
+        self.assertIsNone(find_saturation(steps[:2]))
+
+    def test_queue_delay_estimated_from_latency_growth(self):
+        steps = [self.make_step(1, 100, 50), self.make_step(2, 150, 80)]
+        estimate_queue_delay(steps)
+        self.assertEqual([step["queue_p50_ms"] for step in steps], [0.0, 30.0])
+
+
+class TestBaselineComparison(unittest.TestCase):
+
+    def test_regressions_need_relative_and_absolute_slowdown(self):
+        baseline = {"llm": {"p50_ms": 10.0}, "clean": {"p50_ms": 0.01}, "history": {"p50_ms": 1.0}}
+        current = {"llm": {"p50_ms": 12.0}, "clean": {"p50_ms": 0.02}, "history": {"p50_ms": 1.05}, "new": {"p50_ms": 1.0}}
+        rows = {row[0]: row[4] for row in compare_to_baseline(current, baseline, threshold=0.10)}
+        self.assertEqual(rows, {"llm": True, "clean": False, "history": False})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from comfort_zone import AhoCorasickAutomaton, ComfortZoneDetector
+
+
+def fake_embed(texts):
+    """Deterministic embeddings: one dimension per keyword, so paraphrases share a direction"""
+    keywords = ["arc", "justice", "community", "technology"]
+    return [[1.0 if k in text.lower() else 0.0 for k in keywords] for text in texts]
+
+
+class TestAhoCorasickAutomaton(unittest.TestCase):
+
+    def test_finds_all_patterns_case_insensitively(self):
+        automaton = AhoCorasickAutomaton(["he", "she", "his", "hers"])
+        self.assertEqual(automaton.find("uSHErs"), [0, 1, 3])
+
+    def test_matches_substring_semantics_of_naive_scan(self):
+        phrases = ["beloved community", "love", "community is", "the arc"]
+        text = "The beloved community is a practice; the arc bends."
+        expected = [i for i, p in enumerate(phrases) if p.lower() in text.lower()]
+        self.assertEqual(AhoCorasickAutomaton(phrases).find(text), expected)
+
+    def test_empty_patterns_are_ignored(self):
+        automaton = AhoCorasickAutomaton(["", "abc"])
+        self.assertEqual(automaton.find("xxabcxx"), [1])
+        self.assertEqual(automaton.find(""), [])
+
+
+class TestComfortZoneDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = ComfortZoneDetector(
+            ["The arc of the moral universe bends", "digital compassion"],
+            ["beloved community", "nonviolence"]
+        )
+
+    def test_detect_separates_phrases_and_topics(self):
+        result = self.detector.detect("Nonviolence and DIGITAL compassion remain my answer.")
+        self.assertEqual(result["phrases"], ["digital compassion"])
+        self.assertEqual(result["topics"], ["nonviolence"])
+        self.assertEqual(result["paraphrases"], [])
+        self.assertEqual(self.detector.detect_phrases("Nonviolence and DIGITAL compassion remain my answer."),
+                         {"phrases": ["digital compassion"], "topics": ["nonviolence"]})
+
+    def test_stream_finds_matches_across_chunk_boundaries_once(self):
+        stream = self.detector.stream()
+        self.assertEqual(stream.feed("We need digital com")["phrases"], [])
+        self.assertEqual(stream.feed("passion today.")["phrases"], ["digital compassion"])
+        self.assertEqual(stream.feed(" Yes, digital compassion.")["phrases"], [])
+        self.assertEqual(stream.matches["phrases"], ["digital compassion"])
+
+    def test_semantic_matching_flags_paraphrases(self):
+        embed_fn = MagicMock(side_effect=fake_embed)
+        detector = ComfortZoneDetector(
+            ["The arc bends toward justice", "technology serves the common good"],
+            embed_fn=embed_fn,
+            similarity_threshold=0.9
+        )
+        result = detector.detect("Justice follows a long arc. Nothing else matters.")
+        self.assertEqual(result["phrases"], [])
+        self.assertEqual(result["paraphrases"], ["The arc bends toward justice"])
+
+        detector.detect("Another arc toward justice.")
+        # Phrase centroids are embedded once; each response costs a single embedding call
+        self.assertEqual(embed_fn.call_count, 3)
+
+    def test_score_transcript_batches_embeddings(self):
+        embed_fn = MagicMock(side_effect=fake_embed)
+        detector = ComfortZoneDetector(
+            ["The arc bends toward justice", "digital compassion"],
+            embed_fn=embed_fn,
+            similarity_threshold=0.9
+        )
+        transcript = {
+            "interview": [
+                {"speaker": "HOST", "text": "Question about justice and the arc?", "topic": "T1"},
+                {"speaker": "Expert", "text": "We need digital compassion.", "topic": "T1"},
+                {"speaker": "HOST", "text": "And?", "topic": "T2"},
+                {"speaker": "Expert", "text": "Justice is a long arc. Really.", "topic": "T2"},
+            ],
+            "metadata": {"expert_name": "Expert"}
+        }
+        results = detector.score_transcript(transcript)
+
+        self.assertEqual([r["index"] for r in results], [1, 3])
+        self.assertEqual(results[0]["phrases"], ["digital compassion"])
+        self.assertEqual(results[1]["paraphrases"], ["The arc bends toward justice"])
+        # One call for the phrase centroids, one for every sentence in the transcript
+        self.assertEqual(embed_fn.call_count, 2)
+
+    def test_from_expert_settings_reads_config_lists(self):
+        detector = ComfortZoneDetector.from_expert_settings({
+            'comfort_zone_phrases': ["digital compassion"],
+            'comfort_zone_topics': None
+        })
+        self.assertEqual(detector.phrases, ["digital compassion"])
+        self.assertEqual(detector.topics, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from exchange_scheduler import AdaptiveScheduler, DepthGainPriors, SequentialScheduler
+from transcript_store import TranscriptStore
+
+
+def run(scheduler, depths):
+    """Drive a scheduler with scripted depths per topic (None for a failed exchange) and return the actions it took"""
+    actions = []
+    while True:
+        action = scheduler.next_action()
+        actions.extend(("finished", topic) for topic in scheduler.finished_topics())
+        if action is None:
+            return actions
+        actions.append(action)
+        depth = depths[action[1]].pop(0)
+        if depth is None:
+            scheduler.skip(action[1])
+        else:
+            scheduler.record(action[1], depth)
+
+
+class TestSchedulers(unittest.TestCase):
+
+    def test_sequential_scheduler_keeps_the_original_order(self):
+        scheduler = SequentialScheduler(["a", "b", "c"], budget=5, max_follow_ups=2)
+        actions = run(scheduler, {"a": [1, 2, 2], "b": [3], "c": [1, 1]})
+
+        self.assertEqual(actions, [("open", "a"), ("follow_up", "a"), ("follow_up", "a"), ("finished", "a"), ("open", "b"),
+                                   ("finished", "b"), ("open", "c"), ("finished", "c")])
+        self.assertEqual(scheduler.finish_all(), [])
+
+    def test_adaptive_scheduler_reserves_openings_and_revisits_promising_topics(self):
+        scheduler = AdaptiveScheduler(["a", "b", "c"], budget=6, max_follow_ups=2, min_expected_gain=0.35)
+        actions = run(scheduler, {"a": [1, 1], "b": [1, 2, 3], "c": [2]})
+
+        # Each topic gets one follow-up on the first pass; the exchange "c" didn't need goes back to "b",
+        # whose first follow-up paid off, rather than "a", whose didn't
+        self.assertEqual(actions, [("open", "a"), ("follow_up", "a"), ("open", "b"), ("follow_up", "b"), ("open", "c"),
+                                   ("finished", "a"), ("finished", "c"), ("follow_up", "b")])
+        self.assertEqual(scheduler.progress["b"].best_depth, 3)
+
+    def test_adaptive_scheduler_stops_early_when_no_topic_is_worth_a_follow_up(self):
+        priors = DepthGainPriors(default_gain_by_depth={1: 0.1, 2: 0.05})
+        scheduler = AdaptiveScheduler(["a", "b"], budget=6, max_follow_ups=2, priors=priors, min_expected_gain=0.2)
+
+        actions = run(scheduler, {"a": [1], "b": [2]})
+
+        self.assertEqual(actions, [("open", "a"), ("open", "b"), ("finished", "a"), ("finished", "b")])
+        self.assertEqual(scheduler.remaining, 4)
+
+    def test_skipped_topics_get_no_more_exchanges(self):
+        scheduler = AdaptiveScheduler(["a", "b", "c"], budget=6, max_follow_ups=2, min_expected_gain=0.35)
+        actions = run(scheduler, {"a": [1, None], "b": [None], "c": [1, 1]})
+
+        # "a" failed on a follow-up and is finished; "b" failed on its opening and is never reported as covered
+        self.assertEqual(actions, [("open", "a"), ("follow_up", "a"), ("finished", "a"), ("open", "b"), ("open", "c"),
+                                   ("follow_up", "c"), ("finished", "c")])
+        self.assertEqual(scheduler.remaining, 1)
+
+
+class TestDepthGainPriors(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_priors_learn_from_archived_depths_and_breakthroughs(self):
+        with_depths = {
+            "metadata": {"expert_name": "MLK", "potential_breakthroughs": []},
+            "interview": [
+                {"speaker": "HOST", "text": "q", "topic": "Bias"}, {"speaker": "MLK", "text": "a", "topic": "Bias", "depth": 1},
+                {"speaker": "HOST", "text": "q", "topic": "Bias"}, {"speaker": "MLK", "text": "a", "topic": "Bias", "depth": 3},
+            ],
+        }
+        breakthroughs_only = {
+            "metadata": {"expert_name": "MLK", "potential_breakthroughs": [{"topic": "Labor", "improvement": [2, 3], "question": "q"}]},
+            "interview": [{"speaker": "MLK", "text": "a", "topic": "Labor"}],
+        }
+        with TranscriptStore(os.path.join(self.directory, "archive.db")) as store:
+            store.add_transcript(with_depths, "one.json")
+            store.add_transcript(breakthroughs_only, "two.json")
+            priors = DepthGainPriors.from_transcript_store(store, expert="MLK", topic_weight=1.0)
+
+        self.assertEqual(priors.sample_count(), 2)
+        self.assertEqual(priors.gain("Bias", 1), 2.0)
+        self.assertEqual(priors.gain("Labor", 2), 1.0)
+        self.assertEqual(priors.gain("Bias", 3), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
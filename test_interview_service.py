@@ -0,0 +1,272 @@
+import unittest
+import json
+import os
+import io
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import unittest.mock
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from job_queue import JobQueue, QueueFullError
+from interview_service import InterviewService
+from interview_worker import CoordinatorClient, InterviewWorker
+
+
+class ScriptedSystem:
+    """Stands in for RecursiveInterviewSystem: emits a fixed set of events and writes a transcript"""
+
+    def __init__(self, config, release):
+        self.config = config
+        self.release = release
+        self.event_listeners = []
+
+    def setup_expert(self, expert_name):
+        pass
+
+    def run_interview(self, expert_name, topics, max_exchanges=None):
+        if not self.release.wait(timeout=10):
+            raise RuntimeError("test never released the interview")
+        if expert_name == "Nobody":
+            raise RuntimeError("unknown expert")
+        for listener in self.event_listeners:
+            listener("exchange", {"topic": topics[0], "question": "Why?", "response": "Because."})
+            listener("evaluation", {"topic": topics[0], "depth": 3, "rationale": "New ground"})
+        filename = f"{self.config['transcript_filename_prefix']}final.json"
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({"metadata": {"expert_name": expert_name, "max_exchanges": max_exchanges,
+                                    "temperature": self.config['expert_llm_temperature']}}, f)
+        return filename
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.queue = JobQueue(os.path.join(self.directory, "jobs.db"), max_queued=2)
+
+    def tearDown(self):
+        self.queue.close()
+        shutil.rmtree(self.directory)
+
+    def test_jobs_are_claimed_in_order_and_finish_with_a_status_event(self):
+        first = self.queue.submit("MLK", ["AI bias"])
+        second = self.queue.submit("MLK", ["Nonviolence"], max_exchanges=4, overrides={"expert_llm_temperature": 0.2})
+        self.assertEqual(self.queue.position(second['id']), 1)
+
+        claimed = self.queue.claim("worker-a")
+        self.assertEqual((claimed['id'], claimed['status'], claimed['worker']), (first['id'], "running", "worker-a"))
+        self.assertTrue(self.queue.complete(first['id'], "t.json"))
+        self.assertFalse(self.queue.cancel(first['id']))
+        self.assertEqual(self.queue.events_since(first['id']), [(1, "status", {"status": "succeeded", "transcript": "t.json"})])
+        self.assertEqual(self.queue.claim("worker-b")['overrides'], {"expert_llm_temperature": 0.2})
+        self.assertIsNone(self.queue.claim("worker-b"))
+
+    def test_full_queue_rejects_submissions_and_running_jobs_are_requeued(self):
+        self.queue.submit("MLK", ["a"])
+        self.queue.submit("MLK", ["b"])
+        with self.assertRaises(QueueFullError):
+            self.queue.submit("MLK", ["c"])
+
+        self.queue.claim("crashed-worker")
+        self.assertEqual(self.queue.requeue_running(), 1)
+        self.assertEqual(self.queue.counts(), {"queued": 2})
+
+    def test_expired_leases_are_reclaimed_and_stale_workers_are_rejected(self):
+        queue = JobQueue(os.path.join(self.directory, "leases.db"), lease_seconds=-1, max_attempts=2)
+        job = queue.submit("MLK", ["AI bias"])
+        queue.claim("crashed-worker")
+
+        retried = queue.claim("worker-b")  # The first lease has already expired
+        self.assertEqual((retried['id'], retried['attempts']), (job['id'], 2))
+        self.assertFalse(queue.heartbeat(job['id'], "crashed-worker"))
+        self.assertFalse(queue.complete(job['id'], "stale.json", worker="crashed-worker"))
+
+        self.assertEqual(queue.reclaim_expired(), 1)
+        failed = queue.get(job['id'])
+        self.assertEqual(failed['status'], "failed")
+        self.assertIn("after 2 attempt(s)", failed['error'])
+        self.assertEqual([data["status"] for _, _, data in queue.events_since(job['id'])], ["queued", "failed"])
+        queue.close()
+
+    def test_worker_keeps_polling_after_queue_errors(self):
+        stop = threading.Event()
+        claims = []
+
+        class FlakyQueue:
+            def claim(self, worker):
+                claims.append(worker)
+                if len(claims) == 1:
+                    raise sqlite3.OperationalError("database is locked")
+                if len(claims) == 2:
+                    raise ValueError("malformed coordinator reply")
+                stop.set()
+                return None
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            InterviewWorker("worker-a", FlakyQueue(), {}).run(stop, idle_seconds=0.01)
+        self.assertEqual(len(claims), 3)
+        self.assertIn("database is locked", output.getvalue())
+
+
+class TestInterviewService(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.release = threading.Event()
+        config = {
+            'expert_llm_temperature': 0.7,
+            'service': {
+                'database_path': os.path.join(self.directory, "jobs.db"),
+                'transcript_directory': os.path.join(self.directory, "transcripts"),
+                'workers': 1, 'max_queued_jobs': 1, 'event_poll_seconds': 0.05,
+            },
+        }
+        self.service = InterviewService(config, system_factory=lambda job_config: ScriptedSystem(job_config, self.release))
+        host, port = self.service.serve("127.0.0.1", 0)
+        self.base_url = f"http://{host}:{port}"
+
+    def tearDown(self):
+        self.release.set()
+        self.service.stop(timeout=5)
+        self.service.queue.close()
+        shutil.rmtree(self.directory)
+
+    def request(self, method, path, payload=None, headers=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def read_events(self, job_id):
+        events = []
+        with urllib.request.urlopen(f"{self.base_url}/jobs/{job_id}/events", timeout=10) as response:
+            event = {}
+            for line in response:
+                line = line.decode('utf-8').rstrip("\n")
+                if line.startswith("event: "):
+                    event["type"] = line[len("event: "):]
+                elif line.startswith("data: "):
+                    event["data"] = json.loads(line[len("data: "):])
+                elif not line and event:
+                    events.append(event)
+                    event = {}
+        return events
+
+    def test_job_streams_events_and_serves_its_transcript(self):
+        status, job = self.request("POST", "/jobs", {"expert": "MLK", "topics": ["AI bias"], "max_exchanges": 4,
+                                                     "overrides": {"expert_llm_temperature": 0.1}})
+        self.assertEqual(status, 202)
+        self.release.set()
+
+        events = self.read_events(job['id'])
+
+        self.assertEqual([event["type"] for event in events], ["status", "exchange", "evaluation", "status"])
+        self.assertEqual(events[2]["data"]["depth"], 3)
+        self.assertEqual(events[-1]["data"]["status"], "succeeded")
+        status, transcript = self.request("GET", f"/jobs/{job['id']}/transcript")
+        self.assertEqual(status, 200)
+        self.assertEqual(transcript["metadata"], {"expert_name": "MLK", "max_exchanges": 4, "temperature": 0.1})
+
+    def test_backpressure_validation_and_cancellation(self):
+        self.assertEqual(self.request("POST", "/jobs", {"expert": "MLK", "topics": []})[0], 400)
+        self.assertEqual(self.request("POST", "/jobs", {"expert": "MLK", "topics": ["a"], "overrides": {"chromadb": {}}})[0], 400)
+
+        running = self.request("POST", "/jobs", {"expert": "Nobody", "topics": ["a"]})[1]
+        while self.service.queue.get(running['id'])['status'] != "running":
+            self.service.wait_for_events(0.05)
+        status, queued = self.request("POST", "/jobs", {"expert": "MLK", "topics": ["b"]})
+        self.assertEqual((status, queued['queue_position']), (202, 0))
+        self.assertEqual(self.request("POST", "/jobs", {"expert": "MLK", "topics": ["c"]})[0], 503)
+
+        self.assertEqual(self.request("DELETE", f"/jobs/{queued['id']}")[1]['status'], "cancelled")
+        self.release.set()
+        self.assertEqual(self.read_events(running['id'])[-1]["data"]["status"], "failed")
+        self.assertIn("unknown expert", self.request("GET", f"/jobs/{running['id']}")[1]['error'])
+
+    def test_invalid_last_event_id_is_rejected_before_streaming(self):
+        job = self.request("POST", "/jobs", {"expert": "MLK", "topics": ["AI bias"]})[1]
+        for last_event_id in ("abc", "-1"):
+            status, error = self.request("GET", f"/jobs/{job['id']}/events", headers={"Last-Event-ID": last_event_id})
+            self.assertEqual(status, 400)
+            self.assertIn("Last-Event-ID", error["error"])
+
+
+class TestRemoteWorkers(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        config = {
+            'expert_llm_temperature': 0.7,
+            'service': {
+                'database_path': os.path.join(self.directory, "jobs.db"),
+                'transcript_directory': os.path.join(self.directory, "archive"),
+                'workers': 0, 'worker_token': "secret", 'event_poll_seconds': 0.05,
+            },
+        }
+        self.service = InterviewService(config)
+        host, port = self.service.serve("127.0.0.1", 0)
+        self.url = f"http://{host}:{port}"
+        self.release = threading.Event()
+        self.release.set()
+
+    def tearDown(self):
+        self.service.stop(timeout=5)
+        self.service.queue.close()
+        shutil.rmtree(self.directory)
+
+    def remote_worker(self, name, token="secret"):
+        return InterviewWorker(name, CoordinatorClient(self.url, token), {'expert_llm_temperature': 0.7},
+                               system_factory=lambda job_config: ScriptedSystem(job_config, self.release),
+                               transcript_directory=os.path.join(self.directory, name), heartbeat_seconds=0.05)
+
+    def test_remote_workers_share_the_queue_and_upload_transcripts(self):
+        for topic in ("AI bias", "Nonviolence"):
+            self.service.submit("MLK", [topic])
+        with self.assertRaises(urllib.error.HTTPError):
+            self.remote_worker("intruder", token="wrong").queue.claim("intruder")
+
+        box_a, box_b = self.remote_worker("box-a"), self.remote_worker("box-b")
+        first, second = box_a.queue.claim(box_a.name), box_b.queue.claim(box_b.name)
+        self.assertIsNone(box_b.queue.claim(box_b.name))
+        self.assertTrue(box_a.run_job(first))
+        self.assertTrue(box_b.run_job(second))
+
+        archive = os.path.join(self.directory, "archive")
+        self.assertEqual(sorted(os.listdir(archive)), [f"job_{first['id']}_final.json", f"job_{second['id']}_final.json"])
+        job = self.service.queue.get(first['id'])
+        self.assertEqual((job['status'], job['worker']), ("succeeded", "box-a"))
+        event_types = [event_type for _, event_type, _ in self.service.queue.events_since(first['id'])]
+        self.assertEqual(event_types, ["status", "exchange", "evaluation", "status"])
+
+
+    def test_events_are_only_accepted_from_the_lease_holder(self):
+        job = self.service.submit("MLK", ["AI bias"])
+        box_a, box_b = self.remote_worker("box-a"), self.remote_worker("box-b")
+        self.assertEqual(box_a.queue.claim(box_a.name)['id'], job['id'])
+
+        with self.assertRaises(urllib.error.HTTPError) as missing_worker:
+            box_a.queue.add_event(job['id'], "exchange", {})
+        self.assertEqual(missing_worker.exception.code, 400)
+        self.assertTrue(box_a.queue.add_event(job['id'], "exchange", {"question": "Why?"}, worker=box_a.name))
+
+        # box-b lost its lease on the job: its events are rejected, then no longer sent at all
+        box_b.queue.add_event = unittest.mock.Mock(wraps=box_b.queue.add_event)
+        box_b.publish(job['id'], "exchange", {"question": "Stale?"})
+        box_b.publish(job['id'], "exchange", {"question": "Still stale?"})
+        self.assertEqual(box_b.queue.add_event.call_count, 1)
+        events = [data for _, event_type, data in self.service.queue.events_since(job['id']) if event_type == "exchange"]
+        self.assertEqual(events, [{"question": "Why?"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from interview_state import InterviewHistory, TextJournal, Utterance
+from memory_profile import MemoryProfiler
+
+
+class TestCompactInterviewState(unittest.TestCase):
+
+    def setUp(self):
+        self.journal = TextJournal()
+        self.history = InterviewHistory(self.journal)
+
+    def tearDown(self):
+        self.journal.close()
+
+    def test_texts_are_spilled_to_the_journal(self):
+        self.history.append({"speaker": "HOST", "text": "Is the algorithm neutral? ✊", "topic": "AI bias"})
+        entry = self.history[-1]
+        self.assertIsNone(entry._text)
+        self.assertEqual(entry["text"], "Is the algorithm neutral? ✊")
+        self.assertGreater(self.journal.size(), 0)
+
+    def test_entries_behave_like_the_original_dicts(self):
+        self.history.append({"speaker": "MLK", "text": "We must act.", "topic": "AI bias", "comfort_zone_phrases": ["beloved community"]})
+        entry = self.history[-1]
+        entry["depth"] = 3
+        entry["breakthrough"] = True
+        self.assertEqual(dict(entry), {"speaker": "MLK", "text": "We must act.", "topic": "AI bias",
+                                       "comfort_zone_phrases": ["beloved community"], "depth": 3, "breakthrough": True})
+        self.assertIsNone(self.history[0].get("missing"))
+        self.assertNotIn("depth", Utterance("HOST", "Question"))
+        json.dumps([dict(e) for e in self.history])
+
+    def test_speakers_and_topics_are_interned(self):
+        first = Utterance("".join(["Martin ", "Luther"]), "a", "".join(["AI ", "bias"]))
+        second = Utterance("".join(["Martin", " Luther"]), "b", "".join(["AI", " bias"]))
+        self.assertIs(first.speaker, second.speaker)
+        self.assertIs(first.topic, second.topic)
+
+    def test_clear_truncates_the_journal(self):
+        self.history.extend({"speaker": "HOST", "text": "x" * 1000, "topic": "t"} for _ in range(5))
+        self.history.clear()
+        self.assertEqual(len(self.history), 0)
+        self.assertEqual(self.journal.size(), 0)
+
+
+class TestMemoryProfiler(unittest.TestCase):
+
+    def test_checkpoints_report_growth(self):
+        profiler = MemoryProfiler(enabled=True, top_n=3)
+        profiler.start()
+        retained = [bytearray(256 * 1024)]
+        record = profiler.checkpoint("exchange 1")
+        profiler.stop()
+        self.assertGreater(record["delta_kb"], 200)
+        self.assertTrue(record["top_growth"])
+        self.assertEqual(len(retained), 1)
+
+    def test_disabled_profiler_is_a_no_op(self):
+        profiler = MemoryProfiler(enabled=False)
+        profiler.start()
+        self.assertIsNone(profiler.checkpoint("exchange 1"))
+        self.assertEqual(profiler.records, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,18 @@
 import unittest
 from unittest.mock import patch, MagicMock, call
+import copy
 import io
+import shutil
 import sys
+import tempfile
+import threading
+import time
 
 # Add the parent directory to sys.path to allow importing interview_system
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
+import interview_system
 from interview_system import RecursiveInterviewSystem
 
 class TestRecursiveInterviewSystem(unittest.TestCase):
@@ -497,5 +503,622 @@ Short line.
         mock_perform_web_search.assert_called() # Called during expert responses
         mock_detect_comfort.assert_called() # Called after expert responses
 
+
+class MockedBackendsTestCase(unittest.TestCase):
+    """Builds a system against plain mocks of the Ollama and ChromaDB clients"""
+
+    config = {}
+
+    def setUp(self):
+        self.mock_ollama_client_instance = MagicMock()
+        self.mock_chromadb_client_instance = MagicMock()
+        self.ollama_patcher = patch('ollama.Client', return_value=self.mock_ollama_client_instance)
+        self.chromadb_patcher = patch('chromadb.PersistentClient', return_value=self.mock_chromadb_client_instance)
+        self.ollama_patcher.start()
+        self.chromadb_patcher.start()
+        config = {'logging': {'enabled': False}}
+        config.update(copy.deepcopy(self.config))
+        with patch.object(RecursiveInterviewSystem, '_load_config', return_value=config):
+            self.system = RecursiveInterviewSystem()
+
+    def tearDown(self):
+        self.ollama_patcher.stop()
+        self.chromadb_patcher.stop()
+
+
+class TestStreamingLLMRequests(MockedBackendsTestCase):
+
+    config = {'streaming': {'enabled': True}}
+
+    def test_streamed_chunks_are_cleaned_incrementally(self):
+        chunks = ["<think>plan", "</think>MLK: We", " must act", " now."]
+        self.mock_ollama_client_instance.generate.return_value = iter([{'response': c} for c in chunks])
+        pieces = []
+
+        response = self.system._make_llm_request("EXPERT_RESPONSE", "test-model", "prompt", on_text=pieces.append)
+
+        self.assertEqual(response['response'], ''.join(chunks))
+        self.assertEqual(''.join(pieces), "We must act now.")
+        self.assertEqual(self.system.clean_response(response['response']), "We must act now.")
+        self.assertFalse(response['stopped_at_word_budget'])
+        self.assertTrue(self.mock_ollama_client_instance.generate.call_args.kwargs['stream'])
+
+    def test_stream_stops_at_word_budget(self):
+        chunks = ["one ", "two ", "three ", "four ", "five"]
+        self.mock_ollama_client_instance.generate.return_value = iter([{'response': c} for c in chunks])
+
+        response = self.system._make_llm_request("EXPERT_RESPONSE", "test-model", "prompt", word_budget=2)
+
+        self.assertTrue(response['stopped_at_word_budget'])
+        self.assertEqual(response['response'], "one two three ")
+
+
+class TestStructuredEvaluation(MockedBackendsTestCase):
+
+    config = {
+        'structured_evaluation': {'enabled': True, 'num_predict': 100, 'max_retries': 1},
+        'prompts': {'evaluation': {
+            'main_prompt': "Evaluate {question} / {response}",
+            'rationale_parsing_error_prefix': "Test: Parse error prefix."
+        }}
+    }
+
+    def test_valid_json_is_used_directly(self):
+        self.mock_ollama_client_instance.generate.return_value = {
+            'response': '{"score": 3, "rationale": "New ground.", "comfort_zone_flags": ["beloved community"]}'
+        }
+
+        score, rationale = self.system.evaluate_response_depth("Q", "R")
+
+        self.assertEqual((score, rationale), (3, "New ground."))
+        self.assertEqual(self.system.last_evaluation['comfort_zone_flags'], ["beloved community"])
+        kwargs = self.mock_ollama_client_instance.generate.call_args.kwargs
+        self.assertEqual(kwargs['format'], interview_system.EVALUATION_RESPONSE_SCHEMA)
+        self.assertEqual(kwargs['options']['num_predict'], 100)
+        self.assertEqual(self.system.evaluation_stats['parse_failures'], 0)
+
+    def test_single_retry_after_schema_failure(self):
+        self.mock_ollama_client_instance.generate.side_effect = [
+            {'response': '{"score": 5, "rationale": "Too high"}'},
+            {'response': '{"score": 1, "rationale": "Rehearsed.", "comfort_zone_flags": []}'}
+        ]
+
+        score, rationale = self.system.evaluate_response_depth("Q", "R")
+
+        self.assertEqual((score, rationale), (1, "Rehearsed."))
+        self.assertEqual(self.mock_ollama_client_instance.generate.call_count, 2)
+        self.assertEqual(self.system.evaluation_stats['parse_failures'], 1)
+        self.assertEqual(self.system.evaluation_stats['retries'], 1)
+
+    def test_falls_back_to_default_score_after_retries(self):
+        self.mock_ollama_client_instance.generate.return_value = {'response': 'Score: 3'}
+
+        score, rationale = self.system.evaluate_response_depth("Q", "R")
+
+        self.assertEqual(score, 2)
+        self.assertTrue(rationale.startswith("Test: Parse error prefix."))
+        self.assertEqual(self.mock_ollama_client_instance.generate.call_count, 2)
+        self.assertEqual(self.system.evaluation_stats['fallbacks'], 1)
+        self.assertEqual(self.system.evaluation_stats['parse_failures'], 2)
+
+    def test_parse_structured_evaluation_validates_fields(self):
+        parsed = interview_system.parse_structured_evaluation(
+            '<think>hmm</think>{"score": 2, "rationale": " Familiar. ", "comfort_zone_flags": []}')
+        self.assertEqual(parsed, {"score": 2, "rationale": "Familiar.", "comfort_zone_flags": []})
+        for bad in ['not json', '[]', '{"score": true, "rationale": "x"}', '{"score": 2, "rationale": ""}',
+                    '{"score": 2, "rationale": "x", "comfort_zone_flags": "flag"}', '{"score": 2, "rationale": "x"}']:
+            with self.assertRaises(ValueError):
+                interview_system.parse_structured_evaluation(bad)
+
+class TestCompactState(MockedBackendsTestCase):
+
+    config = {'memory': {'compact_state': True}, 'interview': {'conversation_history_last_n': 2}}
+
+    def test_history_works_through_journal_and_resets(self):
+        self.system.interview_history.append({"speaker": "HOST", "text": "Why?", "topic": "AI bias"})
+        self.system.interview_history.append({"speaker": "MLK", "text": "Because.", "topic": "AI bias"})
+        self.system.interview_history[-1]["depth"] = 2
+        self.system.comfort_zone_patterns.append("beloved community")
+
+        self.assertEqual(self.system.get_conversation_history(), "HOST: Why?\nMLK: Because.")
+        self.assertEqual(dict(self.system.interview_history[-1])["depth"], 2)
+
+        self.system.reset_interview_state()
+        self.assertEqual(len(self.system.interview_history), 0)
+        self.assertEqual(self.system._journal.size(), 0)
+        self.assertEqual(self.system.comfort_zone_patterns, [])
+
+class TestLazyStartup(MockedBackendsTestCase):
+
+    config = {'startup': {'lazy_initialization': True, 'warm_up_models': True, 'keep_alive': "5m"},
+              'expert_llm_model': 'expert-model', 'host_llm_model': 'host-model', 'evaluation_llm_model': 'host-model'}
+
+    def test_backends_open_on_first_use(self):
+        chroma = self.mock_chromadb_client_instance
+        chroma.get_or_create_collection.assert_not_called()
+        self.assertIsNone(self.system._client)
+
+        self.system.expert_collection.query(query_texts=["q"], n_results=1)
+
+        self.assertEqual(chroma.get_or_create_collection.call_count, 1)
+        self.assertIn("chromadb.PersistentClient()", [step for step, _ in self.system.startup_timings])
+
+    def test_warm_up_loads_each_model_once_in_the_background(self):
+        thread = self.system.start_model_warm_up()
+        thread.join(timeout=5)
+
+        calls = self.mock_ollama_client_instance.generate.call_args_list
+        self.assertEqual([c.kwargs['model'] for c in calls], ['expert-model', 'host-model'])
+        self.assertTrue(all(c.kwargs['prompt'] == "" and c.kwargs['keep_alive'] == "5m" for c in calls))
+        self.assertIs(self.system.start_model_warm_up(), thread)
+
+class TestExpertPersonas(MockedBackendsTestCase):
+
+    config = {
+        'chromadb': {'expert_collection_name': "experts"},
+        'persona_settings': {'personas_directory': "personas"},
+        'expert_defaults': {
+            'martin_luther_king_jr': {'persona_file': "personas/mlk.md", 'speaker_tag': "MLK", 'expert_age': 96,
+                                      'comfort_zone_phrases': ["beloved community"]},
+            'ada_lovelace': {'expert_age': 210, 'comfort_zone_phrases': ["poetical science"]},
+        },
+        'prompts': {'expert_response': {'main_prompt': "{expert_name} ({expert_age}): {question}"}},
+        'web_search_settings': {'enabled': False},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def setUp(self):
+        super().setUp()
+        collections = {}
+
+        def get_or_create_collection(name, metadata):
+            collection = collections[name] = MagicMock(metadata=dict(metadata))
+            collection.modify.side_effect = lambda metadata: setattr(collection, 'metadata', metadata)
+            collection.query.return_value = {'documents': [[f"{name} knowledge"]]}
+            return collection
+
+        self.collections = collections
+        self.mock_chromadb_client_instance.get_or_create_collection.side_effect = get_or_create_collection
+        self.mock_ollama_client_instance.generate.return_value = {'response': "An answer."}
+
+    def test_each_expert_uses_its_own_collection_and_settings(self):
+        self.system.generate_expert_response("Ada Lovelace", "What is an engine?")
+        self.system.generate_expert_response("Martin Luther King Jr.", "What is justice?")
+
+        prompts = [c.kwargs['prompt'] for c in self.mock_ollama_client_instance.generate.call_args_list]
+        self.assertEqual(prompts, ["Ada Lovelace (210): What is an engine?", "Martin Luther King Jr. (96): What is justice?"])
+        self.collections["experts_ada_lovelace"].query.assert_called_once()
+        self.assertTrue(self.system.detect_comfort_zone_patterns("A poetical science.", "Ada Lovelace")[0])
+        self.assertFalse(self.system.detect_comfort_zone_patterns("A poetical science.", "MLK")[0])
+
+    def test_opening_question_names_the_expert_being_interviewed(self):
+        self.system.config['prompts']['question_generation'] = {'opening_question': "Ask {expert_name} about {topic}"}
+        self.system.current_expert_name = "Ada Lovelace"
+        self.system.generate_host_question("Engines")
+        self.assertEqual(self.mock_ollama_client_instance.generate.call_args.kwargs['prompt'].strip(),
+                         "Ask Ada Lovelace about Engines")
+
+        # A name the registry doesn't know is used as given rather than replaced by the default persona
+        self.system.current_expert_name = "Grace Hopper"
+        self.system.generate_host_question("Compilers")
+        self.assertEqual(self.mock_ollama_client_instance.generate.call_args.kwargs['prompt'].strip(),
+                         "Ask Grace Hopper about Compilers")
+
+    def test_persona_file_is_ingested_once(self):
+        with patch('sys.stdout', new_callable=io.StringIO):
+            self.system.setup_expert("MLK")
+            written = self.system.setup_expert("MLK")
+
+        collection = self.collections["experts_martin_luther_king_jr"]
+        collection.upsert.assert_called_once()
+        self.assertEqual(written, 0)
+        self.assertTrue(collection.upsert.call_args.kwargs['ids'][0].startswith("mlk_doc_"))
+        self.assertIn('persona_fingerprint', collection.metadata)
+
+
+class TestExchangeScheduling(MockedBackendsTestCase):
+
+    config = {
+        'interview': {'max_follow_ups_per_response': 2, 'min_topic_depth_before_early_conclusion': 0},
+        'scheduling': {'strategy': "adaptive", 'min_expected_gain': 0.35, 'learn_from_archive': False},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_adaptive_schedule_drives_the_interview(self):
+        depths = {"a": [1, 1], "b": [1, 2, 3], "c": [2]}
+        events = []
+        self.system.event_listeners.append(lambda event_type, data: events.append((event_type, data.get('topic'))))
+        with patch.object(self.system, 'conduct_interview_opening'), \
+                patch.object(self.system, 'generate_host_question', side_effect=lambda topic, *a, **k: f"Q {topic}"), \
+                patch.object(self.system, 'generate_expert_response', side_effect=lambda name, question, *a: question[2:]), \
+                patch.object(self.system, 'evaluate_response_depth', side_effect=lambda q, topic: (depths[topic].pop(0), "r")), \
+                patch.object(self.system, 'generate_interview_conclusion', return_value="Bye"), \
+                patch.object(self.system, 'save_transcript', return_value="t.json"), \
+                patch('sys.stdout', new_callable=io.StringIO):
+            self.system.run_interview("MLK", ["a", "b", "c"], max_exchanges=8)
+
+        asked = [entry['topic'] for entry in self.system.interview_history if entry['speaker'] == "HOST"]
+        self.assertEqual(asked, ["a", "a", "b", "b", "c", "b", "Conclusion"])
+        self.assertEqual(self.system.topic_depth_scores, {"a": 1, "b": 3, "c": 2})
+        completed = [topic for event_type, topic in events if event_type == "topic_completed"]
+        self.assertEqual(completed, ["a", "c", "b"])
+        self.assertEqual(self.system.potential_breakthroughs[0]['improvement'], (2, 3))
+
+
+class TestEpisodeAudio(MockedBackendsTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.config = {
+            'streaming': {'enabled': True},
+            'speech': {'enabled': True, 'backend_options': {'sample_rate': 8000}, 'pause_seconds': 0,
+                       'cache_directory': os.path.join(self.directory, "cache"), 'output_directory': self.directory},
+            'expert_defaults': {'martin_luther_king_jr': {'voice': "mlk"}},
+            'prompts': {'expert_response': {'main_prompt': "{expert_name}: {question}"}},
+            'web_search_settings': {'enabled': False},
+            'startup': {'lazy_initialization': True, 'warm_up_models': False},
+        }
+        super().setUp()
+        self.mock_chromadb_client_instance.get_or_create_collection.return_value.query.return_value = {'documents': [[]]}
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.directory)
+
+    def test_streamed_answer_is_rendered_after_the_host_line(self):
+        chunks = ["<think>x</think>Injustice anywhere ", "is a threat. We must", " act."]
+        self.mock_ollama_client_instance.generate.return_value = iter([{'response': c} for c in chunks])
+
+        with patch('sys.stdout', new_callable=io.StringIO):
+            self.system.start_episode_audio()
+            episode = self.system.episode_audio
+            self.system._speak("HOST", "What is at stake?")
+            self.system.generate_expert_response("Martin Luther King Jr.", "What is at stake?")
+            self.system.finish_episode_audio()
+
+        self.assertEqual([(s["voice"], s["text"]) for s in episode.segments],
+                         [("host", "What is at stake?"), ("mlk", "Injustice anywhere is a threat."), ("mlk", "We must act.")])
+        self.assertEqual(self.system.audio_report["sentences"], 3)
+        self.assertTrue(os.path.exists(self.system.audio_report["path"]))
+        self.system.speech_pipeline.close()
+
+
+class TestRetrievalCache(MockedBackendsTestCase):
+
+    config = {
+        'retrieval_cache': {'enabled': True, 'max_cosine_distance': 0.05},
+        'prompts': {'expert_response': {'main_prompt': "{relevant_knowledge} | {question}"}},
+        'web_search_settings': {'enabled': True},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_paraphrased_follow_up_reuses_retrieval(self):
+        vectors = {"Why nonviolence?": [1.0, 0.0], "Why is nonviolence right?": [0.98, 0.1], "What of AI?": [0.0, 1.0]}
+        self.mock_ollama_client_instance.embed.side_effect = lambda model, input: {'embeddings': [vectors[input[0]]]}
+        self.mock_ollama_client_instance.generate.return_value = {'response': "An answer."}
+        collection = self.mock_chromadb_client_instance.get_or_create_collection.return_value
+        collection.query.return_value = {'documents': [["notes"]]}
+
+        with patch.object(self.system, 'perform_web_search', return_value=["A long enough web snippet."]) as web_search, \
+                patch('sys.stdout', new_callable=io.StringIO):
+            for question in list(vectors) + ["Why nonviolence?"]:
+                self.system.generate_expert_response("MLK", question)
+
+        self.assertEqual(web_search.call_count, 2)
+        self.assertEqual(collection.query.call_count, 2)
+        prompts = [c.kwargs['prompt'] for c in self.mock_ollama_client_instance.generate.call_args_list]
+        self.assertEqual(prompts[1], "notes | Why is nonviolence right?")
+        # The web snippets added for "What of AI?" don't drop the entry cached for "Why nonviolence?"
+        self.assertEqual(self.system.retrieval_cache.report()['invalidations'], 0)
+        self.assertEqual(self.system.retrieval_cache.report()['hit_rate'], 0.5)
+        self.assertEqual(len(self.system.retrieval_cache), 2)
+
+
+class TestLatencyBudget(MockedBackendsTestCase):
+
+    config = {
+        'interview': {'max_follow_ups_per_response': 2, 'min_topic_depth_before_early_conclusion': 0},
+        # Every exchange overruns a zero deadline, so each one switches on the next step
+        'latency_budget': {'enabled': True, 'interview_seconds': 3600, 'exchange_seconds': 0,
+                           'degraded_evaluation_model': "tiny-evaluator"},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_run_degrades_step_by_step_and_records_it(self):
+        events = []
+        self.system.event_listeners.append(lambda event_type, data: events.append((event_type, data)))
+        with patch.object(self.system, 'conduct_interview_opening'), \
+                patch.object(self.system, 'generate_host_question', side_effect=lambda topic, *a, **k: f"Q {topic}"), \
+                patch.object(self.system, 'generate_expert_response', return_value="An answer."), \
+                patch.object(self.system, 'evaluate_response_depth', return_value=(1, "r")), \
+                patch.object(self.system, 'generate_interview_conclusion', return_value="Bye"), \
+                patch.object(self.system, 'save_transcript', return_value="t.json"), \
+                patch('sys.stdout', new_callable=io.StringIO):
+            self.system.run_interview("MLK", ["a", "b"], max_exchanges=10)
+
+        asked = [entry['topic'] for entry in self.system.interview_history if entry['speaker'] == "HOST"]
+        self.assertEqual(asked, ["a", "a", "a", "b", "Conclusion"])
+        steps = [data['step'] for event_type, data in events if event_type == "degradation"]
+        self.assertEqual(steps, ["skip_web_search", "shrink_retrieval", "lower_num_predict", "small_evaluation_model", "cut_follow_ups"])
+        self.assertEqual(self.system._evaluation_model(), "tiny-evaluator")
+        self.assertEqual(self.system.latency_budget.report()['missed_deadlines']['exchange'], 5)
+
+    def test_timed_out_requests_degrade_and_retry_instead_of_ending_the_episode(self):
+        class TimeoutException(Exception):  # httpx's timeout base class, which ollama.Client raises
+            pass
+
+        evaluations = []
+
+        def generate(model, prompt, options=None, **kwargs):
+            if "Respond to: Q b" in prompt or "concluding statement" in prompt:
+                raise TimeoutException("timed out")  # Every attempt
+            if prompt.startswith("Evaluate"):
+                evaluations.append(model)
+                if len(evaluations) == 1:
+                    raise TimeoutException("timed out")  # Only the first attempt
+                return {'response': "Score: 3\nRationale: New ground."}
+            return {'response': "An answer."}
+
+        self.mock_ollama_client_instance.generate.side_effect = generate
+        self.system.config['latency_budget']['exchange_seconds'] = 3600  # Only the timeouts fall behind
+        events = []
+        self.system.event_listeners.append(lambda event_type, data: events.append((event_type, data)))
+        with patch.object(self.system, 'conduct_interview_opening'), \
+                patch.object(self.system, 'generate_host_question', side_effect=lambda topic, *a, **k: f"Q {topic}"), \
+                patch.object(self.system, 'retrieve_expert_knowledge', return_value=""), \
+                patch.object(self.system, 'save_transcript', return_value="t.json") as save_transcript, \
+                patch('sys.stdout', new_callable=io.StringIO):
+            self.assertEqual(self.system.run_interview("MLK", ["a", "b", "c"], max_exchanges=10), "t.json")
+
+        save_transcript.assert_called_once()
+        # Topic b is skipped after its retry timed out too; the conclusion falls back to a default line
+        asked = [(entry['topic'], entry['text']) for entry in self.system.interview_history if entry['speaker'] == "HOST"]
+        self.assertEqual([topic for topic, _ in asked], ["a", "c", "Conclusion"])
+        self.assertIn("That's all the time we have", asked[-1][1])
+        # The retried evaluation kept its score
+        self.assertEqual(self.system.topic_depth_scores, {"a": 3, "c": 3})
+        steps = [data['step'] for event_type, data in events if event_type == "degradation"]
+        self.assertEqual(steps, ["skip_web_search", "shrink_retrieval", "lower_num_predict", "small_evaluation_model", "cut_follow_ups"])
+        self.assertEqual(self.system.latency_budget.report()['missed_deadlines']['request'], 5)
+
+
+class TestModelRouting(MockedBackendsTestCase):
+
+    config = {
+        'model_routing': {'enabled': True, 'cascades': {
+            'HOST_FOLLOWUP_QUESTION': {'models': ["small-host", "large-host"], 'escalate_after_shallow': 2,
+                                       'self_check': "question"},
+        }},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_rejected_draft_is_retried_on_the_next_model(self):
+        self.mock_ollama_client_instance.generate.side_effect = [
+            {'response': "Not a question"},
+            {'response': "What would you say to those who call the movement impatient?"},
+        ]
+
+        response = self.system._make_llm_request("HOST_FOLLOWUP_QUESTION", "configured-model", "prompt")
+
+        self.assertEqual(response['response'], "What would you say to those who call the movement impatient?")
+        models = [c.kwargs['model'] for c in self.mock_ollama_client_instance.generate.call_args_list]
+        self.assertEqual(models, ["small-host", "large-host"])
+        self.assertEqual(self.system.model_router.report()['HOST_FOLLOWUP_QUESTION']['tiers'][0]['escalation_rate'], 1.0)
+
+    def test_shallow_topic_starts_on_the_larger_model_and_unrouted_types_keep_their_model(self):
+        self.mock_ollama_client_instance.generate.return_value = {'response': "Why does that matter so much to you?"}
+        self.system.current_topic = "Nonviolence"
+        for _ in range(2):
+            self.system.model_router.record_depth("Nonviolence", 1)
+
+        self.system._make_llm_request("HOST_FOLLOWUP_QUESTION", "configured-model", "prompt")
+        self.system._make_llm_request("EXPERT_RESPONSE", "expert-model", "prompt")
+
+        models = [c.kwargs['model'] for c in self.mock_ollama_client_instance.generate.call_args_list]
+        self.assertEqual(models, ["large-host", "expert-model"])
+
+        # The next interview on the same topic starts back on the small model
+        self.system.reset_interview_state()
+        self.assertEqual(self.system.model_router.start_tier("HOST_FOLLOWUP_QUESTION", "Nonviolence"), 0)
+        self.assertEqual(self.system.model_router.report(), {})
+
+
+class TestWriteBehind(MockedBackendsTestCase):
+
+    config = {
+        'write_behind': {'enabled': True, 'flush_size': 100, 'flush_interval_seconds': 60, 'overlay_n_results': 1},
+        'prompts': {'expert_response': {'main_prompt': "{relevant_knowledge} | {question}"}},
+        'web_search_settings': {'enabled': True},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_web_snippets_are_written_later_but_retrieved_now(self):
+        self.mock_ollama_client_instance.generate.return_value = {'response': "An answer."}
+        collection = self.mock_chromadb_client_instance.get_or_create_collection.return_value
+        collection.query.return_value = {'documents': [["notes", "more notes", "old notes"]]}
+        snippet = "Nonviolence was a way of life, not a tactic, for the movement."
+        self.system.expert_collection_for("MLK")  # Persona ingestion still upserts directly
+        collection.upsert.reset_mock()
+
+        with patch.object(self.system, 'perform_web_search', return_value=[snippet]), \
+                patch('sys.stdout', new_callable=io.StringIO):
+            self.system.generate_expert_response("MLK", "Was nonviolence a tactic?")
+
+        collection.upsert.assert_not_called()
+        prompt = self.mock_ollama_client_instance.generate.call_args.kwargs['prompt']
+        self.assertEqual(prompt, f"{snippet}\n\nnotes\n\nmore notes | Was nonviolence a tactic?")
+
+        self.assertTrue(self.system.flush_writes(timeout=5))
+        self.assertEqual(collection.upsert.call_args.kwargs['documents'], [snippet])
+        self.system.write_buffer.close()
+
+
+class TestRetrievalServerBackend(MockedBackendsTestCase):
+
+    config = {
+        'retrieval_server': {'url': "http://127.0.0.1:8766", 'pool_size': 2},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_collections_come_from_the_server_instead_of_a_local_store(self):
+        from retrieval_server import RetrievalClient
+        client = self.system.chroma_client
+        self.assertIsInstance(client, RetrievalClient)
+        self.assertEqual((client.host, client.port), ("127.0.0.1", 8766))
+        self.assertNotIn("chromadb.PersistentClient()", [step for step, _ in self.system.startup_timings])
+
+
+class TestSpeculativeFollowUps(MockedBackendsTestCase):
+
+    config = {
+        'interview': {'max_follow_ups_per_response': 1},
+        'speculation': {'enabled': True},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_follow_up_is_generated_during_evaluation_and_kept_only_when_asked_for(self):
+        def host_question(topic, conversation_history="", is_followup=False, expert_response_text=None):
+            return f"Follow-up on '{expert_response_text}'?" if is_followup else f"Opening on {topic}?"
+
+        with patch.object(self.system, 'conduct_interview_opening'), \
+                patch.object(self.system, 'generate_host_question', side_effect=host_question) as generate, \
+                patch.object(self.system, 'generate_expert_response', side_effect=lambda name, q, h: f"answer to {q}"), \
+                patch.object(self.system, 'evaluate_response_depth', side_effect=[(1, "r"), (2, "r"), (3, "r")]), \
+                patch.object(self.system, 'generate_interview_conclusion', return_value="Bye"), \
+                patch.object(self.system, 'save_transcript', return_value="t.json"), \
+                patch('sys.stdout', new_callable=io.StringIO):
+            self.system.run_interview("MLK", ["a", "b"], max_exchanges=10)
+            self.system._speculation_executor.shutdown(wait=True)  # Let the discarded draft finish
+
+        asked = [entry['text'] for entry in self.system.interview_history if entry['speaker'] == "HOST"]
+        self.assertEqual(asked, ["Opening on a?", "Follow-up on 'answer to Opening on a?'?", "Opening on b?", "Bye"])
+        # Two openings plus two speculative follow-ups: "a" used its draft, "b" scored 3 so its draft was thrown away
+        self.assertEqual(generate.call_count, 4)
+        report = self.system.speculation_report()
+        self.assertEqual((report['started'], report['used'], report['discarded'], report['failed']), (2, 1, 1, 0))
+
+
+class TestTopicBriefing(MockedBackendsTestCase):
+
+    config = {
+        'topic_briefing': {'enabled': True, 'pool_size': 10},
+        'chromadb': {'default_n_results': 1},
+        'prompts': {'expert_response': {'main_prompt': "{relevant_knowledge} | {question}"}},
+        'web_search_settings': {'enabled': True},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_questions_on_a_topic_rerank_its_bundle_in_memory(self):
+        vectors = {"AI bias": [1.0, 1.0], "Web view on bias": [0.0, 1.0], "Dream speech": [1.0, 0.0],
+                   "Is bias a moral failure?": [0.1, 1.0], "What would you dream now?": [1.0, 0.2]}
+        self.mock_ollama_client_instance.embed.side_effect = lambda model, input: {'embeddings': [vectors[t] for t in input]}
+        self.mock_ollama_client_instance.generate.return_value = {'response': "An answer."}
+        collection = self.mock_chromadb_client_instance.get_or_create_collection.return_value
+        collection.query.return_value = {'documents': [["Dream speech"]]}
+        self.system.current_expert_name = "MLK"
+        self.system.current_topic = "AI bias"
+
+        with patch.object(self.system, 'perform_web_search', return_value=["Web view on bias"]) as web_search, \
+                patch('sys.stdout', new_callable=io.StringIO):
+            self.system._brief_topic("MLK", "AI bias")
+            for question in ("Is bias a moral failure?", "What would you dream now?"):
+                self.system.generate_expert_response("MLK", question)
+
+        # One web search and one collection query for the topic, none per question
+        web_search.assert_called_once_with("AI bias")
+        self.assertEqual(collection.query.call_args_list, [call(query_texts=["AI bias"], n_results=10)])
+        prompts = [c.kwargs['prompt'] for c in self.mock_ollama_client_instance.generate.call_args_list]
+        self.assertEqual(prompts, ["Web view on bias | Is bias a moral failure?", "Dream speech | What would you dream now?"])
+        self.assertEqual(self.system.topic_briefings.report()['ranked'], 2)
+
+
+class TestSingleFlight(MockedBackendsTestCase):
+
+    config = {
+        'single_flight': {'enabled': True, 'nonzero_temperature_request_types': ["HOST_OPENING_QUESTION"]},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def test_concurrent_interviews_share_an_identical_opening_question(self):
+        from single_flight import PROCESS_GROUP
+        with patch.object(RecursiveInterviewSystem, '_load_config', return_value=copy.deepcopy(self.system.config)):
+            other_system = RecursiveInterviewSystem()
+        release = threading.Event()
+
+        def generate(**kwargs):
+            release.wait(5)
+            return {'response': "Where does bias begin?"}
+
+        self.mock_ollama_client_instance.generate.side_effect = generate
+        shared_before = PROCESS_GROUP.report().get("llm", {}).get("shared", 0)
+        responses = []
+
+        def ask(system):
+            responses.append(system._make_llm_request("HOST_OPENING_QUESTION", "host", "Open on AI bias", {"temperature": 0.85}))
+
+        threads = [threading.Thread(target=ask, args=(system,)) for system in (self.system, other_system)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while PROCESS_GROUP.report().get("llm", {}).get("shared", 0) == shared_before and time.monotonic() < deadline:
+            time.sleep(0.005)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(self.mock_ollama_client_instance.generate.call_count, 1)
+        self.assertEqual([response['response'] for response in responses], ["Where does bias begin?"] * 2)
+        reports = [system.single_flight_report()["llm"] for system in (self.system, other_system)]
+        self.assertEqual(sorted(report["shared"] for report in reports), [0, 1])
+
+    def test_sampled_generations_are_shared_only_when_allowlisted(self):
+        self.assertTrue(self.system._shareable_generation("RESPONSE_EVALUATION", {"temperature": 0}))
+        self.assertTrue(self.system._shareable_generation("HOST_OPENING_QUESTION", {"temperature": 0.85}))
+        self.assertFalse(self.system._shareable_generation("EXPERT_RESPONSE", {"temperature": 0.7}))
+        self.assertFalse(self.system._shareable_generation("RESPONSE_EVALUATION", None))
+
+
+class TestPatternSelection(MockedBackendsTestCase):
+
+    config = {
+        'pattern_selection': {'enabled': True, 'diversity': 0.5},
+        'host_ai_settings': {'learning': {'enabled': True, 'max_patterns_to_inject_in_prompt': 2}},
+        'prompts': {'question_generation': {'opening_question': "Open on {topic}"}},
+        'startup': {'lazy_initialization': True, 'warm_up_models': False},
+    }
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.config = copy.deepcopy(self.config)
+        self.config['pattern_selection']['directory'] = self.directory
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_host_prompt_gets_varied_patterns_instead_of_near_duplicates(self):
+        vectors = {"Bias question": [1.0, 0.0], "Bias question, rephrased": [0.99, 0.05], "Dream question": [0.6, 0.8],
+                   "successful patterns for topic: AI bias": [1.0, 0.1], "New question": [0.0, 1.0]}
+        self.mock_ollama_client_instance.embed.side_effect = lambda model, input: {'embeddings': [vectors[t] for t in input]}
+        self.mock_ollama_client_instance.generate.return_value = {'response': "Why?"}
+        host_collection = self.mock_chromadb_client_instance.get_or_create_collection.return_value
+        host_collection.get.return_value = {'ids': ["p1", "p2", "p3"],
+                                            'documents': ["Bias question", "Bias question, rephrased", "Dream question"]}
+
+        self.system.generate_host_question("AI bias")
+
+        prompt = self.mock_ollama_client_instance.generate.call_args.kwargs['prompt']
+        # The two bias patterns are near-duplicates, so the second example is the dream pattern
+        self.assertIn("Dream question", prompt)
+        self.assertEqual(prompt.count("Bias question"), 1)
+        host_collection.query.assert_not_called()
+
+        self.system._add_learned_pattern("p4", "New question")
+        self.assertEqual(len(self.system.pattern_library), 4)
+        self.system.save_pattern_library()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "patterns.npz")))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from knowledge_bundle import KnowledgeBundle, TopicBriefings
+
+
+class TestKnowledgeBundle(unittest.TestCase):
+
+    def test_rank_orders_by_cosine_similarity(self):
+        bundle = KnowledgeBundle("AI bias", ["east", "north", "north-east", "zero"],
+                                 [[10.0, 0.0], [0.0, 1.0], [1.0, 1.0], [0.0, 0.0]])
+        self.assertEqual(bundle.rank([0.1, 1.0], 2), ["north", "north-east"])
+        self.assertEqual(bundle.rank([1.0, 0.0], 10)[:2], ["east", "north-east"])
+        self.assertEqual(KnowledgeBundle("empty", [], []).rank([1.0, 0.0], 3), [])
+
+
+class TestTopicBriefings(unittest.TestCase):
+
+    def test_prepared_bundles_are_built_once_in_the_background(self):
+        built = []
+        release = threading.Event()
+
+        def build(expert_name, topic):
+            release.wait(5)
+            built.append((expert_name, topic, threading.current_thread().name))
+            return KnowledgeBundle(topic, [topic], [[1.0]])
+
+        briefings = TopicBriefings(build)
+        briefings.prepare("MLK", ["a", "b"])
+        self.assertIsNone(briefings.ready("MLK", "a"))
+        release.set()
+        self.assertEqual(briefings.get("MLK", "b").documents, ["b"])
+        self.assertEqual(briefings.get("MLK", "a").documents, ["a"])
+        self.assertEqual([(expert, topic) for expert, topic, _ in built], [("MLK", "a"), ("MLK", "b")])
+        self.assertTrue(all(name.startswith("topic-briefing") for _, _, name in built))
+        self.assertEqual(briefings.rank(briefings.ready("MLK", "a"), [1.0], 3), ["a"])
+        self.assertEqual(briefings.report()['built'], 2)
+
+    def test_failed_build_raises_and_is_never_ready(self):
+        briefings = TopicBriefings(lambda expert_name, topic: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            briefings.get("MLK", "a")
+        self.assertIsNone(briefings.ready("MLK", "a"))
+        self.assertEqual(briefings.report()['failed'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
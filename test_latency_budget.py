@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from latency_budget import LatencyBudget, is_timeout
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.budget = LatencyBudget(100, steps=["skip_web_search", "cut_follow_ups"], clock=self.clock)
+        self.budget.start_interview(topic_count=2, exchange_count=10)
+
+    def exchange(self, topic, seconds, remaining):
+        self.budget.start_exchange(topic)
+        self.clock.now += seconds
+        return self.budget.finish_exchange(remaining)
+
+    def test_deadlines_default_to_even_shares_and_on_pace_runs_are_untouched(self):
+        self.assertEqual((self.budget.topic_seconds, self.budget.exchange_seconds), (50, 10))
+        for remaining in range(8, 0, -1):
+            self.assertIsNone(self.exchange("a" if remaining > 4 else "b", 9, remaining))
+        self.assertEqual(self.budget.report()["degradations"], [])
+        self.assertTrue(self.budget.report()["met_deadline"])
+
+    def test_falling_behind_switches_steps_on_in_order(self):
+        self.assertIsNone(self.exchange("a", 8, remaining=8))
+        self.assertEqual(self.exchange("a", 12, remaining=7), "skip_web_search")  # Over the exchange deadline
+        self.assertFalse(self.budget.active("cut_follow_ups"))
+        # Still on pace for the interview: the remaining exchanges and the conclusion at 10s each fit exactly
+        self.assertIsNone(self.exchange("a", 10, remaining=6))
+        self.assertIsNone(self.exchange("a", 10, remaining=5))
+        self.assertEqual(self.exchange("a", 12, remaining=4), "cut_follow_ups")
+        self.assertIsNone(self.exchange("b", 30, remaining=1))  # Nothing left to switch on
+
+        report = self.budget.report()
+        self.assertEqual([d["step"] for d in report["degradations"]], ["skip_web_search", "cut_follow_ups"])
+        self.assertIn("topic 'a' has taken 52.0s", report["degradations"][1]["reason"])
+        self.assertEqual(report["missed_deadlines"], {'exchange': 3, 'topic': 1, 'interview': 2, 'request': 0})
+
+    def test_request_timeouts_switch_the_next_step_on(self):
+        class TimeoutException(Exception):  # Stands in for httpx.TimeoutException
+            pass
+
+        class ReadTimeout(TimeoutException):
+            pass
+
+        self.assertTrue(is_timeout(ReadTimeout("timed out")))
+        self.assertTrue(is_timeout(TimeoutError()))
+        self.assertFalse(is_timeout(ConnectionError("refused")))
+
+        self.assertEqual(self.budget.request_timed_out("EXPERT_RESPONSE timed out"), "skip_web_search")
+        self.assertTrue(self.budget.active("skip_web_search"))
+        self.assertEqual(self.budget.report()["missed_deadlines"]["request"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from model_router import ModelCascade, ModelRouter, check_answer, check_question
+
+
+class TestModelRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = ModelRouter.from_config({'cascades': {
+            'HOST_FOLLOWUP_QUESTION': {'models': ["small", "medium", "large"], 'escalate_after_shallow': 2,
+                                       'self_check': "question"},
+        }})
+
+    def test_shallow_answers_move_a_topic_up_the_cascade_until_it_deepens(self):
+        for depth, expected_tier in ((1, 0), (1, 1), (1, 1), (1, 2), (1, 2), (2, 0)):
+            self.router.record_depth("AI bias", depth)
+            self.assertEqual(self.router.start_tier('HOST_FOLLOWUP_QUESTION', "AI bias"), expected_tier)
+        self.assertEqual(self.router.start_tier('HOST_FOLLOWUP_QUESTION', "Nonviolence"), 0)
+
+    def test_report_counts_calls_escalations_and_latency_per_tier(self):
+        for seconds in (0.2, 0.4, 0.3):
+            self.router.record_call('HOST_FOLLOWUP_QUESTION', 0, seconds)
+        self.router.record_escalation('HOST_FOLLOWUP_QUESTION', 0)
+        self.router.record_call('HOST_FOLLOWUP_QUESTION', 1, 1.0)
+
+        report = self.router.report()['HOST_FOLLOWUP_QUESTION']
+        self.assertEqual(report['calls'], 4)
+        self.assertEqual(report['tiers'][0], {"model": "small", "calls": 3, "share": 0.75, "escalation_rate": 0.333, "mean_seconds": 0.3})
+        self.assertEqual(report['tiers'][1]['model'], "medium")
+
+    def test_reset_forgets_depth_history_and_statistics(self):
+        for _ in range(4):
+            self.router.record_depth("AI bias", 1)
+        self.router.record_call('HOST_FOLLOWUP_QUESTION', 2, 1.0)
+        self.router.reset()
+        self.assertEqual(self.router.start_tier('HOST_FOLLOWUP_QUESTION', "AI bias"), 0)
+        self.assertEqual(self.router.report(), {})
+
+    def test_self_checks(self):
+        self.assertTrue(check_question("What would you say to the engineers building these systems?")[0])
+        self.assertEqual(check_question("Tell me more about that.")[1], "draft is not a question")
+        self.assertFalse(check_answer("Yes.")[0])
+        self.assertTrue(ModelCascade("EXPERT_RESPONSE", ["a"], self_check="answer", min_words=1).check("Yes.")[0])
+        with self.assertRaises(ValueError):
+            ModelCascade("EXPERT_RESPONSE", ["a"], self_check="vibes")
+
+
+if __name__ == '__main__':
+    unittest.main()
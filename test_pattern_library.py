@@ -0,0 +1,90 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from pattern_library import PatternLibrary, spherical_kmeans
+
+
+def clustered_vectors(groups, per_group, dimensions=16, spread=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(groups, dimensions))
+    labels = np.repeat(np.arange(groups), per_group)
+    return (centers[labels] + spread * rng.normal(size=(len(labels), dimensions))).astype(np.float32), labels, centers
+
+
+class TestSphericalKMeans(unittest.TestCase):
+
+    def test_recovers_well_separated_groups(self):
+        vectors, labels, _ = clustered_vectors(4, 25)
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        assignments, sums, counts = spherical_kmeans(unit, 4, seed=1)
+        self.assertEqual(sorted(counts.tolist()), [25, 25, 25, 25])
+        # Every group lands in a single cluster
+        for group in range(4):
+            self.assertEqual(len(set(assignments[labels == group].tolist())), 1)
+
+
+class TestPatternLibrary(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_selection_spreads_over_clusters_instead_of_near_duplicates(self):
+        vectors, labels, centers = clustered_vectors(3, 20)
+        library = PatternLibrary(self.directory, max_clusters=3, diversity=0.5)
+        library.sync([str(i) for i in range(len(vectors))], [f"group {label}" for label in labels],
+                     lambda documents: [vectors[int(i)] for i in range(len(documents))])
+        self.assertEqual(library.clusters, 3)
+
+        # A query close to group 0: plain top-k would return group 0 three times
+        picked = library.select(centers[0] + 0.3 * centers[1], 3)
+        self.assertEqual(picked[0], "group 0")
+        self.assertEqual(sorted(picked), ["group 0", "group 1", "group 2"])
+
+    def test_added_patterns_join_clusters_and_survive_a_reload(self):
+        vectors, _, _ = clustered_vectors(2, 3)
+        library = PatternLibrary(self.directory, max_clusters=2)
+        for i, vector in enumerate(vectors):
+            library.add(f"pattern_{i}", f"doc {i}", vector)
+        library.add("pattern_0", "doc 0 (replaced)", vectors[0])
+        library.wait()
+        self.assertEqual((len(library), library.clusters), (6, 2))
+        self.assertGreaterEqual(library.report()['refits'], 1)  # k-means ran once there were more patterns than clusters
+
+        library.save()
+        reloaded = PatternLibrary.load(self.directory, max_clusters=2)
+        self.assertEqual(reloaded.ids, library.ids)
+        self.assertIn("doc 0 (replaced)", reloaded.documents)
+        self.assertEqual(reloaded.select(vectors[0], 2), library.select(vectors[0], 2))
+
+        # Syncing embeds only patterns the library hasn't seen and drops deleted ones
+        embedded = []
+        ids = [f"pattern_{i}" for i in range(1, 6)] + ["pattern_new"]
+        documents = [f"doc {i}" for i in range(1, 6)] + ["doc new"]
+
+        def embed(texts):
+            embedded.extend(texts)
+            return [vectors[0]] * len(texts)
+
+        self.assertEqual(reloaded.sync(ids, documents, embed), 1)
+        self.assertEqual(embedded, ["doc new"])
+        self.assertEqual(sorted(reloaded.ids), sorted(ids))
+
+    def test_mismatched_query_dimensions_raise(self):
+        library = PatternLibrary(self.directory)
+        library.add("pattern_0", "doc", [1.0, 0.0])
+        with self.assertRaises(ValueError):
+            library.select([1.0, 0.0, 0.0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from persona_registry import PersonaRegistry, partial_format
+
+
+class TestPersonaRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(os.path.join(self.directory, "mlk.md"), "w", encoding="utf-8") as f:
+            f.write("# Martin Luther King Jr. — Evolved Digital Persona (1929-2025)\n")
+        with open(os.path.join(self.directory, "ada.md"), "w", encoding="utf-8") as f:
+            f.write("# Ada Lovelace — Enchantress of Numbers\n\n**ADA:** The engine weaves algebraic patterns.\n")
+        self.config = {
+            'chromadb': {'expert_collection_name': "experts"},
+            'persona_settings': {'personas_directory': self.directory, 'max_open_collections': 2},
+            'expert_defaults': {
+                'martin_luther_king_jr': {'aliases': ["MLK"], 'persona_file': os.path.join(self.directory, "mlk.md"),
+                                          'collection_name': "expert_knowledge", 'expert_age': 96},
+            },
+        }
+        self.opened = []
+        self.first_opens = []
+        self.registry = PersonaRegistry(
+            self.config,
+            lambda name, metadata: self.opened.append(name) or {"name": name},
+            lambda persona, collection: self.first_opens.append(persona.key),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_discovers_configured_and_file_only_personas(self):
+        self.assertEqual(sorted(self.registry.personas), ["ada_lovelace", "martin_luther_king_jr"])
+        self.assertEqual(self.registry.resolve("MLK").settings['expert_age'], 96)
+        ada = self.registry.resolve("Ada Lovelace")
+        self.assertEqual(ada.collection_name, "experts_ada_lovelace")
+        self.assertEqual(ada.doc_id_prefix, "ada_lovelace_doc_")
+        self.assertIs(self.registry.resolve("Somebody Unknown"), self.registry.default)
+
+    def test_collections_are_opened_once_and_evicted_least_recently_used(self):
+        self.registry.collection("MLK")
+        self.registry.collection("Ada Lovelace")
+        self.registry.collection("MLK")
+        self.assertEqual(self.opened, ["expert_knowledge", "experts_ada_lovelace"])
+
+        self.config['expert_defaults']['grace_hopper'] = {}
+        self.registry._personas = None  # Rediscover with the extra expert
+        self.registry.collection("Grace Hopper")
+        self.assertEqual(self.registry.open_collections(), ["martin_luther_king_jr", "grace_hopper"])
+
+        # Reopening an evicted collection doesn't repeat the first-open work
+        self.registry.collection("Ada Lovelace")
+        self.assertEqual(self.opened[-1], "experts_ada_lovelace")
+        self.assertEqual(self.first_opens, ["martin_luther_king_jr", "ada_lovelace", "grace_hopper"])
+
+    def test_persona_documents_drop_tags_and_heading_markers(self):
+        ada = self.registry.resolve("ada_lovelace")
+        with open(ada.file_path, encoding="utf-8") as f:
+            self.assertEqual(ada.extract_documents(f.read()),
+                             ["Ada Lovelace — Enchantress of Numbers", "The engine weaves algebraic patterns."])
+
+    def test_prompt_prefix_is_built_once_and_formats_like_the_full_template(self):
+        template = "You are {expert_name}, age {expert_age}. {{Literal}} Knowledge: {relevant_knowledge}. Q: {question!r} ({max_words:>4} words)"
+        persona = self.registry.default
+        prefix = persona.prompt_template(template, expert_name="Dr. {King}", expert_age=96, max_words=50)
+
+        self.assertIs(persona.prompt_template(template, expert_name="Dr. {King}", expert_age=96, max_words=50), prefix)
+        self.assertEqual(prefix.format(relevant_knowledge="{none}", question="Why?"),
+                         template.format(expert_name="Dr. {King}", expert_age=96, max_words=50,
+                                         relevant_knowledge="{none}", question="Why?"))
+        self.assertEqual(partial_format("{a:>3}{b}", a=7), "  7{b}")
+
+
+if __name__ == '__main__':
+    unittest.main()
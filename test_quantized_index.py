@@ -0,0 +1,122 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from quantized_index import QuantizedCollection, QuantizedIndex
+
+
+class VectorCollection:
+    """Stands in for a Chroma collection that stores the embeddings its embed function makes"""
+
+    def __init__(self, name, embed):
+        self.name = name
+        self.embed = embed
+        self.records = {}  # id -> (document, metadata, embedding)
+        self.exports = 0
+        self.queries = 0
+
+    def upsert(self, ids, documents, metadatas=None):
+        metadatas = metadatas or [None] * len(ids)
+        for doc_id, document, metadata, vector in zip(ids, documents, metadatas, self.embed(documents)):
+            self.records[doc_id] = (document, metadata, vector)
+
+    def get(self, ids=None, limit=None, offset=0, include=None):
+        if ids is None:
+            self.exports += 1
+            ids = list(self.records)[offset:offset + limit]
+        return {"ids": ids, "documents": [self.records[i][0] for i in ids],
+                "metadatas": [self.records[i][1] for i in ids], "embeddings": np.array([self.records[i][2] for i in ids])}
+
+    def delete(self, ids=None, where=None):
+        for doc_id in ids or []:
+            del self.records[doc_id]
+
+    def count(self):
+        return len(self.records)
+
+    def query(self, **kwargs):
+        self.queries += 1
+        return {"documents": [["from chroma"]]}
+
+
+def axis_embed(texts):
+    """Embeds texts naming compass directions as 2-d vectors"""
+    directions = {"east": [1.0, 0.0], "north": [0.0, 1.0], "north-east": [1.0, 1.0], "west": [-1.0, 0.1]}
+    return [directions[text.split()[0]] for text in texts]
+
+
+class TestQuantizedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_quantized_search_finds_the_exact_nearest_neighbours(self):
+        rng = np.random.default_rng(7)
+        embeddings = rng.normal(size=(500, 32))
+        queries = rng.normal(size=(20, 32))
+        unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        for quantization in ("int8", "float16"):
+            index = QuantizedIndex.build(os.path.join(self.directory, quantization), [str(i) for i in range(500)],
+                                         [f"doc {i}" for i in range(500)], None, embeddings, quantization=quantization)
+            for query in queries:
+                expected = list(np.argsort(-(unit @ (query / np.linalg.norm(query))))[:5])
+                self.assertEqual([row for row, _ in index.search(query, 5)], expected)
+            self.assertEqual(index.documents([3, 1]), ["doc 3", "doc 1"])
+        self.assertEqual(index.resident_bytes(), 500 * 32 * 2)
+
+    def test_where_filter_and_reopening(self):
+        path = os.path.join(self.directory, "host")
+        QuantizedIndex.build(path, ["a", "b", "c"], ["east", "north", "north-east"],
+                             [{"type": "pattern"}, {"type": "web"}, {"type": "pattern"}], axis_embed(["east", "north", "north-east"]))
+        index = QuantizedIndex(path)
+        self.assertEqual([index.ids[row] for row, _ in index.search([0.0, 1.0], 3, where={"type": "pattern"})], ["c", "a"])
+
+
+class TestQuantizedCollection(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.chroma = VectorCollection("expert_mlk", axis_embed)
+        self.chroma.upsert(["e", "n"], ["east wind", "north star"], [{"type": "base_persona"}] * 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_queries_use_the_index_plus_recent_upserts(self):
+        collection = QuantizedCollection(self.chroma, axis_embed, self.directory)
+        self.assertEqual(collection.query(query_texts=["north"], n_results=1)["documents"], [["north star"]])
+        self.assertEqual(self.chroma.exports, 1)
+
+        collection.upsert(ids=["ne"], documents=["north-east breeze"], metadatas=[{"type": "web_search"}])
+        result = collection.query(query_texts=["north-east"], n_results=2)
+        self.assertEqual(result["documents"], [["north-east breeze", "east wind"]])
+        self.assertAlmostEqual(result["distances"][0][0], 0.0, places=5)
+        self.assertEqual(collection.query(query_texts=["north-east"], n_results=1, where={"type": "base_persona"})["ids"], [["e"]])
+        self.assertEqual(self.chroma.exports, 1)
+        self.assertEqual(collection.count(), 3)
+
+        # Unsupported filters are answered by the collection itself
+        self.assertEqual(collection.query(query_texts=["east"], where={"$or": [{"type": "a"}]})["documents"], [["from chroma"]])
+
+    def test_index_is_reused_across_runs_and_rebuilt_after_a_delete(self):
+        QuantizedCollection(self.chroma, axis_embed, self.directory).query(query_texts=["east"], n_results=1)
+        reopened = QuantizedCollection(self.chroma, axis_embed, self.directory)
+        reopened.query(query_texts=["east"], n_results=1)
+        self.assertEqual(self.chroma.exports, 1)
+
+        reopened.delete(ids=["e"])
+        self.assertEqual(reopened.query(query_texts=["east"], n_results=2)["documents"], [["north star"]])
+        self.assertEqual(self.chroma.exports, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+from unittest.mock import MagicMock
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from rescore_transcripts import (BatchEvaluator, iter_exchange_pairs, load_completed_keys,
+                                 pack_pairs, rescore)
+
+TEST_CONFIG = {
+    'evaluation_llm_model': 'test-eval-llm',
+    'prompts': {'evaluation': {'main_prompt': "Evaluate {question} and {response}"}},
+    'batch_evaluation': {'pairs_per_prompt': 2, 'max_prompt_tokens': 10000}
+}
+
+
+def make_transcript(topic_texts):
+    interview = [
+        {"speaker": "HOST", "text": "Intro question", "topic": "Introduction"},
+        {"speaker": "Test Expert", "text": "Intro answer", "topic": "Introduction"},
+    ]
+    for topic, question, response in topic_texts:
+        interview.append({"speaker": "HOST", "text": question, "topic": topic})
+        interview.append({"speaker": "Test Expert", "text": response, "topic": topic})
+    interview.append({"speaker": "HOST", "text": "Goodbye", "topic": "Conclusion"})
+    return {
+        "timestamp": "20250101_120000",
+        "interview": interview,
+        "metadata": {"expert_name": "Test Expert", "topic_depth_scores": {"T1": 2}}
+    }
+
+
+def batch_reply(numbers, score=3):
+    return {'response': json.dumps({"evaluations": [
+        {"exchange": n, "score": score, "rationale": f"R{n}", "comfort_zone_flags": []} for n in numbers
+    ]})}
+
+
+class TestRescoreTranscripts(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.transcript_path = os.path.join(self.directory, "interview_1.json")
+        with open(self.transcript_path, 'w', encoding='utf-8') as f:
+            json.dump(make_transcript([
+                ("T1", "Q1", "A1"), ("T1", "Q2", "A2"), ("T2", "Q3", "A3")
+            ]), f)
+        self.output_path = os.path.join(self.directory, "rescored.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_evaluator(self, replies):
+        evaluator = BatchEvaluator(TEST_CONFIG)
+        evaluator._client = MagicMock()
+        evaluator._client.generate.side_effect = replies
+        return evaluator
+
+    def test_pairs_skip_introduction_and_conclusion(self):
+        pairs = list(iter_exchange_pairs([self.transcript_path]))
+        self.assertEqual([(p['question'], p['response']) for p in pairs], [("Q1", "A1"), ("Q2", "A2"), ("Q3", "A3")])
+        self.assertEqual([p['entry_index'] for p in pairs], [2, 4, 6])
+        self.assertEqual(pairs[0]['live_topic_depth'], 2)
+
+    def test_pack_pairs_respects_count_and_token_budget(self):
+        pairs = [{"question": "q" * 40, "response": "r" * 40} for _ in range(5)]
+        self.assertEqual([len(b) for b in pack_pairs(pairs, 2, 10000)], [2, 2, 1])
+        # Each pair is ~37 estimated tokens, so only one fits beside a 50-token base prompt
+        self.assertEqual([len(b) for b in pack_pairs(pairs, 4, 100, base_prompt_tokens=50)], [1, 1, 1, 1, 1])
+
+    def test_batch_prompt_packs_exchanges_into_one_call(self):
+        evaluator = self.make_evaluator([batch_reply([1, 2])])
+        batch = list(iter_exchange_pairs([self.transcript_path]))[:2]
+
+        rows, failures = evaluator.evaluate_batch(batch)
+
+        self.assertEqual(failures, 0)
+        self.assertEqual([r['rationale'] for r in rows], ["R1", "R2"])
+        self.assertEqual(evaluator._client.generate.call_count, 1)
+        prompt = evaluator._client.generate.call_args.kwargs['prompt']
+        self.assertIn("### Exchange 2\nQuestion: Q2", prompt)
+
+    def test_missing_batch_entries_fall_back_to_single_evaluation(self):
+        single = {'response': '{"score": 1, "rationale": "Single", "comfort_zone_flags": []}'}
+        evaluator = self.make_evaluator([batch_reply([1]), single])
+        batch = list(iter_exchange_pairs([self.transcript_path]))[:2]
+
+        rows, failures = evaluator.evaluate_batch(batch)
+
+        self.assertEqual([(r['score'], r['pairs_in_prompt']) for r in rows], [(3, 2), (1, 1)])
+        self.assertEqual(failures, 0)
+
+    def test_rescore_writes_results_and_resumes(self):
+        evaluator_client = MagicMock()
+        # Three pairs with two per prompt: one packed prompt, then a single-exchange prompt
+        evaluator_client.generate.side_effect = [
+            batch_reply([1, 2]),
+            {'response': '{"score": 2, "rationale": "Alone", "comfort_zone_flags": []}'}
+        ]
+        with unittest.mock.patch('rescore_transcripts.ollama.Client', return_value=evaluator_client):
+            written, failed = rescore([self.transcript_path], self.output_path, TEST_CONFIG, workers=1, log=lambda m: None)
+
+        self.assertEqual((written, failed), (3, 0))
+        with open(self.output_path, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([r['question'] for r in rows], ["Q1", "Q2", "Q3"])
+        prompt_hash = BatchEvaluator(TEST_CONFIG).prompt_hash
+        self.assertEqual(load_completed_keys(self.output_path),
+                         {(self.transcript_path, i, 'test-eval-llm', prompt_hash) for i in (2, 4, 6)})
+
+        # A second run finds nothing left to score
+        evaluator_client.generate.reset_mock()
+        with unittest.mock.patch('rescore_transcripts.ollama.Client', return_value=evaluator_client):
+            written, failed = rescore([self.transcript_path], self.output_path, TEST_CONFIG, workers=1, log=lambda m: None)
+        self.assertEqual((written, failed), (0, 0))
+        evaluator_client.generate.assert_not_called()
+
+        # A changed evaluation prompt is a new campaign: everything is scored again into the same file
+        changed_config = dict(TEST_CONFIG, prompts={'evaluation': {'main_prompt': "Judge {question} / {response}"}})
+        evaluator_client.generate.side_effect = [
+            batch_reply([1, 2]),
+            {'response': '{"score": 1, "rationale": "Again", "comfort_zone_flags": []}'}
+        ]
+        with unittest.mock.patch('rescore_transcripts.ollama.Client', return_value=evaluator_client):
+            written, failed = rescore([self.transcript_path], self.output_path, changed_config, workers=1, log=lambda m: None)
+        self.assertEqual((written, failed), (3, 0))
+        with open(self.output_path, encoding='utf-8', newline='') as f:
+            self.assertEqual(len({r['prompt_hash'] for r in csv.DictReader(f)}), 2)
+
+    def test_backend_errors_fail_pairs_without_stopping_the_run(self):
+        evaluator_client = MagicMock()
+        # The packed prompt times out, so both of its pairs are retried alone: one scores, one keeps failing
+        evaluator_client.generate.side_effect = [
+            TimeoutError("timed out"),
+            {'response': '{"score": 2, "rationale": "Alone", "comfort_zone_flags": []}'},
+            ConnectionError("connection refused"),
+            ConnectionError("connection refused"),
+            {'response': '{"score": 3, "rationale": "Last", "comfort_zone_flags": []}'},
+        ]
+        with unittest.mock.patch('rescore_transcripts.ollama.Client', return_value=evaluator_client), \
+                self.assertLogs('rescore_transcripts', level='WARNING'):
+            written, failed = rescore([self.transcript_path], self.output_path, TEST_CONFIG, workers=1, log=lambda m: None)
+
+        self.assertEqual((written, failed), (2, 1))
+        with open(self.output_path, encoding='utf-8', newline='') as f:
+            self.assertEqual([r['question'] for r in csv.DictReader(f)], ["Q1", "Q3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
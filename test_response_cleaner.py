@@ -0,0 +1,99 @@
+import unittest
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from response_cleaner import StreamingResponseCleaner, clean_response_text, strip_think_blocks
+
+# Same inputs and expectations as the clean_response tests in test_interview_system.py
+CLEAN_RESPONSE_CASES = [
+    ("  <think>This is a thought.</think> Hello world!  <think>Another thought here.</think>  ", "Hello world!"),
+    ("   Lots of   spaces   here.   ", "Lots of spaces here."),
+    ("This is a clean string.", "This is a clean string."),
+    ("<think>Outer<think>Inner</think></think>Some<think>T1</think>text<think>T2</think>here.", "Sometexthere."),
+    ("", ""),
+    ("<think>thought one</think><think>thought two</think>", ""),
+]
+
+FUZZ_TOKENS = [
+    "<think>", "</think>", "<", "think>", "**", "*", "**Opening Question:**", "**Follow-up Question:** \"",
+    "**Rationale:**", "**MLK:**", "**HOST:**", "MLK:", "HOST:", " ", "  ", "\n", "\t", '"', "'",
+    "word", "don't", "two words", "<thi", "nk>", "end."
+]
+
+
+def stream_clean(text, chunk_sizes):
+    cleaner = StreamingResponseCleaner()
+    streamed = []
+    position = 0
+    for size in chunk_sizes:
+        if position >= len(text):
+            break
+        streamed.append(cleaner.feed(text[position:position + size]))
+        position += size
+    if position < len(text):
+        streamed.append(cleaner.feed(text[position:]))
+    return ''.join(streamed), cleaner.finish()
+
+
+class TestCleanResponseText(unittest.TestCase):
+
+    def test_existing_clean_response_cases(self):
+        for text, expected in CLEAN_RESPONSE_CASES:
+            self.assertEqual(clean_response_text(text), expected)
+
+    def test_labels_rationale_speaker_and_quotes(self):
+        text = '<think>plan</think>\n**Follow-up Question:** Why now?\n**Rationale:** pushes harder'
+        self.assertEqual(clean_response_text(text), "Why now?")
+        self.assertEqual(clean_response_text('**HOST:** MLK: "Why now?"'), "Why now?")
+
+    def test_unclosed_think_block_is_dropped(self):
+        self.assertEqual(strip_think_blocks("Answer<think>still thinking"), "Answer")
+
+
+class TestStreamingResponseCleaner(unittest.TestCase):
+
+    def test_existing_cases_one_character_at_a_time(self):
+        for text, expected in CLEAN_RESPONSE_CASES:
+            _, final = stream_clean(text, [1] * len(text))
+            self.assertEqual(final, expected)
+
+    def test_matches_batch_cleaning_for_random_chunkings(self):
+        rng = random.Random(7)
+        for _ in range(3000):
+            text = ''.join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, 10)))
+            chunk_sizes = [rng.randint(1, 5) for _ in range(len(text))]
+            streamed, final = stream_clean(text, chunk_sizes)
+            expected = clean_response_text(text)
+            self.assertEqual(final, expected, repr(text))
+            # Streamed text is a prefix of the result, apart from a withheld leading quote
+            unquoted = expected[1:].lstrip(' ') if expected[:1] in ('"', "'") else expected
+            self.assertTrue(expected.startswith(streamed) or unquoted.startswith(streamed), repr(text))
+
+    def test_think_spans_and_tags_are_removed_while_streaming(self):
+        cleaner = StreamingResponseCleaner()
+        self.assertEqual(cleaner.feed("<thi"), "")
+        self.assertEqual(cleaner.feed("nk>hidden</th"), "")
+        self.assertEqual(cleaner.feed("ink>MLK: The"), "The")
+        self.assertEqual(cleaner.feed(" dream"), " dream")
+        self.assertEqual(cleaner.finish(), "The dream")
+
+    def test_word_count_tracks_streamed_text(self):
+        cleaner = StreamingResponseCleaner()
+        cleaner.feed('"We   have')
+        self.assertEqual(cleaner.word_count, 2)
+        cleaner.feed(' come\nfar"')
+        self.assertEqual(cleaner.word_count, 4)
+        self.assertEqual(cleaner.finish(), "We have come far")
+
+    def test_feed_after_finish_raises(self):
+        cleaner = StreamingResponseCleaner()
+        cleaner.finish()
+        with self.assertRaises(ValueError):
+            cleaner.feed("more")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from retrieval_cache import SemanticRetrievalCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSemanticRetrievalCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SemanticRetrievalCache(max_cosine_distance=0.05, max_entries=2, ttl_seconds=60, clock=self.clock)
+
+    def test_near_identical_questions_share_an_entry_per_expert(self):
+        self.cache.store("mlk", [1.0, 0.0], "nonviolence notes")
+
+        self.assertEqual(self.cache.lookup("mlk", [0.99, 0.05]), "nonviolence notes")
+        self.assertIsNone(self.cache.lookup("mlk", [0.7, 0.7]))
+        self.assertIsNone(self.cache.lookup("ada", [1.0, 0.0]))
+        self.assertEqual(self.cache.report()['hit_rate'], 0.333)
+
+    def test_entries_expire_are_evicted_and_invalidated(self):
+        self.cache.store("mlk", [1.0, 0.0], "old")
+        self.clock.now = 30
+        self.cache.store("mlk", [0.0, 1.0], "newer")
+        self.clock.now = 50
+        self.cache.store("ada", [1.0, 1.0], "ada")  # Evicts "old", the least recently used
+
+        self.assertIsNone(self.cache.lookup("mlk", [1.0, 0.0]))
+        self.assertEqual(self.cache.stats['evictions'], 1)
+        self.clock.now = 95  # "newer" is 65s old
+        self.assertIsNone(self.cache.lookup("mlk", [0.0, 1.0]))
+        self.assertEqual(self.cache.invalidate("ada"), 1)
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from retrieval_server import QueryBatcher, RetrievalClient, RetrievalServer, RetrievalServerError
+
+
+class WordCollection:
+    """Stands in for a Chroma collection: ranks documents by words shared with the query"""
+
+    def __init__(self, name, metadata):
+        self.name = name
+        self.metadata = metadata
+        self.documents = {}
+        self.query_calls = []
+        self.lock = threading.Lock()
+
+    def upsert(self, ids, documents, metadatas=None):
+        with self.lock:
+            self.documents.update(zip(ids, documents))
+
+    def delete(self, ids=None, where=None):
+        for doc_id in ids or []:
+            self.documents.pop(doc_id, None)
+
+    def modify(self, metadata=None, name=None):
+        self.metadata = metadata
+
+    def count(self):
+        return len(self.documents)
+
+    def query(self, query_texts, n_results=10, **options):
+        self.query_calls.append(list(query_texts))
+        if "where" in options and options["where"] is None:
+            raise ValueError("where must be a dict")
+        ranked = []
+        for text in query_texts:
+            words = set(text.lower().split())
+            ordered = sorted(self.documents, key=lambda doc_id: -len(words & set(self.documents[doc_id].lower().split())))[:n_results]
+            ranked.append(ordered)
+        return {"ids": ranked, "documents": [[self.documents[doc_id] for doc_id in row] for row in ranked],
+                "distances": [[0.0] * len(row) for row in ranked], "included": ["documents", "distances"]}
+
+
+class WordChromaClient:
+    def __init__(self):
+        self.collections = {}
+
+    def get_or_create_collection(self, name, metadata=None):
+        return self.collections.setdefault(name, WordCollection(name, metadata))
+
+
+class TestRetrievalServer(unittest.TestCase):
+
+    def setUp(self):
+        self.chroma = WordChromaClient()
+        self.server = RetrievalServer(self.chroma, batch_window_ms=50)
+        host, port = self.server.serve("127.0.0.1", 0)
+        self.client = RetrievalClient(f"http://{host}:{port}", pool_size=2)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_collections_are_shared_through_the_server(self):
+        collection = self.client.get_or_create_collection("expert_mlk", metadata={"persona": "mlk"})
+        collection.upsert(ids=["a", "b"], documents=["nonviolent resistance works", "the weather today"],
+                          metadatas=[{"type": "web"}, {"type": "web"}])
+        collection.modify(metadata={"persona": "mlk", "persona_fingerprint": "f1"})
+
+        # A second process (client) sees the same index and metadata
+        other = RetrievalClient(f"http://{self.client.host}:{self.client.port}")
+        reopened = other.get_or_create_collection("expert_mlk")
+        self.assertEqual(reopened.metadata["persona_fingerprint"], "f1")
+        result = reopened.query(query_texts=["does nonviolent resistance work"], n_results=1)
+        self.assertEqual(result["documents"], [["nonviolent resistance works"]])
+        self.assertEqual(result["included"], ["documents", "distances"])
+        reopened.delete(ids=["b"])
+        self.assertEqual(collection.count(), 1)
+        other.close()
+
+    def test_concurrent_queries_are_answered_by_one_batched_query(self):
+        collection = self.client.get_or_create_collection("expert_mlk")
+        collection.upsert(ids=["a", "b"], documents=["nonviolence", "justice"])
+        results = {}
+
+        def ask(text):
+            client = RetrievalClient(f"http://{self.client.host}:{self.client.port}")
+            results[text] = client.get_or_create_collection("expert_mlk").query(query_texts=[text], n_results=1)["documents"]
+            client.close()
+
+        threads = [threading.Thread(target=ask, args=(text,)) for text in ("nonviolence", "justice", "justice now")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {"nonviolence": [["nonviolence"]], "justice": [["justice"]], "justice now": [["justice"]]})
+        self.assertEqual(len(self.chroma.collections["expert_mlk"].query_calls), 1)
+        self.assertEqual(self.server.batcher.stats, {'requests': 3, 'batches': 1})
+
+    def test_errors_are_reported_and_connections_reused(self):
+        collection = self.client.get_or_create_collection("host_knowledge")
+        with self.assertRaises(RetrievalServerError) as raised:
+            collection.query(query_texts=["x"], where=None)
+        self.assertEqual(raised.exception.status, 400)
+        collection.count()
+        self.assertEqual(self.client._pool.qsize(), 1)
+
+
+class TestQueryBatcher(unittest.TestCase):
+
+    def test_full_batch_runs_without_waiting_out_the_window(self):
+        batcher = QueryBatcher(window_seconds=10, max_batch_size=2)
+        results = {}
+        follower = threading.Thread(target=lambda: results.setdefault("b", batcher.submit("k", ["b"], lambda items: [i.upper() for i in items])))
+        leader = threading.Thread(target=lambda: results.setdefault("a", batcher.submit("k", ["a"], lambda items: [i.upper() for i in items])))
+        leader.start()
+        follower.start()
+        leader.join(5)
+        follower.join(5)
+        self.assertEqual(results, {"a": ["A"], "b": ["B"]})
+        self.assertEqual(batcher.stats['batches'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from single_flight import SingleFlight, request_key
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting")
+        time.sleep(0.005)
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def run_concurrently(self, group, callers, key, function):
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(group.do("llm", key, function))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        group = SingleFlight()
+        release = threading.Event()
+        executions = []
+
+        def generate():
+            executions.append(1)
+            release.wait(5)
+            return {'response': "Shared question?"}
+
+        threads, results, _ = self.run_concurrently(group, 4, request_key("model", "prompt", {"temperature": 0}), generate)
+        wait_for(lambda: group.report().get("llm", {}).get("shared") == 3)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(executions), 1)
+        self.assertEqual([result for result, _ in results], [{'response': "Shared question?"}] * 4)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True])
+        # Callers don't share the result object itself
+        self.assertEqual(len({id(result) for result, _ in results}), 4)
+        self.assertEqual(group.report()["llm"], {"requests": 4, "backend_calls": 1, "shared": 3, "dedup_ratio": 0.75})
+
+        # Nothing is cached once the call has finished
+        group.do("llm", request_key("model", "prompt", {"temperature": 0}), generate)
+        self.assertEqual(len(executions), 2)
+
+    def test_errors_reach_every_waiting_caller(self):
+        group = SingleFlight()
+        release = threading.Event()
+
+        def failing():
+            release.wait(5)
+            raise ConnectionError("ollama is down")
+
+        threads, results, errors = self.run_concurrently(group, 3, "key", failing)
+        wait_for(lambda: group.report().get("llm", {}).get("shared") == 2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, [])
+        self.assertEqual([str(e) for e in errors], ["ollama is down"] * 3)
+
+    def test_request_key_ignores_dict_order_but_not_values(self):
+        self.assertEqual(request_key("m", {"a": 1, "b": 2}), request_key("m", {"b": 2, "a": 1}))
+        self.assertNotEqual(request_key("m", {"temperature": 0}), request_key("m", {"temperature": 0.1}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from speech_pipeline import SentenceSplitter, SpeechPipeline, ToneTTSBackend, load_backend
+
+
+class SlowHostBackend(ToneTTSBackend):
+    """Host clips take longer than expert clips, so they finish out of script order"""
+
+    def __init__(self):
+        super().__init__(sample_rate=8000, words_per_minute=600)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def synthesize(self, text, voice):
+        with self.lock:
+            self.calls.append((voice, text))
+        if voice == "host":
+            time.sleep(0.05)
+        return super().synthesize(text, voice)
+
+
+class TestSentenceSplitter(unittest.TestCase):
+
+    def test_sentences_are_released_as_they_complete(self):
+        splitter = SentenceSplitter()
+
+        self.assertEqual(splitter.feed("Injustice anywhere is a thr"), [])
+        self.assertEqual(splitter.feed("eat. Are we \"ready?\" We"), ["Injustice anywhere is a threat.", "Are we \"ready?\""])
+        self.assertEqual(splitter.feed(" must act"), [])
+        self.assertEqual(splitter.flush(), ["We must act"])
+        self.assertEqual(splitter.flush(), [])
+
+
+class TestSpeechPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.backend = SlowHostBackend()
+        self.pipeline = SpeechPipeline(self.backend, cache_directory=os.path.join(self.directory, "cache"),
+                                       workers=4, pause_seconds=0.25)
+
+    def tearDown(self):
+        self.pipeline.close()
+        shutil.rmtree(self.directory)
+
+    def record_episode(self, name):
+        episode = self.pipeline.start_episode(os.path.join(self.directory, name))
+        episode.say("host", "Welcome to The Recursive. What changed?")
+        answer = episode.utterance("mlk")
+        for piece in ("The algorithm ", "is the new lunch counter. ", "We must ", "sit in"):
+            answer.feed(piece)
+        answer.finish("ignored, since the answer was streamed")
+        return episode.close(), episode.segments
+
+    def test_streamed_turns_are_assembled_in_script_order(self):
+        report, segments = self.record_episode("episode.wav")
+
+        self.assertEqual([(s["voice"], s["text"]) for s in segments], [
+            ("host", "Welcome to The Recursive."), ("host", "What changed?"),
+            ("mlk", "The algorithm is the new lunch counter."), ("mlk", "We must sit in"),
+        ])
+        # 17 words at 600 wpm is 1.7s of speech, plus a 0.25s pause after each of the two turns
+        self.assertEqual(report["duration_seconds"], 2.2)
+        self.assertEqual(segments[2]["start"], 0.6 + 0.25)
+        with wave.open(report["path"], 'rb') as audio:
+            self.assertEqual(audio.getnframes(), int(2.2 * 8000))
+
+    def test_clips_are_cached_by_voice_and_text(self):
+        self.record_episode("first.wav")
+        report, _ = self.record_episode("second.wav")
+
+        self.assertEqual(len(self.backend.calls), 4)
+        self.assertEqual(self.pipeline.stats, {'synthesized': 4, 'cache_hits': 4})
+        self.assertEqual(report["sentences"], 4)
+
+    def test_backends_load_by_name_or_import_path(self):
+        self.assertFalse(load_backend("tone", {"tone": False}).tone)
+        self.assertIsInstance(load_backend("speech_pipeline:ToneTTSBackend"), ToneTTSBackend)
+        with self.assertRaises(ValueError):
+            load_backend("elevenlabs")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from tracing import NULL_SPAN, Tracer, traced
+
+
+class Traced:
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    @traced()
+    def outer(self):
+        return self.inner() + 1
+
+    @traced("custom_inner")
+    def inner(self):
+        return 1
+
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        self.assertIs(tracer.span("anything"), NULL_SPAN)
+        self.assertEqual(Traced(tracer).outer(), 2)
+        self.assertEqual(tracer.events, [])
+
+    def test_nested_spans_export_as_chrome_trace_events(self):
+        tracer = Tracer(enabled=True)
+        topic = tracer.start_span("topic", topic="AI bias")
+        self.assertEqual(Traced(tracer).outer(), 2)
+        tracer.end_span(topic)
+
+        path = tracer.export_chrome_trace(os.path.join(self.directory, "trace.json"))
+        with open(path, encoding='utf-8') as f:
+            events = [e for e in json.load(f)['traceEvents'] if e['ph'] == "X"]
+        by_name = {e['name']: e for e in events}
+        self.assertEqual(set(by_name), {"topic", "outer", "custom_inner"})
+        self.assertEqual(by_name["topic"]["args"], {"topic": "AI bias"})
+        # Children start after and end before their parent
+        for parent, child in (("topic", "outer"), ("outer", "custom_inner")):
+            self.assertGreaterEqual(by_name[child]["ts"], by_name[parent]["ts"])
+            self.assertLessEqual(by_name[child]["ts"] + by_name[child]["dur"], by_name[parent]["ts"] + by_name[parent]["dur"])
+
+    def test_exceptions_are_recorded_on_the_span(self):
+        tracer = Tracer(enabled=True)
+        with self.assertRaises(RuntimeError):
+            with tracer.span("generation"):
+                raise RuntimeError("boom")
+        self.assertEqual(tracer.events[0]["args"]["error"], "RuntimeError: boom")
+
+    def test_closing_an_outer_span_records_spans_left_open_inside_it(self):
+        tracer = Tracer(enabled=True)
+        topic = tracer.start_span("topic")
+        exchange = tracer.start_span("exchange", number=2)
+        tracer.end_span(topic)
+        tracer.end_span(exchange)  # Already closed with the topic; not recorded twice
+
+        self.assertEqual([e["name"] for e in tracer.events], ["exchange", "topic"])
+        self.assertEqual(tracer.events[0]["args"], {"number": 2, "closed_by": "topic"})
+        self.assertEqual(tracer._stack(), [])
+
+    def test_sampled_spans_are_profiled(self):
+        tracer = Tracer(enabled=True, profile_spans=["outer"], profile_sample_rate=1.0,
+                        profile_directory=os.path.join(self.directory, "profiles"))
+        Traced(tracer).outer()
+        outer = next(e for e in tracer.events if e["name"] == "outer")
+        self.assertTrue(os.path.exists(outer["args"]["profile"]))
+        self.assertNotIn("args", next(e for e in tracer.events if e["name"] == "custom_inner"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from transcript_store import TranscriptStore
+
+VOCABULARY = ["algorithm", "justice", "dream", "segregation", "data"]
+
+
+def fake_embed(texts):
+    """Bag-of-words vectors over a tiny vocabulary"""
+    return [[float(text.lower().count(word)) for word in VOCABULARY] for text in texts]
+
+
+def make_transcript():
+    return {
+        "timestamp": "20250101_120000",
+        "interview": [
+            {"speaker": "HOST", "text": "Welcome", "topic": "Introduction"},
+            {"speaker": "MLK", "text": "I have a dream about justice.", "topic": "Introduction"},
+            {"speaker": "HOST", "text": "Is the algorithm a new segregation?", "topic": "AI Bias"},
+            {"speaker": "MLK", "text": "The arc of the moral universe is long.", "topic": "AI Bias",
+             "comfort_zone_phrases": ["arc of the moral universe"], "depth": 1},
+            {"speaker": "HOST", "text": "But who owns the data?", "topic": "AI Bias"},
+            {"speaker": "MLK", "text": "The algorithm encodes segregation in data we never see.", "topic": "AI Bias",
+             "comfort_zone_phrases": [], "depth": 3, "breakthrough": True},
+        ],
+        "metadata": {"expert_name": "Martin Luther King Jr.", "topics": ["AI Bias"],
+                     "topic_depth_scores": {"AI Bias": 3}}
+    }
+
+
+class TestTranscriptStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = TranscriptStore(os.path.join(self.directory, "transcripts.db"), embed_fn=fake_embed)
+        self.assertEqual(self.store.add_transcript(make_transcript(), "/archive/interview_1.json"), 6)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_full_text_search_ranks_matching_utterances(self):
+        results = self.store.search("segregation", speaker="MLK")
+        self.assertEqual([r['position'] for r in results], [5])
+        self.assertEqual(results[0]['source_path'], "/archive/interview_1.json")
+        self.assertEqual(len(self.store.search("algorithm")), 2)
+
+    def test_punctuation_in_queries_is_matched_literally(self):
+        for text in ("don't", "what?", "AI-driven", 'say "dream"', "segregation?"):
+            self.store.search(text)  # No fts5 syntax errors or unknown columns
+        self.assertEqual([r['position'] for r in self.store.search("owns the data?")], [4])
+        self.assertEqual([r['position'] for r in self.store.search("algorithm NOT data", raw=True)], [2])
+        # Blank text is no full-text filter at all
+        self.assertEqual([r['position'] for r in self.store.search("   ", min_depth=3)], [5])
+
+    def test_metadata_filters(self):
+        self.assertEqual([r['position'] for r in self.store.search(min_depth=3)], [5])
+        self.assertEqual([r['position'] for r in self.store.search(comfort_phrase="arc of the moral universe")], [3])
+        self.assertEqual([r['position'] for r in self.store.search(breakthrough=True)], [5])
+        self.assertEqual(len(self.store.search(topic="AI Bias", min_topic_depth=3)), 4)
+        self.assertEqual(self.store.search(expert="Someone Else"), [])
+
+    def test_import_is_idempotent_unless_replacing(self):
+        self.assertEqual(self.store.add_transcript(make_transcript(), "/archive/interview_1.json"), 0)
+        self.assertEqual(self.store.add_transcript(make_transcript(), "/archive/interview_1.json", replace=True), 6)
+        self.assertEqual(self.store.stats(), {"transcripts": 1, "utterances": 6, "embedded": 6})
+        # Deleted rows must also leave the full-text index
+        self.assertEqual(len(self.store.search("segregation")), 2)
+
+    def test_semantic_search_orders_by_similarity(self):
+        results = self.store.semantic_search("data and algorithm", limit=2, speaker="MLK")
+        self.assertEqual(results[0]['position'], 5)
+        self.assertGreater(results[0]['similarity'], results[1]['similarity'])
+
+
+if __name__ == '__main__':
+    unittest.main()
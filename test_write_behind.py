@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+from write_behind import WriteBehindBuffer
+
+
+class TestWriteBehindBuffer(unittest.TestCase):
+
+    def test_upserts_are_batched_per_collection_and_written_on_flush(self):
+        host, expert = MagicMock(), MagicMock()
+        buffer = WriteBehindBuffer(flush_size=100, flush_interval_seconds=60)
+        buffer.upsert(expert, ids=["w1"], documents=["first"], metadatas=[{"source": "web_search"}])
+        buffer.upsert(expert, ids=["w2", "w1"], documents=["second", "first again"], metadatas=[{"n": 2}, {"n": 1}])
+        buffer.upsert(host, ids=["p1"], documents=["pattern"], metadatas=[{"type": "pattern"}])
+        expert.upsert.assert_not_called()
+
+        self.assertTrue(buffer.close(timeout=5))
+        expert.upsert.assert_called_once_with(ids=["w1", "w2"], documents=["first again", "second"],
+                                              metadatas=[{"n": 1}, {"n": 2}])
+        host.upsert.assert_called_once()
+        self.assertEqual(buffer.report(), {'queued': 4, 'written': 3, 'batches': 2, 'retries': 0, 'failed': 0, 'unwritten': 0})
+        with self.assertRaises(RuntimeError):
+            buffer.upsert(host, ids=["p2"], documents=["late"])
+
+    def test_unwritten_documents_stay_visible_until_written(self):
+        collection = MagicMock()
+        release = threading.Event()
+        collection.upsert.side_effect = lambda **kwargs: release.wait(5)
+        buffer = WriteBehindBuffer(flush_size=1)
+        buffer.upsert(collection, ids=["a", "b"], documents=["Gandhi taught nonviolent resistance", "Weather report"])
+
+        # The batch is in flight (its write is blocked) but retrieval still sees it
+        self.assertEqual(buffer.matching(collection, "What did Gandhi teach about resistance?", limit=5),
+                         ["Gandhi taught nonviolent resistance"])
+        self.assertEqual(buffer.matching(MagicMock(), "Gandhi", limit=5), [])
+        release.set()
+        self.assertTrue(buffer.flush(timeout=5))
+        self.assertEqual(buffer.unwritten(collection), [])
+        buffer.close()
+
+    def test_timed_out_flush_does_not_disable_batching(self):
+        collection = MagicMock()
+        release = threading.Event()
+        collection.upsert.side_effect = lambda **kwargs: release.wait(5)
+        buffer = WriteBehindBuffer(flush_size=100, flush_interval_seconds=60)
+        buffer.upsert(collection, ids=["a"], documents=["first"])
+
+        self.assertFalse(buffer.flush(timeout=0.05))  # The forced batch is still being written
+        release.set()
+        deadline = time.monotonic() + 5
+        while buffer.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+        buffer.upsert(collection, ids=["b"], documents=["second"])
+        time.sleep(0.05)
+        self.assertEqual(collection.upsert.call_count, 1)  # Waits for the batch size or interval again
+        self.assertEqual([doc_id for doc_id, _, _ in buffer.unwritten(collection)], ["b"])
+        self.assertTrue(buffer.close(timeout=5))
+        self.assertEqual(collection.upsert.call_count, 2)
+
+    def test_failed_batches_are_retried_then_dropped(self):
+        flaky, broken = MagicMock(), MagicMock()
+        flaky.upsert.side_effect = [OSError("disk busy"), None]
+        broken.upsert.side_effect = OSError("read-only")
+        buffer = WriteBehindBuffer(flush_size=100, max_retries=2, retry_backoff_seconds=0)
+        buffer.upsert(flaky, ids=["a"], documents=["x"])
+        buffer.upsert(broken, ids=["b"], documents=["y"])
+
+        self.assertTrue(buffer.close(timeout=5))
+        self.assertEqual(flaky.upsert.call_count, 2)
+        self.assertEqual(broken.upsert.call_count, 3)
+        self.assertEqual(buffer.stats['retries'], 3)
+        self.assertEqual(buffer.stats['failed'], 1)
+        self.assertEqual(buffer.stats['written'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+#
+# Tracing
+# =======
+# Lightweight spans for the interview hot path. Spans nest per thread and
+# are recorded as Chrome trace events, so a whole interview's timeline can
+# be opened in chrome://tracing or https://ui.perfetto.dev. Closing a span
+# also closes and records any span still open inside it (an exception
+# that skipped its end_span()), tagged with closed_by.
+#
+# A span can optionally be profiled with cProfile: spans whose name is in
+# profile_spans are sampled at profile_sample_rate and their stats written
+# to profile_directory as .prof files (open with snakeviz or pstats).
+#
+# When tracing is disabled, span() returns a shared no-op context and the
+# @traced decorator calls straight through.
+#
+
+import cProfile
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+
+class _NullSpan:
+    """No-op span used when tracing is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "args", "start", "thread_id", "profiler", "closed")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0.0
+        self.thread_id = threading.get_ident()
+        self.profiler = None
+        self.closed = False
+
+    def set(self, **args):
+        """Attach extra arguments shown in the trace viewer"""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.tracer._open(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer._close(self)
+        return False
+
+
+class Tracer:
+    """Records nested spans as Chrome trace events"""
+
+    def __init__(self, enabled=False, profile_spans=(), profile_sample_rate=0.0, profile_directory="./traces/profiles", seed=None):
+        self.enabled = enabled
+        self.profile_spans = frozenset(profile_spans or ())
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_directory = profile_directory
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._random = random.Random(seed)
+        self._profiling = False  # Only one cProfile profiler runs at a time
+        self._profile_count = 0
+        self._origin = time.perf_counter()
+
+    @classmethod
+    def from_config(cls, tracing_settings):
+        tracing_settings = tracing_settings or {}
+        return cls(
+            enabled=tracing_settings.get('enabled', False),
+            profile_spans=tracing_settings.get('profile_spans', []),
+            profile_sample_rate=tracing_settings.get('profile_sample_rate', 0.0),
+            profile_directory=tracing_settings.get('profile_directory', "./traces/profiles"),
+        )
+
+    def span(self, name, **args):
+        """Context manager timing one span"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def start_span(self, name, **args):
+        """Open a span without a with-block; close it with end_span()"""
+        span = self.span(name, **args)
+        span.__enter__()
+        return span
+
+    def end_span(self, span):
+        span.__exit__(None, None, None)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _open(self, span):
+        self._stack().append(span)
+        if span.name in self.profile_spans and self.profile_sample_rate > 0:
+            self._maybe_start_profile(span)
+        span.start = time.perf_counter()
+
+    def _close(self, span):
+        end = time.perf_counter()
+        if span.closed:
+            return  # Already closed along with an outer span
+        stack = self._stack()
+        inner = []
+        if span in stack:
+            # Closing an outer span also closes (and records) anything left open inside it
+            index = stack.index(span)
+            inner = stack[index + 1:]
+            del stack[index:]
+        for unclosed in reversed(inner):
+            unclosed.args['closed_by'] = span.name
+            self._record(unclosed, end)
+        self._record(span, end)
+
+    def _record(self, span, end):
+        span.closed = True
+        if span.profiler is not None:
+            self._finish_profile(span)
+        event = {
+            "name": span.name,
+            "cat": span.name.split(':')[0],
+            "ph": "X",
+            "ts": (span.start - self._origin) * 1e6,
+            "dur": (end - span.start) * 1e6,
+            "pid": os.getpid(),
+            "tid": span.thread_id,
+        }
+        if span.args:
+            event["args"] = {key: value if isinstance(value, (int, float, bool, type(None))) else str(value)
+                             for key, value in span.args.items()}
+        with self._lock:
+            self.events.append(event)
+
+    def _maybe_start_profile(self, span):
+        with self._lock:
+            if self._profiling or self._random.random() >= self.profile_sample_rate:
+                return
+            self._profiling = True
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. an outer cProfile run) is already active
+            with self._lock:
+                self._profiling = False
+            return
+        span.profiler = profiler
+
+    def _finish_profile(self, span):
+        span.profiler.disable()
+        with self._lock:
+            self._profile_count += 1
+            count = self._profile_count
+            self._profiling = False
+        os.makedirs(self.profile_directory, exist_ok=True)
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in span.name)
+        path = os.path.join(self.profile_directory, f"{safe_name}_{os.getpid()}_{count}.prof")
+        span.profiler.dump_stats(path)
+        span.args['profile'] = path
+        span.profiler = None
+
+    def chrome_trace(self):
+        """Return the recorded spans as a Chrome trace-event document"""
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+             "args": {"name": thread_names.get(tid, f"thread-{tid}")}}
+            for tid in sorted({event["tid"] for event in events})
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def summary(self):
+        """Total and count of recorded time per span name, slowest first"""
+        totals = {}
+        with self._lock:
+            for event in self.events:
+                total, count = totals.get(event["name"], (0.0, 0))
+                totals[event["name"]] = (total + event["dur"] / 1e6, count + 1)
+        return sorted(((name, total, count) for name, (total, count) in totals.items()), key=lambda item: -item[1])
+
+    def reset(self):
+        with self._lock:
+            self.events = []
+        self._origin = time.perf_counter()
+
+
+def traced(name=None):
+    """Decorator that wraps a method in a span on self.tracer"""
+
+    def decorator(method):
+        span_name = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self, 'tracer', None)
+            if tracer is None or not tracer.enabled:
+                return method(self, *args, **kwargs)
+            with tracer.span(span_name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
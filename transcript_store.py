@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+#
+# Transcript Store
+# ================
+# A SQLite archive of interview transcripts with a full-text (FTS5) index
+# over every utterance and metadata columns for expert, topic, depth,
+# comfort zone phrases and breakthroughs. An optional embedding column
+# supports semantic search.
+#
+# Usage:
+#   python transcript_store.py import interview_*.json [--db transcripts.db] [--embed]
+#   python transcript_store.py search "algorithm" --expert "Martin Luther King Jr." --min-depth 3
+#   python transcript_store.py search 'algorithm NOT data' --raw   (FTS5 query syntax)
+#   python transcript_store.py semantic "digital segregation" --limit 5
+#
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import yaml
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY,
+    source_path TEXT UNIQUE,
+    timestamp TEXT,
+    expert_name TEXT,
+    topics TEXT,
+    metadata TEXT,
+    imported_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS utterances (
+    id INTEGER PRIMARY KEY,
+    transcript_id INTEGER NOT NULL REFERENCES transcripts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    speaker TEXT,
+    expert_name TEXT,
+    topic TEXT,
+    text TEXT,
+    depth INTEGER,
+    topic_best_depth INTEGER,
+    comfort_phrases TEXT,
+    is_breakthrough INTEGER DEFAULT 0,
+    embedding BLOB
+);
+
+CREATE INDEX IF NOT EXISTS idx_utterances_expert_topic_depth ON utterances(expert_name, topic, depth);
+CREATE INDEX IF NOT EXISTS idx_utterances_transcript ON utterances(transcript_id, position);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS utterances_fts USING fts5(
+    text, speaker, topic,
+    content='utterances', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS utterances_after_insert AFTER INSERT ON utterances BEGIN
+    INSERT INTO utterances_fts(rowid, text, speaker, topic) VALUES (new.id, new.text, new.speaker, new.topic);
+END;
+
+CREATE TRIGGER IF NOT EXISTS utterances_after_delete AFTER DELETE ON utterances BEGIN
+    INSERT INTO utterances_fts(utterances_fts, rowid, text, speaker, topic) VALUES ('delete', old.id, old.text, old.speaker, old.topic);
+END;
+"""
+
+RESULT_FIELDS = (
+    "id", "source_path", "timestamp", "position", "speaker", "expert_name",
+    "topic", "text", "depth", "topic_best_depth", "comfort_phrases", "is_breakthrough"
+)
+
+
+class TranscriptStore:
+    """SQLite-backed archive of interview transcripts"""
+
+    def __init__(self, path="./transcripts.db", embed_fn=None):
+        self.path = path
+        self.embed_fn = embed_fn  # Callable taking a list of texts and returning a list of vectors
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def has_transcript(self, source_path):
+        row = self.connection.execute("SELECT 1 FROM transcripts WHERE source_path = ?", (source_path,)).fetchone()
+        return row is not None
+
+    def add_transcript(self, transcript, source_path, replace=False):
+        """Index and commit one transcript dict. Returns the number of utterances stored (0 if already present)."""
+        with self.connection:
+            return self._add_transcript(transcript, source_path, replace)
+
+    def _add_transcript(self, transcript, source_path, replace=False):
+        if self.has_transcript(source_path):
+            if not replace:
+                return 0
+            self.connection.execute("DELETE FROM transcripts WHERE source_path = ?", (source_path,))
+
+        metadata = transcript.get('metadata', {})
+        expert_name = metadata.get('expert_name', '')
+        topic_depths = metadata.get('topic_depth_scores', {})
+        breakthrough_questions = {bt.get('question') for bt in metadata.get('potential_breakthroughs', [])}
+
+        cursor = self.connection.execute(
+            "INSERT INTO transcripts (source_path, timestamp, expert_name, topics, metadata, imported_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (source_path, transcript.get('timestamp', ''), expert_name, json.dumps(metadata.get('topics', [])),
+             json.dumps(metadata, ensure_ascii=False), datetime.now().isoformat())
+        )
+        transcript_id = cursor.lastrowid
+
+        rows = []
+        entries = transcript.get('interview', [])
+        for position, entry in enumerate(entries):
+            previous_text = entries[position - 1].get('text') if position > 0 else None
+            is_expert = entry.get('speaker') != "HOST"
+            rows.append((
+                transcript_id, position, entry.get('speaker'), expert_name, entry.get('topic'), entry.get('text', ''),
+                entry.get('depth'), topic_depths.get(entry.get('topic')),
+                json.dumps(entry.get('comfort_zone_phrases', []), ensure_ascii=False),
+                int(bool(entry.get('breakthrough')) or (is_expert and previous_text in breakthrough_questions))
+            ))
+        self.connection.executemany(
+            "INSERT INTO utterances (transcript_id, position, speaker, expert_name, topic, text, depth, topic_best_depth, "
+            "comfort_phrases, is_breakthrough) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        if self.embed_fn is not None:
+            self._embed_transcript(transcript_id)
+        return len(rows)
+
+    def _embed_transcript(self, transcript_id):
+        """Embed every utterance of a transcript in one batch"""
+        rows = self.connection.execute(
+            "SELECT id, text FROM utterances WHERE transcript_id = ? AND text != ''", (transcript_id,)
+        ).fetchall()
+        if not rows:
+            return
+        vectors = np.asarray(self.embed_fn([row['text'] for row in rows]), dtype=np.float32)
+        self.connection.executemany(
+            "UPDATE utterances SET embedding = ? WHERE id = ?",
+            [(vector.tobytes(), row['id']) for vector, row in zip(vectors, rows)]
+        )
+
+    def import_files(self, paths, replace=False):
+        """Bulk-import transcript JSON files in a single transaction. Returns (files_imported, utterances)."""
+        files_imported = 0
+        utterance_count = 0
+        with self.connection:
+            for path in paths:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        transcript = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"⚠️ Skipping unreadable transcript {path}: {e}")
+                    continue
+                stored = self._add_transcript(transcript, os.path.abspath(path), replace=replace)
+                if stored:
+                    files_imported += 1
+                    utterance_count += stored
+        return files_imported, utterance_count
+
+    def _filters(self, expert=None, topic=None, speaker=None, min_depth=None, min_topic_depth=None,
+                 comfort_phrase=None, breakthrough=None):
+        clauses = []
+        params = []
+        if expert:
+            clauses.append("u.expert_name = ?")
+            params.append(expert)
+        if topic:
+            clauses.append("u.topic = ?")
+            params.append(topic)
+        if speaker:
+            clauses.append("u.speaker = ?")
+            params.append(speaker)
+        if min_depth is not None:
+            clauses.append("u.depth >= ?")
+            params.append(min_depth)
+        if min_topic_depth is not None:
+            # Older transcripts only recorded the best depth per topic
+            clauses.append("u.topic_best_depth >= ?")
+            params.append(min_topic_depth)
+        if comfort_phrase:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(u.comfort_phrases) WHERE value = ?)")
+            params.append(comfort_phrase)
+        if breakthrough is not None:
+            clauses.append("u.is_breakthrough = ?")
+            params.append(int(breakthrough))
+        return clauses, params
+
+    def search(self, text=None, limit=50, raw=False, **filters):
+        """Find utterances by full-text query and/or metadata filters, best matches first.
+
+        Every word of `text` must appear; raw=True passes `text` on as FTS5 query syntax instead.
+        """
+        clauses, params = self._filters(**filters)
+        text = text.strip() if text else text  # Blank input means no full-text filter, not an empty MATCH
+        select = ("SELECT u.id, t.source_path, t.timestamp, u.position, u.speaker, u.expert_name, u.topic, u.text, "
+                  "u.depth, u.topic_best_depth, u.comfort_phrases, u.is_breakthrough")
+        if text:
+            sql = (f"{select}, bm25(utterances_fts) AS rank FROM utterances_fts "
+                   "JOIN utterances u ON u.id = utterances_fts.rowid JOIN transcripts t ON t.id = u.transcript_id "
+                   "WHERE utterances_fts MATCH ?")
+            params.insert(0, text if raw else fts_phrase_query(text))
+            order = " ORDER BY rank"
+        else:
+            sql = f"{select} FROM utterances u JOIN transcripts t ON t.id = u.transcript_id WHERE 1 = 1"
+            order = " ORDER BY t.timestamp, u.position"
+        for clause in clauses:
+            sql += f" AND {clause}"
+        sql += order + " LIMIT ?"
+        params.append(limit)
+        return [self._row_to_result(row) for row in self.connection.execute(sql, params)]
+
+    def semantic_search(self, query, limit=10, **filters):
+        """Rank utterances with stored embeddings by cosine similarity to the query"""
+        if self.embed_fn is None:
+            raise ValueError("semantic_search requires a TranscriptStore created with embed_fn")
+        clauses, params = self._filters(**filters)
+        sql = ("SELECT u.id, t.source_path, t.timestamp, u.position, u.speaker, u.expert_name, u.topic, u.text, "
+               "u.depth, u.topic_best_depth, u.comfort_phrases, u.is_breakthrough, u.embedding "
+               "FROM utterances u JOIN transcripts t ON t.id = u.transcript_id WHERE u.embedding IS NOT NULL")
+        for clause in clauses:
+            sql += f" AND {clause}"
+        rows = self.connection.execute(sql, params).fetchall()
+        if not rows:
+            return []
+
+        matrix = np.vstack([np.frombuffer(row['embedding'], dtype=np.float32) for row in rows])
+        query_vector = np.asarray(self.embed_fn([query])[0], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query_vector) or 1.0)
+        norms[norms == 0] = 1.0
+        similarities = (matrix @ query_vector) / norms
+        top = np.argsort(-similarities)[:limit]
+        results = []
+        for index in top:
+            result = self._row_to_result(rows[index])
+            result['similarity'] = float(similarities[index])
+            results.append(result)
+        return results
+
+    def _row_to_result(self, row):
+        result = {field: row[field] for field in RESULT_FIELDS}
+        result['comfort_phrases'] = json.loads(result['comfort_phrases'] or "[]")
+        result['is_breakthrough'] = bool(result['is_breakthrough'])
+        return result
+
+    def iter_transcripts(self, expert=None):
+        """Yield archived transcripts as dicts (metadata plus each utterance's speaker, topic and depth)"""
+        sql = "SELECT id, expert_name, metadata FROM transcripts"
+        params = ()
+        if expert:
+            sql += " WHERE expert_name = ?"
+            params = (expert,)
+        for row in self.connection.execute(sql + " ORDER BY id", params).fetchall():
+            utterances = self.connection.execute(
+                "SELECT speaker, topic, depth FROM utterances WHERE transcript_id = ? ORDER BY position", (row['id'],)
+            )
+            yield {
+                "metadata": json.loads(row['metadata'] or "{}"),
+                "interview": [dict(utterance) for utterance in utterances],
+            }
+
+    def stats(self):
+        row = self.connection.execute(
+            "SELECT (SELECT COUNT(*) FROM transcripts) AS transcripts, COUNT(*) AS utterances, "
+            "COUNT(embedding) AS embedded FROM utterances"
+        ).fetchone()
+        return dict(row)
+
+
+def fts_phrase_query(text):
+    """An FTS5 query matching every whitespace-separated word of `text` literally, so punctuation in
+    user input ("don't", "what?", "AI-driven") isn't read as query syntax"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def _embed_fn_from_config(config):
+    import ollama
+    client = ollama.Client()
+    embedding_model = config.get('embedding_model', 'nomic-embed-text')
+    return lambda texts: client.embed(model=embedding_model, input=texts)['embeddings']
+
+
+def _print_results(results):
+    for result in results:
+        depth = result['depth'] if result['depth'] is not None else '-'
+        flags = " ⚡" if result['is_breakthrough'] else ""
+        similarity = f" ({result['similarity']:.2f})" if 'similarity' in result else ""
+        print(f"\n[{result['timestamp']}] {result['topic']} · depth {depth}{flags}{similarity}")
+        print(f"   {result['speaker']}: {result['text'][:300]}")
+        print(f"   ↳ {result['source_path']}#{result['position']}")
+    print(f"\n{len(results)} result(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import and search archived interview transcripts.")
+    parser.add_argument('--db', default=None, help="SQLite database path (defaults to transcript_store.path)")
+    parser.add_argument('--config', default="config.yaml", help="Path to config.yaml")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="Bulk-import transcript JSON files")
+    import_parser.add_argument('transcripts', nargs='+', help="Transcript files or glob patterns")
+    import_parser.add_argument('--replace', action='store_true', help="Re-index transcripts that are already stored")
+    import_parser.add_argument('--embed', action='store_true', help="Store utterance embeddings for semantic search")
+
+    for name, help_text in (('search', "Full-text and metadata search"), ('semantic', "Embedding similarity search")):
+        query_parser = subparsers.add_parser(name, help=help_text)
+        query_parser.add_argument('query', nargs='?' if name == 'search' else None, default=None)
+        query_parser.add_argument('--expert', default=None)
+        query_parser.add_argument('--topic', default=None)
+        query_parser.add_argument('--speaker', default=None)
+        query_parser.add_argument('--min-depth', type=int, default=None, help="Minimum depth of the exchange itself")
+        query_parser.add_argument('--min-topic-depth', type=int, default=None, help="Minimum best depth reached on the topic")
+        query_parser.add_argument('--comfort-phrase', default=None)
+        query_parser.add_argument('--breakthroughs', action='store_true', help="Only breakthrough moments")
+        query_parser.add_argument('--limit', type=int, default=20)
+        if name == 'search':
+            query_parser.add_argument('--raw', action='store_true', help="Treat the query as FTS5 syntax (AND, OR, NOT, prefix*, ...)")
+
+    subparsers.add_parser('stats', help="Show archive size")
+    args = parser.parse_args()
+
+    config = {}
+    if os.path.exists(args.config):
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+    db_path = args.db or config.get('transcript_store', {}).get('path', "./transcripts.db")
+    needs_embeddings = args.command == 'semantic' or (args.command == 'import' and args.embed)
+    embed_fn = _embed_fn_from_config(config) if needs_embeddings else None
+
+    with TranscriptStore(db_path, embed_fn=embed_fn) as store:
+        if args.command == 'import':
+            paths = sorted({path for pattern in args.transcripts for path in glob.glob(pattern)})
+            files_imported, utterance_count = store.import_files(paths, replace=args.replace)
+            print(f"✓ Imported {files_imported}/{len(paths)} transcript(s), {utterance_count} utterances into {db_path}")
+        elif args.command == 'stats':
+            print(store.stats())
+        else:
+            filters = dict(
+                expert=args.expert, topic=args.topic, speaker=args.speaker, min_depth=args.min_depth,
+                min_topic_depth=args.min_topic_depth,
+                comfort_phrase=args.comfort_phrase, breakthrough=True if args.breakthroughs else None
+            )
+            if args.command == 'search':
+                _print_results(store.search(args.query, limit=args.limit, raw=args.raw, **filters))
+            else:
+                _print_results(store.semantic_search(args.query, limit=args.limit, **filters))
+
+
+if __name__ == "__main__":
+    main()
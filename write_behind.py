@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+#
+# Write-Behind Buffer
+# ===================
+# Web snippets and successful questioning patterns used to be upserted into
+# ChromaDB inline, so every expert turn waited for the documents to be
+# embedded and written to disk before its prompt was even built. This
+# buffer queues upserts per collection and writes them from a background
+# thread in batches, when flush_size documents are waiting or the oldest
+# has waited flush_interval_seconds. A failed batch is retried with
+# exponential backoff, then dropped and counted.
+#
+# Until a document is written it stays in an in-memory overlay, so the
+# same exchange's retrieval still sees it (read-your-writes): matching()
+# ranks a collection's unwritten documents by word overlap with the query,
+# which needs no embedding. flush() waits for everything queued so far;
+# close() flushes and stops the thread.
+#
+# Usage:
+#   buffer = WriteBehindBuffer(flush_size=32, flush_interval_seconds=2.0)
+#   buffer.upsert(collection, ids=[...], documents=[...], metadatas=[...])
+#   buffer.matching(collection, "question text", limit=2)   # unwritten documents
+#   buffer.close()
+#
+
+import re
+import threading
+import time
+
+WORD_PATTERN = re.compile(r"[a-z0-9']{3,}")
+
+
+def _words(text):
+    return set(WORD_PATTERN.findall(text.lower()))
+
+
+class _CollectionQueue:
+    """Unwritten documents of one collection: queued, and taken by the flush in progress"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.pending = {}  # id -> (document, metadata), newest write wins
+        self.in_flight = {}
+        self.oldest = None  # When the oldest pending document was queued
+
+    def documents(self):
+        return {**self.in_flight, **self.pending}
+
+
+class WriteBehindBuffer:
+    """Batched background upserts per collection, with an overlay of what is not yet written"""
+
+    def __init__(self, flush_size=32, flush_interval_seconds=2.0, max_retries=3, retry_backoff_seconds=0.5,
+                 logger=None, clock=time.monotonic):
+        self.flush_size = flush_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.logger = logger
+        self.clock = clock
+        self._queues = {}  # id(collection) -> _CollectionQueue
+        self._condition = threading.Condition()
+        self._flush_waiters = 0  # flush() calls in progress; batching is bypassed while any is waiting
+        self._closing = False
+        self._thread = None
+        self.stats = {'queued': 0, 'written': 0, 'batches': 0, 'retries': 0, 'failed': 0}
+
+    @classmethod
+    def from_config(cls, settings, logger=None):
+        return cls(flush_size=settings.get('flush_size', 32),
+                   flush_interval_seconds=settings.get('flush_interval_seconds', 2.0),
+                   max_retries=settings.get('max_retries', 3),
+                   retry_backoff_seconds=settings.get('retry_backoff_seconds', 0.5),
+                   logger=logger)
+
+    def upsert(self, collection, ids, documents, metadatas=None):
+        """Queue documents for collection.upsert(); returns without embedding or writing anything"""
+        metadatas = metadatas if metadatas is not None else [None] * len(ids)
+        with self._condition:
+            if self._closing:
+                raise RuntimeError("write-behind buffer is closed")
+            queue = self._queues.get(id(collection))
+            if queue is None:
+                queue = self._queues[id(collection)] = _CollectionQueue(collection)
+            if not queue.pending:
+                queue.oldest = self.clock()
+            for doc_id, document, metadata in zip(ids, documents, metadatas):
+                queue.pending[doc_id] = (document, metadata)
+            self.stats['queued'] += len(ids)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def pending_count(self):
+        with self._condition:
+            return sum(len(queue.pending) + len(queue.in_flight) for queue in self._queues.values())
+
+    def unwritten(self, collection):
+        """(id, document, metadata) for every document of the collection not yet written"""
+        with self._condition:
+            queue = self._queues.get(id(collection))
+            if queue is None:
+                return []
+            return [(doc_id, document, metadata) for doc_id, (document, metadata) in queue.documents().items()]
+
+    def matching(self, collection, query, limit):
+        """Up to limit unwritten documents sharing words with the query, best overlap first"""
+        query_words = _words(query)
+        scored = []
+        for _, document, _ in self.unwritten(collection):
+            overlap = len(query_words & _words(document))
+            if overlap:
+                scored.append((overlap, document))
+        scored.sort(key=lambda item: -item[0])  # Stable, so equal overlaps keep queue order
+        return [document for _, document in scored[:limit]]
+
+    def flush(self, timeout=None):
+        """Write everything queued so far now; True once nothing is left unwritten"""
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._condition:
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            try:
+                while any(queue.pending or queue.in_flight for queue in self._queues.values()):
+                    remaining = None if deadline is None else deadline - self.clock()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                return True
+            finally:
+                # Also on a timeout, or later upserts would never be batched again
+                self._flush_waiters -= 1
+
+    def close(self, timeout=None):
+        """Flush and stop the background thread; later upserts raise"""
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return flushed
+
+    def report(self):
+        return {**self.stats, 'unwritten': self.pending_count()}
+
+    def _due(self):
+        pending = [queue for queue in self._queues.values() if queue.pending]
+        if not pending:
+            return []
+        if self._flush_waiters or self._closing or sum(len(queue.pending) for queue in pending) >= self.flush_size:
+            return pending
+        cutoff = self.clock() - self.flush_interval_seconds
+        return [queue for queue in pending if queue.oldest <= cutoff]
+
+    def _next_wake(self):
+        oldest = [queue.oldest for queue in self._queues.values() if queue.pending]
+        if not oldest:
+            return None
+        return max(min(oldest) + self.flush_interval_seconds - self.clock(), 0.0)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._due()
+                while not due:
+                    if self._closing:
+                        return
+                    self._condition.wait(self._next_wake())
+                    due = self._due()
+                for queue in due:
+                    queue.in_flight, queue.pending = queue.pending, {}
+            for queue in due:
+                self._write(queue)
+            with self._condition:
+                for queue in due:
+                    queue.in_flight = {}
+                    if queue.pending:
+                        queue.oldest = self.clock()
+                self._condition.notify_all()
+
+    def _write(self, queue):
+        ids = list(queue.in_flight)
+        documents = [queue.in_flight[doc_id][0] for doc_id in ids]
+        metadatas = [queue.in_flight[doc_id][1] for doc_id in ids]
+        options = {'metadatas': metadatas} if all(metadata is not None for metadata in metadatas) else {}
+        for attempt in range(self.max_retries + 1):
+            try:
+                queue.collection.upsert(ids=ids, documents=documents, **options)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    with self._condition:
+                        self.stats['failed'] += len(ids)
+                    if self.logger:
+                        self.logger.error(f"Write-behind upsert of {len(ids)} document(s) failed after {attempt + 1} attempt(s): {e}")
+                    return
+                with self._condition:
+                    self.stats['retries'] += 1
+                if self.logger:
+                    self.logger.warning(f"Write-behind upsert failed ({e}); retrying")
+                time.sleep(self.retry_backoff_seconds * 2 ** attempt)
+            else:
+                with self._condition:
+                    self.stats['written'] += len(ids)
+                    self.stats['batches'] += 1
+                return